@@ -1,37 +1,23 @@
 #!/bin/bash
 
-# 매개변수 개수 확인
-if [ "$#" -ne 3 ]; then
-  echo "How to use: $0 os_name target_dir exec_path(no ext)"
-  exit 1
-fi
+# 실제 작업은 copy_deps.py가 수행 (ldd 대신 ELF/PE import를 직접 읽고, 바뀐 라이브러리만 복사)
+# 실행 파일은 여러 개 지정할 수 있음: $0 os_name target_dir exec_path(no ext) [exec_path ...]
 
-OS="$1"
-TARGET_DIR="$2"
-EXEC_PATH="$3"
-
-if [ "$OS" == "Windows" ]; then
-  PROGRAM="$EXEC_PATH.exe"
-  rm -vrf "$TARGET_DIR/*.dll"
-  LIBS=$(ldd "$PROGRAM" | grep "=> /ucrt64" | awk '{print $3}')
-elif [ "$OS" == "Linux" ]; then
-  PROGRAM="$EXEC_PATH"
-  rm -vrf "$TARGET_DIR/*.so"
-  LIBS=$(ldd "$PROGRAM" | grep "=> /" | awk '{print $3}')
-else
-  echo "Invalid OS"
+# 매개변수 개수 확인
+if [ "$#" -lt 3 ]; then
+  echo "How to use: $0 os_name target_dir exec_path(no ext) [exec_path(no ext) ...]"
   exit 1
 fi
 
-echo "Delete all Shared library files in $TARGET_DIR"
+SCRIPT_DIR=$(dirname "$(readlink -f "$0")")
 
-if [ ! -d "$TARGET_DIR" ]; then
-  mkdir -p "$TARGET_DIR"
+if command -v python3 >/dev/null 2>&1; then
+  PYTHON=python3
+else
+  PYTHON=python
 fi
 
-for LIB in $LIBS; do
-  cp -v "$LIB" "$TARGET_DIR"
-done
+exec "$PYTHON" "$SCRIPT_DIR/copy_deps.py" "$@"
 
 # if [ "$OS" == "Windows" ]; then
 #   EXTRA_PATH="/ucrt64/share/qt6/plugins/platforms"
@@ -44,5 +30,3 @@ done
 #     cp -v "$EXTRA_PATH/$EXTRA_LIB" "$EXTRA_DEST_PATH"
 #   done
 # fi
-
-echo "All libraries copied to $TARGET_DIR"
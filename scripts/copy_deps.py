@@ -0,0 +1,551 @@
+#!/usr/bin/env python3
+# copy_deps.py (실행 파일의 공유 라이브러리 의존성을 찾아 대상 디렉터리로 복사)
+#
+# copy-deps.sh는 ldd 출력을 grep/awk로 걸러 매번 모든 라이브러리를 지우고 다시 복사했다.
+# 여기서는 ELF(DT_NEEDED)/PE(import table)를 직접 읽어 의존성 전체(전이 폐포)를 계산하고,
+# 라이브러리별 분석 결과는 mtime/해시로 캐시하며, 바뀐 파일만 하드 링크(또는 reflink, 복사)한다.
+#
+# 사용 예:
+#   python copy_deps.py Linux build/bin build/bin/imgui-demo build/bin/example
+#   python copy_deps.py Windows build/bin build/bin/imgui-demo      # .exe는 자동으로 붙음
+
+import argparse
+import fnmatch
+import glob
+import hashlib
+import json
+import os
+import shutil
+import struct
+import sys
+
+CACHE_FILE_NAME = ".copy-deps-cache.json"
+CACHE_VERSION = 1
+
+# MSYS2 환경에서 복사 대상으로 삼는 DLL 위치 (ldd 출력의 '=> /ucrt64' 필터에 해당)
+DEFAULT_MSYS2_PREFIX = "/ucrt64"
+# ld.so가 기본으로 찾는 디렉터리 (ld.so.conf에 없는 경우 대비)
+DEFAULT_ELF_DIRS = ["/lib64", "/usr/lib64", "/lib", "/usr/lib"]
+
+LINK_MODES = ("auto", "hardlink", "reflink", "copy")
+_FICLONE = 0x40049409  # Linux ioctl: 같은 파일 시스템에서 블록을 공유하는 복사 (btrfs, xfs)
+
+
+class DependencyError(Exception):
+    pass
+
+
+# --- ELF ---
+_ELF_MAGIC = b"\x7fELF"
+_PT_LOAD, _PT_DYNAMIC, _PT_INTERP = 1, 2, 3
+_DT_NULL, _DT_NEEDED, _DT_STRTAB, _DT_RPATH, _DT_RUNPATH = 0, 1, 5, 15, 29
+
+
+def _parse_elf(data):
+    """{"format": "elf", "machine": (class, endian, e_machine), "needed", "rpath", "runpath", "interp"}"""
+    elf_class, endian_flag = data[4], data[5]
+    if elf_class not in (1, 2) or endian_flag not in (1, 2):
+        raise DependencyError("지원되지 않는 ELF 형식")
+    endian = "<" if endian_flag == 1 else ">"
+    is64 = elf_class == 2
+    if is64:
+        e_machine, = struct.unpack_from(endian + "H", data, 18)
+        e_phoff, = struct.unpack_from(endian + "Q", data, 32)
+        e_phentsize, e_phnum = struct.unpack_from(endian + "HH", data, 54)
+        ph_format = endian + "IIQQQQQQ"  # type, flags, offset, vaddr, paddr, filesz, memsz, align
+        dyn_format, dyn_size = endian + "qQ", 16
+    else:
+        e_machine, = struct.unpack_from(endian + "H", data, 18)
+        e_phoff, = struct.unpack_from(endian + "I", data, 28)
+        e_phentsize, e_phnum = struct.unpack_from(endian + "HH", data, 42)
+        ph_format = endian + "IIIIIIII"  # type, offset, vaddr, paddr, filesz, memsz, flags, align
+        dyn_format, dyn_size = endian + "iI", 8
+
+    loads, dynamic, interp = [], None, None
+    for index in range(e_phnum):
+        fields = struct.unpack_from(ph_format, data, e_phoff + index * e_phentsize)
+        if is64:
+            p_type, _, p_offset, p_vaddr, _, p_filesz, _, _ = fields
+        else:
+            p_type, p_offset, p_vaddr, _, p_filesz, _, _, _ = fields
+        if p_type == _PT_LOAD:
+            loads.append((p_vaddr, p_offset, p_filesz))
+        elif p_type == _PT_DYNAMIC:
+            dynamic = (p_offset, p_filesz)
+        elif p_type == _PT_INTERP:
+            interp = data[p_offset : p_offset + p_filesz].rstrip(b"\0").decode()
+
+    info = {
+        "format": "elf",
+        "machine": [elf_class, endian_flag, e_machine],
+        "needed": [],
+        "rpath": [],
+        "runpath": [],
+        "interp": interp,
+    }
+    if dynamic is None:  # 정적 링크
+        return info
+
+    entries = []
+    offset, size = dynamic
+    for pos in range(offset, offset + size, dyn_size):
+        tag, value = struct.unpack_from(dyn_format, data, pos)
+        if tag == _DT_NULL:
+            break
+        entries.append((tag, value))
+
+    strtab_vaddr = next((value for tag, value in entries if tag == _DT_STRTAB), None)
+    if strtab_vaddr is None:
+        return info
+    strtab = _vaddr_to_offset(loads, strtab_vaddr)
+
+    def read_string(string_offset):
+        start = strtab + string_offset
+        return data[start : data.index(b"\0", start)].decode()
+
+    for tag, value in entries:
+        if tag == _DT_NEEDED:
+            info["needed"].append(read_string(value))
+        elif tag == _DT_RPATH:
+            info["rpath"] += read_string(value).split(":")
+        elif tag == _DT_RUNPATH:
+            info["runpath"] += read_string(value).split(":")
+    return info
+
+
+def _vaddr_to_offset(loads, vaddr):
+    for p_vaddr, p_offset, p_filesz in loads:
+        if p_vaddr <= vaddr < p_vaddr + p_filesz:
+            return vaddr - p_vaddr + p_offset
+    raise DependencyError(f"가상 주소 0x{vaddr:x}를 파일 위치로 바꿀 수 없습니다.")
+
+
+# --- PE ---
+_IMPORT_DIRECTORY, _DELAY_IMPORT_DIRECTORY = 1, 13
+
+
+def _parse_pe(data):
+    """{"format": "pe", "machine": ("pe", Machine), "needed": [dll 이름, ...]}"""
+    e_lfanew, = struct.unpack_from("<I", data, 0x3C)
+    if data[e_lfanew : e_lfanew + 4] != b"PE\0\0":
+        raise DependencyError("PE 서명이 없습니다.")
+    coff = e_lfanew + 4
+    machine, section_count = struct.unpack_from("<HH", data, coff)
+    optional_size, = struct.unpack_from("<H", data, coff + 16)
+    optional = coff + 20
+    magic, = struct.unpack_from("<H", data, optional)
+    data_dirs = optional + (112 if magic == 0x20B else 96)  # PE32+ / PE32
+    dir_count, = struct.unpack_from("<I", data, data_dirs - 4)
+
+    sections = []
+    section_table = optional + optional_size
+    for index in range(section_count):
+        base = section_table + index * 40
+        virtual_size, virtual_address, raw_size, raw_pointer = struct.unpack_from("<IIII", data, base + 8)
+        sections.append((virtual_address, max(virtual_size, raw_size), raw_pointer))
+
+    def rva_to_offset(rva):
+        for virtual_address, size, raw_pointer in sections:
+            if virtual_address <= rva < virtual_address + size:
+                return rva - virtual_address + raw_pointer
+        raise DependencyError(f"RVA 0x{rva:x}를 파일 위치로 바꿀 수 없습니다.")
+
+    def read_string(rva):
+        start = rva_to_offset(rva)
+        return data[start : data.index(b"\0", start)].decode("ascii", errors="replace")
+
+    def directory(index):
+        if index >= dir_count:
+            return 0
+        rva, _ = struct.unpack_from("<II", data, data_dirs + index * 8)
+        return rva
+
+    needed = []
+    import_rva = directory(_IMPORT_DIRECTORY)
+    if import_rva:
+        pos = rva_to_offset(import_rva)
+        while True:
+            # IMAGE_IMPORT_DESCRIPTOR (20바이트): Name RVA는 12번째 바이트부터
+            fields = struct.unpack_from("<IIIII", data, pos)
+            if not any(fields):
+                break
+            needed.append(read_string(fields[3]))
+            pos += 20
+    delay_rva = directory(_DELAY_IMPORT_DIRECTORY)
+    if delay_rva:
+        pos = rva_to_offset(delay_rva)
+        while True:
+            # ImgDelayDescr (32바이트): DllNameRVA는 4번째 바이트부터
+            fields = struct.unpack_from("<8I", data, pos)
+            if not any(fields):
+                break
+            needed.append(read_string(fields[1]))
+            pos += 32
+    return {"format": "pe", "machine": ["pe", machine], "needed": needed}
+
+
+def parse_binary(path):
+    """ELF 또는 PE 파일의 직접 의존성을 읽습니다."""
+    with open(path, "rb") as f:
+        data = f.read()
+    try:
+        if data[:4] == _ELF_MAGIC:
+            return _parse_elf(data)
+        if data[:2] == b"MZ":
+            return _parse_pe(data)
+    except (struct.error, ValueError, IndexError) as e:
+        raise DependencyError(f"{path}: 손상된 실행 파일 ({e})")
+    raise DependencyError(f"{path}: ELF/PE 파일이 아닙니다.")
+
+
+# --- 분석 결과 캐시 ---
+def _file_sha256(path):
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+class BinaryInfoCache:
+    """
+    라이브러리별 분석 결과를 {실제 경로: {mtime_ns, size, sha256, info}}로 보관합니다.
+    mtime/크기가 같으면 파일을 읽지 않고, 달라도 해시가 같으면 다시 분석하지 않습니다.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = {}
+        self.copied = []  # 지난 실행에서 대상 디렉터리에 복사한 파일 이름
+        self.dirty = False
+        self.hits = self.misses = 0
+        if path:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == CACHE_VERSION:
+                    self.entries = data.get("libraries", {})
+                    self.copied = data.get("copied", [])
+            except (OSError, ValueError):
+                pass
+
+    def get(self, path):
+        real = os.path.realpath(path)
+        stat = os.stat(real)
+        entry = self.entries.get(real)
+        if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            self.hits += 1
+            return entry["info"]
+        sha256 = _file_sha256(real)
+        if entry and entry["sha256"] == sha256:
+            self.hits += 1
+            info = entry["info"]
+        else:
+            self.misses += 1
+            info = parse_binary(real)
+        self.entries[real] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": sha256,
+            "info": info,
+        }
+        self.dirty = True
+        return info
+
+    def save(self, copied):
+        if not self.path or (not self.dirty and sorted(copied) == sorted(self.copied)):
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": CACHE_VERSION, "libraries": self.entries, "copied": sorted(copied)},
+                f,
+                indent=1,
+            )
+        os.replace(tmp_path, self.path)
+
+
+# --- 라이브러리 찾기 ---
+def _read_ld_so_conf(path="/etc/ld.so.conf", seen=None):
+    seen = set() if seen is None else seen
+    if path in seen:
+        return []
+    seen.add(path)
+    dirs = []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return dirs
+    for line in lines:
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        if line.startswith("include"):
+            pattern = line.split(None, 1)[1]
+            if not os.path.isabs(pattern):
+                pattern = os.path.join(os.path.dirname(path), pattern)
+            for included in sorted(glob.glob(pattern)):
+                dirs += _read_ld_so_conf(included, seen)
+        else:
+            dirs.append(line)
+    return dirs
+
+
+class LibraryResolver:
+    """
+    의존성 이름(soname / dll 이름)을 실제 파일 경로로 바꿉니다.
+    ELF: RPATH(RUNPATH가 없을 때) -> LD_LIBRARY_PATH -> RUNPATH -> ld.so.conf -> 기본 디렉터리
+    PE: search_dirs -> 실행 파일 디렉터리 (대소문자 무시). 찾지 못한 DLL은 시스템 DLL로 보고 건너뜀.
+    """
+
+    def __init__(self, cache, search_dirs=()):
+        self.cache = cache
+        self.search_dirs = list(search_dirs)
+        self._elf_dirs = None
+        self._dir_listing = {}  # 디렉터리 -> {소문자 이름: 실제 이름}
+
+    def _system_elf_dirs(self):
+        if self._elf_dirs is None:
+            env_dirs = [d for d in os.environ.get("LD_LIBRARY_PATH", "").split(":") if d]
+            self._elf_dirs = env_dirs, _read_ld_so_conf() + DEFAULT_ELF_DIRS
+        return self._elf_dirs
+
+    def _listing(self, directory):
+        if directory not in self._dir_listing:
+            try:
+                names = os.listdir(directory)
+            except OSError:
+                names = []
+            self._dir_listing[directory] = {name.lower(): name for name in names}
+        return self._dir_listing[directory]
+
+    def _resolve_elf(self, name, parent_path, parent_info):
+        origin = os.path.dirname(os.path.realpath(parent_path))
+
+        def expand(dirs):
+            return [d.replace("$ORIGIN", origin).replace("${ORIGIN}", origin) for d in dirs if d]
+
+        env_dirs, system_dirs = self._system_elf_dirs()
+        dirs = []
+        if not parent_info["runpath"]:
+            dirs += expand(parent_info["rpath"])
+        dirs += env_dirs + expand(parent_info["runpath"]) + self.search_dirs + system_dirs
+        for directory in dirs:
+            candidate = os.path.join(directory, name)
+            if not os.path.isfile(candidate):
+                continue
+            try:
+                info = self.cache.get(candidate)
+            except DependencyError:
+                continue
+            # ld.so처럼 ELF 클래스/아키텍처가 같은 라이브러리만 사용 (32/64비트 혼재 대비)
+            if info["machine"] == parent_info["machine"]:
+                return candidate
+        return None
+
+    def _resolve_pe(self, name, parent_path):
+        for directory in self.search_dirs + [os.path.dirname(os.path.abspath(parent_path))]:
+            actual = self._listing(directory).get(name.lower())
+            if actual:
+                return os.path.join(directory, actual)
+        return None
+
+    def resolve(self, name, parent_path, parent_info):
+        if parent_info["format"] == "elf":
+            return self._resolve_elf(name, parent_path, parent_info)
+        return self._resolve_pe(name, parent_path)
+
+
+def dependency_closure(executables, resolver, exclude=()):
+    """
+    여러 실행 파일의 의존성 전체를 중복 없이 계산합니다.
+    반환값: ({복사할 파일 이름: 원본 경로}, [찾지 못한 (의존성, 요청한 파일)])
+    ELF 인터프리터(ld-linux)와 exclude 패턴에 맞는 이름은 제외합니다.
+    """
+    libraries, missing = {}, []
+    visited, interpreters = set(), set()
+    queue = list(executables)
+    while queue:
+        path = queue.pop()
+        real = os.path.realpath(path)
+        if real in visited:
+            continue
+        visited.add(real)
+        info = resolver.cache.get(path)
+        if info.get("interp"):
+            interpreters.add(os.path.basename(info["interp"]))
+        for needed in info["needed"]:
+            if needed in interpreters or any(
+                fnmatch.fnmatch(needed.lower(), pattern.lower()) for pattern in exclude
+            ):
+                continue
+            resolved = resolver.resolve(needed, path, info)
+            if resolved is None:
+                if info["format"] == "elf":
+                    missing.append((needed, path))
+                continue  # PE: 시스템 DLL (KERNEL32.dll 등)
+            libraries.setdefault(needed, resolved)
+            queue.append(resolved)
+    return libraries, missing
+
+
+# --- 복사 ---
+def _same_file(src, dst):
+    try:
+        src_stat, dst_stat = os.stat(src), os.stat(dst)
+    except OSError:
+        return False
+    if (src_stat.st_dev, src_stat.st_ino) == (dst_stat.st_dev, dst_stat.st_ino):
+        return True
+    return src_stat.st_size == dst_stat.st_size and src_stat.st_mtime_ns == dst_stat.st_mtime_ns
+
+
+def _reflink(src, dst):
+    import fcntl
+
+    with open(src, "rb") as source, open(dst, "wb") as target:
+        fcntl.ioctl(target.fileno(), _FICLONE, source.fileno())
+    shutil.copystat(src, dst)
+
+
+def install_file(src, dst, mode="auto"):
+    """
+    src를 dst로 설치합니다. 이미 같은 파일이면 아무것도 하지 않고 None을 반환합니다.
+    반환값: "hardlink", "reflink", "copy" 중 실제로 사용한 방법
+    """
+    src = os.path.realpath(src)
+    if _same_file(src, dst):
+        return None
+    tmp_path = dst + ".tmp"
+    if os.path.lexists(tmp_path):
+        os.remove(tmp_path)
+    methods = {
+        "auto": ("hardlink", "reflink", "copy"),
+        "hardlink": ("hardlink", "copy"),
+        "reflink": ("reflink", "copy"),
+        "copy": ("copy",),
+    }[mode]
+    for method in methods:
+        try:
+            if method == "hardlink":
+                os.link(src, tmp_path)
+            elif method == "reflink":
+                _reflink(src, tmp_path)
+            else:
+                shutil.copy2(src, tmp_path)
+        except (OSError, ImportError):
+            if os.path.lexists(tmp_path):
+                os.remove(tmp_path)
+            continue
+        os.replace(tmp_path, dst)
+        return method
+    raise DependencyError(f"{src} -> {dst} 복사 실패")
+
+
+def copy_dependencies(
+    executables, target_dir, search_dirs=(), exclude=(), mode="auto", cache_path=None
+):
+    """
+    실행 파일들의 의존성을 target_dir로 설치하고, 지난 실행에서 복사했지만 더 이상 필요 없는
+    파일은 지웁니다 (copy_deps.py가 복사하지 않은 파일은 건드리지 않음).
+    반환값: {"installed": {...}, "unchanged": n, "removed": [...], "missing": [...]}
+    """
+    os.makedirs(target_dir, exist_ok=True)
+    if cache_path is None:
+        cache_path = os.path.join(target_dir, CACHE_FILE_NAME)
+    cache = BinaryInfoCache(cache_path)
+    resolver = LibraryResolver(cache, search_dirs)
+    libraries, missing = dependency_closure(executables, resolver, exclude)
+
+    installed, unchanged = {}, 0
+    target_real = os.path.realpath(target_dir)
+    for name, src in sorted(libraries.items()):
+        if os.path.dirname(os.path.realpath(src)) == target_real and os.path.basename(src) == name:
+            unchanged += 1  # 이미 대상 디렉터리에 있는 파일 (프로젝트에서 빌드한 DLL 등)
+            continue
+        method = install_file(src, os.path.join(target_dir, name), mode)
+        if method is None:
+            unchanged += 1
+        else:
+            installed[name] = method
+            print(f"'{src}' -> '{os.path.join(target_dir, name)}' ({method})")
+
+    removed = []
+    for name in cache.copied:
+        if name not in libraries and os.path.isfile(os.path.join(target_dir, name)):
+            os.remove(os.path.join(target_dir, name))
+            removed.append(name)
+            print(f"삭제: {os.path.join(target_dir, name)}")
+
+    cache.save(list(libraries))
+    return {
+        "installed": installed,
+        "unchanged": unchanged,
+        "removed": removed,
+        "missing": missing,
+        "cache_hits": cache.hits,
+        "cache_misses": cache.misses,
+    }
+
+
+def _default_search_dirs(os_name):
+    if os_name != "Windows":
+        return []
+    prefix = os.environ.get("MSYSTEM_PREFIX", DEFAULT_MSYS2_PREFIX)
+    return [os.path.join(prefix, "bin")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="실행 파일의 공유 라이브러리 의존성을 대상 디렉터리로 복사합니다."
+    )
+    parser.add_argument("os_name", choices=["Windows", "Linux"])
+    parser.add_argument("target_dir")
+    parser.add_argument("executables", nargs="+", metavar="exec_path(no ext)")
+    parser.add_argument(
+        "--search-dir",
+        action="append",
+        help="라이브러리를 찾을 디렉터리 (Windows 기본: $MSYSTEM_PREFIX/bin 또는 /ucrt64/bin)",
+    )
+    parser.add_argument("--exclude", action="append", default=[], help="제외할 라이브러리 이름 (glob)")
+    parser.add_argument("--mode", choices=LINK_MODES, default="auto")
+    parser.add_argument("--cache", help=f"분석 캐시 파일 (기본: <target_dir>/{CACHE_FILE_NAME})")
+    args = parser.parse_args(argv)
+
+    executables = [
+        path + ".exe" if args.os_name == "Windows" and not path.lower().endswith(".exe") else path
+        for path in args.executables
+    ]
+    for path in executables:
+        if not os.path.isfile(path):
+            print(f"오류: 실행 파일이 없습니다: {path}")
+            return 1
+
+    search_dirs = args.search_dir if args.search_dir is not None else _default_search_dirs(args.os_name)
+    try:
+        result = copy_dependencies(
+            executables,
+            args.target_dir,
+            search_dirs=search_dirs,
+            exclude=args.exclude,
+            mode=args.mode,
+            cache_path=args.cache,
+        )
+    except DependencyError as e:
+        print(f"오류: {e}")
+        return 1
+
+    for needed, parent in result["missing"]:
+        print(f"경고: '{parent}'의 의존성 '{needed}'을(를) 찾을 수 없습니다.")
+    print(
+        f"All libraries copied to {args.target_dir} "
+        f"(설치 {len(result['installed'])}개, 변경 없음 {result['unchanged']}개, "
+        f"삭제 {len(result['removed'])}개, 캐시 적중 {result['cache_hits']}/"
+        f"{result['cache_hits'] + result['cache_misses']})"
+    )
+    return 1 if result["missing"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+# run_gettext.py (번역 파일 생성: POT -> PO -> MO, 도메인/언어별 병렬 + 변경된 단계만 실행)
+#
+# run-gettext.sh는 모든 도메인 x 언어에 대해 xgettext, msgmerge/msginit, msgfmt를 순서대로
+# 매번 다시 실행했다. 여기서는
+#   - 도메인(POT)과 도메인 x 언어(PO, MO) 작업을 프로세스 풀에 나누어 동시에 실행하고,
+#   - 소스/.pot/.po 내용 해시를 기록하여 입력이 바뀌지 않은 단계는 건너뛰며,
+#   - .po -> .mo 변환은 msgfmt를 실행하지 않고 이 프로세스 안에서 직접 만든다.
+# 상태는 $LOCALE_DIR/.gettext-state.json에 저장한다.
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import struct
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.join(SCRIPT_DIR, "..")
+
+# 소스 파일/디렉토리 및 도메인 설정
+DOMAIN_FILES = {
+    "domain1": [os.path.join(ROOT_DIR, "path/to/source")],
+    "domain2": [os.path.join(ROOT_DIR, "path/to/source")],
+    "domain3": [os.path.join(ROOT_DIR, "path/to/source")],
+    "domain4": [os.path.join(ROOT_DIR, "path/to/source")],
+}
+
+LOCALE_DIR = os.path.join(ROOT_DIR, "locales")  # 번역 파일 저장 디렉토리
+LANGUAGES = ["ko_KR", "en_US"]  # 지원 언어 목록
+
+# 디렉터리를 지정했을 때 추출 대상으로 삼는 소스 확장자
+SOURCE_EXTENSIONS = (".c", ".cc", ".cpp", ".cxx", ".h", ".hh", ".hpp", ".hxx", ".ixx", ".cppm")
+XGETTEXT_ARGS = ["--from-code=UTF-8", "--keyword=_", "--no-location"]
+
+STATE_FILE_NAME = ".gettext-state.json"
+STATE_VERSION = 1
+
+
+class GettextError(Exception):
+    pass
+
+
+# --- 해시 / 상태 ---
+def _sha256_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_hash(path):
+    """파일 내용 해시. 파일이 없으면 None."""
+    try:
+        with open(path, "rb") as f:
+            return _sha256_bytes(f.read())
+    except OSError:
+        return None
+
+
+_POT_CREATION_DATE = re.compile(rb'^"POT-Creation-Date: [^"]*\\n"\n', re.MULTILINE)
+
+
+def pot_hash(path):
+    """POT-Creation-Date 줄을 뺀 .pot 해시 (xgettext를 다시 돌려도 내용이 같으면 같은 값)."""
+    try:
+        with open(path, "rb") as f:
+            return _sha256_bytes(_POT_CREATION_DATE.sub(b"", f.read()))
+    except OSError:
+        return None
+
+
+def load_state(locale_dir):
+    try:
+        with open(os.path.join(locale_dir, STATE_FILE_NAME), "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+    if state.get("version") != STATE_VERSION:
+        state = {"version": STATE_VERSION}
+    for stage in ("pot", "po", "mo"):
+        state.setdefault(stage, {})
+    return state
+
+
+def save_state(locale_dir, state):
+    path = os.path.join(locale_dir, STATE_FILE_NAME)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def expand_sources(paths):
+    """존재하는 소스 파일 목록 (디렉터리는 SOURCE_EXTENSIONS 파일로 펼침, 정렬된 순서)."""
+    files = []
+    for path in paths:
+        if os.path.isfile(path):
+            files.append(path)
+        elif os.path.isdir(path):
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames.sort()
+                files += [
+                    os.path.join(dirpath, name)
+                    for name in sorted(filenames)
+                    if name.endswith(SOURCE_EXTENSIONS)
+                ]
+        else:
+            print(f"Skipping: {path} does not exist.")
+    return files
+
+
+# --- .po -> .mo (msgfmt 대체) ---
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "a": "\a", "b": "\b", "f": "\f", "v": "\v", "\\": "\\", '"': '"'}
+
+
+def _unquote(text):
+    """PO 문자열 리터럴 '"..."'의 내용을 C 이스케이프를 풀어 반환합니다."""
+    text = text.strip()
+    if len(text) < 2 or text[0] != '"' or text[-1] != '"':
+        raise GettextError(f"잘못된 문자열: {text}")
+    body = text[1:-1]
+    if "\\" not in body:
+        return body
+    result, i = [], 0
+    while i < len(body):
+        ch = body[i]
+        if ch != "\\":
+            result.append(ch)
+            i += 1
+            continue
+        nxt = body[i + 1 : i + 2]
+        if nxt in _ESCAPES:
+            result.append(_ESCAPES[nxt])
+            i += 2
+        elif nxt.isdigit():  # 8진수 (\ooo)
+            digits = re.match(r"[0-7]{1,3}", body[i + 1 :]).group(0)
+            result.append(chr(int(digits, 8)))
+            i += 1 + len(digits)
+        elif nxt == "x":
+            digits = re.match(r"[0-9a-fA-F]+", body[i + 2 :]).group(0)
+            result.append(chr(int(digits, 16)))
+            i += 2 + len(digits)
+        else:
+            result.append(nxt)
+            i += 2
+    return "".join(result)
+
+
+def parse_po(text):
+    """
+    PO 내용을 [(msgctxt, msgid, msgid_plural, [msgstr...], fuzzy), ...]로 파싱합니다.
+    폐기된 항목(#~)은 무시합니다.
+    """
+    entries = []
+    entry = None
+    field = None
+
+    def finish():
+        if entry is not None and entry["msgid"] is not None:
+            strings = [entry["msgstr"][k] for k in sorted(entry["msgstr"])]
+            entries.append(
+                (entry["msgctxt"], entry["msgid"], entry["msgid_plural"], strings, entry["fuzzy"])
+            )
+
+    def new_entry():
+        return {"msgctxt": None, "msgid": None, "msgid_plural": None, "msgstr": {}, "fuzzy": False}
+
+    for line_number, line in enumerate(text.splitlines(), 1):
+        line = line.strip()
+        if not line or line.startswith("#~"):
+            continue
+        if line.startswith("#"):
+            if field is not None and field[0] == "msgstr":
+                finish()
+                entry, field = None, None
+            if line.startswith("#,") and "fuzzy" in line:
+                entry = entry or new_entry()
+                entry["fuzzy"] = True
+            continue
+        try:
+            if line.startswith("msgctxt"):
+                if field is not None and field[0] == "msgstr":
+                    finish()
+                    entry = None
+                entry = entry or new_entry()
+                entry["msgctxt"] = _unquote(line[len("msgctxt") :])
+                field = ("msgctxt",)
+            elif line.startswith("msgid_plural"):
+                entry["msgid_plural"] = _unquote(line[len("msgid_plural") :])
+                field = ("msgid_plural",)
+            elif line.startswith("msgid"):
+                if field is not None and field[0] == "msgstr":
+                    finish()
+                    entry = None
+                entry = entry or new_entry()
+                entry["msgid"] = _unquote(line[len("msgid") :])
+                field = ("msgid",)
+            elif line.startswith("msgstr"):
+                match = re.match(r"msgstr(?:\[(\d+)\])?\s*(.*)", line)
+                index = int(match.group(1) or 0)
+                entry["msgstr"][index] = _unquote(match.group(2))
+                field = ("msgstr", index)
+            elif line.startswith('"'):
+                value = _unquote(line)
+                if field[0] == "msgstr":
+                    entry["msgstr"][field[1]] += value
+                else:
+                    entry[field[0]] += value
+            else:
+                raise GettextError(f"알 수 없는 줄: {line}")
+        except (TypeError, AttributeError, KeyError) as e:
+            raise GettextError(f"{line_number}번째 줄을 해석할 수 없습니다: {line} ({e})")
+    finish()
+    return entries
+
+
+def _header_charset(entries):
+    for msgctxt, msgid, _, strings, _ in entries:
+        if msgctxt is None and msgid == "" and strings:
+            match = re.search(r"charset=([\w-]+)", strings[0])
+            if match and match.group(1).upper() != "CHARSET":
+                return match.group(1)
+    return "utf-8"
+
+
+def compile_mo(entries):
+    """
+    파싱한 PO 항목으로 GNU .mo 바이트를 만듭니다 (msgfmt와 같은 규칙).
+    - fuzzy 항목과 번역되지 않은 항목은 제외 (헤더는 fuzzy여도 포함)
+    - 문맥은 'msgctxt\\x04msgid', 복수형은 NUL로 연결
+    """
+    charset = _header_charset(entries)
+    messages = {}
+    for msgctxt, msgid, msgid_plural, strings, fuzzy in entries:
+        is_header = msgctxt is None and msgid == ""
+        if (fuzzy and not is_header) or not any(strings):
+            continue
+        key = msgid if msgid_plural is None else msgid + "\0" + msgid_plural
+        if msgctxt is not None:
+            key = msgctxt + "\x04" + key
+        messages[key.encode(charset)] = "\0".join(strings).encode(charset)
+
+    keys = sorted(messages)
+    count = len(keys)
+    originals_offset = 7 * 4
+    translations_offset = originals_offset + count * 8
+    data_offset = translations_offset + count * 8
+
+    ids = b"".join(key + b"\0" for key in keys)
+    strs = b"".join(messages[key] + b"\0" for key in keys)
+    originals, translations = [], []
+    position = data_offset
+    for key in keys:
+        originals += [len(key), position]
+        position += len(key) + 1
+    for key in keys:
+        translations += [len(messages[key]), position]
+        position += len(messages[key]) + 1
+
+    header = struct.pack(
+        "<7I", 0x950412DE, 0, count, originals_offset, translations_offset, 0, data_offset
+    )
+    return (
+        header
+        + struct.pack(f"<{len(originals)}I", *originals)
+        + struct.pack(f"<{len(translations)}I", *translations)
+        + ids
+        + strs
+    )
+
+
+def compile_po_file(po_path, mo_path):
+    with open(po_path, "r", encoding="utf-8") as f:
+        entries = parse_po(f.read())
+    data = compile_mo(entries)
+    directory = os.path.dirname(mo_path)
+    if directory:  # 현재 디렉터리의 파일이면 만들 디렉터리가 없음
+        os.makedirs(directory, exist_ok=True)
+    with open(mo_path + ".tmp", "wb") as f:
+        f.write(data)
+    os.replace(mo_path + ".tmp", mo_path)
+    return _sha256_bytes(data)
+
+
+# --- 단계별 작업 (프로세스 풀에서 실행되므로 모듈 최상위 함수) ---
+def _run(command):
+    try:
+        subprocess.run(command, check=True, capture_output=True, text=True)
+    except FileNotFoundError:
+        raise GettextError(f"'{command[0]}'을(를) 찾을 수 없습니다.")
+    except subprocess.CalledProcessError as e:
+        raise GettextError(f"{' '.join(command)} 실패: {e.stderr.strip()}")
+
+
+def generate_pot(domain, sources, pot_file):
+    """xgettext로 .pot을 만듭니다. 내용이 이전과 같으면(날짜 제외) 기존 파일을 유지합니다."""
+    tmp_file = pot_file + ".new"
+    _run(["xgettext", *sources, "-o", tmp_file, *XGETTEXT_ARGS])
+    if not os.path.exists(tmp_file):  # 추출할 문자열이 없으면 xgettext는 파일을 만들지 않음
+        return pot_hash(pot_file)
+    if pot_hash(tmp_file) == pot_hash(pot_file):
+        os.remove(tmp_file)
+    else:
+        os.replace(tmp_file, pot_file)
+        print(f"Generated {pot_file}")
+    return pot_hash(pot_file)
+
+
+def update_po(domain, lang, pot_file, po_file, backup_dir):
+    if os.path.isfile(po_file):
+        print(f"Updating {po_file}...")
+        os.makedirs(backup_dir, exist_ok=True)
+        shutil.copy2(po_file, os.path.join(backup_dir, f"{domain}.po"))
+        _run(["msgmerge", "--quiet", "--update", "--backup=none", po_file, pot_file])
+    else:
+        print(f"Creating {po_file}...")
+        directory = os.path.dirname(po_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        _run(["msginit", f"--input={pot_file}", f"--locale={lang}", f"--output={po_file}", "--no-translator"])
+        _run(["msgconv", "--to-code=UTF-8", "-o", po_file, po_file])
+    return file_hash(po_file)
+
+
+def build_mo(po_file, mo_file):
+    mo_hash = compile_po_file(po_file, mo_file)
+    print(f"Generated {mo_file}")
+    return mo_hash
+
+
+# --- 파이프라인 ---
+class GettextPipeline:
+    def __init__(self, domain_files, languages, locale_dir, jobs=None, force=False):
+        self.domain_files = domain_files
+        self.languages = languages
+        self.locale_dir = locale_dir
+        self.jobs = jobs or os.cpu_count() or 1
+        self.force = force
+        self.stats = {"pot": [0, 0], "po": [0, 0], "mo": [0, 0]}  # [실행, 건너뜀]
+
+    def pot_file(self, domain):
+        return os.path.join(self.locale_dir, "templates", f"{domain}.pot")
+
+    def po_file(self, domain, lang):
+        return os.path.join(self.locale_dir, lang, f"{domain}.po")
+
+    def mo_file(self, domain, lang):
+        return os.path.join(self.locale_dir, lang, "LC_MESSAGES", f"{domain}.mo")
+
+    def _map(self, executor, stage, tasks):
+        """tasks: [(상태 키, 새 상태(실행 결과 해시를 'output'에 채움), 함수, 인자)] -> 실패 목록"""
+        futures = [(key, entry, executor.submit(func, *args)) for key, entry, func, args in tasks]
+        failures = []
+        for key, entry, future in futures:
+            try:
+                entry["output"] = future.result()
+                self.state[stage][key] = entry
+            except GettextError as e:
+                print(f"오류 ({key}): {e}")
+                self.state[stage].pop(key, None)
+                failures.append(key)
+        self.stats[stage][0] += len(tasks)
+        return failures
+
+    def run(self):
+        os.makedirs(os.path.join(self.locale_dir, "templates"), exist_ok=True)
+        self.state = load_state(self.locale_dir)
+        failures = []
+        try:
+            with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+                failures += self._run_pot(executor)
+                failures += self._run_po(executor)
+                failures += self._run_mo(executor)
+        finally:
+            save_state(self.locale_dir, self.state)
+        return failures
+
+    def _run_pot(self, executor):
+        print("Step 1: Generating POT files for each domain")
+        tasks = []
+        for domain, paths in self.domain_files.items():
+            sources = expand_sources(paths)
+            pot_file = self.pot_file(domain)
+            if not sources:
+                print(f"Skipping generate {pot_file}: Source files does not exist.")
+                continue
+            inputs = _sha256_bytes(
+                json.dumps(
+                    [XGETTEXT_ARGS, [(path, file_hash(path)) for path in sources]]
+                ).encode()
+            )
+            previous = self.state["pot"].get(domain, {})
+            if (
+                not self.force
+                and previous.get("inputs") == inputs
+                and previous.get("output") == pot_hash(pot_file)
+            ):
+                self.stats["pot"][1] += 1
+                continue
+            tasks.append((domain, {"inputs": inputs}, generate_pot, (domain, sources, pot_file)))
+        return self._map(executor, "pot", tasks)
+
+    def _run_po(self, executor):
+        print("Step 2: Generating or Updating PO files for each domain...")
+        tasks = []
+        for domain in self.domain_files:
+            pot_file = self.pot_file(domain)
+            current_pot = pot_hash(pot_file)
+            for lang in self.languages:
+                if current_pot is None:
+                    print(f"Skipping {domain} for {lang}: {pot_file} does not exist.")
+                    continue
+                key = f"{domain}/{lang}"
+                po_file = self.po_file(domain, lang)
+                previous = self.state["po"].get(key, {})
+                # .pot이 바뀌지 않았으면 msgmerge 불필요 (번역자가 .po를 고친 것은 MO 단계에서 반영)
+                if not self.force and previous.get("inputs") == current_pot and os.path.isfile(po_file):
+                    self.stats["po"][1] += 1
+                    continue
+                backup_dir = os.path.join(self.locale_dir, "backup", lang)
+                tasks.append(
+                    (key, {"inputs": current_pot}, update_po, (domain, lang, pot_file, po_file, backup_dir))
+                )
+        return self._map(executor, "po", tasks)
+
+    def _run_mo(self, executor):
+        print("Step 3: Generating MO files for each domain...")
+        tasks = []
+        for domain in self.domain_files:
+            for lang in self.languages:
+                key = f"{domain}/{lang}"
+                po_file, mo_file = self.po_file(domain, lang), self.mo_file(domain, lang)
+                current_po = file_hash(po_file)
+                if current_po is None:
+                    print(f"Skipping {domain} for {lang}: {po_file} does not exist.")
+                    continue
+                previous = self.state["mo"].get(key, {})
+                if (
+                    not self.force
+                    and previous.get("inputs") == current_po
+                    and previous.get("output") == file_hash(mo_file)
+                ):
+                    self.stats["mo"][1] += 1
+                    continue
+                tasks.append((key, {"inputs": current_po}, build_mo, (po_file, mo_file)))
+        return self._map(executor, "mo", tasks)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="번역 파일(POT/PO/MO)을 생성합니다.")
+    parser.add_argument("--locale-dir", default=LOCALE_DIR)
+    parser.add_argument(
+        "--domains",
+        help='도메인 설정 JSON 파일 ({"도메인": ["소스 파일/디렉토리", ...]}, 기본: 스크립트의 DOMAIN_FILES)',
+    )
+    parser.add_argument("--languages", nargs="+", default=LANGUAGES)
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="동시에 실행할 작업 수 (기본: CPU 수)")
+    parser.add_argument("--force", action="store_true", help="해시와 관계없이 모든 단계를 다시 실행")
+    args = parser.parse_args(argv)
+
+    domain_files = DOMAIN_FILES
+    if args.domains:
+        with open(args.domains, "r", encoding="utf-8") as f:
+            domain_files = json.load(f)
+
+    pipeline = GettextPipeline(
+        domain_files, args.languages, args.locale_dir, jobs=args.jobs, force=args.force
+    )
+    failures = pipeline.run()
+    print(
+        "실행/건너뜀: "
+        + ", ".join(f"{stage} {ran}/{skipped}" for stage, (ran, skipped) in pipeline.stats.items())
+    )
+    if failures:
+        print(f"실패한 작업: {', '.join(failures)}")
+        return 1
+    print("Translation process completed successfully.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,12 @@
+# conftest.py (scripts 테스트 공통: 모듈 경로)
+#
+# copy_deps.py, run_gettext.py는 scripts에 평평하게 있으므로 그 디렉터리를 sys.path에 넣습니다.
+#
+# 실행 (scripts에서):
+#   python -m pytest -q tests
+
+import os
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
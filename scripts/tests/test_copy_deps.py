@@ -0,0 +1,66 @@
+# test_copy_deps.py (copy_deps: ldd와 같은 의존성 폐포, 분석 캐시 재사용, 바뀐 라이브러리만 다시 복사)
+
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from copy_deps import BinaryInfoCache, LibraryResolver, copy_dependencies, dependency_closure
+
+EXECUTABLE = "/bin/ls"
+
+pytestmark = pytest.mark.skipif(
+    not sys.platform.startswith("linux") or shutil.which("ldd") is None or not os.path.isfile(EXECUTABLE),
+    reason="Linux의 ldd와 /bin/ls가 필요합니다.",
+)
+
+
+def _ldd(path):
+    """{soname: 실제 경로} (vdso와 ld-linux 제외)"""
+    output = subprocess.run(["ldd", path], capture_output=True, text=True, check=True).stdout
+    libraries = {}
+    for line in output.splitlines():
+        name, arrow, rest = line.strip().partition(" => ")
+        if arrow and rest.startswith("/"):
+            libraries[name] = os.path.realpath(rest.split(" (")[0])
+    return libraries
+
+
+def test_closure_matches_ldd(monkeypatch):
+    monkeypatch.delenv("LD_LIBRARY_PATH", raising=False)
+    libraries, missing = dependency_closure([EXECUTABLE], LibraryResolver(BinaryInfoCache()))
+
+    assert missing == []
+    assert {name: os.path.realpath(path) for name, path in libraries.items()} == _ldd(EXECUTABLE)
+
+
+def test_second_run_uses_cache_and_touched_library_is_copied_again(monkeypatch, tmp_path):
+    monkeypatch.delenv("LD_LIBRARY_PATH", raising=False)
+    # 시스템 라이브러리는 건드릴 수 없으므로 복사본을 검색 디렉터리로 사용
+    lib_dir = tmp_path / "lib"
+    lib_dir.mkdir()
+    for name, path in _ldd(EXECUTABLE).items():
+        shutil.copy2(path, lib_dir / name)
+    target_dir = str(tmp_path / "bin")
+
+    def run():
+        return copy_dependencies([EXECUTABLE], target_dir, search_dirs=[str(lib_dir)], mode="copy")
+
+    first = run()
+    assert sorted(first["installed"]) == sorted(os.listdir(lib_dir))
+    assert first["cache_misses"] == len(first["installed"]) + 1  # 실행 파일 포함
+
+    second = run()
+    assert second["installed"] == {}
+    assert second["unchanged"] == len(first["installed"])
+    assert second["cache_misses"] == 0
+    assert second["cache_hits"] >= len(first["installed"]) + 1  # 라이브러리를 찾을 때마다 적중으로 셈
+
+    touched = sorted(os.listdir(lib_dir))[0]
+    stat = os.stat(lib_dir / touched)
+    os.utime(lib_dir / touched, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    third = run()
+    assert third["installed"] == {touched: "copy"}
+    assert third["cache_misses"] == 0  # 내용(해시)이 같으므로 다시 분석하지 않음
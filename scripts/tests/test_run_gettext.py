@@ -0,0 +1,146 @@
+# test_run_gettext.py (run_gettext: .po -> .mo 변환을 gettext로 읽어 확인, 두 번째 실행은 모든 단계 건너뜀)
+
+import gettext
+import io
+import os
+import stat
+import sys
+
+import pytest
+
+from run_gettext import GettextPipeline, compile_mo, parse_po
+
+PO_TEXT = r'''# 번역 헤더는 fuzzy여도 .mo에 들어가야 함
+#, fuzzy
+msgid ""
+msgstr ""
+"Content-Type: text/plain; charset=UTF-8\n"
+"Plural-Forms: nplurals=2; plural=(n != 1);\n"
+
+msgid "Hello"
+msgstr "안녕하세요"
+
+#, fuzzy
+msgid "Fuzzy"
+msgstr "애매함"
+
+msgid "Untranslated"
+msgstr ""
+
+msgid "Open"
+msgstr "열다"
+
+msgctxt "menu"
+msgid "Open"
+msgstr "열기"
+
+msgid "one file"
+msgid_plural "%d files"
+msgstr[0] "파일 한 개"
+msgstr[1] "파일 %d개"
+
+msgid "Tab\there \"quoted\"\n"
+msgstr ""
+"탭\t여기 "
+"\"따옴표\"\n"
+
+#~ msgid "Old"
+#~ msgstr "옛 문장"
+'''
+
+
+def _translations(po_text):
+    return gettext.GNUTranslations(io.BytesIO(compile_mo(parse_po(po_text))))
+
+
+def test_parse_po_skips_obsolete_entries():
+    entries = parse_po(PO_TEXT)
+    assert [(msgctxt, msgid) for msgctxt, msgid, _, _, _ in entries] == [
+        (None, ""),
+        (None, "Hello"),
+        (None, "Fuzzy"),
+        (None, "Untranslated"),
+        (None, "Open"),
+        ("menu", "Open"),
+        (None, "one file"),
+        (None, 'Tab\there "quoted"\n'),
+    ]
+    assert [fuzzy for _, _, _, _, fuzzy in entries][:3] == [True, False, True]
+    assert entries[6][2:4] == ("%d files", ["파일 한 개", "파일 %d개"])
+
+
+def test_compiled_mo_round_trips_through_gettext():
+    translations = _translations(PO_TEXT)
+
+    # fuzzy 헤더는 남아 charset과 복수형 규칙이 적용됨
+    assert translations.info()["content-type"] == "text/plain; charset=UTF-8"
+    assert translations.gettext("Hello") == "안녕하세요"
+    # fuzzy, 번역되지 않은 항목, 폐기된 항목은 원문 그대로
+    assert translations.gettext("Fuzzy") == "Fuzzy"
+    assert translations.gettext("Untranslated") == "Untranslated"
+    assert translations.gettext("Old") == "Old"
+    assert translations.gettext("Open") == "열다"
+    assert translations.pgettext("menu", "Open") == "열기"
+    assert translations.ngettext("one file", "%d files", 1) == "파일 한 개"
+    assert translations.ngettext("one file", "%d files", 3) == "파일 %d개"
+    assert translations.gettext('Tab\there "quoted"\n') == '탭\t여기 "따옴표"\n'
+
+
+# 가짜 gettext 도구: 실제 도구가 없는 환경에서도 파이프라인의 건너뛰기 판단만 확인
+FAKE_TOOLS = {
+    "xgettext": r'''
+import re, sys
+args = sys.argv[1:]
+output = args[args.index("-o") + 1]
+ids = []
+for path in args[: args.index("-o")]:
+    ids += re.findall(r'_\("([^"]*)"\)', open(path, encoding="utf-8").read())
+with open(output, "w", encoding="utf-8") as f:
+    f.write('msgid ""\nmsgstr ""\n"POT-Creation-Date: now\\n"\n"Content-Type: text/plain; charset=UTF-8\\n"\n')
+    for msgid in ids:
+        f.write(f'\nmsgid "{msgid}"\nmsgstr ""\n')
+''',
+    "msginit": r'''
+import shutil, sys
+options = dict(arg[2:].split("=", 1) for arg in sys.argv[1:] if "=" in arg)
+shutil.copy(options["input"], options["output"])
+''',
+    "msgconv": "",
+    "msgmerge": "",
+}
+
+
+@pytest.fixture
+def fake_gettext_tools(tmp_path, monkeypatch):
+    if sys.platform == "win32":
+        pytest.skip("가짜 도구는 shebang 스크립트로 만듭니다.")
+    bin_dir = tmp_path / "fake-bin"
+    bin_dir.mkdir()
+    for name, body in FAKE_TOOLS.items():
+        path = bin_dir / name
+        path.write_text(f"#!{sys.executable}\n{body}", encoding="utf-8")
+        path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    monkeypatch.setenv("PATH", str(bin_dir) + os.pathsep + os.environ.get("PATH", ""))
+
+
+def test_second_run_skips_every_stage(tmp_path, fake_gettext_tools):
+    source = tmp_path / "src" / "main.cpp"
+    source.parent.mkdir()
+    source.write_text('puts(_("Hello"));\n', encoding="utf-8")
+    locale_dir = str(tmp_path / "locales")
+
+    def run():
+        pipeline = GettextPipeline({"app": [str(source.parent)]}, ["ko_KR", "en_US"], locale_dir, jobs=2)
+        assert pipeline.run() == []
+        return pipeline
+
+    assert run().stats == {"pot": [1, 0], "po": [2, 0], "mo": [2, 0]}
+    assert run().stats == {"pot": [0, 1], "po": [0, 2], "mo": [0, 2]}
+
+    # 번역자가 .po 하나를 고치면 그 언어의 .mo만 다시 만듦
+    po_file = tmp_path / "locales" / "ko_KR" / "app.po"
+    po_text = po_file.read_text(encoding="utf-8")
+    po_file.write_text(po_text.replace('msgid "Hello"\nmsgstr ""', 'msgid "Hello"\nmsgstr "안녕"'), encoding="utf-8")
+    assert run().stats == {"pot": [0, 1], "po": [0, 2], "mo": [1, 1]}
+    with open(tmp_path / "locales" / "ko_KR" / "LC_MESSAGES" / "app.mo", "rb") as f:
+        assert gettext.GNUTranslations(f).gettext("Hello") == "안녕"
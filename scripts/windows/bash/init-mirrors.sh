@@ -35,6 +35,11 @@ all_mirrors=(
     "https://repo.msys2.org/mingw"
 )
 
+# pacman_proxy.py 주소가 주어지면 모든 미러리스트 맨 앞에 추가 (예: SETUP_PACMAN_PROXY=http://build01:8767)
+if [ -n "$SETUP_PACMAN_PROXY" ]; then
+    all_mirrors=("${SETUP_PACMAN_PROXY%/}/mingw" "${all_mirrors[@]}")
+fi
+
 echo "미러리스트 파일 저장"
 for ext in "${EXTENSIONS[@]}"; do
     filename="mirrorlist.$ext"
@@ -42,14 +47,15 @@ for ext in "${EXTENSIONS[@]}"; do
     
     > "$filepath"
     for url in "${all_mirrors[@]}"; do
-        # ext가 msys일 경우 $arch로 변경
+        # ext가 msys일 경우 $arch로 변경 (ext를 덮어쓰면 두 번째 미러부터 변환되지 않으므로 repo에 저장)
+        repo="$ext"
         if [ "$ext" = "msys" ]; then
-            ext="\$arch"
+            repo="\$arch"
             url="${url/mingw/msys}"
         fi
         
         if [ "$ext" = "mingw" ]; then
-            ext="\$repo"
+            repo="\$repo"
         fi
         
         # if [ "$ext" = "mingw32" ]; then
@@ -60,6 +66,6 @@ for ext in "${EXTENSIONS[@]}"; do
         #     ext="x86_64"
         # fi
         # 변환된 주소를 파일에 저장
-        echo "Server = $url/$ext/" >> "$filepath"
+        echo "Server = $url/$repo/" >> "$filepath"
     done
 done
@@ -0,0 +1,223 @@
+# artifact_cache.py (URL/SHA-256 기반 다운로드 캐시, LRU 제거)
+
+import hashlib
+import json
+import os
+import threading
+import time
+from urllib.parse import quote
+
+from download_engine import download_file, DownloadError
+
+# --- 상수 ---
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024 * 2  # 캐시 최대 크기 (2GB)
+INDEX_FILE_NAME = "index.json"
+OBJECTS_DIR_NAME = "objects"
+INCOMING_DIR_NAME = "incoming"
+ARTIFACT_PATH = "/artifact"  # 아티팩트 노드(artifact_node.py)에서 URL로 캐시 파일을 찾는 경로
+
+
+def artifact_url(source, url):
+    """아티팩트 노드 source에서 url의 캐시 파일을 받을 주소."""
+    return f"{source.rstrip('/')}{ARTIFACT_PATH}?url={quote(url, safe='')}"
+
+
+class ArtifactCache:
+    r"""
+    다운로드한 파일을 SHA-256 이름으로 보관하는 영구 캐시입니다.
+    root/
+      index.json          URL -> {sha256, size, file_name, last_used}
+      objects/ab/<sha256><확장자>
+      incoming/           다운로드 중인 임시 파일 (이어받기 상태 포함)
+    max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 삭제합니다 (LRU).
+    source: 캐시에 없을 때 원래 주소보다 먼저 물어볼 아티팩트 노드 주소 (fleet.py, 없으면 None)
+    """
+
+    def __init__(self, root, max_bytes=DEFAULT_MAX_BYTES, source=None):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.source = source
+        self.index_path = os.path.join(root, INDEX_FILE_NAME)
+        self.objects_dir = os.path.join(root, OBJECTS_DIR_NAME)
+        self.incoming_dir = os.path.join(root, INCOMING_DIR_NAME)
+        self.lock = threading.Lock()
+        self.url_locks = {}  # URL -> 그 URL을 받는 중인 fetch/put이 잡는 잠금
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.incoming_dir, exist_ok=True)
+        self.entries = self._load_index()
+
+    # --- 인덱스 ---
+    def _load_index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    def _object_path(self, sha256, file_name):
+        _, ext = os.path.splitext(file_name)
+        # 확장자를 유지해야 .exe 설치 파일을 그대로 실행할 수 있음
+        return os.path.join(self.objects_dir, sha256[:2], sha256 + ext.lower())
+
+    def total_bytes(self):
+        # 같은 객체를 가리키는 URL이 여럿일 수 있으므로 객체 단위로 합산
+        return sum({e["sha256"]: e["size"] for e in self.entries.values()}.values())
+
+    # --- 조회 ---
+    def lookup(self, url, sha256=None):
+        """캐시에 있으면 파일 경로를, 없으면 None을 반환합니다 (네트워크 사용 안 함)."""
+        with self.lock:
+            entry = self.entries.get(url)
+            if entry is None and sha256:
+                # 다른 URL로 받은 같은 내용이 있으면 재사용
+                entry = next(
+                    (e for e in self.entries.values() if e["sha256"] == sha256.lower()),
+                    None,
+                )
+            if entry is None:
+                return None
+            if sha256 and entry["sha256"] != sha256.lower():
+                return None
+
+            path = self._object_path(entry["sha256"], entry["file_name"])
+            if not os.path.exists(path) or os.path.getsize(path) != entry["size"]:
+                # 외부에서 지워졌거나 손상된 항목
+                self._forget(entry["sha256"])
+                self._save_index()
+                return None
+
+            entry["last_used"] = time.time()
+            self.entries.setdefault(url, entry)
+            self._save_index()
+            return path
+
+    # --- 추가 / 제거 ---
+    def _url_lock(self, url):
+        with self.lock:
+            return self.url_locks.setdefault(url, threading.Lock())
+
+    def fetch(self, url, sha256=None, file_name=None, **download_kwargs):
+        """
+        url의 파일을 캐시에서 찾고, 없으면 다운로드하여 캐시에 넣은 뒤 경로를 반환합니다.
+        sha256을 주면 받은 내용의 해시가 일치하는지 검증하고, 다르면 DownloadError를 발생시킵니다.
+        download_kwargs는 download_engine.download_file에 그대로 전달됩니다.
+        같은 URL을 동시에 요청하면 하나만 받고, 나머지는 기다렸다가 캐시된 파일을 씁니다
+        (URL별 임시 경로를 함께 쓰므로 동시에 받으면 서로의 파일을 덮어씀).
+        """
+        cached = self.lookup(url, sha256)
+        if cached:
+            print(f"캐시에서 '{url}'을(를) 찾았습니다: {cached}")
+            return cached
+
+        with self._url_lock(url):
+            cached = self.lookup(url, sha256)  # 기다리는 동안 다른 스레드가 받았을 수 있음
+            if cached:
+                print(f"캐시에서 '{url}'을(를) 찾았습니다: {cached}")
+                return cached
+
+            file_name = file_name or os.path.basename(url.split("?", 1)[0]) or "download"
+            # URL별로 고정된 임시 경로를 써야 중단된 다운로드를 이어받을 수 있음
+            url_key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+            incoming_path = os.path.join(self.incoming_dir, f"{url_key}-{file_name}")
+
+            hasher = hashlib.sha256()
+            if not self._fetch_from_source(url, incoming_path, hasher, download_kwargs):
+                hasher = hashlib.sha256()
+                download_file(url, incoming_path, hasher=hasher, **download_kwargs)
+            digest = hasher.hexdigest()
+
+            if sha256 and digest != sha256.lower():
+                os.remove(incoming_path)
+                raise DownloadError(
+                    f"SHA-256 불일치: 예상 {sha256.lower()}, 실제 {digest} ({url})"
+                )
+            return self._store(url, incoming_path, digest, file_name)
+
+    def _fetch_from_source(self, url, incoming_path, hasher, download_kwargs):
+        """아티팩트 노드에 같은 URL의 파일이 있으면 받아 옵니다. 없거나 실패하면 False (원래 주소에서 받음)."""
+        if not self.source:
+            return False
+        import requests
+
+        source_url = artifact_url(self.source, url)
+        try:
+            download_file(source_url, incoming_path, hasher=hasher, **download_kwargs)
+        except (requests.exceptions.RequestException, DownloadError) as e:
+            print(f"아티팩트 노드에서 받지 못해 원래 주소에서 받습니다: {url} ({e})")
+            return False
+        print(f"아티팩트 노드에서 받았습니다: {source_url}")
+        return True
+
+    def put(self, url, path, file_name=None):
+        """
+        이미 가지고 있는 파일(path)을 url 항목으로 캐시에 옮겨 넣고 캐시 안의 경로를 반환합니다.
+        (USB 등으로 옮겨 온 설치 파일을 등록하거나, 시험용으로 아티팩트 노드를 채울 때)
+        """
+        hasher = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                hasher.update(block)
+        with self._url_lock(url):
+            return self._store(url, path, hasher.hexdigest(), file_name or os.path.basename(path))
+
+    def _store(self, url, incoming_path, digest, file_name):
+        size = os.path.getsize(incoming_path)
+        with self.lock:
+            self._evict(self.max_bytes - size)
+            path = self._object_path(digest, file_name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(incoming_path, path)
+            self.entries[url] = {
+                "sha256": digest,
+                "size": size,
+                "file_name": file_name,
+                "last_used": time.time(),
+            }
+            self._save_index()
+        return path
+
+    def _forget(self, sha256):
+        """sha256을 가리키는 모든 URL 항목과 객체 파일을 제거합니다."""
+        for url in [u for u, e in self.entries.items() if e["sha256"] == sha256]:
+            entry = self.entries.pop(url)
+            path = self._object_path(sha256, entry["file_name"])
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _evict(self, budget):
+        """캐시 크기가 budget 이하가 될 때까지 오래된 항목부터 제거합니다."""
+        # 같은 객체를 가리키는 URL이 여럿이면 객체당 한 번만 계산
+        objects = {}
+        for entry in self.entries.values():
+            current = objects.get(entry["sha256"])
+            if current is None or entry["last_used"] > current["last_used"]:
+                objects[entry["sha256"]] = entry
+        used = sum(e["size"] for e in objects.values())
+        for entry in sorted(objects.values(), key=lambda e: e["last_used"]):
+            if used <= budget:
+                break
+            print(f"캐시 용량 초과: '{entry['file_name']}' ({entry['size']} 바이트) 제거")
+            self._forget(entry["sha256"])
+            used -= entry["size"]
+
+    def evict(self, max_bytes=None):
+        """캐시를 max_bytes(기본값: 설정된 최대 크기) 이하로 줄입니다."""
+        with self.lock:
+            self._evict(self.max_bytes if max_bytes is None else max_bytes)
+            self._save_index()
+
+    def clear_incoming(self):
+        """완료되지 않은 임시 다운로드 파일을 모두 삭제합니다."""
+        for name in os.listdir(self.incoming_dir):
+            try:
+                os.remove(os.path.join(self.incoming_dir, name))
+            except OSError:
+                pass
@@ -0,0 +1,160 @@
+# artifact_node.py (다운로드 캐시와 wheelhouse를 다른 PC에 나눠 주는 HTTP 서버)
+#
+# fleet 모드에서 아티팩트 노드로 정한 PC가 실행합니다 (fleet.py agent --serve-artifacts).
+#   GET /artifact?url=<원래 URL>  캐시(artifact_cache.ArtifactCache)에 있는 파일 (Range 지원)
+#   GET /wheelhouse/              wheel 목록 HTML (pip --find-links로 바로 사용)
+#   GET /wheelhouse/<파일 이름>    wheel 파일
+#   GET /mingw/..., /msys/...      pacman_proxy가 주어지면 pacman 미러 (pacman_proxy.PacmanProxy)
+# 다른 PC는 ArtifactCache(source=노드 주소)로 캐시에 없는 파일을 이 노드에서 먼저 받고,
+# 노드에도 없으면(404) 원래 주소에서 받습니다. 읽기 전용이며 캐시에 없는 것을 대신 받아 오지는 않습니다.
+
+import html
+import http.server
+import os
+import re
+import threading
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+from artifact_cache import ARTIFACT_PATH
+
+WHEELHOUSE_PATH = "/wheelhouse/"
+DEFAULT_PORT = 8766
+
+
+class _ArtifactHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # 연결 재사용
+    server_version = "setup-artifact-node"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        node = self.server.node
+        parts = urlsplit(self.path)
+        if parts.path == ARTIFACT_PATH:
+            url = parse_qs(parts.query).get("url", [""])[0]
+            path = node.cache.lookup(url) if url else None
+            self._send_file(path, "application/octet-stream")
+        elif parts.path == WHEELHOUSE_PATH and node.wheelhouse_dir:
+            self._send_listing(node.wheelhouse_dir)
+        elif parts.path.startswith(WHEELHOUSE_PATH) and node.wheelhouse_dir:
+            name = unquote(parts.path[len(WHEELHOUSE_PATH) :])
+            valid = name.endswith(".whl") and "/" not in name and "\\" not in name and ".." not in name
+            path = os.path.join(node.wheelhouse_dir, name) if valid else None
+            self._send_file(path if path and os.path.isfile(path) else None, "application/octet-stream")
+        elif node.pacman_proxy is not None and node.pacman_proxy.handles(parts.path):
+            node.pacman_proxy.handle(self, parts.path)
+        else:
+            self._send_error(404)
+
+    def _send_error(self, code):
+        with self.server.node.lock:
+            self.server.node.stats["misses"] += 1
+        self.send_response(code)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _send_listing(self, directory):
+        names = sorted(name for name in os.listdir(directory) if name.endswith(".whl"))
+        body = "".join(
+            f'<a href="{quote(name)}">{html.escape(name)}</a><br>\n' for name in names
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_file(self, path, content_type):
+        if path is None:
+            self._send_error(404)
+            return
+        # 캐시 객체는 내용 해시로 이름 붙이므로 파일 이름이 곧 검증자
+        sent = send_file(self, path, content_type, {"ETag": f'"{os.path.basename(path)}"'})
+        with self.server.node.lock:
+            self.server.node.stats["files"] += 1
+            self.server.node.stats["bytes"] += sent
+
+
+def send_file(handler, path, content_type, headers=None):
+    """
+    handler(BaseHTTPRequestHandler)로 path 파일을 보냅니다 (Range 요청이면 206, sendfile 사용).
+    headers는 함께 보낼 응답 헤더입니다. 보낸 바이트 수를 반환합니다.
+    """
+    total = os.path.getsize(path)
+    start, end = 0, total - 1
+    match = re.match(r"bytes=(\d+)-(\d*)$", handler.headers.get("Range", ""))
+    if match and total:
+        start = int(match.group(1))
+        end = min(int(match.group(2)), total - 1) if match.group(2) else total - 1
+        if start > end:
+            handler.send_response(416)
+            handler.send_header("Content-Range", f"bytes */{total}")
+            handler.send_header("Content-Length", "0")
+            handler.end_headers()
+            return 0
+        handler.send_response(206)
+        handler.send_header("Content-Range", f"bytes {start}-{end}/{total}")
+    else:
+        handler.send_response(200)
+    length = end - start + 1 if total else 0
+    handler.send_header("Content-Type", content_type)
+    handler.send_header("Content-Length", str(length))
+    handler.send_header("Accept-Ranges", "bytes")
+    for name, value in (headers or {}).items():
+        handler.send_header(name, value)
+    handler.end_headers()
+    sent = 0
+    with open(path, "rb") as f:
+        try:
+            if length:
+                sent = handler.connection.sendfile(f, start, length)
+        except (BrokenPipeError, ConnectionResetError):
+            handler.close_connection = True  # 받는 쪽이 필요한 만큼만 받고 끊음 (크기 확인용 Range 요청 등)
+    return sent
+
+
+class ArtifactNode:
+    """
+    cache: 내놓을 ArtifactCache (이 PC의 단계들이 쓰는 것과 같은 인스턴스)
+    wheelhouse_dir: 내놓을 wheelhouse 디렉터리 (None이면 /wheelhouse/ 없음)
+    advertise_host: 다른 PC가 접속할 이름/주소 (기본: 바인드 주소, 0.0.0.0이면 컴퓨터 이름)
+    pacman_proxy: 같은 포트로 pacman 미러 요청도 받을 PacmanProxy (None이면 없음)
+    """
+
+    def __init__(
+        self, cache, wheelhouse_dir=None, host="0.0.0.0", port=DEFAULT_PORT, advertise_host=None, pacman_proxy=None
+    ):
+        self.cache = cache
+        self.wheelhouse_dir = wheelhouse_dir
+        self.pacman_proxy = pacman_proxy
+        self.host = host
+        self.port = port
+        self.advertise_host = advertise_host
+        self.server = None
+        self.lock = threading.Lock()
+        self.stats = {"files": 0, "bytes": 0, "misses": 0}
+
+    @property
+    def url(self):
+        host = self.advertise_host
+        if not host:
+            import socket
+
+            host = socket.gethostname() if self.host in ("", "0.0.0.0") else self.host
+        return f"http://{host}:{self.port}"
+
+    def start(self):
+        """별도 스레드에서 서버를 시작하고 주소를 반환합니다 (port=0이면 빈 포트를 골라 씀)."""
+        self.server = http.server.ThreadingHTTPServer((self.host, self.port), _ArtifactHandler)
+        self.server.daemon_threads = True
+        self.server.node = self
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, name="artifact-node", daemon=True).start()
+        return self.url
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
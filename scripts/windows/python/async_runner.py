@@ -0,0 +1,245 @@
+# async_runner.py (asyncio 기반 명령 실행: 타임아웃, 단계적 종료, 취소, 동시 실행 제한)
+
+import asyncio
+import collections
+import os
+import signal
+import subprocess
+import time
+
+from step_trace import get_tracer, CATEGORY_SUBPROCESS
+
+# --- 상수 ---
+DEFAULT_MAX_CONCURRENCY = 4  # 동시에 실행할 명령 수
+DEFAULT_TERMINATE_GRACE = 5.0  # 정상 종료 요청 후 강제 종료까지 기다리는 시간 (초)
+DEFAULT_MAX_CAPTURED_LINES = 10000
+READ_CHUNK_SIZE = 1024 * 64
+EXIT_POLL_INTERVAL = 0.05  # 파이프가 열려 있는 동안 종료 코드를 확인하는 간격 (초)
+
+IS_WINDOWS = os.name == "nt"
+
+
+class AsyncCommandResult:
+    def __init__(self, command_list):
+        self.command_list = command_list
+        self.returncode = None
+        self.stdout_lines = collections.deque()
+        self.stderr_lines = collections.deque()
+        self.timed_out = False
+        self.cancelled = False
+        self.duration = 0.0
+
+    @property
+    def ok(self):
+        return self.returncode == 0 and not self.timed_out and not self.cancelled
+
+    @property
+    def stdout(self):
+        return "\n".join(self.stdout_lines)
+
+    @property
+    def stderr(self):
+        return "\n".join(self.stderr_lines)
+
+    def __repr__(self):
+        return (
+            f"AsyncCommandResult({self.command_list[0]!r}, returncode={self.returncode}, "
+            f"timed_out={self.timed_out}, cancelled={self.cancelled})"
+        )
+
+
+class AsyncCommandRunner:
+    """
+    asyncio.create_subprocess_exec 위에서 여러 명령을 동시에 실행합니다.
+    - 동시 실행 수는 세마포어(max_concurrency)로 제한합니다.
+    - timeout을 넘기면 정상 종료를 요청하고(terminate / Windows는 CTRL_BREAK),
+      terminate_grace초 안에 끝나지 않으면 강제 종료(kill)합니다.
+    - 실행 중인 작업이 취소되면 자식 프로세스도 같은 방식으로 종료합니다.
+    """
+
+    def __init__(
+        self,
+        max_concurrency=DEFAULT_MAX_CONCURRENCY,
+        terminate_grace=DEFAULT_TERMINATE_GRACE,
+        echo=True,
+        max_captured_lines=DEFAULT_MAX_CAPTURED_LINES,
+    ):
+        self.semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self.terminate_grace = terminate_grace
+        self.echo = echo
+        self.max_captured_lines = max_captured_lines
+
+    async def _drain(self, stream, lines, prefix):
+        pending = b""
+        while True:
+            data = await stream.read(READ_CHUNK_SIZE)
+            if not data:
+                break
+            pending += data
+            *complete, pending = pending.split(b"\n")
+            for raw_line in complete:
+                self._emit(raw_line, lines, prefix)
+        if pending:
+            self._emit(pending, lines, prefix)
+
+    def _emit(self, raw_line, lines, prefix):
+        line = raw_line.decode("utf-8", errors="replace").strip()
+        if self.echo:
+            print(f"{prefix}{line}")
+        lines.append(line)
+
+    @staticmethod
+    async def _wait_exit(process):
+        """
+        프로세스 종료를 기다려 종료 코드를 반환합니다.
+        process.wait()는 파이프가 모두 닫힌 뒤에야 돌아오므로(손자 프로세스가 파이프를 물고 있으면 계속 대기)
+        종료 코드도 함께 확인합니다.
+        """
+        waiter = asyncio.ensure_future(process.wait())
+        try:
+            while process.returncode is None and not waiter.done():
+                await asyncio.wait([waiter], timeout=EXIT_POLL_INTERVAL)
+        finally:
+            waiter.cancel()
+        return process.returncode
+
+    async def _stop(self, process):
+        """정상 종료를 요청하고, 유예 시간 안에 끝나지 않으면 강제 종료합니다."""
+        if process.returncode is not None:
+            return
+        try:
+            if IS_WINDOWS:
+                # CREATE_NEW_PROCESS_GROUP으로 시작했으므로 CTRL_BREAK를 보낼 수 있음
+                process.send_signal(signal.CTRL_BREAK_EVENT)
+            else:
+                process.terminate()
+        except ProcessLookupError:
+            return
+        try:
+            await asyncio.wait_for(self._wait_exit(process), self.terminate_grace)
+        except asyncio.TimeoutError:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+            await self._wait_exit(process)
+
+    @staticmethod
+    async def _close_pipes(process, readers):
+        """리더를 취소하고 파이프 transport를 닫습니다 (이벤트 루프 종료 후 정리 경고 방지)."""
+        readers.cancel()
+        try:
+            await readers
+        except asyncio.CancelledError:
+            pass
+        # asyncio.subprocess.Process의 공개 API로는 읽기 파이프를 닫을 수 없어(StreamReader에 close 없음)
+        # 내부 속성 _transport를 사용. CPython 3.11.7, 3.12.1, 3.13.0에서 확인함
+        # (tests/test_async_runner.py가 미정리 transport 경고를 오류로 취급). 속성이 없으면 건너뜀
+        transport = getattr(process, "_transport", None)
+        if transport is not None:
+            transport.close()
+
+    @staticmethod
+    def _record_trace(result, started_at):
+        """asyncio 작업은 스레드 하나에서 겹쳐 실행되므로 구간을 직접 기록합니다."""
+        tracer = get_tracer()
+        with tracer.span(os.path.basename(result.command_list[0]), CATEGORY_SUBPROCESS) as span:
+            span.args["exit_code"] = result.returncode
+            span.args["timed_out"] = result.timed_out
+        span.start = span.end - result.duration
+
+    async def run(self, command_list, timeout=None, cwd=None, env=None, label=None):
+        """
+        명령 하나를 실행하고 AsyncCommandResult를 반환합니다.
+        실행 파일이 없으면 FileNotFoundError가 그대로 전달됩니다.
+        """
+        result = AsyncCommandResult(command_list)
+        result.stdout_lines = collections.deque(maxlen=self.max_captured_lines)
+        result.stderr_lines = collections.deque(maxlen=self.max_captured_lines)
+        prefix = f"[{label}] " if label else ""
+
+        async with self.semaphore:
+            if self.echo:
+                print(f"{prefix}실행 중: {' '.join(command_list)}")
+            started_at = time.monotonic()
+            kwargs = {}
+            if IS_WINDOWS:
+                kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+            process = await asyncio.create_subprocess_exec(
+                *command_list,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=cwd,
+                env=env,
+                **kwargs,
+            )
+            readers = asyncio.gather(
+                self._drain(process.stdout, result.stdout_lines, prefix),
+                self._drain(process.stderr, result.stderr_lines, prefix),
+            )
+            waiter = asyncio.ensure_future(self._wait_exit(process))
+            deadline = None if timeout is None else started_at + timeout
+            try:
+                # 시간 제한은 프로세스 종료 기준 (리더는 그동안 함께 읽음)
+                await asyncio.wait_for(asyncio.shield(waiter), timeout)
+                result.returncode = waiter.result()
+            except asyncio.TimeoutError:
+                result.timed_out = True
+                if self.echo:
+                    print(f"{prefix}시간 초과 ({timeout}초), 프로세스를 종료합니다.")
+                await self._stop(process)
+                result.returncode = process.returncode
+            except asyncio.CancelledError:
+                result.cancelled = True
+                await asyncio.shield(self._stop(process))
+                raise
+            finally:
+                if not waiter.done():
+                    waiter.cancel()
+                # 종료된 프로세스의 파이프는 EOF가 되므로 리더도 곧 끝남.
+                # 손자 프로세스가 파이프를 물고 있을 수 있으므로 유예 시간(남은 제한 시간 이내)만 기다리고
+                # 그래도 열려 있으면 파이프를 닫음 (종료 코드는 실제 값 유지)
+                grace = self.terminate_grace
+                if deadline is not None and not result.timed_out:
+                    grace = min(grace, max(0.0, deadline - time.monotonic()))
+                finished = False
+                if process.returncode is not None:
+                    try:
+                        await asyncio.wait_for(asyncio.shield(readers), grace)
+                        finished = True
+                    except asyncio.TimeoutError:
+                        pass
+                if not finished:
+                    await self._close_pipes(process, readers)
+                result.duration = time.monotonic() - started_at
+                self._record_trace(result, started_at)
+        return result
+
+    async def run_many(self, commands, timeout=None):
+        """
+        여러 명령을 동시에 실행합니다 (동시 실행 수는 세마포어로 제한).
+        commands: [명령 리스트, ...]
+        반환값: 같은 순서의 AsyncCommandResult 목록
+        """
+        return await asyncio.gather(
+            *(self.run(command, timeout=timeout, label=command[0]) for command in commands)
+        )
+
+
+def run_commands_concurrently(
+    commands,
+    timeout=None,
+    max_concurrency=DEFAULT_MAX_CONCURRENCY,
+    terminate_grace=DEFAULT_TERMINATE_GRACE,
+    echo=True,
+):
+    """동기 코드에서 여러 명령을 동시에 실행할 때 사용하는 도우미입니다."""
+
+    async def _main():
+        runner = AsyncCommandRunner(
+            max_concurrency=max_concurrency, terminate_grace=terminate_grace, echo=echo
+        )
+        return await runner.run_many(commands, timeout=timeout)
+
+    return asyncio.run(_main())
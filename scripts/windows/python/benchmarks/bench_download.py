@@ -0,0 +1,182 @@
+# bench_download.py (download_engine 처리량 측정: 로컬 HTTP 서버에서 큰 파일 받기)
+#
+# 별도 프로세스로 띄운 로컬 HTTP 서버(Range 지원, sendfile 전송)에서 큰 파일(기본 2GB, 희소 파일)을 받아
+# 방식별 처리량(MB/s)과 다운로드 프로세스의 CPU 시간을 비교합니다.
+#   legacy    : 예전 방식 (iter_content 4KB 조각 + 조각마다 tqdm.update)
+#   engine    : download_file 단일 스트림 (재사용 버퍼 + 적응형 읽기 단위 + 진행률 갱신 제한)
+#   engine-N  : download_file Range 병렬 (connections=N)
+# 서버가 같은 프로세스에 있으면 GIL을 나눠 쓰므로 결과가 왜곡되어 서버는 별도 프로세스로 실행합니다.
+#
+# 사용 예:
+#   python benchmarks/bench_download.py --size-mb 4096 --connections 4
+#   python benchmarks/bench_download.py --size-mb 512 --modes engine,legacy --json
+
+import argparse
+import contextlib
+import http.server
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PYTHON_DIR)
+
+DEFAULT_SIZE_MB = 2048
+DEFAULT_MODES = "legacy,engine,engine-N"
+LEGACY_CHUNK_SIZE = 4096
+
+
+# --- 서버 (별도 프로세스) ---
+class _FileHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # 연결 재사용
+    file_path = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        total = os.path.getsize(self.file_path)
+        start, end = 0, total - 1
+        match = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+        if match:
+            start = int(match.group(1))
+            end = min(int(match.group(2)), total - 1) if match.group(2) else total - 1
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{total}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", f'"{total}"')
+        self.end_headers()
+        self.wfile.flush()
+        with open(self.file_path, "rb") as f:
+            try:
+                self.connection.sendfile(f, start, end - start + 1)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # 클라이언트가 필요한 만큼만 받고 끊음
+
+
+def serve(file_path):
+    _FileHandler.file_path = file_path
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _FileHandler)
+    print(server.server_address[1], flush=True)
+    server.serve_forever()
+
+
+@contextlib.contextmanager
+def local_server(file_path):
+    process = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--serve", file_path],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        port = int(process.stdout.readline())
+        yield f"http://127.0.0.1:{port}/{os.path.basename(file_path)}"
+    finally:
+        process.terminate()
+        process.wait()
+
+
+# --- 클라이언트 ---
+def _download_legacy(url, dest_path):
+    import requests
+    from tqdm import tqdm
+
+    with requests.get(url, stream=True, timeout=(10, 30)) as response:
+        response.raise_for_status()
+        total = int(response.headers.get("content-length", 0))
+        with open(dest_path, "wb") as f, tqdm(total=total, unit="iB", unit_scale=True) as bar:
+            for data in response.iter_content(chunk_size=LEGACY_CHUNK_SIZE):
+                f.write(data)
+                bar.update(len(data))
+
+
+def _download_engine(url, dest_path, connections):
+    from download_engine import download_file
+
+    download_file(url, dest_path, connections=connections)
+
+
+def measure(mode, url, dest_path, size, connections):
+    # 모듈 import 시간이 측정에 들어가지 않도록 미리 불러 둠
+    import download_engine  # noqa: F401
+    import requests  # noqa: F401
+    import tqdm  # noqa: F401
+
+    if mode == "legacy":
+        run = lambda: _download_legacy(url, dest_path)  # noqa: E731
+    elif mode == "engine":
+        run = lambda: _download_engine(url, dest_path, 1)  # noqa: E731
+    else:
+        run = lambda: _download_engine(url, dest_path, connections)  # noqa: E731
+
+    # 진행률 표시는 실제처럼 그리되, 측정 결과 출력과 섞이지 않도록 버림
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stderr(devnull):
+        cpu_started = time.process_time()
+        started = time.perf_counter()
+        run()
+        wall = time.perf_counter() - started
+        cpu = time.process_time() - cpu_started
+    received = os.path.getsize(dest_path)
+    os.remove(dest_path)
+    if received != size:
+        raise RuntimeError(f"{mode}: 받은 크기가 다릅니다 ({received}/{size})")
+    return {
+        "mode": mode if mode != "engine-N" else f"engine-{connections}",
+        "seconds": wall,
+        "cpu_seconds": cpu,
+        "mb_per_s": size / (1024 * 1024) / wall,
+        "cpu_per_gb": cpu / (size / (1024 ** 3)),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="download_engine 처리량을 측정합니다.")
+    parser.add_argument("--size-mb", type=int, default=DEFAULT_SIZE_MB, help="받을 파일 크기 (MB)")
+    parser.add_argument("--connections", type=int, default=4, help="engine-N의 연결 수")
+    parser.add_argument("--modes", default=DEFAULT_MODES, help="쉼표로 구분한 측정 방식")
+    parser.add_argument("--dir", help="임시 파일 위치 (기본: 시스템 임시 디렉터리)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    parser.add_argument("--serve", metavar="FILE", help=argparse.SUPPRESS)  # 내부용: 서버 프로세스
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        serve(args.serve)
+        return 0
+
+    size = args.size_mb * 1024 * 1024
+    work_dir = tempfile.mkdtemp(prefix="bench-download-", dir=args.dir)
+    try:
+        source = os.path.join(work_dir, "source.bin")
+        with open(source, "wb") as f:
+            f.truncate(size)  # 희소 파일: 디스크를 쓰지 않고 서버는 0으로 채운 내용을 보냄
+        results = []
+        with local_server(source) as url:
+            for mode in args.modes.split(","):
+                results.append(
+                    measure(mode.strip(), url, os.path.join(work_dir, "dest.bin"), size, args.connections)
+                )
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps({"size_mb": args.size_mb, "results": results}, indent=2))
+    else:
+        print(f"파일 크기: {args.size_mb} MB")
+        for r in results:
+            print(
+                f"{r['mode']:<10} {r['mb_per_s']:8.1f} MB/s  {r['seconds']:6.2f} s  "
+                f"CPU {r['cpu_seconds']:6.2f} s ({r['cpu_per_gb']:.2f} s/GB)"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
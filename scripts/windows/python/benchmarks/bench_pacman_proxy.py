@@ -0,0 +1,168 @@
+# bench_pacman_proxy.py (여러 PC가 같은 패키지를 받을 때 미러 직접 대비 pacman_proxy 경유 비교)
+#
+# 속도가 제한된 가짜 미러(로컬 HTTP 서버, 연결당 --mirror-mbps)에 패키지 파일 여러 개와 동기화 DB를 두고,
+# PC 여러 대(--hosts)가 동시에 DB와 모든 패키지를 받는 상황(pacman의 ParallelDownloads처럼 PC당 병렬)을
+#   direct     : 모든 PC가 미러에서 직접 받음
+#   proxy-cold : 빈 캐시의 pacman_proxy를 거쳐 받음 (같은 파일의 동시 요청을 한 번으로 합침)
+#   proxy-warm : 캐시가 찬 pacman_proxy를 거쳐 받음 (DB는 미러에 다시 확인)
+# 세 방식으로 실행하여 전체 시간과 미러가 보낸 바이트를 비교합니다.
+#
+# 사용 예:
+#   python benchmarks/bench_pacman_proxy.py --hosts 8 --packages 6 --package-mb 8
+#   python benchmarks/bench_pacman_proxy.py --mirror-mbps 50 --json
+
+import argparse
+import http.server
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PYTHON_DIR)
+
+import requests  # noqa: E402
+
+from net_governor import NetworkGovernor, set_governor  # noqa: E402
+from pacman_proxy import PacmanProxy  # noqa: E402
+
+REPO_PATH = "/mingw/ucrt64"
+DB_NAME = "ucrt64.db"
+PARALLEL_DOWNLOADS = 5  # setup-pacman.sh는 10, 로컬 측정에서는 스레드 수를 줄임
+SEND_CHUNK = 1024 * 64
+
+
+class _MirrorHandler(http.server.SimpleHTTPRequestHandler):
+    """연결마다 속도를 제한하고 보낸 바이트를 세는 미러."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def copyfile(self, source, outputfile):
+        server = self.server
+        interval = SEND_CHUNK / server.bytes_per_second
+        while True:
+            data = source.read(SEND_CHUNK)
+            if not data:
+                break
+            outputfile.write(data)
+            with server.lock:
+                server.bytes_sent += len(data)
+            time.sleep(interval)
+
+
+def start_mirror(root, mbps):
+    handler = lambda *args, **kwargs: _MirrorHandler(*args, directory=root, **kwargs)  # noqa: E731
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    server.bytes_per_second = mbps * 1024 * 1024
+    server.bytes_sent = 0
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def make_mirror(root, packages, package_mb):
+    repo_dir = os.path.join(root, REPO_PATH.strip("/"))
+    os.makedirs(repo_dir)
+    with open(os.path.join(repo_dir, DB_NAME), "wb") as f:
+        f.write(os.urandom(256 * 1024))
+    names = []
+    for index in range(packages):
+        name = f"mingw-w64-ucrt-x86_64-bench{index}-1.0-1-any.pkg.tar.zst"
+        with open(os.path.join(repo_dir, name), "wb") as f:
+            f.write(os.urandom(package_mb * 1024 * 1024))
+        names.append(name)
+    return names
+
+
+def host_sync(base_url, names):
+    """PC 한 대: DB를 받은 뒤 패키지를 병렬로 받음."""
+    with requests.Session() as session:
+        response = session.get(f"{base_url}{REPO_PATH}/{DB_NAME}", timeout=60)
+        response.raise_for_status()
+
+        def fetch(name):
+            with session.get(f"{base_url}{REPO_PATH}/{name}", stream=True, timeout=60) as r:
+                r.raise_for_status()
+                return sum(len(chunk) for chunk in r.iter_content(SEND_CHUNK))
+
+        with ThreadPoolExecutor(max_workers=PARALLEL_DOWNLOADS) as executor:
+            return sum(executor.map(fetch, names))
+
+
+def run_wave(base_url, names, hosts):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=hosts) as executor:
+        received = sum(executor.map(lambda _: host_sync(base_url, names), range(hosts)))
+    return time.perf_counter() - started, received
+
+
+def measure(hosts, packages, package_mb, mirror_mbps):
+    root = tempfile.mkdtemp(prefix="bench-pacman-proxy-")
+    previous_governor = set_governor(NetworkGovernor())  # 환경 변수의 속도 제한이 결과에 섞이지 않도록
+    mirror = None
+    proxy = None
+    try:
+        names = make_mirror(os.path.join(root, "mirror"), packages, package_mb)
+        mirror = start_mirror(os.path.join(root, "mirror"), mirror_mbps)
+        mirror_url = f"http://127.0.0.1:{mirror.server_address[1]}"
+        proxy = PacmanProxy(os.path.join(root, "cache"), upstreams=[mirror_url], host="127.0.0.1", port=0)
+        proxy_url = proxy.start()
+
+        result = {
+            "hosts": hosts,
+            "packages": packages,
+            "package_mb": package_mb,
+            "mirror_mbps": mirror_mbps,
+            "modes": {},
+        }
+        for mode, base_url in (("direct", mirror_url), ("proxy-cold", proxy_url), ("proxy-warm", proxy_url)):
+            mirror.bytes_sent = 0
+            seconds, received = run_wave(base_url, names, hosts)
+            result["modes"][mode] = {
+                "seconds": seconds,
+                "received_mb": received / (1024 * 1024),
+                "mirror_mb": mirror.bytes_sent / (1024 * 1024),
+            }
+        result["proxy_stats"] = dict(proxy.stats)
+        return result
+    finally:
+        if proxy is not None:
+            proxy.stop()
+        if mirror is not None:
+            mirror.shutdown()
+            mirror.server_close()
+        set_governor(previous_governor)
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="미러 직접 다운로드와 pacman_proxy 경유를 비교합니다.")
+    parser.add_argument("--hosts", type=int, default=8, help="동시에 받는 PC 수")
+    parser.add_argument("--packages", type=int, default=6, help="PC마다 받을 패키지 수")
+    parser.add_argument("--package-mb", type=int, default=8, help="패키지 하나의 크기 (MB)")
+    parser.add_argument("--mirror-mbps", type=float, default=20, help="미러의 연결당 속도 (MB/s)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    result = measure(args.hosts, args.packages, args.package_mb, args.mirror_mbps)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return 0
+    print(
+        f"PC {result['hosts']}대 x 패키지 {result['packages']}개 ({result['package_mb']} MB), "
+        f"미러 연결당 {result['mirror_mbps']:.0f} MB/s"
+    )
+    for mode, x in result["modes"].items():
+        print(f"{mode:<11} {x['seconds']:6.2f} s  받은 양 {x['received_mb']:7.1f} MB  미러 전송 {x['mirror_mb']:7.1f} MB")
+    print(f"프록시 통계: {result['proxy_stats']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,157 @@
+# bench_path.py (PATH 정리 전후 실행 파일 검색 비용과 PATH 편집 비용 측정)
+#
+# 임시 디렉터리에 실제 디렉터리 여러 개를 만들고, 그 디렉터리들을 표기만 바꿔 여러 번 반복하고
+# 존재하지 않는 디렉터리를 섞은 긴 PATH를 만듭니다. 이 PATH로
+#   - shutil.which (찾는 실행 파일이 마지막 디렉터리에 있는 경우 / 어디에도 없는 경우)
+#   - PATH 항목 추가 (예전 방식: 매번 분할 + normcase 선형 비교 / PathModel 색인)
+# 를 재고, PathModel.compact(remove_dead=True)로 정리한 PATH와 비교합니다. Linux에서도 실행됩니다.
+#
+# 사용 예:
+#   python benchmarks/bench_path.py --dirs 80 --dead 200 --repeat 3
+#   python benchmarks/bench_path.py --json
+
+import argparse
+import json
+import ntpath
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import time
+
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PYTHON_DIR)
+
+from path_model import PathModel, normalize_key  # noqa: E402
+
+TOOL_NAME = "bench-path-tool"
+
+
+def build_path(root, dirs, dead, repeat):
+    """(PATH 문자열, 실제 디렉터리 목록). 찾는 실행 파일은 마지막 실제 디렉터리에만 있음."""
+    real = []
+    for index in range(dirs):
+        directory = os.path.join(root, f"bin{index:03d}")
+        os.makedirs(directory)
+        for file_index in range(5):  # 다른 실행 파일도 조금씩
+            open(os.path.join(directory, f"other{file_index}.exe"), "w").close()
+        real.append(directory)
+
+    tool = os.path.join(real[-1], TOOL_NAME + (".exe" if os.name == "nt" else ""))
+    with open(tool, "w") as f:
+        f.write("#!/bin/sh\n")
+    os.chmod(tool, os.stat(tool).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+
+    # 같은 디렉터리를 다른 표기로 반복 (끝 구분자, '.', Windows에서는 대소문자)
+    variants = [lambda d: d, lambda d: d + os.sep, lambda d: os.path.join(d, ".")]
+    if os.name == "nt":
+        variants.append(lambda d: d.upper())
+    entries = []
+    for round_index in range(repeat):
+        variant = variants[round_index % len(variants)]
+        entries += [variant(d) for d in real[:-1]]
+        entries += [os.path.join(root, "missing", f"round{round_index}", f"dir{i:03d}") for i in range(dead // repeat)]
+    entries.append(real[-1])
+    return os.pathsep.join(entries), real
+
+
+def _time_per_call(func, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started) / iterations
+
+
+def _legacy_add(path_value, entries_to_add):
+    """
+    예전 add_to_system_path 방식: 추가할 때마다 전체를 나누고 normcase로 선형 비교.
+    Linux의 os.path.normcase는 아무것도 하지 않으므로 Windows와 같은 ntpath.normcase로 잽니다.
+    """
+    for entry in entries_to_add:
+        paths = [p.strip() for p in path_value.split(os.pathsep) if p.strip()]
+        norm = ntpath.normcase(entry.strip())
+        if not any(ntpath.normcase(p) == norm for p in paths):
+            paths.append(entry)
+        path_value = os.pathsep.join(paths)
+    return path_value
+
+
+def _model_add(path_value, entries_to_add):
+    normalize_key.cache_clear()  # 반복 측정에서 이전 호출의 캐시를 쓰지 않도록
+    model = PathModel(path_value, sep=os.pathsep)
+    for entry in entries_to_add:
+        model.add(entry)
+    return model.value
+
+
+def measure(dirs, dead, repeat, iterations, adds):
+    root = tempfile.mkdtemp(prefix="bench-path-")
+    try:
+        before, real = build_path(root, dirs, dead, repeat)
+
+        parse_started = time.perf_counter()
+        model = PathModel(before, sep=os.pathsep)
+        report = model.compact(remove_dead=True)
+        compact_seconds = time.perf_counter() - parse_started
+        after = model.value
+
+        found = shutil.which(TOOL_NAME, path=after)
+        if found is None or shutil.which(TOOL_NAME, path=before) is None:
+            raise RuntimeError("정리 전후 PATH에서 실행 파일을 찾지 못했습니다.")
+
+        entries_to_add = [os.path.join(root, f"new{i}") for i in range(adds)] + real[: adds // 2]
+        result = {
+            "entries_before": len(before.split(os.pathsep)),
+            "entries_after": len(after.split(os.pathsep)),
+            "duplicates_removed": len(report["duplicates"]),
+            "dead_removed": len(report["dead"]),
+            "compact_ms": compact_seconds * 1000,
+            "which_hit_us": {},
+            "which_miss_us": {},
+            "add_ms": {},
+        }
+        for label, value in (("before", before), ("after", after)):
+            result["which_hit_us"][label] = (
+                _time_per_call(lambda: shutil.which(TOOL_NAME, path=value), iterations) * 1e6
+            )
+            result["which_miss_us"][label] = (
+                _time_per_call(lambda: shutil.which("no-such-tool", path=value), iterations) * 1e6
+            )
+        result["add_ms"]["legacy"] = _time_per_call(lambda: _legacy_add(before, entries_to_add), 5) * 1000
+        result["add_ms"]["model"] = _time_per_call(lambda: _model_add(before, entries_to_add), 5) * 1000
+        return result
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PATH 정리 전후 실행 파일 검색/편집 비용을 측정합니다.")
+    parser.add_argument("--dirs", type=int, default=80, help="실제 디렉터리 수")
+    parser.add_argument("--dead", type=int, default=200, help="존재하지 않는 디렉터리 수")
+    parser.add_argument("--repeat", type=int, default=3, help="실제 디렉터리를 반복하는 횟수")
+    parser.add_argument("--iterations", type=int, default=200, help="which 측정 반복 횟수")
+    parser.add_argument("--adds", type=int, default=20, help="PATH 추가 측정에서 추가할 항목 수")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    result = measure(args.dirs, args.dead, args.repeat, args.iterations, args.adds)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return 0
+
+    print(
+        f"PATH 항목: {result['entries_before']} -> {result['entries_after']} "
+        f"(중복 {result['duplicates_removed']}개, 없는 디렉터리 {result['dead_removed']}개 제거, "
+        f"정리 {result['compact_ms']:.2f} ms)"
+    )
+    for key, label in (("which_hit_us", "which (마지막 디렉터리)"), ("which_miss_us", "which (없음)")):
+        before, after = result[key]["before"], result[key]["after"]
+        print(f"{label:<24} 정리 전 {before:9.1f} us  정리 후 {after:9.1f} us  ({before / after:.1f}배)")
+    legacy, model = result["add_ms"]["legacy"], result["add_ms"]["model"]
+    print(f"{'PATH 항목 추가':<24} 예전 방식 {legacy:7.2f} ms  PathModel {model:7.2f} ms  ({legacy / model:.1f}배)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
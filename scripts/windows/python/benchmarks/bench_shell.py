@@ -0,0 +1,124 @@
+# bench_shell.py (스크립트마다 'bash -lc' 실행 대비 로그인 셸 세션 재사용 비용 측정)
+#
+# 작은 설정 스크립트 여러 개(설정 파일 sed 편집 + echo, setup-pacman.sh와 비슷한 모양)를
+#   spawn   : 스크립트마다 'bash -lc "cd ...; ./script.sh"' (예전 run_msys2_bash_script)
+#   session : msys2_shell.BashSession 하나에서 차례로 실행
+# 두 방식으로 실행하여 스크립트당 시간을 비교합니다. 일반 Linux bash로 실행됩니다.
+# Linux의 로그인 셸은 MSYS2보다 훨씬 가벼우므로, --profile-forks N을 주면 임시 HOME의
+# .bash_profile이 외부 명령을 N번 실행하여 MSYS2 /etc/profile의 fork 비용을 흉내 냅니다.
+#
+# 사용 예:
+#   python benchmarks/bench_shell.py --scripts 4 --rounds 5
+#   python benchmarks/bench_shell.py --bash "C:\msys64\usr\bin\bash.exe" --profile-forks 0 --json
+
+import argparse
+import contextlib
+import json
+import os
+import shutil
+import stat
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PYTHON_DIR)
+
+from msys2_shell import BashSession  # noqa: E402
+
+SCRIPT_BODY = """#!/bin/bash
+echo "설정 파일 수정 중..."
+sed -i 's/^#\\?\\s*ParallelDownloads\\s*=.*/ParallelDownloads = 10/' "$(dirname "$0")/pacman.conf"
+sed -i 's/^\\s*CheckSpace/#&/' "$(dirname "$0")/pacman.conf"
+echo "완료"
+"""
+
+
+def make_workspace(root, scripts, profile_forks):
+    """(HOME 디렉터리, 스크립트 상대 경로 목록)"""
+    home = os.path.join(root, "home")
+    os.makedirs(home)
+    with open(os.path.join(home, ".bash_profile"), "w", encoding="utf-8") as f:
+        # MSYS2의 /etc/profile처럼 외부 명령을 여러 번 실행하는 로그인 스크립트
+        f.write("".join(f"_probe_{i}=$(uname -s)\n" for i in range(profile_forks)))
+
+    bash_dir = os.path.join(root, "bash")
+    os.makedirs(bash_dir)
+    with open(os.path.join(bash_dir, "pacman.conf"), "w", encoding="utf-8") as f:
+        f.write("#ParallelDownloads = 5\nCheckSpace\n")
+    names = []
+    for index in range(scripts):
+        path = os.path.join(bash_dir, f"script{index}.sh")
+        with open(path, "w", encoding="utf-8", newline="\n") as f:
+            f.write(SCRIPT_BODY)
+        os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+        names.append(f"bash/script{index}.sh")
+    return home, names
+
+
+def run_spawn(bash, root, names, env):
+    for name in names:
+        result = subprocess.run(
+            [bash, "-lc", f"cd '{root}'; {name}"], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"{name} 실패 (종료 코드: {result.returncode})")
+
+
+def run_session(bash, root, names, env):
+    with BashSession(bash, env=env, echo=False) as session:
+        for name in names:
+            result = session.run(name, cwd=root)
+            if result.returncode != 0:
+                raise RuntimeError(f"{name} 실패 (종료 코드: {result.returncode}): {result.stdout}")
+
+
+def measure(bash, scripts, rounds, profile_forks):
+    root = tempfile.mkdtemp(prefix="bench-shell-")
+    try:
+        home, names = make_workspace(root, scripts, profile_forks)
+        env = dict(os.environ, HOME=home)
+        result = {"bash": bash, "scripts": scripts, "profile_forks": profile_forks, "seconds": {}}
+        for mode, run in (("spawn", run_spawn), ("session", run_session)):
+            samples = []
+            for _ in range(rounds):
+                started = time.perf_counter()
+                run(bash, root, names, env)
+                samples.append(time.perf_counter() - started)
+            result["seconds"][mode] = statistics.median(samples)
+        result["per_script_ms"] = {mode: s / scripts * 1000 for mode, s in result["seconds"].items()}
+        result["speedup"] = result["seconds"]["spawn"] / result["seconds"]["session"]
+        return result
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="bash -lc 반복 실행과 로그인 셸 세션 재사용을 비교합니다.")
+    parser.add_argument("--bash", default=shutil.which("bash") or "bash", help="bash 실행 파일")
+    parser.add_argument("--scripts", type=int, default=4, help="한 번에 실행할 스크립트 수")
+    parser.add_argument("--rounds", type=int, default=5, help="측정 반복 횟수 (중앙값 사용)")
+    parser.add_argument(
+        "--profile-forks", type=int, default=40, help="로그인 스크립트가 실행할 외부 명령 수 (MSYS2 흉내)"
+    )
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    with contextlib.redirect_stdout(sys.stderr):  # 세션의 콘솔 출력이 결과와 섞이지 않도록
+        result = measure(args.bash, args.scripts, args.rounds, args.profile_forks)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return 0
+    print(f"bash: {result['bash']}, 스크립트 {result['scripts']}개, 로그인 시 외부 명령 {result['profile_forks']}번")
+    for mode in ("spawn", "session"):
+        print(
+            f"{mode:<8} 전체 {result['seconds'][mode] * 1000:8.1f} ms  스크립트당 {result['per_script_ms'][mode]:7.1f} ms"
+        )
+    print(f"세션 재사용: {result['speedup']:.1f}배")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,89 @@
+# bench_startup.py (setup.py 시작 비용 측정: 모듈 import 시간과 무거운 모듈 로드 여부)
+#
+# setup.py를 새 인터프리터에서 import 하는 데 걸리는 시간을 여러 번 재고,
+# 빈 인터프리터 시작 시간을 뺀 중앙값이 예산(--budget-ms)을 넘거나
+# 단계 실행 전에 불러오면 안 되는 모듈(requests, winreg 등)이 로드되면 실패(종료 코드 1)합니다.
+# Linux에서도 실행할 수 있습니다 (winreg/ctypes는 단계 함수 안에서만 import 되므로).
+#
+# 사용 예:
+#   python benchmarks/bench_startup.py --runs 15 --budget-ms 150
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_RUNS = 10
+DEFAULT_BUDGET_MS = 150.0
+# setup.py import 시점에 로드되면 안 되는 모듈 (단계 함수 안에서 필요할 때만 import)
+HEAVY_MODULES = ["requests", "urllib3", "tqdm", "winreg", "ctypes", "asyncio"]
+
+_PROBE = """
+import json, sys, time
+sys.path.insert(0, {python_dir!r})
+started = time.perf_counter()
+import setup
+elapsed = time.perf_counter() - started
+print(json.dumps({{"elapsed": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def _run(code):
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    return time.perf_counter() - started, output
+
+
+def measure(runs=DEFAULT_RUNS):
+    """(프로세스 전체 시간 - 빈 인터프리터 시간) 중앙값, import 구간 중앙값, 로드된 무거운 모듈."""
+    probe = _PROBE.format(python_dir=PYTHON_DIR, heavy=HEAVY_MODULES)
+    baseline, total, imports, loaded = [], [], [], set()
+    for _ in range(runs):
+        baseline.append(_run("pass")[0])
+        wall, output = _run(probe)
+        data = json.loads(output.strip().splitlines()[-1])
+        total.append(wall)
+        imports.append(data["elapsed"])
+        loaded.update(data["loaded"])
+    return {
+        "runs": runs,
+        "interpreter_ms": statistics.median(baseline) * 1000,
+        "startup_overhead_ms": max(0.0, statistics.median(total) - statistics.median(baseline)) * 1000,
+        "import_ms": statistics.median(imports) * 1000,
+        "heavy_modules_loaded": sorted(loaded),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="setup.py 시작 비용을 측정합니다.")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    result = measure(args.runs)
+    result["budget_ms"] = args.budget_ms
+    result["ok"] = result["import_ms"] <= args.budget_ms and not result["heavy_modules_loaded"]
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"빈 인터프리터 시작: {result['interpreter_ms']:.1f} ms")
+        print(f"setup.py import:    {result['import_ms']:.1f} ms (예산 {args.budget_ms:.0f} ms)")
+        print(f"시작 비용 (차이):   {result['startup_overhead_ms']:.1f} ms")
+        if result["heavy_modules_loaded"]:
+            print(f"실패: 시작 시 불러온 무거운 모듈: {', '.join(result['heavy_modules_loaded'])}")
+        elif not result["ok"]:
+            print("실패: import 시간이 예산을 넘었습니다.")
+    return 0 if result["ok"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
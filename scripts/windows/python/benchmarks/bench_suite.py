@@ -0,0 +1,342 @@
+# bench_suite.py (설정 도구 전체 벤치마크: Linux에서 Windows 대역으로 실행, JSON 결과)
+#
+# 성능 작업의 기준선을 남기기 위한 모음입니다. Windows 전용 부분은 fake_windows.py의 대역
+# (메모리 레지스트리, ctypes.windll, 외부 도구 스크립트)으로 바꿔 Linux에서도 실행합니다.
+#   run_command : 대량 출력을 내는 명령의 처리량 (subprocess.run 캡처 대비)
+#   console     : 출력을 가상 터미널(pty)에 쓸 때 줄마다 flush 대비 콘솔 렌더러(live/plain)의 시간과 터미널 쓰기량
+#   download    : 로컬 HTTP 서버에서 download_file 처리량 (bench_download.py)
+#   registry    : add_to_system_path / 환경 변수 트랜잭션 / 세션 PATH 갱신 비용 (가짜 레지스트리)
+#   main        : 단계 함수를 모두 즉시 성공하는 대역으로 바꾼 setup.main()의 고정 비용
+# 결과는 JSON으로 저장하여 회귀 추적에 씁니다 (--output).
+#
+# 사용 예:
+#   python benchmarks/bench_suite.py --output bench-results.json
+#   python benchmarks/bench_suite.py --only registry,main --json
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PYTHON_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, PYTHON_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+import fake_windows  # noqa: E402
+
+SECTIONS = ["run_command", "console", "download", "registry", "main"]
+DEFAULT_OUTPUT_LINES = 200000
+DEFAULT_DOWNLOAD_MB = 256
+DEFAULT_PATH_ENTRIES = 150
+DEFAULT_MAIN_RUNS = 5
+MACHINE_ENV_KEY = r"SYSTEM\CurrentControlSet\Control\Session Manager\Environment"
+
+
+@contextlib.contextmanager
+def _quiet():
+    """측정 중 print 출력은 버림 (콘솔 출력 비용이 결과를 흔들지 않도록)."""
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        with contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+            yield
+
+
+@contextlib.contextmanager
+def _preserve_environ():
+    saved = dict(os.environ)
+    try:
+        yield
+    finally:
+        os.environ.clear()
+        os.environ.update(saved)
+
+
+def _median_time(func, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+# --- run_command ---
+def bench_run_command(lines=DEFAULT_OUTPUT_LINES, runs=3):
+    from setup_utils import run_command
+
+    line = "x" * 79
+    code = f"import sys\nw = sys.stdout.write\nfor i in range({lines}): w({line!r} + '\\n')"
+    command = [sys.executable, "-c", code]
+    output_mb = lines * (len(line) + 1) / (1024 * 1024)
+
+    baseline = _median_time(lambda: subprocess.run(command, capture_output=True, check=True), runs)
+    with _quiet():
+        captured = _median_time(lambda: run_command(command, capture_output_for_result=True), runs)
+        echoed = _median_time(lambda: run_command(command), runs)
+    return {
+        "lines": lines,
+        "output_mb": output_mb,
+        "subprocess_run_s": baseline,
+        "run_command_capture_s": captured,
+        "run_command_echo_s": echoed,
+        "lines_per_s": lines / echoed,
+        "mb_per_s": output_mb / echoed,
+        "overhead_vs_subprocess": echoed / baseline,
+    }
+
+
+# --- console (가상 터미널) ---
+@contextlib.contextmanager
+def _pty_stdout(counter):
+    """sys.stdout을 가상 터미널로 바꾸고, 다른 스레드가 읽어 간 바이트 수를 counter["bytes"]에 셉니다."""
+    import pty
+
+    master, slave = pty.openpty()
+
+    def drain():
+        while True:
+            try:
+                data = os.read(master, 1024 * 64)
+            except OSError:
+                return
+            if not data:
+                return
+            counter["bytes"] += len(data)
+
+    reader = threading.Thread(target=drain, daemon=True)
+    reader.start()
+    terminal = open(slave, "w", encoding="utf-8", closefd=True)
+    try:
+        with contextlib.redirect_stdout(terminal):
+            yield
+    finally:
+        terminal.close()
+        reader.join(timeout=5)
+        os.close(master)
+
+
+def bench_console(lines=DEFAULT_OUTPUT_LINES // 4):
+    if os.name == "nt":
+        return {"skipped": "가상 터미널(pty)이 없는 플랫폼"}
+    import console_output
+    from command_runner import run_streaming
+
+    code = f"for i in range({lines}): print('building target', i, 'x' * 60)"
+    command = [sys.executable, "-c", code]
+
+    def per_line_flush(stream_name, line):
+        print(line)
+        sys.stdout.flush()
+
+    results = {"lines": lines}
+    variants = [
+        ("per_line_flush", None, lambda: run_streaming(command, echo=False, on_line=per_line_flush)),
+        ("plain", console_output.MODE_PLAIN, lambda: run_streaming(command)),
+        ("live", console_output.MODE_LIVE, lambda: run_streaming(command)),
+    ]
+    for name, mode, run in variants:
+        counter = {"bytes": 0}
+        previous = console_output.set_console(console_output.Console(mode=mode))
+        try:
+            with _pty_stdout(counter):
+                seconds = _median_time(run, 1)
+        finally:
+            console_output.set_console(previous)
+        results[name] = {"seconds": seconds, "terminal_kb": counter["bytes"] / 1024}
+    return results
+
+
+# --- download ---
+def bench_download(size_mb=DEFAULT_DOWNLOAD_MB, connections=4):
+    import bench_download as download
+
+    size = size_mb * 1024 * 1024
+    work_dir = tempfile.mkdtemp(prefix="bench-suite-download-")
+    try:
+        source = os.path.join(work_dir, "source.bin")
+        with open(source, "wb") as f:
+            f.truncate(size)
+        with download.local_server(source) as url:
+            results = [
+                download.measure(mode, url, os.path.join(work_dir, "dest.bin"), size, connections)
+                for mode in ("engine", "engine-N")
+            ]
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return {"size_mb": size_mb, "results": {r["mode"]: r for r in results}}
+
+
+# --- registry / PATH ---
+def _seed_registry(windows, entries):
+    import winreg
+
+    path = ";".join(rf"C:\Tools\tool{i:03d}\bin" for i in range(entries))
+    windows.registry.seed(winreg.HKEY_LOCAL_MACHINE, MACHINE_ENV_KEY, {"Path": (path, winreg.REG_EXPAND_SZ)})
+    windows.registry.seed(winreg.HKEY_CURRENT_USER, "Environment", {"Path": (r"C:\Users\bench\bin", winreg.REG_EXPAND_SZ)})
+
+
+def bench_registry(entries=DEFAULT_PATH_ENTRIES, edits=50):
+    windows = fake_windows.install()
+    try:
+        import setup_utils
+
+        results = {"path_entries": entries, "edits": edits}
+        with _preserve_environ(), _quiet():
+            _seed_registry(windows, entries)
+            started = time.perf_counter()
+            for i in range(edits):
+                setup_utils.add_to_system_path(rf"C:\New\dir{i:03d}")
+            results["add_to_system_path_ms"] = (time.perf_counter() - started) / edits * 1000
+            results["add_to_system_path_calls"] = dict(windows.registry.calls)
+
+            _seed_registry(windows, entries)
+            before = dict(windows.registry.calls)
+            started = time.perf_counter()
+            with setup_utils.begin_environment_transaction() as tx:
+                for i in range(edits):
+                    tx.add_to_path(rf"C:\New\dir{i:03d}")
+                tx.set("MSYS2_ROOT", r"C:\msys64")
+                tx.compact_path()
+            results["transaction_ms"] = (time.perf_counter() - started) * 1000
+            results["transaction_calls"] = {k: windows.registry.calls[k] - before[k] for k in before}
+
+            results["session_path_refresh_ms"] = (
+                _median_time(setup_utils.update_current_session_path_from_registry, 20) * 1000
+            )
+        results["broadcasts"] = windows.windll_calls.get("SendMessageTimeoutW", 0)
+        return results
+    finally:
+        windows.uninstall()
+
+
+# --- setup.main() ---
+def bench_main(runs=DEFAULT_MAIN_RUNS):
+    windows = fake_windows.install()
+    work_dir = tempfile.mkdtemp(prefix="bench-suite-main-")
+    try:
+        import setup
+        from step_trace import get_tracer
+
+        setup.TEMP_DOWNLOAD_DIR = work_dir
+        setup.SETUP_JOURNAL_PATH = os.path.join(work_dir, "setup-journal.json")
+        for name in dir(setup):
+            if name.startswith("step_"):
+                setattr(setup, name, lambda: True)
+
+        def run(cold):
+            if cold and os.path.exists(setup.SETUP_JOURNAL_PATH):
+                os.remove(setup.SETUP_JOURNAL_PATH)
+            get_tracer().reset()
+            with _quiet():
+                code = setup.main("all")
+            if code != 0:
+                raise RuntimeError("대역 단계로 실행한 main()이 실패했습니다.")
+
+        with _preserve_environ():
+            fake_windows.make_fake_tools(os.path.join(work_dir, "tools"))
+            os.environ["PATH"] = os.path.join(work_dir, "tools") + os.pathsep + os.environ.get("PATH", "")
+            cold = _median_time(lambda: run(cold=True), runs)
+            warm = _median_time(lambda: run(cold=False), runs)
+        return {
+            "runs": runs,
+            "steps": len(setup.build_setup_steps()),
+            "cold_journal_ms": cold * 1000,
+            "warm_journal_ms": warm * 1000,
+        }
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        windows.uninstall()
+
+
+def run_suite(sections, quick=False):
+    scale = 0.1 if quick else 1.0
+    benches = {
+        "run_command": lambda: bench_run_command(lines=int(DEFAULT_OUTPUT_LINES * scale)),
+        "console": lambda: bench_console(lines=int(DEFAULT_OUTPUT_LINES // 4 * scale)),
+        "download": lambda: bench_download(size_mb=max(16, int(DEFAULT_DOWNLOAD_MB * scale))),
+        "registry": lambda: bench_registry(),
+        "main": lambda: bench_main(runs=2 if quick else DEFAULT_MAIN_RUNS),
+    }
+    results = {}
+    for section in sections:
+        started = time.perf_counter()
+        results[section] = benches[section]()
+        print(f"[{section}] {time.perf_counter() - started:.1f}초", file=sys.stderr)
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def format_results(data):
+    r = data["results"]
+    lines = []
+    if "run_command" in r:
+        x = r["run_command"]
+        lines.append(
+            f"run_command: {x['lines']}줄 {x['output_mb']:.1f} MB -> {x['lines_per_s']:.0f}줄/s, "
+            f"{x['mb_per_s']:.1f} MB/s (subprocess.run 대비 {x['overhead_vs_subprocess']:.1f}배)"
+        )
+    if "console" in r and "skipped" not in r["console"]:
+        x = r["console"]
+        lines.append(
+            f"console ({x['lines']}줄, 가상 터미널): "
+            + ", ".join(
+                f"{name} {x[name]['seconds']:.2f} s / {x[name]['terminal_kb']:.0f} KB"
+                for name in ("per_line_flush", "plain", "live")
+            )
+        )
+    if "download" in r:
+        for mode, x in r["download"]["results"].items():
+            lines.append(f"download {mode}: {x['mb_per_s']:.0f} MB/s, CPU {x['cpu_per_gb']:.2f} s/GB")
+    if "registry" in r:
+        x = r["registry"]
+        lines.append(
+            f"registry: add_to_system_path {x['add_to_system_path_ms']:.2f} ms/회, "
+            f"트랜잭션({x['edits']}건) {x['transaction_ms']:.2f} ms, 세션 PATH 갱신 {x['session_path_refresh_ms']:.2f} ms"
+        )
+    if "main" in r:
+        x = r["main"]
+        lines.append(
+            f"main(): 단계 {x['steps']}개, 저널 없음 {x['cold_journal_ms']:.1f} ms, 저널 있음 {x['warm_journal_ms']:.1f} ms"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="설정 도구 벤치마크 모음 (Linux에서 Windows 대역으로 실행)")
+    parser.add_argument("--only", help=f"쉼표로 구분한 구간 ({', '.join(SECTIONS)})")
+    parser.add_argument("--quick", action="store_true", help="작은 입력으로 빠르게 실행")
+    parser.add_argument("--output", help="JSON 결과를 저장할 파일")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    sections = [s.strip() for s in args.only.split(",")] if args.only else SECTIONS
+    unknown = sorted(set(sections) - set(SECTIONS))
+    if unknown:
+        parser.error(f"알 수 없는 구간: {', '.join(unknown)}")
+
+    data = run_suite(sections, quick=args.quick)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+    print(json.dumps(data, indent=2, ensure_ascii=False) if args.json else format_results(data))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
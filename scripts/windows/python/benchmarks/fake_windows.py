@@ -0,0 +1,187 @@
+# fake_windows.py (Linux에서 벤치마크를 돌리기 위한 Windows 대역: winreg, ctypes.windll, 외부 도구)
+#
+# install()은 메모리 레지스트리로 동작하는 가짜 winreg 모듈을 sys.modules에 넣고,
+# ctypes.windll(관리자 확인, 환경 변수 브로드캐스트, 관리자 재실행)을 성공만 돌려주는 대역으로 바꿉니다.
+# make_fake_tools()는 winget/code/pwsh/pacman 같은 외부 도구 자리에 즉시 끝나는 스크립트를 만듭니다.
+# 실제 Windows에서는 install()이 아무것도 바꾸지 않습니다 (진짜 레지스트리를 건드리지 않도록 force=True 필요).
+
+import ctypes
+import os
+import stat
+import sys
+import types
+
+# --- 가짜 winreg ---
+HKEY_LOCAL_MACHINE = 0x80000002
+HKEY_CURRENT_USER = 0x80000001
+KEY_READ = 0x20019
+KEY_WRITE = 0x20006
+REG_SZ = 1
+REG_EXPAND_SZ = 2
+
+
+class FakeRegistry:
+    """{(hive, 소문자 키 경로): {값 이름: (값, 타입)}}. 호출 횟수를 셉니다."""
+
+    def __init__(self):
+        self.keys = {}
+        self.calls = {"open": 0, "query": 0, "set": 0, "enum": 0}
+
+    def values(self, hive, key_path):
+        return self.keys.setdefault((hive, key_path.replace("\\\\", "\\").lower()), {})
+
+    def seed(self, hive, key_path, values):
+        self.values(hive, key_path).update(values)
+
+
+class _FakeKey:
+    def __init__(self, registry, hive, key_path=""):
+        self.registry = registry
+        self.hive = hive
+        self.key_path = key_path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def Close(self):
+        pass
+
+
+def _make_winreg_module(registry):
+    module = types.ModuleType("winreg")
+    module.HKEY_LOCAL_MACHINE = HKEY_LOCAL_MACHINE
+    module.HKEY_CURRENT_USER = HKEY_CURRENT_USER
+    module.KEY_READ = KEY_READ
+    module.KEY_WRITE = KEY_WRITE
+    module.REG_SZ = REG_SZ
+    module.REG_EXPAND_SZ = REG_EXPAND_SZ
+    module.registry = registry
+
+    def ConnectRegistry(computer_name, hive):
+        return _FakeKey(registry, hive)
+
+    def OpenKey(key, sub_key, reserved=0, access=KEY_READ):
+        registry.calls["open"] += 1
+        hive = key.hive if isinstance(key, _FakeKey) else key
+        return _FakeKey(registry, hive, sub_key)
+
+    def _lookup(values, name):
+        for existing in values:
+            if existing.lower() == name.lower():
+                return existing
+        return None
+
+    def QueryValueEx(key, name):
+        registry.calls["query"] += 1
+        values = registry.values(key.hive, key.key_path)
+        existing = _lookup(values, name)
+        if existing is None:
+            raise FileNotFoundError(2, "지정된 파일을 찾을 수 없습니다", name)
+        return values[existing]
+
+    def SetValueEx(key, name, reserved, value_type, value):
+        registry.calls["set"] += 1
+        values = registry.values(key.hive, key.key_path)
+        values[_lookup(values, name) or name] = (value, value_type)
+
+    def EnumValue(key, index):
+        registry.calls["enum"] += 1
+        items = list(registry.values(key.hive, key.key_path).items())
+        if index >= len(items):
+            raise OSError(259, "더 이상 데이터가 없습니다")
+        name, (value, value_type) = items[index]
+        return name, value, value_type
+
+    def CloseKey(key):
+        pass
+
+    for func in (ConnectRegistry, OpenKey, QueryValueEx, SetValueEx, EnumValue, CloseKey):
+        setattr(module, func.__name__, func)
+    return module
+
+
+# --- 가짜 ctypes.windll ---
+class _FakeDll:
+    def __init__(self, **functions):
+        self.__dict__.update(functions)
+
+
+def _make_windll(counters):
+    def counted(name, result):
+        def func(*args):
+            counters[name] = counters.get(name, 0) + 1
+            return result
+
+        return func
+
+    return _FakeDll(
+        shell32=_FakeDll(
+            IsUserAnAdmin=counted("IsUserAnAdmin", 1),
+            ShellExecuteW=counted("ShellExecuteW", 42),
+        ),
+        user32=_FakeDll(SendMessageTimeoutW=counted("SendMessageTimeoutW", 1)),
+        kernel32=_FakeDll(GetLastError=counted("GetLastError", 0)),
+    )
+
+
+class FakeWindows:
+    """install()이 돌려주는 핸들: registry, windll 호출 횟수, uninstall()."""
+
+    def __init__(self, registry, windll_calls, restore):
+        self.registry = registry
+        self.windll_calls = windll_calls
+        self._restore = restore
+
+    def uninstall(self):
+        self._restore()
+
+
+def install(registry=None, force=False):
+    """가짜 winreg/ctypes.windll을 설치합니다. Windows에서는 force=True일 때만 바꿉니다."""
+    registry = registry or FakeRegistry()
+    windll_calls = {}
+    if os.name == "nt" and not force:
+        return FakeWindows(registry, windll_calls, lambda: None)
+
+    saved_winreg = sys.modules.get("winreg")
+    saved = {name: getattr(ctypes, name, None) for name in ("windll", "get_last_error")}
+    sys.modules["winreg"] = _make_winreg_module(registry)
+    ctypes.windll = _make_windll(windll_calls)
+    ctypes.get_last_error = lambda: 0
+
+    def restore():
+        if saved_winreg is None:
+            sys.modules.pop("winreg", None)
+        else:
+            sys.modules["winreg"] = saved_winreg
+        for name, value in saved.items():
+            if value is None:
+                if hasattr(ctypes, name):
+                    delattr(ctypes, name)
+            else:
+                setattr(ctypes, name, value)
+
+    return FakeWindows(registry, windll_calls, restore)
+
+
+# --- 가짜 외부 도구 ---
+FAKE_TOOLS = {
+    "winget": "echo 'Found an existing package already installed.'",
+    "code": 'if [ "$1" = "--list-extensions" ]; then echo ms-python.python@2025.4.0; fi',
+    "pwsh": "echo C:/Users/bench/Documents/PowerShell/Microsoft.PowerShell_profile.ps1",
+    "pacman": "exit 0",
+}
+
+
+def make_fake_tools(directory, tools=None):
+    """directory에 즉시 끝나는 도구 스크립트를 만들고 directory를 반환합니다 (PATH 앞에 두어 사용)."""
+    os.makedirs(directory, exist_ok=True)
+    for name, body in (tools or FAKE_TOOLS).items():
+        path = os.path.join(directory, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"#!/bin/sh\n{body}\n")
+        os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return directory
@@ -0,0 +1,159 @@
+# command_runner.py (stdout/stderr 동시 스트리밍 명령 실행기)
+#
+# 화면 출력은 console_output의 콘솔로 보냅니다. 콘솔 쓰기는 렌더러 스레드가 모아서 하므로
+# 출력이 많은 명령도 콘솔 때문에 느려지거나 멈추지 않습니다.
+
+import collections
+import os
+import queue
+import subprocess
+import threading
+
+from console_output import get_console
+from step_trace import trace_span, CATEGORY_SUBPROCESS
+
+# --- 상수 ---
+DEFAULT_MAX_CAPTURED_LINES = 10000  # 캡처할 최대 줄 수 (초과분은 오래된 줄부터 버림)
+READ_CHUNK_SIZE = 1024 * 64  # 파이프에서 한 번에 읽을 최대 바이트
+QUEUE_MAX_BATCHES = 256  # 리더 스레드와 소비자 사이의 대기열 크기 (역압 용도)
+
+STDOUT = "stdout"
+STDERR = "stderr"
+
+
+class CommandResult:
+    def __init__(self, returncode, stdout_lines, stderr_lines, spool_path=None):
+        self.returncode = returncode
+        self.stdout_lines = stdout_lines  # 마지막 N줄 (collections.deque)
+        self.stderr_lines = stderr_lines
+        self.spool_path = spool_path  # 전체 출력이 저장된 파일 (요청 시)
+
+    @property
+    def stdout(self):
+        return "\n".join(self.stdout_lines)
+
+    @property
+    def stderr(self):
+        return "\n".join(self.stderr_lines)
+
+
+def _pump(pipe, stream_name, out_queue):
+    """
+    파이프를 읽어 완성된 줄 묶음을 (스트림 이름, [줄...])로 대기열에 넣습니다.
+    read1은 이미 도착한 데이터만 돌려주므로 출력이 지연되지 않습니다.
+    """
+    pending = []  # 아직 줄바꿈이 오지 않은 조각들 (긴 줄도 새 조각만 나누도록 이어 붙이지 않음)
+    try:
+        while True:
+            data = pipe.read1(READ_CHUNK_SIZE)
+            if not data:
+                break
+            lines = data.split(b"\n")
+            if len(lines) == 1:
+                pending.append(data)
+                continue
+            if pending:
+                pending.append(lines[0])
+                lines[0] = b"".join(pending)
+            tail = lines.pop()
+            pending = [tail] if tail else []
+            out_queue.put((stream_name, lines))
+        if pending:
+            out_queue.put((stream_name, [b"".join(pending)]))
+    finally:
+        pipe.close()
+        out_queue.put((stream_name, None))  # 스트림 종료 표시
+
+
+def run_streaming(
+    command_list,
+    shell=False,
+    cwd=None,
+    env=None,
+    echo=True,
+    capture=False,
+    max_captured_lines=DEFAULT_MAX_CAPTURED_LINES,
+    spool_path=None,
+    on_line=None,
+    label=None,
+):
+    """
+    명령을 실행하고 stdout/stderr를 별도 스레드에서 동시에 읽습니다.
+    한쪽 파이프가 가득 차 자식 프로세스가 멈추는 교착 상태가 생기지 않으며,
+    두 스트림의 줄은 도착한 순서대로 출력됩니다.
+    echo: 줄을 콘솔(console_output.get_console())로 보냅니다. 터미널에서는 명령마다 마지막 몇 줄만
+          제자리에서 갱신되고, 단계 로그가 켜져 있으면 전체 출력이 압축 로그에 남습니다.
+    capture: 스트림별로 마지막 max_captured_lines 줄만 보관합니다 (메모리 상한).
+    spool_path: 주어지면 전체 출력을 이 파일에 기록합니다 (stderr 줄은 'stderr: ' 접두사).
+    on_line: 줄마다 on_line(스트림 이름, 줄)을 호출합니다.
+    label: 콘솔과 로그에 표시할 이름 (기본: 명령줄)
+    FileNotFoundError 등 프로세스 시작 오류는 호출자에게 그대로 전달됩니다.
+    """
+    out_queue = queue.Queue(maxsize=QUEUE_MAX_BATCHES)
+    captured = {
+        STDOUT: collections.deque(maxlen=max_captured_lines if capture else 0),
+        STDERR: collections.deque(maxlen=max_captured_lines if capture else 0),
+    }
+
+    command_name = command_list[0] if isinstance(command_list, list) else command_list.split()[0]
+    with trace_span(os.path.basename(command_name), CATEGORY_SUBPROCESS) as span:
+        process = subprocess.Popen(
+            command_list,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            shell=shell,
+            cwd=cwd,
+            env=env,
+        )
+        readers = [
+            threading.Thread(target=_pump, args=(process.stdout, STDOUT, out_queue), daemon=True),
+            threading.Thread(target=_pump, args=(process.stderr, STDERR, out_queue), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+
+        view = None
+        if echo:
+            if label is None:
+                label = subprocess.list2cmdline(command_list) if isinstance(command_list, list) else command_list
+            view = get_console().begin(label)
+        spool = open(spool_path, "w", encoding="utf-8") if spool_path else None
+        open_streams = 2
+        output_bytes = 0
+        try:
+            while open_streams:
+                stream_name, raw_lines = out_queue.get()
+                if raw_lines is None:
+                    open_streams -= 1
+                    continue
+                output_bytes += sum(map(len, raw_lines)) + len(raw_lines)
+                lines = [raw_line.decode("utf-8", errors="replace").rstrip("\r\n") for raw_line in raw_lines]
+                if view is not None:
+                    view.add(lines, stderr=stream_name == STDERR)  # 메모리에 넣고 바로 돌아옴
+                if capture:
+                    captured[stream_name].extend(line.strip() for line in lines)
+                if spool is not None:
+                    prefix = "stderr: " if stream_name == STDERR else ""
+                    spool.write("".join(f"{prefix}{line}\n" for line in lines))
+                if on_line is not None:
+                    for line in lines:
+                        on_line(stream_name, line)
+        except BaseException:
+            # 중단(Ctrl+C 등) 시 자식을 종료하고, 리더 스레드가 대기열에서 막히지 않도록 비움
+            process.kill()
+            while open_streams:
+                if out_queue.get()[1] is None:
+                    open_streams -= 1
+            raise
+        finally:
+            if spool is not None:
+                spool.close()
+            for reader in readers:
+                reader.join()
+            process.wait()
+            if view is not None:
+                view.finish(process.returncode)
+        span.args["exit_code"] = process.returncode
+        span.args["output_bytes"] = output_bytes
+
+    return CommandResult(process.returncode, captured[STDOUT], captured[STDERR], spool_path)
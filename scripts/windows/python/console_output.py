@@ -0,0 +1,446 @@
+# console_output.py (하위 프로세스 출력 렌더러와 단계별 압축 로그)
+#
+# 줄마다 print/flush 하면 pacman -Syu, pip처럼 수천 줄을 내는 명령에서 Windows 콘솔 쓰기가
+# 눈에 띄게 느려지고, 콘솔이 멈추면(빠른 편집 모드에서 선택 중 등) 명령 실행까지 멈춥니다.
+# 명령 출력은 get_console()로 얻은 하나의 콘솔을 거칩니다.
+#   - 실행기 스레드는 줄을 메모리에 넣기만 하고 바로 돌아갑니다 (콘솔 쓰기로 막히지 않음).
+#   - 렌더러 스레드가 refresh_interval마다 모아서 한 번에 씁니다.
+#       live  (터미널): 실행 중인 명령마다 마지막 N줄만 제자리에서 다시 그리고,
+#                       끝난 명령은 요약 한 줄(실패 시 마지막 N줄 포함)을 위에 남깁니다.
+#       plain (리디렉션/CI): 모든 줄을 묶어서 씁니다. 콘솔이 따라오지 못하면
+#                       오래된 줄부터 버리고 버린 줄 수를 알립니다.
+#   - log_dir이 지정되면 단계별 전체 출력을 압축 로그(<단계>.log.zst, zstd가 없으면 .log.gz)에 남깁니다.
+# 렌더러가 도는 동안 sys.stdout(live에서는 sys.stderr도)을 콘솔 경유로 바꾸어
+# 다른 print()나 tqdm 진행률과 섞여도 화면이 깨지지 않도록 합니다.
+#
+# 환경 변수 (get_console()이 처음 만들 때 읽음):
+#   SETUP_CONSOLE=live|plain      (기본: 터미널이면 live, 아니면 plain)
+#   SETUP_CONSOLE_TAIL=8          live에서 명령마다 보여줄 줄 수
+#   SETUP_CONSOLE_REFRESH=0.1     다시 그리는 간격 (초)
+
+import collections
+import contextlib
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+import unicodedata
+
+MODE_LIVE = "live"
+MODE_PLAIN = "plain"
+
+# --- 상수 ---
+DEFAULT_TAIL_LINES = 8
+DEFAULT_REFRESH_INTERVAL = 0.1
+MAX_PENDING_LINES = 50000  # 아직 쓰지 못한 줄의 상한 (넘으면 오래된 줄부터 버림)
+LOG_GZIP_LEVEL = 3  # zstd가 없을 때 gzip 압축 수준 (로그는 반복이 많아 낮은 수준으로도 충분)
+DEFAULT_LOG_NAME = "setup"  # 단계 밖에서 실행한 명령의 로그 이름
+ENABLE_VIRTUAL_TERMINAL_PROCESSING = 0x0004
+
+ENV_CONSOLE = "SETUP_CONSOLE"
+ENV_TAIL_LINES = "SETUP_CONSOLE_TAIL"
+ENV_REFRESH_INTERVAL = "SETUP_CONSOLE_REFRESH"
+
+_CONTROL_CHARS = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]|[\x00-\x08\x0b-\x1f\x7f]")
+
+
+# --- 화면 한 줄 맞추기 ---
+def _clean(text):
+    """다시 그리는 영역에 넣을 줄: 색상 코드/제어 문자 제거, 탭은 공백으로."""
+    return _CONTROL_CHARS.sub("", text.expandtabs(4))
+
+
+def _fit(text, width):
+    """
+    터미널 한 줄에 들어가도록 자릅니다 (동아시아 전각 문자는 2칸).
+    줄이 넘쳐 감기면 다음에 다시 그릴 위치가 어긋납니다.
+    """
+    if len(text) * 2 < width:
+        return text
+    used = 0
+    for index, char in enumerate(text):
+        used += 2 if unicodedata.east_asian_width(char) in "WF" else 1
+        if used >= width:
+            return text[:index]
+    return text
+
+
+def _enable_vt_mode(stream):
+    """Windows 콘솔에서 ANSI 제어 문자를 켭니다 (Windows 10 이상). 실패하면 False (plain으로 동작)."""
+    if os.name != "nt":
+        return True
+    try:
+        import ctypes
+        import msvcrt
+
+        kernel32 = ctypes.windll.kernel32
+        handle = msvcrt.get_osfhandle(stream.fileno())
+        mode = ctypes.c_uint32()
+        if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            return False
+        return bool(kernel32.SetConsoleMode(handle, mode.value | ENABLE_VIRTUAL_TERMINAL_PROCESSING))
+    except Exception:
+        return False
+
+
+# --- 압축 로그 ---
+def open_compressed_log(path_base):
+    """
+    path_base + 확장자로 압축 텍스트 파일을 이어 쓰기로 엽니다. (파일, 경로)를 반환합니다.
+    zstd(파이썬 3.14의 compression.zstd 또는 zstandard 패키지)가 있으면 .zst, 없으면 .gz.
+    이어 쓰면 프레임(gzip은 멤버)이 뒤에 붙으며, zstd -d / zcat으로 한 번에 풀립니다.
+    """
+    try:
+        from compression import zstd
+
+        path = path_base + ".zst"
+        return zstd.open(path, "at", encoding="utf-8", errors="replace"), path
+    except ImportError:
+        pass
+    try:
+        import io
+        import zstandard
+
+        path = path_base + ".zst"
+        writer = zstandard.ZstdCompressor().stream_writer(open(path, "ab"))
+        return io.TextIOWrapper(writer, encoding="utf-8", errors="replace"), path
+    except ImportError:
+        pass
+    import gzip
+
+    path = path_base + ".gz"
+    return gzip.open(path, "at", compresslevel=LOG_GZIP_LEVEL, encoding="utf-8", errors="replace"), path
+
+
+class StepLog:
+    """단계 하나의 전체 출력 로그. 한 단계 안의 여러 스레드가 함께 써도 되도록 잠급니다."""
+
+    def __init__(self, path_base):
+        self.file, self.path = open_compressed_log(path_base)
+        self.lock = threading.Lock()
+
+    def write(self, text):
+        with self.lock:
+            self.file.write(text)
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+
+# --- 단계 이름 (스레드별) ---
+_step_local = threading.local()
+
+
+@contextlib.contextmanager
+def step_context(name):
+    """이 스레드에서 실행하는 명령의 출력을 name 단계의 로그에 남깁니다 (StepScheduler가 사용)."""
+    previous = getattr(_step_local, "name", None)
+    _step_local.name = name
+    try:
+        yield
+    finally:
+        _step_local.name = previous
+
+
+def current_step():
+    return getattr(_step_local, "name", None)
+
+
+# --- 명령별 출력 ---
+class CommandView:
+    """
+    실행 중인 명령 하나의 출력 (Console.begin()이 반환).
+    add()는 로그에 쓰고 메모리에 넣기만 하므로 콘솔 상태와 관계없이 바로 돌아옵니다.
+    """
+
+    def __init__(self, console, label, log):
+        self.console = console
+        self.label = label
+        self.title = " ".join(label.split())  # 화면용 한 줄 (python -c 같은 여러 줄 명령)
+        self.log = log
+        self.tail = collections.deque(maxlen=console.tail_lines)
+        self.line_count = 0
+        self.started = time.monotonic()
+        self.returncode = None
+
+    def add(self, lines, stderr=False):
+        if self.log is not None:
+            prefix = "stderr: " if stderr else ""
+            self.log.write("".join(f"{prefix}{line}\n" for line in lines))
+        self.console._add_lines(self, lines)
+
+    def finish(self, returncode):
+        self.returncode = returncode
+        if self.log is not None:
+            self.log.write(
+                f"[종료 코드 {returncode}, {self.line_count}줄, {time.monotonic() - self.started:.1f}초]\n\n"
+            )
+        self.console._finish(self)
+
+
+class _ConsoleStream:
+    """렌더러가 도는 동안 sys.stdout/sys.stderr 자리에 두는 스트림. 쓰기는 콘솔 대기열로 갑니다."""
+
+    def __init__(self, console, key, original):
+        self.console = console
+        self.key = key
+        self.original = original
+
+    def write(self, text):
+        self.console.write_text(self.key, text)
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def writable(self):
+        return True
+
+    def isatty(self):
+        return self.original.isatty()
+
+    def __getattr__(self, name):  # encoding, fileno 등은 원래 스트림 것
+        return getattr(self.original, name)
+
+
+# --- 콘솔 ---
+class Console:
+    """
+    mode: MODE_LIVE, MODE_PLAIN 또는 None (렌더러를 시작할 때 stdout이 터미널이면 live)
+    tail_lines: live에서 명령마다 보여줄 마지막 줄 수
+    refresh_interval: 렌더러가 다시 그리는 간격 (초)
+    log_dir: 단계별 압축 로그를 남길 디렉터리 (None이면 남기지 않음)
+    렌더러 스레드는 실행 중인 명령이나 session()이 있는 동안만 돕니다.
+    """
+
+    def __init__(
+        self,
+        mode=None,
+        tail_lines=DEFAULT_TAIL_LINES,
+        refresh_interval=DEFAULT_REFRESH_INTERVAL,
+        log_dir=None,
+        max_pending_lines=MAX_PENDING_LINES,
+    ):
+        self.mode = mode
+        self.tail_lines = tail_lines
+        self.refresh_interval = refresh_interval
+        self.log_dir = log_dir
+        self.lock = threading.Lock()  # 대기열/명령 목록 (짧게만 잡음, 잡은 채로 쓰지 않음)
+        self.state_lock = threading.Lock()  # 렌더러 시작/정지
+        self.users = 0
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.live = False
+        self.stream = None  # 렌더러가 실제로 쓰는 스트림
+        self.saved_streams = None
+        self.active = []  # 실행 중인 CommandView (시작 순서)
+        self.pending = collections.deque(maxlen=max_pending_lines)  # 위에 남길 줄
+        self.partial = {}  # 스트림 -> 줄바꿈 전 텍스트 (tqdm 진행률 등)
+        self.dropped = 0
+        self.region_height = 0  # live에서 마지막으로 그린 영역의 줄 수
+        self.last_region = []
+        self.logs = {}  # 단계 이름 -> StepLog
+        self.log_paths = {}  # 단계 이름 -> 로그 경로 (닫은 뒤에도 유지)
+        self.stats = {"lines": 0, "frames": 0, "dropped": 0}
+
+    # --- 실행기 쪽 (막히지 않음) ---
+    def begin(self, label, step=None):
+        """명령 하나의 출력을 시작합니다. step을 생략하면 현재 스레드의 단계(step_context) 로그에 남깁니다."""
+        self._acquire()
+        log = self._step_log(step or current_step()) if self.log_dir else None
+        if log is not None:
+            log.write(f"$ {label}\n[시작 {time.strftime('%Y-%m-%d %H:%M:%S')}]\n")
+        view = CommandView(self, label, log)
+        with self.lock:
+            self.active.append(view)
+        return view
+
+    def _add_lines(self, view, lines):
+        with self.lock:
+            view.line_count += len(lines)
+            self.stats["lines"] += len(lines)
+            view.tail.extend(lines)
+            if not self.live:
+                self._queue(lines)
+
+    def _finish(self, view):
+        with self.lock:
+            self.active.remove(view)
+            if self.live:
+                status = "완료" if view.returncode == 0 else f"실패 (종료 코드 {view.returncode})"
+                summary = f"[{status}] {view.title} ({view.line_count}줄, {time.monotonic() - view.started:.1f}초)"
+                if view.log is not None:
+                    summary += f" 로그: {view.log.path}"
+                self._queue([summary])
+                if view.returncode != 0:
+                    self._queue([f"  {line}" for line in view.tail])
+        self._release()
+
+    def write_text(self, key, text):
+        """print()/tqdm 출력. 완성된 줄은 대기열로, 줄바꿈 전 텍스트는 live 영역의 상태 줄로."""
+        with self.lock:
+            *lines, rest = (self.partial.get(key, "") + text).split("\n")
+            if lines:
+                self._queue([line.rstrip("\r").rsplit("\r", 1)[-1] for line in lines])
+            self.partial[key] = rest
+
+    def _queue(self, lines):
+        overflow = len(self.pending) + len(lines) - self.pending.maxlen
+        if overflow > 0:
+            self.dropped += overflow
+        self.pending.extend(lines)
+
+    # --- 단계 로그 ---
+    def _step_log(self, step):
+        name = re.sub(r"[^\w.-]", "_", step or DEFAULT_LOG_NAME)
+        with self.lock:
+            log = self.logs.get(name)
+            if log is None:
+                os.makedirs(self.log_dir, exist_ok=True)
+                log = self.logs[name] = StepLog(os.path.join(self.log_dir, f"{name}.log"))
+                self.log_paths[name] = log.path
+            return log
+
+    def _close_logs(self):
+        with self.lock:
+            logs, self.logs = list(self.logs.values()), {}
+        for log in logs:
+            log.close()
+
+    # --- 렌더러 시작/정지 ---
+    @contextlib.contextmanager
+    def session(self, log_dir=None):
+        """with 블록 동안 렌더러를 유지합니다. log_dir이 주어지면 단계별 로그를 그 디렉터리에 남깁니다."""
+        if log_dir:
+            self.log_dir = log_dir
+        self._acquire()
+        try:
+            yield self
+        finally:
+            self._release()
+
+    def _acquire(self):
+        with self.state_lock:
+            self.users += 1
+            if self.users == 1:
+                self._start()
+
+    def _release(self):
+        with self.state_lock:
+            self.users -= 1
+            if self.users == 0:
+                self._stop()
+
+    def _start(self):
+        self.stream = sys.stdout
+        mode = self.mode
+        if mode is None:
+            mode = MODE_LIVE if self.stream.isatty() else MODE_PLAIN
+        self.live = mode == MODE_LIVE and _enable_vt_mode(self.stream)
+        self.region_height = 0
+        self.last_region = []
+        self.saved_streams = (sys.stdout, sys.stderr)
+        sys.stdout = _ConsoleStream(self, "stdout", sys.stdout)
+        if self.live:
+            sys.stderr = _ConsoleStream(self, "stderr", sys.stderr)
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name="console-renderer", daemon=True)
+        self.thread.start()
+
+    def _stop(self):
+        self.stop_event.set()
+        self.thread.join()
+        self.thread = None
+        # 그 사이 다른 코드가 바꿔 둔 스트림(contextlib.redirect_stdout 등)은 건드리지 않음
+        if isinstance(sys.stdout, _ConsoleStream) and sys.stdout.console is self:
+            sys.stdout = self.saved_streams[0]
+        if isinstance(sys.stderr, _ConsoleStream) and sys.stderr.console is self:
+            sys.stderr = self.saved_streams[1]
+        self._close_logs()
+
+    # --- 렌더러 스레드 ---
+    def _run(self):
+        while not self.stop_event.wait(self.refresh_interval):
+            self._render()
+        self._render(final=True)
+
+    def _region(self, width, height):
+        """live에서 제자리에 다시 그릴 줄: 명령마다 제목과 마지막 N줄, 그리고 진행률 같은 줄바꿈 전 텍스트."""
+        now = time.monotonic()
+        rows = []
+        for view in self.active:
+            rows.append(_fit(f"[실행 중] {_clean(view.title)} ({view.line_count}줄, {now - view.started:.0f}초)", width))
+            rows.extend(_fit("  " + _clean(line), width) for line in view.tail)
+        for text in self.partial.values():
+            text = _clean(text.rsplit("\r", 1)[-1])
+            if text.strip():
+                rows.append(_fit(text, width))
+        return rows[-(height - 1) :] if len(rows) >= height else rows
+
+    def _render(self, final=False):
+        size = shutil.get_terminal_size() if self.live else None
+        with self.lock:
+            lines = list(self.pending)
+            self.pending.clear()
+            dropped, self.dropped = self.dropped, 0
+            if final:
+                lines += [text.rsplit("\r", 1)[-1] for text in self.partial.values() if text]
+                self.partial.clear()
+            region = self._region(size.columns, size.lines) if self.live and not final else []
+        if not lines and not dropped and region == self.last_region:
+            return
+
+        out = []
+        if self.region_height:
+            out.append(f"\x1b[{self.region_height}F\x1b[J")  # 지난 영역의 첫 줄로 올라가 아래를 지움
+        if dropped:
+            self.stats["dropped"] += dropped
+            out.append(f"... 출력 {dropped}줄 생략 (콘솔이 따라오지 못함, 전체 출력은 단계 로그 참고)\n")
+        out.extend(f"{line}\n" for line in lines)
+        out.extend(f"{row}\n" for row in region)
+        try:
+            self.stream.write("".join(out))
+            self.stream.flush()
+        except (OSError, ValueError):
+            pass  # 콘솔이 닫혀도 명령 실행은 계속
+        self.stats["frames"] += 1
+        self.region_height = len(region)
+        self.last_region = region
+
+
+def _float_from_env(name, default):
+    value = os.environ.get(name, "").strip()
+    return float(value) if value else default
+
+
+def console_from_env():
+    """환경 변수(SETUP_CONSOLE 등)로 콘솔을 만듭니다."""
+    mode = os.environ.get(ENV_CONSOLE, "").strip().lower() or None
+    return Console(
+        mode=mode if mode in (MODE_LIVE, MODE_PLAIN) else None,
+        tail_lines=int(_float_from_env(ENV_TAIL_LINES, DEFAULT_TAIL_LINES)),
+        refresh_interval=_float_from_env(ENV_REFRESH_INTERVAL, DEFAULT_REFRESH_INTERVAL),
+    )
+
+
+_console = None
+_console_lock = threading.Lock()
+
+
+def get_console():
+    global _console
+    with _console_lock:
+        if _console is None:
+            _console = console_from_env()
+        return _console
+
+
+def set_console(console):
+    """전역 콘솔을 바꿉니다 (시험/벤치마크용). 이전 콘솔을 반환합니다."""
+    global _console
+    with _console_lock:
+        previous, _console = _console, console
+        return previous
@@ -0,0 +1,447 @@
+# download_engine.py (멀티 커넥션, 이어받기 지원 다운로드 엔진)
+
+import contextlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests  # HTTP 요청
+import urllib3  # requests가 사용하는 HTTP 라이브러리 (본문을 직접 읽을 때의 예외)
+from tqdm import tqdm  # 진행률 표시
+
+from net_governor import get_governor, host_of, PRIORITY_NORMAL
+from step_trace import trace_span, traced_sleep, CATEGORY_DOWNLOAD
+
+# --- 상수 ---
+DEFAULT_CONNECTIONS = 4  # 동시 Range 요청 수
+DEFAULT_TIMEOUT = (10, 30)  # (연결, 읽기) 타임아웃 (초)
+DEFAULT_CHUNK_SIZE = 1024 * 256  # 스트림 읽기 시작 단위 (256KB), 빠른 연결에서는 MAX_CHUNK_SIZE까지 커짐
+MAX_CHUNK_SIZE = 1024 * 1024 * 8  # 스트림 읽기 최대 단위 (8MB)
+TARGET_READ_TIME = 0.05  # 읽기 한 번에 걸리는 시간의 목표 (초), 이에 맞춰 읽기 단위를 조정
+PROGRESS_INTERVAL = 0.2  # 진행률 표시 갱신 최소 간격 (초)
+MIN_SEGMENT_SIZE = 1024 * 1024  # 세그먼트 최소 크기 (1MB), 작은 파일은 분할하지 않음
+MAX_RETRIES = 5  # 세그먼트당 재시도 횟수
+RETRY_BACKOFF = 0.5  # 첫 재시도 전 대기 시간 (초), 재시도마다 두 배
+MAX_RETRY_BACKOFF = 8.0  # 재시도 전 최대 대기 시간 (초)
+STATE_SAVE_INTERVAL = 1024 * 1024 * 4  # 상태 파일 저장 주기 (4MB 수신마다)
+
+PART_SUFFIX = ".part"  # 받는 중인 데이터 파일
+STATE_SUFFIX = ".part.json"  # 이어받기 상태 파일
+
+
+class DownloadError(Exception):
+    """다운로드를 완료할 수 없을 때 발생합니다."""
+
+
+# --- 서버 정보 확인 ---
+def probe_url(url, timeout=DEFAULT_TIMEOUT, session=None):
+    """
+    서버에 1바이트 Range 요청을 보내 파일 크기, Range 지원 여부, 검증자(ETag 등)를 확인합니다.
+    HEAD를 막아 둔 서버가 있으므로 GET + Range: bytes=0-0 을 사용합니다.
+    반환값: {"url", "total_size", "accept_ranges", "validator"}
+    """
+    http = session or requests
+    response = http.get(
+        url, headers={"Range": "bytes=0-0"}, stream=True, timeout=timeout
+    )
+    try:
+        response.raise_for_status()
+        total_size = None
+        accept_ranges = False
+        if response.status_code == 206:
+            # Content-Range: bytes 0-0/12345
+            content_range = response.headers.get("content-range", "")
+            _, _, total = content_range.partition("/")
+            if total.strip().isdigit():
+                total_size = int(total)
+                accept_ranges = True
+        else:
+            # Range를 무시하고 전체 본문을 주는 서버
+            length = response.headers.get("content-length")
+            if length and length.isdigit():
+                total_size = int(length)
+
+        validator = response.headers.get("etag") or response.headers.get(
+            "last-modified"
+        )
+        return {
+            "url": response.url,  # 리다이렉트 후 최종 URL (GitHub 릴리스 등)
+            "total_size": total_size,
+            "accept_ranges": accept_ranges,
+            "validator": validator,
+        }
+    finally:
+        response.close()
+
+
+# --- 이어받기 상태 파일 ---
+def _split_segments(total_size, connections):
+    """파일을 connections개의 [start, end] (end 포함) 구간으로 나눕니다."""
+    count = max(1, min(connections, total_size // MIN_SEGMENT_SIZE))
+    base = total_size // count
+    segments = []
+    start = 0
+    for i in range(count):
+        end = total_size - 1 if i == count - 1 else start + base - 1
+        segments.append({"start": start, "end": end, "done": 0})
+        start = end + 1
+    return segments
+
+
+def _load_state(state_path, url, info):
+    """기존 상태 파일이 같은 파일을 가리키면 읽어 오고, 아니면 None을 반환합니다."""
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if (
+        state.get("url") != url
+        or state.get("total_size") != info["total_size"]
+        or state.get("validator") != info["validator"]
+    ):
+        return None
+    return state
+
+
+def _save_state(state_path, state):
+    """상태 파일을 원자적으로 저장합니다 (임시 파일 작성 후 교체)."""
+    tmp_path = state_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, state_path)
+
+
+def _preallocate(part_path, total_size):
+    """데이터 파일을 전체 크기로 미리 할당합니다 (이미 있으면 유지)."""
+    mode = "r+b" if os.path.exists(part_path) else "wb"
+    with open(part_path, mode) as f:
+        f.truncate(total_size)
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+# --- 스트림 쓰기 경로 ---
+class _BodyReader:
+    """
+    urllib3 응답 본문을 readinto(버퍼)로 읽는 어댑터.
+    urllib3의 read(n)/readinto는 n바이트를 채울 때까지 기다리고, 그 사이 연결이 끊기면 이미 받은
+    데이터까지 버리고 예외를 던집니다. read1은 도착한 만큼만 돌려주므로 끊기기 전까지 받은 데이터는
+    기록되어 이어받기에 쓰입니다. gzip 등 압축 인코딩은 urllib3가 풀어서 전달합니다.
+    """
+
+    def __init__(self, raw):
+        raw.decode_content = True
+        self._read = getattr(raw, "read1", raw.read)  # read1은 urllib3 2.0부터
+
+    def readinto(self, view):
+        data = self._read(len(view))
+        view[: len(data)] = data
+        return len(data)
+
+
+def _body_reader(response):
+    return _BodyReader(response.raw)
+
+
+class _AdaptiveBuffer:
+    """
+    다시 쓰는 읽기 버퍼. 읽기가 버퍼를 가득 채우면서 빨리 끝나면(빠른 연결) 크기를 두 배로,
+    TARGET_READ_TIME보다 한참 오래 걸리면 절반으로 조정합니다 (initial ~ maximum).
+    """
+
+    def __init__(self, initial=DEFAULT_CHUNK_SIZE, maximum=MAX_CHUNK_SIZE):
+        self.maximum = max(initial, maximum)
+        self.minimum = initial
+        self.size = initial
+        self._buffer = bytearray(initial)
+
+    def view(self, limit=None):
+        size = self.size if limit is None else min(self.size, limit)
+        return memoryview(self._buffer)[:size]
+
+    def adjust(self, received, requested, elapsed):
+        if received == requested and elapsed < TARGET_READ_TIME / 2 and self.size < self.maximum:
+            self.size = min(self.size * 2, self.maximum)
+        elif elapsed > TARGET_READ_TIME * 4 and self.size > self.minimum:
+            self.size = max(self.size // 2, self.minimum)
+        if self.size > len(self._buffer):
+            # 커질 때만 새로 할당 (로그 단계이므로 다운로드당 몇 번뿐)
+            self._buffer = bytearray(self.size)
+
+
+def _copy_stream(
+    response, f, limit, on_data, chunk_size=DEFAULT_CHUNK_SIZE, governor=None, priority=PRIORITY_NORMAL
+):
+    """
+    응답 본문을 재사용 버퍼로 읽어 파일 f에 씁니다. 받은 조각마다 on_data(memoryview)를 호출합니다.
+    limit: 최대로 읽을 바이트 수 (None이면 끝까지)
+    governor: 주어지면 받은 만큼 속도 제한에 맞춰 기다립니다 (읽기 단위도 허가 크기로 제한)
+    반환값: 기록한 바이트 수
+    """
+    reader = _body_reader(response)
+    buffer = _AdaptiveBuffer(chunk_size)
+    grant = governor.grant_size() if governor is not None else None
+    written = 0
+    while limit is None or written < limit:
+        want = None if limit is None else limit - written
+        if grant is not None:
+            want = grant if want is None else min(want, grant)
+        view = buffer.view(want)
+        started = time.perf_counter()
+        received = reader.readinto(view)
+        elapsed = time.perf_counter() - started
+        if not received:
+            break
+        data = view[:received]
+        pending = data
+        while pending:  # 버퍼링 없는 파일은 일부만 쓸 수 있음
+            pending = pending[f.write(pending):]
+        written += received
+        on_data(data)
+        buffer.adjust(received, len(view), elapsed)
+        if governor is not None:
+            governor.throttle(received, priority)
+    return written
+
+
+class _ThrottledProgress:
+    """진행률 표시(tqdm) 갱신을 모아서 PROGRESS_INTERVAL마다 한 번만 전달합니다."""
+
+    def __init__(self, bar, interval=PROGRESS_INTERVAL, clock=time.monotonic):
+        self.bar = bar
+        self.interval = interval
+        self.clock = clock
+        self.pending = 0
+        self.last_flush = clock()
+
+    def update(self, size):
+        self.pending += size
+        now = self.clock()
+        if now - self.last_flush >= self.interval:
+            self.last_flush = now
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            self.bar.update(self.pending)
+            self.pending = 0
+
+
+# --- 다운로드 작업 ---
+class _RangeDownload:
+    """여러 Range 세그먼트를 병렬로 받아 미리 할당한 파일에 기록합니다."""
+
+    def __init__(
+        self, url, part_path, state_path, state, timeout, chunk_size, bar, governor=None, priority=PRIORITY_NORMAL
+    ):
+        self.url = url
+        self.part_path = part_path
+        self.state_path = state_path
+        self.state = state
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.bar = bar
+        self.governor = governor
+        self.priority = priority
+        self.lock = threading.Lock()
+        self.unsaved_bytes = 0
+
+    def _advance(self, segment, size):
+        with self.lock:
+            segment["done"] += size
+            self.unsaved_bytes += size
+            if self.bar is not None:
+                self.bar.update(size)
+            if self.unsaved_bytes >= STATE_SAVE_INTERVAL:
+                self.unsaved_bytes = 0
+                _save_state(self.state_path, self.state)
+
+    def _fetch_segment(self, segment):
+        last_error = None
+        for attempt in range(MAX_RETRIES):
+            offset = segment["start"] + segment["done"]
+            if offset > segment["end"]:
+                return
+            if attempt:
+                # 서버/네트워크가 회복할 시간을 두고 재시도 (지수 백오프)
+                traced_sleep(min(RETRY_BACKOFF * 2 ** (attempt - 1), MAX_RETRY_BACKOFF), "download-retry")
+            try:
+                with _connection(self.governor, self.url, self.priority), requests.get(
+                    self.url,
+                    headers={"Range": f"bytes={offset}-{segment['end']}"},
+                    stream=True,
+                    timeout=self.timeout,
+                ) as response:
+                    response.raise_for_status()
+                    if response.status_code != 206:
+                        raise DownloadError(
+                            f"서버가 Range 요청을 처리하지 않았습니다 (상태 코드: {response.status_code})"
+                        )
+                    with open(self.part_path, "r+b", buffering=0) as f:
+                        f.seek(offset)
+                        _copy_stream(
+                            response,
+                            f,
+                            segment["end"] - offset + 1,
+                            lambda data: self._advance(segment, len(data)),
+                            self.chunk_size,
+                            self.governor,
+                            self.priority,
+                        )
+                if segment["start"] + segment["done"] > segment["end"]:
+                    return
+            except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError, OSError) as e:
+                last_error = e
+        raise DownloadError(
+            f"세그먼트 {segment['start']}-{segment['end']} 다운로드 실패: {last_error}"
+        )
+
+    def run(self, connections):
+        pending = [
+            s for s in self.state["segments"] if s["start"] + s["done"] <= s["end"]
+        ]
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, connections)) as executor:
+                for future in [executor.submit(self._fetch_segment, s) for s in pending]:
+                    future.result()
+        finally:
+            # 실패하더라도 진행 상태는 남겨 다음 실행에서 이어받음
+            with self.lock:
+                _save_state(self.state_path, self.state)
+
+
+def _connection(governor, url, priority):
+    """조절기가 있으면 url 호스트의 연결 슬롯을, 없으면 아무것도 하지 않는 컨텍스트."""
+    if governor is None:
+        return contextlib.nullcontext()
+    return governor.connection(host_of(url), priority)
+
+
+def _download_single_stream(
+    url, part_path, timeout, chunk_size, bar, hasher=None, governor=None, priority=PRIORITY_NORMAL
+):
+    """Range를 지원하지 않는 서버용: 하나의 스트림으로 처음부터 받습니다."""
+
+    def on_data(data):
+        if hasher is not None:
+            hasher.update(data)  # 받는 즉시 해시 계산
+        if bar is not None:
+            bar.update(len(data))
+
+    with _connection(governor, url, priority), requests.get(url, stream=True, timeout=timeout) as response:
+        response.raise_for_status()
+        # 버퍼를 직접 관리하므로 파일 쪽 버퍼링은 끔 (큰 조각을 한 번 더 복사하지 않음)
+        with open(part_path, "wb", buffering=0) as f:
+            try:
+                _copy_stream(response, f, None, on_data, chunk_size, governor, priority)
+            except urllib3.exceptions.HTTPError as e:
+                # 본문은 urllib3 응답에서 직접 읽으므로 끊긴 전송은 urllib3 예외(ProtocolError 등)로 옴
+                raise DownloadError(f"전송이 중단되었습니다: {e}")
+
+
+def _hash_file(path, hasher, chunk_size=DEFAULT_CHUNK_SIZE):
+    """파일 전체를 순서대로 읽어 hasher를 갱신합니다."""
+    with open(path, "rb") as f:
+        for data in iter(lambda: f.read(chunk_size), b""):
+            hasher.update(data)
+
+
+def download_file(
+    url,
+    dest_path,
+    connections=DEFAULT_CONNECTIONS,
+    timeout=DEFAULT_TIMEOUT,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    show_progress=True,
+    hasher=None,
+    governor=None,
+    priority=PRIORITY_NORMAL,
+):
+    """
+    url의 파일을 dest_path로 다운로드합니다.
+    본문은 재사용 버퍼로 읽어 바로 파일에 쓰고(readinto + memoryview), 읽기 단위는 chunk_size에서
+    시작해 연결 속도에 맞춰 MAX_CHUNK_SIZE까지 조정합니다. 진행률은 PROGRESS_INTERVAL마다 갱신합니다.
+    서버가 Range를 지원하면 connections개의 세그먼트로 나누어 병렬로 받고,
+    중단되면 '<dest_path>.part.json' 상태 파일을 기준으로 이어받습니다.
+    Range를 지원하지 않으면 단일 스트림으로 받습니다.
+    hasher: hashlib 객체를 주면 받은 내용으로 갱신합니다. 단일 스트림은 받는 즉시,
+            세그먼트 다운로드는 순서가 섞이므로 조립이 끝난 뒤 파일을 읽어 계산합니다.
+    governor: 대역폭/연결 조절기 (기본: net_governor.get_governor()), priority: 전송 우선순위
+    실패 시 DownloadError 또는 requests.exceptions.RequestException을 발생시킵니다.
+    """
+    with trace_span(os.path.basename(dest_path), CATEGORY_DOWNLOAD, url=url) as span:
+        dest_dir = os.path.dirname(dest_path)
+        if dest_dir:
+            os.makedirs(dest_dir, exist_ok=True)
+
+        part_path = dest_path + PART_SUFFIX
+        state_path = dest_path + STATE_SUFFIX
+
+        governor = governor or get_governor()
+        with _connection(governor, url, priority):
+            info = probe_url(url, timeout=timeout)
+        total_size = info["total_size"]
+        ranged = info["accept_ranges"] and total_size and connections > 1
+
+        bar = None
+        if show_progress:
+            bar = _ThrottledProgress(
+                tqdm(
+                    desc=os.path.basename(dest_path),
+                    total=total_size or 0,
+                    unit="iB",
+                    unit_scale=True,
+                    unit_divisor=1024,
+                )
+            )
+        try:
+            if ranged:
+                state = _load_state(state_path, url, info)
+                if state is None or not os.path.exists(part_path):
+                    state = {
+                        "url": url,
+                        "total_size": total_size,
+                        "validator": info["validator"],
+                        "segments": _split_segments(total_size, connections),
+                    }
+                    _remove_quietly(part_path)
+                else:
+                    resumed = sum(s["done"] for s in state["segments"])
+                    print(f"이전 다운로드 상태에서 이어받습니다 ({resumed}/{total_size} 바이트).")
+                    if bar is not None:
+                        bar.update(resumed)
+                _preallocate(part_path, total_size)
+                _save_state(state_path, state)
+                _RangeDownload(
+                    info["url"], part_path, state_path, state, timeout, chunk_size, bar, governor, priority
+                ).run(connections)
+                if hasher is not None:
+                    _hash_file(part_path, hasher)
+            else:
+                _remove_quietly(state_path)
+                _download_single_stream(
+                    info["url"], part_path, timeout, chunk_size, bar, hasher, governor, priority
+                )
+                if total_size and os.path.getsize(part_path) != total_size:
+                    raise DownloadError(
+                        f"받은 크기가 예상과 다릅니다 ({os.path.getsize(part_path)}/{total_size} 바이트)"
+                    )
+        finally:
+            if bar is not None:
+                bar.flush()
+                bar.bar.close()
+
+        os.replace(part_path, dest_path)
+        _remove_quietly(state_path)
+        span.args["bytes"] = os.path.getsize(dest_path)
+        span.args["connections"] = connections if ranged else 1
+    return dest_path
@@ -0,0 +1,215 @@
+# env_transaction.py (환경 변수/PATH 변경을 모아 한 번에 기록하고 한 번만 브로드캐스트)
+
+import os
+
+from path_model import PathModel
+
+# --- 상수 ---
+MACHINE_ENV_KEY_PATH = r"SYSTEM\CurrentControlSet\Control\Session Manager\Environment"
+USER_ENV_KEY_PATH = r"Environment"
+
+REG_SZ = "REG_SZ"
+REG_EXPAND_SZ = "REG_EXPAND_SZ"
+SUPPORTED_TYPES = (REG_SZ, REG_EXPAND_SZ)
+
+PATH_VAR_NAME = "Path"
+
+
+# --- 레지스트리 백엔드 ---
+class InMemoryRegistryBackend:
+    """
+    테스트/벤치마크용 메모리 백엔드입니다 (Linux에서도 동작).
+    values: {scope: {이름: (값, 타입)}}
+    read_count / write_count / broadcast_count로 접근 횟수를 확인할 수 있습니다.
+    """
+
+    def __init__(self, values=None):
+        self.values = {"machine": {}, "user": {}}
+        for scope, scope_values in (values or {}).items():
+            self.values[scope] = dict(scope_values)
+        self.read_count = 0
+        self.write_count = 0
+        self.broadcast_count = 0
+
+    def read_values(self, scope):
+        self.read_count += 1
+        return dict(self.values[scope])
+
+    def write_values(self, scope, changes):
+        self.write_count += len(changes)
+        self.values[scope].update(changes)
+
+    def broadcast(self):
+        self.broadcast_count += 1
+
+
+class WinregBackend:
+    """
+    실제 Windows 레지스트리 백엔드입니다. winreg는 Windows에서만 있으므로 사용 시점에 import 합니다.
+    broadcast: WM_SETTINGCHANGE를 보내는 함수 (setup_utils._broadcast_environment_change)
+    """
+
+    def __init__(self, broadcast=None):
+        self._broadcast = broadcast
+
+    @staticmethod
+    def _open(scope, access):
+        import winreg
+
+        hive, key_path = {
+            "machine": (winreg.HKEY_LOCAL_MACHINE, MACHINE_ENV_KEY_PATH),
+            "user": (winreg.HKEY_CURRENT_USER, USER_ENV_KEY_PATH),
+        }[scope]
+        return winreg.OpenKey(hive, key_path, 0, access)
+
+    def read_values(self, scope):
+        import winreg
+
+        type_names = {winreg.REG_SZ: REG_SZ, winreg.REG_EXPAND_SZ: REG_EXPAND_SZ}
+        values = {}
+        with self._open(scope, winreg.KEY_READ) as key:
+            index = 0
+            while True:
+                try:
+                    name, value, value_type = winreg.EnumValue(key, index)
+                except OSError:  # 더 이상 값이 없음
+                    break
+                if value_type in type_names:
+                    values[name] = (value, type_names[value_type])
+                index += 1
+        return values
+
+    def write_values(self, scope, changes):
+        import winreg
+
+        type_codes = {REG_SZ: winreg.REG_SZ, REG_EXPAND_SZ: winreg.REG_EXPAND_SZ}
+        with self._open(scope, winreg.KEY_READ | winreg.KEY_WRITE) as key:
+            for name, (value, value_type) in changes.items():
+                winreg.SetValueEx(key, name, 0, type_codes[value_type], value)
+
+    def broadcast(self):
+        if self._broadcast is not None:
+            self._broadcast()
+
+
+# --- 트랜잭션 ---
+def _find_name(values, name):
+    """레지스트리 값 이름은 대소문자를 구분하지 않으므로 기존 이름을 찾아 반환합니다."""
+    for existing in values:
+        if existing.lower() == name.lower():
+            return existing
+    return name
+
+
+class EnvironmentTransaction:
+    """
+    여러 환경 변수/PATH 변경을 모았다가 commit()에서 한 번에 적용합니다.
+    - 레지스트리 키는 commit 시 한 번만 읽습니다.
+    - 실제로 값이 바뀐 항목만 기록합니다.
+    - 변경이 있을 때만 WM_SETTINGCHANGE를 한 번 브로드캐스트합니다.
+    with 문으로 사용하면 블록이 정상 종료될 때 commit 합니다.
+    """
+
+    def __init__(self, backend, scope="machine", update_os_environ=True):
+        if scope not in ("machine", "user"):
+            raise ValueError("Scope는 'machine' 또는 'user'여야 합니다.")
+        self.backend = backend
+        self.scope = scope
+        self.update_os_environ = update_os_environ
+        self.operations = []
+        self.committed = False
+
+    def set(self, name, value, value_type=REG_SZ):
+        value_type = value_type.upper()
+        if value_type not in SUPPORTED_TYPES:
+            raise ValueError(
+                f"지원되지 않는 레지스트리 타입 '{value_type}'. REG_SZ 또는 REG_EXPAND_SZ를 사용하세요."
+            )
+        self.operations.append(("set", name, value, value_type))
+        return self
+
+    def add_to_path(self, entry, front=False):
+        """PATH에 entry를 추가합니다 (대소문자 무시 중복 검사). front=True이면 맨 앞에 추가."""
+        self.operations.append(("path_add", entry.strip(), front))
+        return self
+
+    def remove_from_path(self, entry):
+        self.operations.append(("path_remove", entry.strip()))
+        return self
+
+    def compact_path(self, remove_dead=False):
+        """PATH의 중복 항목(remove_dead=True면 없는 디렉터리도)을 제거합니다 (path_model.PathModel.compact)."""
+        self.operations.append(("path_compact", remove_dead))
+        return self
+
+    def plan(self, current):
+        """현재 값(current)에 작업을 적용한 결과 중 바뀐 항목만 {이름: (값, 타입)}으로 반환합니다."""
+        values = dict(current)
+        path_model = None  # PATH는 처음 필요할 때 한 번만 파싱
+        for operation in self.operations:
+            kind = operation[0]
+            if kind == "set":
+                _, name, value, value_type = operation
+                values[_find_name(values, name)] = (value, value_type)
+                continue
+
+            if path_model is None:
+                path_value, _ = values.get(_find_name(values, PATH_VAR_NAME), ("", REG_EXPAND_SZ))
+                path_model = PathModel(path_value, variables=self._variables(values))
+            if kind == "path_add":
+                path_model.add(operation[1], front=operation[2])
+            elif kind == "path_remove":
+                path_model.remove(operation[1])
+            else:  # path_compact
+                report = path_model.compact(remove_dead=operation[1])
+                if report["duplicates"] or (operation[1] and report["dead"]):
+                    print(f"PATH 정리: 중복 {len(report['duplicates'])}개, 없는 디렉터리 {len(report['dead'])}개")
+
+        if path_model is not None and path_model.changes() is not None:
+            # Path는 항상 REG_EXPAND_SZ로 설정하는 것이 안전
+            values[_find_name(values, PATH_VAR_NAME)] = (path_model.value, REG_EXPAND_SZ)
+
+        return {
+            name: new for name, new in values.items() if current.get(name) != new
+        }
+
+    @staticmethod
+    def _variables(values):
+        """%VAR% 풀이용 변수: 현재 프로세스 환경 위에 같은 범위의 레지스트리 값 (이번 트랜잭션의 set 포함)."""
+        variables = dict(os.environ)
+        variables.update({name: value for name, (value, _) in values.items()})
+        return variables
+
+    def commit(self):
+        """변경 사항을 적용하고 실제로 바뀐 변수 이름 목록을 반환합니다."""
+        if self.committed:
+            raise RuntimeError("이미 commit된 트랜잭션입니다.")
+        self.committed = True
+        if not self.operations:
+            return []
+
+        current = self.backend.read_values(self.scope)
+        changes = self.plan(current)
+        if not changes:
+            print("환경 변수 변경 사항이 없습니다 (모두 이미 설정됨).")
+            return []
+
+        self.backend.write_values(self.scope, changes)
+        for name, (value, value_type) in changes.items():
+            print(f"환경 변수 '{name}'을(를) '{value}' (타입: {value_type}) (으)로 설정했습니다.")
+        self.backend.broadcast()
+
+        if self.update_os_environ:
+            # Path는 시스템+사용자 값을 합쳐야 하므로 호출부에서 별도로 갱신
+            for name, (value, _) in changes.items():
+                if name.lower() != PATH_VAR_NAME.lower():
+                    os.environ[name] = value
+        return list(changes)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None and not self.committed:
+            self.commit()
+        return False
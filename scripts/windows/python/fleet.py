@@ -0,0 +1,762 @@
+# fleet.py (여러 PC를 한 번에 설정하는 코디네이터/에이전트)
+#
+# 개발/CI PC 수십 대가 각자 setup.py를 돌리면 같은 설치 파일과 pip 패키지를 모두 인터넷에서 따로 받습니다.
+# fleet 모드에서는
+#   - 코디네이터가 단계 의존 관계(setup.build_setup_steps)에 따라 PC(에이전트)마다 실행할 단계를 나눠 주고,
+#     PC당 동시 단계 수(--per-host)와 전체 동시 단계 수(--max-running)를 제한하며,
+#     진행 상황과 실패를 한곳에 모아 보여 줍니다.
+#   - 에이전트는 각 PC에서 코디네이터에 HTTP로 단계를 받아 실행하고 결과를 보고합니다.
+#     단계 사이의 상태(_step_state)와 저널을 공유하도록 한 프로세스 안에서 실행합니다.
+#   - 아티팩트 노드: 에이전트 하나(--artifact-agent)가 다운로드 캐시와 wheelhouse를 내놓습니다
+#     (artifact_node.py). 다른 에이전트의 다운로드 단계(ARTIFACT_STEPS)는 그 노드가 같은 단계를
+#     끝낸 뒤에 시작하여 인터넷 대신 노드에서 받습니다 (노드에 없으면 원래 주소에서 받음).
+#     노드 에이전트는 자기 단계를 마친 뒤에도 다른 에이전트가 모두 끝날 때까지 노드를 유지합니다.
+#     노드는 같은 포트로 pacman 캐싱 프록시(pacman_proxy.py)도 내놓으며, 모든 에이전트가 이를 mirrorlist
+#     맨 앞에 넣으므로 같은 패키지를 동시에 받아도 미러에서는 한 번만 받습니다.
+# 'fleet.py local'은 코디네이터와 에이전트 프로세스들을 localhost에서 띄워 시험합니다.
+# 이때 에이전트는 단계 대신 잠깐 기다리고, 다운로드 단계에서는 아티팩트 노드에서 실제로 파일을 받습니다.
+#
+# 사용 예:
+#   python fleet.py coordinator --agents 20 --artifact-agent build01
+#   python fleet.py agent --coordinator http://build01:8765 --name build01 --serve-artifacts
+#   python fleet.py agent --coordinator http://build01:8765 --name dev07
+#   python fleet.py local --agents 8 --per-host 2 --fail-rate 0.05
+
+import argparse
+import http.server
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from step_scheduler import (
+    STATUS_FAILED,
+    STATUS_PENDING,
+    STATUS_RUNNING,
+    STATUS_SKIPPED,
+    STATUS_SUCCESS,
+    STATUS_UP_TO_DATE,
+)
+
+# --- 상수 ---
+DEFAULT_PORT = 8765
+DEFAULT_PER_HOST = 3  # PC당 동시에 실행할 단계 수 (setup.SETUP_MAX_WORKERS와 같은 값)
+POLL_INTERVAL = 0.5  # 할 일이 없을 때 에이전트가 다시 묻는 간격 (초)
+AGENT_TIMEOUT = 60.0  # 이 시간 동안 연락이 없는 에이전트는 잃은 것으로 봄 (초)
+ARTIFACT_WAIT = 120.0  # 아티팩트 노드가 등록하기를 기다리는 최대 시간 (초)
+REQUEST_TIMEOUT = 10
+REQUEST_RETRIES = 5
+# 아티팩트 노드가 먼저 끝내야 하는 단계 (다른 PC는 노드의 캐시/wheelhouse에서 받음)
+ARTIFACT_STEPS = ("msys2-download", "wheelhouse")
+PACMAN_CACHE_DIR_NAME = "pacman-cache"  # 아티팩트 노드의 pacman 프록시 캐시 (TEMP_DOWNLOAD_DIR 기준)
+
+_FINISHED = (STATUS_SUCCESS, STATUS_UP_TO_DATE, STATUS_FAILED, STATUS_SKIPPED)
+_SATISFIED = (STATUS_SUCCESS, STATUS_UP_TO_DATE)
+_SHORT_STATUS = {
+    STATUS_PENDING: "-",
+    STATUS_RUNNING: "RUN",
+    STATUS_SUCCESS: "OK",
+    STATUS_UP_TO_DATE: "UP",
+    STATUS_FAILED: "FAIL",
+    STATUS_SKIPPED: "SKIP",
+}
+
+
+class FleetError(Exception):
+    """코디네이터와 통신할 수 없을 때 발생합니다."""
+
+
+# --- 코디네이터 ---
+class AgentState:
+    def __init__(self, name, step_names, clock):
+        self.name = name
+        self.host = None
+        self.status = {step: STATUS_PENDING for step in step_names}
+        self.errors = {}
+        self.durations = {}
+        self.artifact_url = None  # 아티팩트 노드이면 그 주소
+        self.last_seen = clock()
+        self.lost = False
+
+    def count(self, status):
+        return sum(1 for s in self.status.values() if s == status)
+
+    @property
+    def finished(self):
+        return all(s in _FINISHED for s in self.status.values())
+
+
+class FleetCoordinator:
+    """
+    steps: step_scheduler.Step 목록 (이름과 depends_on만 사용, 선언 순서대로 나눠 줌)
+    per_host: PC당 동시에 실행할 단계 수
+    max_running: 전체에서 동시에 실행할 단계 수 (None이면 제한 없음)
+    artifact_agent: 아티팩트 노드 역할을 하는 에이전트 이름 (None이면 각자 인터넷에서 받음)
+    expected_agents: 이만큼 등록해야 끝난 것으로 봄 (None이면 등록한 에이전트만 기다림)
+    clock을 주입하면 가짜 시계로 시험할 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        steps,
+        per_host=DEFAULT_PER_HOST,
+        max_running=None,
+        artifact_agent=None,
+        artifact_steps=ARTIFACT_STEPS,
+        expected_agents=None,
+        agent_timeout=AGENT_TIMEOUT,
+        artifact_wait=ARTIFACT_WAIT,
+        poll_interval=POLL_INTERVAL,
+        clock=time.monotonic,
+    ):
+        self.steps = {step.name: tuple(step.depends_on) for step in steps}
+        self.per_host = max(1, per_host)
+        self.max_running = max_running
+        self.artifact_agent = artifact_agent
+        self.artifact_steps = set(artifact_steps) & set(self.steps)
+        self.expected_agents = expected_agents
+        self.agent_timeout = agent_timeout
+        self.artifact_wait = artifact_wait
+        self.poll_interval = poll_interval
+        self.clock = clock
+        self.started = clock()
+        self.agents = {}  # 이름 -> AgentState (등록 순서)
+        self.lock = threading.Lock()
+
+    # --- 에이전트 요청 (HTTP 처리 스레드에서 호출) ---
+    def register(self, agent, host=None, artifact_url=None):
+        with self.lock:
+            state = self.agents.get(agent)
+            if state is None:
+                state = self.agents[agent] = AgentState(agent, self.steps, self.clock)
+            state.host = host
+            state.artifact_url = artifact_url
+            state.last_seen = self.clock()
+            state.lost = False
+        role = f", 아티팩트 노드 {artifact_url}" if artifact_url else ""
+        print(f"[{agent}] 등록 ({host or '?'}{role}) - 에이전트 {len(self.agents)}대")
+        return {"steps": list(self.steps), "poll_interval": self.poll_interval}
+
+    def heartbeat(self, agent):
+        with self.lock:
+            self._touch(agent)
+        return {}
+
+    def next_task(self, agent):
+        """다음에 실행할 단계 {"step", "artifact_source"}, 기다리라는 {"wait"}, 끝났다는 {"done"} 중 하나."""
+        with self.lock:
+            state = self._touch(agent)
+            self._expire_lost()
+            self._skip_blocked(state)
+            if state.finished:
+                if agent == self.artifact_agent and not self._others_finished(agent):
+                    return {"wait": self.poll_interval}  # 다른 PC가 아직 받아 갈 수 있으므로 노드를 유지
+                return {"done": True}
+            if state.count(STATUS_RUNNING) >= self.per_host:
+                return {"wait": self.poll_interval}
+            if self.max_running and self._running_total() >= self.max_running:
+                return {"wait": self.poll_interval}
+            for name, deps in self.steps.items():
+                if state.status[name] != STATUS_PENDING:
+                    continue
+                if not all(state.status[dep] in _SATISFIED for dep in deps):
+                    continue
+                if not self._artifact_ready(agent, name):
+                    continue
+                state.status[name] = STATUS_RUNNING
+                return {"step": name, "artifact_source": self._artifact_source(agent)}
+            return {"wait": self.poll_interval}
+
+    def report(self, agent, step, status, duration=0.0, error=None):
+        if step not in self.steps or status not in _FINISHED:
+            raise ValueError(f"잘못된 보고: {step} {status}")
+        with self.lock:
+            state = self._touch(agent)
+            state.status[step] = status
+            state.durations[step] = duration
+            if error:
+                state.errors[step] = error
+            self._skip_blocked(state)
+            progress = self._progress_text()
+        text = {STATUS_SUCCESS: "완료", STATUS_UP_TO_DATE: "최신 상태", STATUS_SKIPPED: "건너뜀"}.get(status, "실패")
+        detail = f": {error}" if error and status == STATUS_FAILED else ""
+        print(f"[{agent}] {step} {text} ({duration:.1f}초){detail} | {progress}")
+        return {}
+
+    # --- 내부 ---
+    def _touch(self, agent):
+        state = self.agents.get(agent)
+        if state is None:
+            raise ValueError(f"등록하지 않은 에이전트: {agent}")
+        state.last_seen = self.clock()
+        if state.lost:
+            print(f"[{agent}] 다시 연결됨")
+            state.lost = False
+        return state
+
+    def _others_finished(self, agent):
+        if self.expected_agents and len(self.agents) < self.expected_agents:
+            return False
+        return all(
+            state.finished or state.lost for name, state in self.agents.items() if name != agent
+        )
+
+    def _running_total(self):
+        return sum(state.count(STATUS_RUNNING) for state in self.agents.values())
+
+    def _skip_blocked(self, state):
+        """실패하거나 건너뛴 단계에 의존하는 단계는 건너뜀 (StepScheduler와 같은 규칙)."""
+        progressed = True
+        while progressed:
+            progressed = False
+            for name, deps in self.steps.items():
+                if state.status[name] != STATUS_PENDING:
+                    continue
+                failed = [dep for dep in deps if state.status[dep] in (STATUS_FAILED, STATUS_SKIPPED)]
+                if failed:
+                    state.status[name] = STATUS_SKIPPED
+                    state.errors[name] = f"의존 단계 실패: {', '.join(failed)}"
+                    progressed = True
+
+    def _artifact_ready(self, agent, step):
+        """다른 PC의 다운로드 단계는 아티팩트 노드가 같은 단계를 끝낸 뒤에 시작 (실패했으면 각자 받음)."""
+        if step not in self.artifact_steps or not self.artifact_agent or agent == self.artifact_agent:
+            return True
+        node = self.agents.get(self.artifact_agent)
+        if node is None:
+            return self.clock() - self.started >= self.artifact_wait
+        return node.lost or node.status[step] not in (STATUS_PENDING, STATUS_RUNNING)
+
+    def _artifact_source(self, agent):
+        node = self.agents.get(self.artifact_agent) if self.artifact_agent else None
+        if node is None or node.lost or agent == self.artifact_agent:
+            return None
+        return node.artifact_url
+
+    def _expire_lost(self):
+        now = self.clock()
+        for state in self.agents.values():
+            if state.lost or state.finished or now - state.last_seen < self.agent_timeout:
+                continue
+            state.lost = True
+            for name, status in state.status.items():
+                if status == STATUS_RUNNING:
+                    state.status[name] = STATUS_FAILED
+                    state.errors[name] = "에이전트 응답 없음"
+            print(f"[{state.name}] {self.agent_timeout:.0f}초 동안 응답이 없어 잃은 것으로 처리합니다.")
+
+    def _progress_text(self):
+        counts = {status: 0 for status in _SHORT_STATUS}
+        for state in self.agents.values():
+            for status in state.status.values():
+                counts[status] += 1
+        total = len(self.agents) * len(self.steps)
+        done = counts[STATUS_SUCCESS] + counts[STATUS_UP_TO_DATE]
+        return (
+            f"완료 {done}/{total}, 실행 중 {counts[STATUS_RUNNING]}, "
+            f"실패 {counts[STATUS_FAILED]}, 건너뜀 {counts[STATUS_SKIPPED]}"
+        )
+
+    # --- 상태 ---
+    def is_done(self):
+        with self.lock:
+            self._expire_lost()
+            if not self.agents:
+                return False
+            if self.expected_agents and len(self.agents) < self.expected_agents:
+                return False
+            return all(state.finished or state.lost for state in self.agents.values())
+
+    def wait(self, timeout=None):
+        """모든 에이전트가 끝날 때까지 기다립니다. 시간이 지나면 False."""
+        deadline = None if timeout is None else self.clock() + timeout
+        while not self.is_done():
+            if deadline is not None and self.clock() >= deadline:
+                return False
+            time.sleep(self.poll_interval)
+        return True
+
+    def ok(self):
+        with self.lock:
+            return bool(self.agents) and all(
+                not state.lost and all(s in _SATISFIED for s in state.status.values())
+                for state in self.agents.values()
+            )
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "steps": list(self.steps),
+                "progress": self._progress_text(),
+                "agents": {
+                    name: {
+                        "host": state.host,
+                        "lost": state.lost,
+                        "artifact_url": state.artifact_url,
+                        "status": dict(state.status),
+                        "durations": dict(state.durations),
+                        "errors": dict(state.errors),
+                    }
+                    for name, state in self.agents.items()
+                },
+            }
+
+    def format_summary(self):
+        """에이전트 x 단계 결과 표와 실패 목록."""
+        with self.lock:
+            agents = list(self.agents.values())
+            name_width = max([len("에이전트")] + [len(state.name) for state in agents]) + 2
+            widths = {step: max(len(step), 4) + 2 for step in self.steps}
+            lines = ["에이전트".ljust(name_width) + "".join(step.ljust(widths[step]) for step in self.steps)]
+            failures = []
+            for state in agents:
+                cells = "".join(_SHORT_STATUS[state.status[step]].ljust(widths[step]) for step in self.steps)
+                lines.append(state.name.ljust(name_width) + cells + (" (응답 없음)" if state.lost else ""))
+                for step, error in state.errors.items():
+                    if state.status[step] == STATUS_FAILED:
+                        failures.append(f"  {state.name} {step}: {error}")
+            for step in self.steps:
+                durations = sorted(
+                    state.durations[step]
+                    for state in agents
+                    if state.status[step] == STATUS_SUCCESS and step in state.durations
+                )
+                if durations:
+                    lines.append(
+                        f"{step}: {len(durations)}대 실행, 중앙값 {durations[len(durations) // 2]:.1f}초, "
+                        f"최대 {durations[-1]:.1f}초"
+                    )
+            lines.append(self._progress_text())
+        if failures:
+            lines.append("실패한 단계:")
+            lines.extend(failures)
+        return "\n".join(lines)
+
+
+class _CoordinatorHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "setup-fleet"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        coordinator = self.server.coordinator
+        routes = {
+            "/register": coordinator.register,
+            "/next": coordinator.next_task,
+            "/report": coordinator.report,
+            "/heartbeat": coordinator.heartbeat,
+        }
+        handler = routes.get(self.path)
+        if handler is None:
+            self._send(404, {"error": f"알 수 없는 경로: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            result = handler(**json.loads(self.rfile.read(length) or b"{}"))
+        except (TypeError, ValueError) as e:
+            self._send(400, {"error": str(e)})
+            return
+        self._send(200, result)
+
+    def do_GET(self):
+        if self.path == "/status":
+            self._send(200, self.server.coordinator.snapshot())
+        else:
+            self._send(404, {"error": f"알 수 없는 경로: {self.path}"})
+
+    def _send(self, code, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve_coordinator(coordinator, host="0.0.0.0", port=DEFAULT_PORT):
+    """별도 스레드에서 코디네이터 HTTP 서버를 시작하고 서버를 반환합니다 (server_address로 포트 확인)."""
+    server = http.server.ThreadingHTTPServer((host, port), _CoordinatorHandler)
+    server.daemon_threads = True
+    server.coordinator = coordinator
+    threading.Thread(target=server.serve_forever, name="fleet-coordinator", daemon=True).start()
+    return server
+
+
+# --- 에이전트 ---
+class SetupStepRunner:
+    """
+    이 PC에서 setup.py의 단계를 하나씩 실행합니다 (한 프로세스에서 _step_state와 저널을 공유).
+    관리자 권한이 필요한 단계가 있으므로 에이전트는 관리자 권한으로 실행해야 합니다.
+    MSYS2는 설치되어 있지 않을 때만 설치합니다 (재설치는 force에 msys2-install).
+    artifact_node가 주어지면(이 PC가 아티팩트 노드) pacman도 그 노드의 프록시를 거쳐 받아 캐시를 채웁니다.
+    단계는 하나씩 따로 스케줄하므로, 이 PC에서 실제로 다시 실행된 단계를 기억해 두고
+    그 단계에 의존하는 단계는 지문이 같아도 실행합니다 (StepScheduler와 같은 규칙).
+    """
+
+    def __init__(self, force=(), artifact_node=None):
+        import setup
+        from step_journal import StepJournal
+
+        self.setup = setup
+        self.artifact_node = artifact_node
+        self.steps = setup.build_setup_steps()
+        self.depends_on = {step.name: step.depends_on for step in self.steps}
+        self.journal = StepJournal(setup.SETUP_JOURNAL_PATH)
+        self.force = set(force)
+        self.ran = set()  # 이 에이전트에서 실행되어 성공한 단계
+        self.sources_applied = False
+        self.lock = threading.Lock()
+        setup._step_state["reinstall_msys2"] = bool(
+            self.force & {"all", "msys2-download", "msys2-install"}
+        ) or not setup._msys2_installed()
+        if setup._step_state["reinstall_msys2"]:
+            self.force |= {"msys2-download", "msys2-install"}
+
+    def _apply_sources(self, artifact_source):
+        """
+        아티팩트 노드 주소를 환경 변수로 알립니다 (setup 단계와 bash 스크립트가 읽음).
+        단계가 여러 개 동시에 실행되므로 단계마다 바꾸지 않고, 주소를 처음 알게 되었을 때 한 번만 설정합니다.
+        노드가 도중에 없어져도 다운로드 캐시는 원래 주소에서, pacman은 다음 미러에서 받습니다.
+        """
+        from setup_utils import ENV_ARTIFACT_SOURCE, ENV_PACMAN_PROXY
+
+        with self.lock:
+            if self.sources_applied:
+                return
+            if self.artifact_node is not None:
+                # 아티팩트 노드는 같은 포트로 pacman 프록시도 내놓음 (pacman_proxy.py)
+                os.environ[ENV_PACMAN_PROXY] = self.artifact_node.url
+            elif artifact_source:
+                os.environ[ENV_ARTIFACT_SOURCE] = artifact_source
+                os.environ[ENV_PACMAN_PROXY] = artifact_source
+            else:
+                return  # 노드가 아직 등록하지 않음
+            self.sources_applied = True
+
+    def __call__(self, name, artifact_source=None):
+        from step_scheduler import StepScheduler, select_steps
+
+        self._apply_sources(artifact_source)
+        force = self.force & {name, "all"}
+        with self.lock:
+            if any(dep in self.ran for dep in self.depends_on[name]):
+                force.add(name)
+        results = StepScheduler(
+            select_steps(self.steps, [name]),
+            max_workers=1,
+            journal=self.journal,
+            force=force,
+        ).run()
+        result = results[name]
+        if result.status == STATUS_SUCCESS:
+            with self.lock:
+                self.ran.add(name)
+        return result.status, (str(result.error) if result.error else None)
+
+
+class SimulatedRunner:
+    """
+    단계를 실행하지 않고 잠깐 기다리기만 합니다 (localhost 시험용). fail_rate 확률로 실패합니다.
+    cache(ArtifactCache)가 주어지면 다운로드 단계(ARTIFACT_STEPS)에서 실제로 파일을 다룹니다:
+    아티팩트 노드는 artifact_bytes 크기의 파일을 캐시에 넣고, 다른 에이전트는 노드에서 받습니다.
+    """
+
+    def __init__(self, min_seconds=0.05, max_seconds=0.3, fail_rate=0.0, seed=None, cache=None, artifact_bytes=1024 * 1024):
+        self.min_seconds = min_seconds
+        self.max_seconds = max_seconds
+        self.fail_rate = fail_rate
+        self.random = random.Random(seed)
+        self.cache = cache
+        self.artifact_bytes = artifact_bytes
+        self.is_artifact_node = False
+
+    def __call__(self, name, artifact_source=None):
+        time.sleep(self.random.uniform(self.min_seconds, self.max_seconds))
+        if self.random.random() < self.fail_rate:
+            return STATUS_FAILED, "가상 실패 (--fail-rate)"
+        if self.cache is not None and name in ARTIFACT_STEPS:
+            url = f"https://artifacts.invalid/{name}.bin"
+            if self.is_artifact_node:
+                path = os.path.join(self.cache.root, f"{name}.bin")
+                with open(path, "wb") as f:
+                    f.write(os.urandom(self.artifact_bytes))
+                self.cache.put(url, path)
+            elif artifact_source:
+                self.cache.source = artifact_source
+                try:
+                    self.cache.fetch(url, show_progress=False)
+                except Exception as e:
+                    return STATUS_FAILED, f"아티팩트 노드에서 받지 못함: {e}"
+        return STATUS_SUCCESS, None
+
+
+class FleetAgent:
+    """
+    coordinator_url: 코디네이터 주소 (http://호스트:포트)
+    runner: runner(단계 이름, 아티팩트 노드 주소) -> (상태, 오류 메시지)
+    slots: 동시에 실행할 단계 수 (코디네이터의 per_host가 더 작으면 그 값)
+    artifact_node: 이 PC가 아티팩트 노드이면 artifact_node.ArtifactNode (시작은 run()에서)
+    """
+
+    def __init__(self, coordinator_url, name, runner, slots=DEFAULT_PER_HOST, artifact_node=None):
+        self.coordinator_url = coordinator_url.rstrip("/")
+        self.name = name
+        self.runner = runner
+        self.slots = max(1, slots)
+        self.artifact_node = artifact_node
+        self.poll_interval = POLL_INTERVAL
+        self.failed = []
+
+    def _call(self, path, **payload):
+        """코디네이터에 JSON을 보내고 응답을 반환합니다. 연결 오류는 잠시 뒤 다시 시도합니다."""
+        data = json.dumps(payload).encode("utf-8")
+        delay = 0.5
+        for attempt in range(REQUEST_RETRIES):
+            request = urllib.request.Request(
+                self.coordinator_url + path, data=data, headers={"Content-Type": "application/json"}
+            )
+            try:
+                with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT) as response:
+                    return json.loads(response.read() or b"{}")
+            except urllib.error.HTTPError as e:
+                raise FleetError(f"코디네이터가 요청을 거부했습니다 ({path}, {e.code}): {e.read().decode('utf-8', 'replace')}")
+            except OSError as e:
+                if attempt == REQUEST_RETRIES - 1:
+                    raise FleetError(f"코디네이터에 연결할 수 없습니다: {self.coordinator_url} ({e})")
+                time.sleep(delay)
+                delay *= 2
+
+    def _run_step(self, task):
+        step = task["step"]
+        print(f"단계 '{step}' 시작" + (f" (아티팩트 노드: {task['artifact_source']})" if task.get("artifact_source") else ""))
+        started = time.monotonic()
+        try:
+            status, error = self.runner(step, task.get("artifact_source"))
+        except Exception as e:
+            status, error = STATUS_FAILED, repr(e)
+        if status == STATUS_FAILED:
+            self.failed.append(step)
+        self._call(
+            "/report", agent=self.name, step=step, status=status, duration=time.monotonic() - started, error=error
+        )
+
+    def run(self):
+        """코디네이터가 끝났다고 할 때까지 단계를 받아 실행합니다. 실패한 단계 이름 목록을 반환합니다."""
+        artifact_url = self.artifact_node.start() if self.artifact_node else None
+        try:
+            reply = self._call("/register", agent=self.name, host=socket.gethostname(), artifact_url=artifact_url)
+            self.poll_interval = reply.get("poll_interval", self.poll_interval)
+            workers = []
+            while True:
+                workers = [worker for worker in workers if worker.is_alive()]
+                if len(workers) >= self.slots:
+                    self._call("/heartbeat", agent=self.name)
+                    time.sleep(self.poll_interval)
+                    continue
+                task = self._call("/next", agent=self.name)
+                if task.get("done"):
+                    break
+                if "step" in task:
+                    worker = threading.Thread(target=self._run_step, args=(task,), name=f"step-{task['step']}")
+                    worker.start()
+                    workers.append(worker)
+                    continue
+                time.sleep(task.get("wait", self.poll_interval))
+            for worker in workers:
+                worker.join()
+            if self.artifact_node is not None:
+                stats = self.artifact_node.stats
+                print(f"아티팩트 노드: 파일 {stats['files']}개, {stats['bytes'] / (1024 * 1024):.1f} MB 전송, 없음 {stats['misses']}건")
+        finally:
+            if self.artifact_node is not None:
+                self.artifact_node.stop()
+        return self.failed
+
+
+# --- 명령줄 ---
+def _setup_steps(command):
+    import setup
+    from step_scheduler import select_steps
+
+    steps = setup.build_setup_steps()
+    if setup.SETUP_COMMANDS[command] is not None:
+        steps = select_steps(steps, setup.SETUP_COMMANDS[command])
+    return steps
+
+
+def run_coordinator(args):
+    coordinator = FleetCoordinator(
+        _setup_steps(args.command),
+        per_host=args.per_host,
+        max_running=args.max_running,
+        artifact_agent=args.artifact_agent,
+        expected_agents=args.agents,
+    )
+    server = serve_coordinator(coordinator, args.host, args.port)
+    print(f"코디네이터 시작: http://{socket.gethostname()}:{server.server_address[1]} (에이전트 {args.agents or '?'}대 대기)")
+    try:
+        coordinator.wait()
+    finally:
+        server.shutdown()
+    print(coordinator.format_summary())
+    return 0 if coordinator.ok() else 1
+
+
+def run_agent(args):
+    node = None
+    if args.simulate:
+        from artifact_cache import ArtifactCache
+
+        work_dir = args.work_dir or tempfile.mkdtemp(prefix=f"fleet-{args.name}-")
+        cache = ArtifactCache(os.path.join(work_dir, "cache"))
+        runner = SimulatedRunner(
+            args.min_seconds, args.max_seconds, args.fail_rate, seed=args.seed, cache=cache
+        )
+        runner.is_artifact_node = args.serve_artifacts
+        wheelhouse_dir = None
+    else:
+        runner = SetupStepRunner(force=args.force)
+        from setup_utils import get_artifact_cache
+
+        cache = get_artifact_cache(runner.setup.TEMP_DOWNLOAD_DIR)
+        wheelhouse_dir = runner.setup.WHEELHOUSE_DIR
+    if args.serve_artifacts:
+        from artifact_node import ArtifactNode
+
+        pacman_proxy = None
+        if not args.simulate:
+            from pacman_proxy import PacmanProxy
+
+            pacman_proxy = PacmanProxy(os.path.join(runner.setup.TEMP_DOWNLOAD_DIR, PACMAN_CACHE_DIR_NAME))
+        node = ArtifactNode(
+            cache,
+            wheelhouse_dir,
+            port=args.artifact_port,
+            advertise_host=args.artifact_host,
+            pacman_proxy=pacman_proxy,
+        )
+        if not args.simulate:
+            runner.artifact_node = node
+    agent = FleetAgent(args.coordinator, args.name, runner, slots=args.slots, artifact_node=node)
+    try:
+        failed = agent.run()
+    except FleetError as e:
+        print(f"오류: {e}")
+        return 2
+    print(f"에이전트 '{args.name}' 종료" + (f" (실패: {', '.join(failed)})" if failed else ""))
+    return 1 if failed else 0
+
+
+def run_local(args):
+    """코디네이터를 이 프로세스에서, 에이전트를 localhost의 하위 프로세스로 띄워 시험합니다."""
+    coordinator = FleetCoordinator(
+        _setup_steps(args.command),
+        per_host=args.per_host,
+        max_running=args.max_running,
+        artifact_agent="local-0",
+        expected_agents=args.agents,
+        poll_interval=0.05,
+    )
+    server = serve_coordinator(coordinator, "127.0.0.1", 0)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    work_root = tempfile.mkdtemp(prefix="fleet-local-")
+    processes = []
+    started = time.monotonic()
+    try:
+        for index in range(args.agents):
+            name = f"local-{index}"
+            command = [
+                sys.executable, os.path.abspath(__file__), "agent",
+                "--coordinator", url, "--name", name, "--simulate",
+                "--work-dir", os.path.join(work_root, name),
+                "--slots", str(args.per_host),
+                "--min-seconds", str(args.min_seconds), "--max-seconds", str(args.max_seconds),
+                "--fail-rate", str(args.fail_rate), "--seed", str(index),
+            ]  # fmt: skip
+            if index == 0:
+                command += ["--serve-artifacts", "--artifact-port", "0", "--artifact-host", "127.0.0.1"]
+            os.makedirs(os.path.join(work_root, name))
+            log = open(os.path.join(work_root, name, "agent.log"), "w", encoding="utf-8")
+            processes.append(subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT))
+            log.close()
+        finished = coordinator.wait(timeout=args.timeout)
+        for process in processes:
+            process.wait(timeout=REQUEST_TIMEOUT)
+    finally:
+        for process in processes:
+            if process.poll() is None:
+                process.kill()
+        server.shutdown()
+        if args.keep:
+            print(f"에이전트 로그: {work_root}")
+        else:
+            shutil.rmtree(work_root, ignore_errors=True)
+    print(coordinator.format_summary())
+    print(f"전체 {time.monotonic() - started:.1f}초")
+    if not finished:
+        print(f"오류: {args.timeout}초 안에 끝나지 않았습니다.")
+        return 1
+    return 0 if coordinator.ok() else 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="여러 PC를 한 번에 설정하는 fleet 모드")
+    subparsers = parser.add_subparsers(dest="mode", required=True, metavar="MODE")
+
+    def add_coordinator_arguments(sub):
+        sub.add_argument("--command", default="all", help="실행할 setup.py 하위 명령 (기본: all)")
+        sub.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST, help="PC당 동시에 실행할 단계 수")
+        sub.add_argument("--max-running", type=int, help="전체에서 동시에 실행할 단계 수 (기본: 제한 없음)")
+
+    def add_simulation_arguments(sub):
+        sub.add_argument("--min-seconds", type=float, default=0.05, help="가상 단계의 최소 실행 시간")
+        sub.add_argument("--max-seconds", type=float, default=0.3, help="가상 단계의 최대 실행 시간")
+        sub.add_argument("--fail-rate", type=float, default=0.0, help="가상 단계가 실패할 확률")
+
+    coordinator = subparsers.add_parser("coordinator", help="단계를 나눠 주고 결과를 모음")
+    add_coordinator_arguments(coordinator)
+    coordinator.add_argument("--host", default="0.0.0.0", help="바인드 주소")
+    coordinator.add_argument("--port", type=int, default=DEFAULT_PORT, help="포트")
+    coordinator.add_argument("--agents", type=int, help="기다릴 에이전트 수")
+    coordinator.add_argument("--artifact-agent", help="아티팩트 노드 역할을 하는 에이전트 이름")
+
+    agent = subparsers.add_parser("agent", help="이 PC에서 단계를 받아 실행")
+    agent.add_argument("--coordinator", required=True, help="코디네이터 주소 (http://호스트:포트)")
+    agent.add_argument("--name", default=socket.gethostname(), help="에이전트 이름 (기본: 컴퓨터 이름)")
+    agent.add_argument("--slots", type=int, default=DEFAULT_PER_HOST, help="동시에 실행할 단계 수")
+    agent.add_argument("--force", action="append", default=[], metavar="STEP", help="저널과 관계없이 다시 실행할 단계")
+    agent.add_argument("--serve-artifacts", action="store_true", help="이 PC를 아티팩트 노드로 사용")
+    agent.add_argument("--artifact-port", type=int, default=8766, help="아티팩트 노드 포트")
+    agent.add_argument("--artifact-host", help="다른 PC가 아티팩트 노드에 접속할 이름 (기본: 컴퓨터 이름)")
+    agent.add_argument("--simulate", action="store_true", help="단계를 실행하지 않고 흉내만 냄 (시험용)")
+    agent.add_argument("--work-dir", help=argparse.SUPPRESS)
+    agent.add_argument("--seed", type=int, help=argparse.SUPPRESS)
+    add_simulation_arguments(agent)
+
+    local = subparsers.add_parser("local", help="localhost에서 코디네이터와 가상 에이전트들로 시험")
+    add_coordinator_arguments(local)
+    local.add_argument("--agents", type=int, default=4, help="띄울 에이전트 수")
+    local.add_argument("--timeout", type=float, default=300, help="전체 제한 시간 (초)")
+    local.add_argument("--keep", action="store_true", help="에이전트 로그 디렉터리를 남김")
+    add_simulation_arguments(local)
+
+    args = parser.parse_args(argv)
+    if args.mode == "coordinator":
+        return run_coordinator(args)
+    if args.mode == "agent":
+        return run_agent(args)
+    return run_local(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,269 @@
+# msys2_shell.py (로그인 bash 하나를 띄워 두고 여러 스크립트를 차례로 실행하는 세션)
+#
+# MSYS2의 로그인 셸은 시작할 때 /etc/profile 등을 읽으며 여러 번 fork 하는데,
+# Cygwin 방식으로 흉내 낸 fork가 느려서 'bash -lc'를 스크립트마다 새로 띄우면 그 비용을 매번 냅니다.
+# BashSession은 로그인 셸을 한 번만 띄우고 스크립트를 파이프로 보냅니다.
+#   - 스크립트는 따옴표로 감싸 서브셸 '( eval '...' )'에서 실행하므로 exit, cd, set -e 등이
+#     세션에 남지 않고, 문법 오류(닫히지 않은 따옴표 등)도 eval의 실패로 끝나 세션이 어긋나지 않습니다.
+#   - timeout이 지나면 세션(셸과 그 자식 전체)을 강제 종료하고 ShellTimeoutError를 발생시킵니다.
+#   - 스크립트의 표준 입력은 /dev/null입니다 (세션의 명령 파이프를 읽어 가지 않도록).
+#   - stderr는 stdout에 합쳐 순서를 유지하고, 끝에 스크립트마다 고유한 표지 줄과
+#     종료 코드를 찍어 출력의 끝을 알아냅니다.
+#   - 출력은 run_streaming처럼 콘솔(console_output)과 단계 로그로 갑니다.
+# 일반 Linux bash에서도 그대로 동작합니다 (benchmarks/bench_shell.py).
+
+import collections
+import os
+import shlex
+import signal
+import subprocess
+import threading
+import uuid
+
+from command_runner import CommandResult, DEFAULT_MAX_CAPTURED_LINES
+from console_output import get_console
+from step_trace import trace_span, CATEGORY_SUBPROCESS
+
+# --- 상수 ---
+SENTINEL_PREFIX = "__SETUP_BASH_DONE_"
+READ_CHUNK_SIZE = 1024 * 64
+CLOSE_TIMEOUT = 10  # 세션 종료 시 bash가 끝나기를 기다리는 시간 (초)
+
+
+class ShellSessionError(Exception):
+    """셸을 시작할 수 없거나, 스크립트가 끝나기 전에 셸이 종료되었을 때 발생합니다."""
+
+
+class ShellTimeoutError(ShellSessionError):
+    """스크립트가 시간 제한 안에 끝나지 않아 세션을 종료했을 때 발생합니다."""
+
+
+class BashSession:
+    """
+    bash: bash 실행 파일 경로
+    login: True이면 로그인 셸(--login)로 시작 (MSYS2의 PATH/MSYSTEM 설정을 위해 필요)
+    cwd, env: 셸의 시작 디렉터리/환경 변수 (스크립트마다 run(cwd=...)로 바꿀 수 있음)
+    echo: 스크립트 출력을 콘솔로 보냄
+    timeout: 스크립트 하나의 시간 제한 (초, None이면 제한 없음). run(timeout=...)으로 바꿀 수 있음
+    with 문으로 쓰면 블록이 끝날 때 셸을 종료합니다. 셸은 첫 run()에서 시작됩니다.
+    """
+
+    def __init__(
+        self,
+        bash="bash",
+        login=True,
+        cwd=None,
+        env=None,
+        echo=True,
+        max_captured_lines=DEFAULT_MAX_CAPTURED_LINES,
+        timeout=None,
+    ):
+        self.bash = bash
+        self.login = login
+        self.cwd = cwd
+        self.env = env
+        self.echo = echo
+        self.max_captured_lines = max_captured_lines
+        self.timeout = timeout
+        self.process = None
+        self.pending = b""  # 아직 줄바꿈이 오지 않은 출력
+        self.lock = threading.Lock()  # 한 번에 스크립트 하나만
+        self.startup_lines = []  # 로그인 스크립트가 낸 출력 (시작 실패 시 확인용)
+        self.script_count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    # --- 시작/종료 ---
+    def start(self):
+        """로그인 셸을 띄우고 로그인 스크립트가 끝날 때까지 기다립니다."""
+        command = [self.bash] + (["--login"] if self.login else []) + ["-s"]
+        kwargs = {}
+        if os.name != "nt":
+            kwargs["start_new_session"] = True  # 시간 초과 시 자식까지 한 번에 종료 (_kill_tree)
+        with trace_span(f"{os.path.basename(self.bash)} 세션 시작", CATEGORY_SUBPROCESS):
+            try:
+                self.process = subprocess.Popen(
+                    command,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    cwd=self.cwd,
+                    env=self.env,
+                    **kwargs,
+                )
+            except OSError as e:
+                raise ShellSessionError(f"bash를 시작할 수 없습니다: {self.bash} ({e})")
+            try:
+                code = self._exchange(":", self.startup_lines.extend)
+            except BaseException:
+                self._kill()
+                raise
+        if code != 0:
+            self._kill()
+            raise ShellSessionError(f"bash 세션을 시작하지 못했습니다 (종료 코드: {code})")
+
+    def close(self):
+        """셸에 exit를 보내고 끝나기를 기다립니다 (CLOSE_TIMEOUT이 지나면 강제 종료)."""
+        if self.process is None:
+            return
+        try:
+            self.process.stdin.write(b"exit\n")
+            self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout=CLOSE_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.process.stdout.close()
+        self.process = None
+
+    def _kill(self):
+        """중단되었거나 주고받기가 어긋난 셸은 재사용하지 않음 (다음 run()에서 새로 시작)."""
+        if self.process is None:
+            return
+        _kill_tree(self.process)
+        self.process.wait()
+        for pipe in (self.process.stdin, self.process.stdout):
+            try:
+                pipe.close()
+            except OSError:
+                pass
+        self.process = None
+        self.pending = b""
+
+    # --- 실행 ---
+    def run(self, command, cwd=None, label=None, timeout=None):
+        """
+        command(bash 명령 또는 스크립트 경로)를 세션에서 실행하고 CommandResult를 반환합니다.
+        stdout_lines에는 stderr가 합쳐진 마지막 max_captured_lines 줄이 들어 있습니다.
+        셸이 도중에 끝나면 ShellSessionError, timeout(기본: 세션의 timeout)초가 지나면
+        세션을 종료하고 ShellTimeoutError를 발생시킵니다 (다음 run()은 새 셸에서 실행).
+        """
+        timeout = self.timeout if timeout is None else timeout
+        if cwd:
+            command = f"cd {shlex.quote(cwd)} || exit 1\n{command}"
+        label = label or " ".join(command.split())
+        captured = collections.deque(maxlen=self.max_captured_lines)
+
+        with self.lock:
+            if self.process is None:
+                self.start()
+            with trace_span(f"bash: {label}", CATEGORY_SUBPROCESS) as span:
+                view = get_console().begin(label) if self.echo else None
+
+                def deliver(lines):
+                    if view is not None:
+                        view.add(lines)
+                    captured.extend(line.strip() for line in lines)
+
+                code = None
+                try:
+                    code = self._exchange(command, deliver, timeout)
+                except BaseException:
+                    self._kill()
+                    raise
+                finally:
+                    if view is not None:
+                        view.finish(code if code is not None else -1)
+                span.args["exit_code"] = code
+            self.script_count += 1
+        return CommandResult(code, captured, collections.deque())
+
+    def _exchange(self, command, deliver, timeout=None):
+        """명령을 보내고 표지 줄이 올 때까지 출력을 deliver(줄 목록)에 넘깁니다. 종료 코드를 반환합니다."""
+        token = f"{SENTINEL_PREFIX}{uuid.uuid4().hex}__"
+        # 명령은 한 단어로 감싸 eval에 넘김: 그대로 붙여 넣으면 문법 오류(닫히지 않은 따옴표 등)가
+        # 뒤따르는 표지 printf까지 삼켜 표지가 오지 않음.
+        # 표지는 printf 인자로만 보내므로, 스크립트를 그대로 되풀이해 보여주는 출력과 헷갈리지 않음
+        payload = f"( eval {shlex.quote(command)} ) </dev/null 2>&1\nprintf '%s %d\\n' {token} $?\n"
+        try:
+            self.process.stdin.write(payload.encode("utf-8"))
+            self.process.stdin.flush()
+        except OSError as e:
+            raise ShellSessionError(f"bash 세션에 명령을 보낼 수 없습니다 ({e})")
+
+        timer = None
+        expired = threading.Event()
+        if timeout is not None:
+            process = self.process
+
+            def expire():
+                expired.set()
+                _kill_tree(process)  # 파이프를 물고 있는 자식까지 끝나야 아래 read1이 돌아옴
+
+            timer = threading.Timer(timeout, expire)
+            timer.daemon = True
+            timer.start()
+        try:
+            code = self._read_until(token, deliver, expired, timeout)
+        finally:
+            if timer is not None:
+                timer.cancel()
+        if expired.is_set():  # 끝나는 순간 시간 제한도 지나 셸이 종료됨: 다음 run()에서 새로 시작
+            self._kill()
+        return code
+
+    def _read_until(self, token, deliver, expired, timeout):
+        token_bytes = token.encode("ascii")
+        while True:
+            data = self.process.stdout.read1(READ_CHUNK_SIZE)
+            if not data:
+                if expired.is_set():
+                    raise ShellTimeoutError(f"명령이 {timeout}초 안에 끝나지 않아 bash 세션을 종료했습니다.")
+                try:
+                    exit_code = self.process.wait(timeout=CLOSE_TIMEOUT)
+                except subprocess.TimeoutExpired:
+                    exit_code = None
+                raise ShellSessionError(f"명령이 끝나기 전에 bash 세션이 종료되었습니다 (종료 코드: {exit_code})")
+            self.pending += data
+            *raw_lines, self.pending = self.pending.split(b"\n")
+            lines = []
+            code = None
+            for index, raw_line in enumerate(raw_lines):
+                at = raw_line.find(token_bytes)
+                if at < 0:
+                    lines.append(raw_line)
+                    continue
+                if at:  # 줄바꿈 없이 끝난 마지막 출력
+                    lines.append(raw_line[:at])
+                code = int(raw_line[at + len(token_bytes) :].strip() or -1)
+                rest = raw_lines[index + 1 :]
+                if rest:
+                    self.pending = b"\n".join(rest + [self.pending])
+                break
+            if lines:
+                deliver([line.decode("utf-8", errors="replace").rstrip("\r") for line in lines])
+            if code is not None:
+                return code
+
+
+def _kill_tree(process):
+    """셸과 그 자식(서브셸, 스크립트가 띄운 명령)을 모두 강제 종료합니다."""
+    if os.name == "nt":
+        # MSYS2 프로그램도 Windows 프로세스 트리를 이루므로 taskkill /T로 함께 종료
+        subprocess.run(
+            ["taskkill", "/F", "/T", "/PID", str(process.pid)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+    else:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)  # start_new_session=True로 시작한 프로세스 그룹
+        except OSError:
+            pass
+    try:
+        process.kill()
+    except OSError:
+        pass
+
+
+def msys2_bash_session(msys2_root, **kwargs):
+    r"""MSYS2의 bash.exe(msys2_root\usr\bin\bash.exe)로 로그인 셸 세션을 만듭니다."""
+    return BashSession(os.path.join(msys2_root, "usr", "bin", "bash.exe"), login=True, **kwargs)
@@ -0,0 +1,273 @@
+# net_governor.py (프로세스 전역 네트워크 대역폭/동시 연결 조절기)
+#
+# 설치 파일 다운로드, 미러 측정, pacman 동기화, pip/VSCode 마켓플레이스 전송이 서로 모르고
+# 동시에 달리면, 여러 PC가 함께 쓰는 사무실 회선에서 서로를 굶기게 됩니다.
+# 네트워크를 쓰는 코드는 get_governor()로 얻은 하나의 조절기를 거칩니다.
+#   - 토큰 버킷 속도 제한: throttle(바이트 수, 우선순위)가 필요한 만큼 기다립니다.
+#     (바이트를 직접 읽는 전송만 해당. pip/pacman 같은 하위 프로세스는 연결 슬롯만 사용)
+#   - 호스트별/전체 동시 연결 수 제한: with connection(호스트, 우선순위): ...
+#   - 우선순위: 높은 우선순위 전송은 낮은 우선순위의 예약 뒤에 줄 서지 않고,
+#     연결 슬롯도 먼저 받습니다.
+#   - stats()/format_stats(): 최근 처리량, 한도 대비 사용률, 우선순위별 전송량/대기 시간, 호스트별 연결 수
+#
+# 한도는 환경 변수로 지정합니다 (지정하지 않으면 제한 없음, 통계만 수집):
+#   SETUP_BANDWIDTH_LIMIT=20M         초당 바이트 (K/M/G 접미사, 1024 단위)
+#   SETUP_MAX_CONNECTIONS_PER_HOST=4
+#   SETUP_MAX_CONNECTIONS=16
+# clock/sleep을 주입하면 가짜 시계로 시험할 수 있습니다 (속도 제한은 실제로 잠들지 않고 계산만 함).
+
+import collections
+import contextlib
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+# --- 우선순위 (작을수록 먼저) ---
+PRIORITY_HIGH = 0  # 다른 단계가 결과를 기다리는 전송 (MSYS2 설치 파일 등)
+PRIORITY_NORMAL = 1
+PRIORITY_BACKGROUND = 2  # 미러 측정, wheel 미리 받기, 확장 설치 등
+PRIORITY_NAMES = {PRIORITY_HIGH: "high", PRIORITY_NORMAL: "normal", PRIORITY_BACKGROUND: "background"}
+
+# --- 상수 ---
+DEFAULT_BURST_SECONDS = 0.5  # 쉬고 있던 동안 모아 둘 수 있는 토큰 (한도 x 초)
+GRANT_SECONDS = 0.1  # 속도 제한 시 한 번에 허가할 최대 바이트 (한도 x 초), 읽기 단위 상한으로 사용
+MIN_GRANT_BYTES = 1024 * 16
+STATS_WINDOW = 5.0  # 최근 처리량 계산 구간 (초)
+
+ENV_BANDWIDTH_LIMIT = "SETUP_BANDWIDTH_LIMIT"
+ENV_MAX_CONNECTIONS_PER_HOST = "SETUP_MAX_CONNECTIONS_PER_HOST"
+ENV_MAX_CONNECTIONS = "SETUP_MAX_CONNECTIONS"
+
+_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+
+
+def parse_rate(text):
+    """'20M', '512K', '1048576' -> 초당 바이트. 빈 문자열/0이면 None (제한 없음), 형식이 틀리면 ValueError."""
+    text = (text or "").strip().upper().removesuffix("/S").removesuffix("B")
+    if not text:
+        return None
+    unit = text[-1] if text[-1] in _UNITS and not text[-1].isdigit() else ""
+    value = float(text[: len(text) - len(unit)]) * _UNITS[unit]
+    if value < 0:
+        raise ValueError(f"전송 한도는 0 이상이어야 합니다: {text!r}")
+    return value if value > 0 else None
+
+
+def host_of(url):
+    """URL의 호스트 이름 (연결 제한 단위). 호스트가 없으면 url 그대로."""
+    return urlsplit(url).hostname or url
+
+
+class NetworkGovernor:
+    """
+    rate: 전체 전송 한도 (초당 바이트, None이면 제한 없음)
+    burst: 쉬고 있던 뒤 기다리지 않고 보낼 수 있는 바이트 (기본: rate x DEFAULT_BURST_SECONDS)
+    per_host: 호스트별 최대 동시 연결 수 (None이면 제한 없음)
+    max_connections: 전체 최대 동시 연결 수 (None이면 제한 없음)
+    """
+
+    def __init__(
+        self,
+        rate=None,
+        burst=None,
+        per_host=None,
+        max_connections=None,
+        clock=time.monotonic,
+        sleep=time.sleep,
+    ):
+        self.rate = rate
+        self.burst = burst if burst is not None else (rate or 0) * DEFAULT_BURST_SECONDS
+        self.per_host = per_host
+        self.max_connections = max_connections
+        self.clock = clock
+        self.sleep = sleep
+        self._cond = threading.Condition()
+        # 우선순위별로 "이 우선순위의 다음 전송이 시작할 수 있는 시각" (예약 방식 토큰 버킷)
+        self._next_free = {p: float("-inf") for p in PRIORITY_NAMES}
+        # 연결 슬롯
+        self._active = collections.Counter()  # 호스트 -> 사용 중 연결 수
+        self._waiting = []  # [(우선순위, 순번, 호스트)]
+        self._sequence = 0
+        # 통계
+        self._started_at = clock()
+        self._bytes = collections.Counter()  # 우선순위 -> 누적 바이트
+        self._throttled = collections.Counter()  # 우선순위 -> 속도 제한으로 기다린 시간 (초)
+        self._queued = collections.Counter()  # 우선순위 -> 연결 슬롯을 기다린 시간 (초)
+        self._recent = collections.deque()  # (시각, 바이트)
+        self._peak_connections = 0
+
+    # --- 속도 제한 ---
+    @property
+    def limited(self):
+        return self.rate is not None
+
+    def grant_size(self):
+        """속도 제한 중일 때 한 번에 읽을 최대 바이트 (제한이 없으면 None)."""
+        if self.rate is None:
+            return None
+        return max(MIN_GRANT_BYTES, int(self.rate * GRANT_SECONDS))
+
+    def reserve(self, size, priority=PRIORITY_NORMAL):
+        """
+        size 바이트 전송을 예약하고 기다려야 할 시간(초)을 반환합니다 (잠들지 않음).
+        같은 우선순위와 더 높은 우선순위의 예약이 끝난 뒤에 시작하며,
+        예약이 끝나는 시각까지 더 낮은 우선순위는 시작하지 못합니다.
+        """
+        now = self.clock()
+        with self._cond:
+            self._record(size, priority, now)
+            if self.rate is None:
+                return 0.0
+            start = max(self._next_free[priority], now - self.burst / self.rate)
+            end = start + size / self.rate
+            for other in self._next_free:
+                if other >= priority:
+                    self._next_free[other] = max(self._next_free[other], end)
+            delay = max(0.0, end - now)
+            self._throttled[priority] += delay
+            return delay
+
+    def throttle(self, size, priority=PRIORITY_NORMAL):
+        """size 바이트를 보낸(받은) 만큼 한도에 맞춰 기다립니다. 기다린 시간을 반환합니다."""
+        delay = self.reserve(size, priority)
+        if delay > 0:
+            self.sleep(delay)
+        return delay
+
+    def account(self, size, priority=PRIORITY_NORMAL):
+        """속도 제한 없이 통계에만 기록합니다 (처리량을 재는 미러 측정 등)."""
+        with self._cond:
+            self._record(size, priority, self.clock())
+
+    def _record(self, size, priority, now):
+        self._bytes[priority] += size
+        self._recent.append((now, size))
+        while self._recent and self._recent[0][0] < now - STATS_WINDOW:
+            self._recent.popleft()
+
+    # --- 연결 슬롯 ---
+    def _has_capacity(self, host):
+        if self.max_connections is not None and sum(self._active.values()) >= self.max_connections:
+            return False
+        return self.per_host is None or self._active[host] < self.per_host
+
+    def _may_enter(self, entry):
+        """entry보다 앞선 대기자 중 지금 들어갈 수 있는 대기자가 없으면 True."""
+        if not self._has_capacity(entry[2]):
+            return False
+        return not any(other < entry and self._has_capacity(other[2]) for other in self._waiting)
+
+    def acquire_connection(self, host, priority=PRIORITY_NORMAL, timeout=None):
+        """host로의 연결 슬롯을 얻습니다. timeout 안에 못 얻으면 False."""
+        started = self.clock()
+        deadline = None if timeout is None else started + timeout
+        with self._cond:
+            self._sequence += 1
+            entry = (priority, self._sequence, host)
+            self._waiting.append(entry)
+            try:
+                while not self._may_enter(entry):
+                    remaining = None if deadline is None else deadline - self.clock()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._cond.wait(remaining)
+            finally:
+                self._waiting.remove(entry)
+                self._cond.notify_all()  # 이 대기자 때문에 막혀 있던 다른 대기자
+            self._active[host] += 1
+            self._peak_connections = max(self._peak_connections, sum(self._active.values()))
+            self._queued[priority] += self.clock() - started
+            return True
+
+    def release_connection(self, host):
+        with self._cond:
+            self._active[host] -= 1
+            if self._active[host] <= 0:
+                del self._active[host]
+            self._cond.notify_all()
+
+    @contextlib.contextmanager
+    def connection(self, host, priority=PRIORITY_NORMAL):
+        """with 블록 동안 host로의 연결 슬롯 하나를 차지합니다. host에는 URL을 줘도 됩니다."""
+        if "://" in host:
+            host = host_of(host)
+        self.acquire_connection(host, priority)
+        try:
+            yield self
+        finally:
+            self.release_connection(host)
+
+    # --- 통계 ---
+    def stats(self):
+        now = self.clock()
+        with self._cond:
+            while self._recent and self._recent[0][0] < now - STATS_WINDOW:
+                self._recent.popleft()
+            window = min(STATS_WINDOW, max(now - self._started_at, 1e-9))
+            recent_rate = sum(size for _, size in self._recent) / window
+            return {
+                "rate_limit": self.rate,
+                "recent_rate": recent_rate,
+                "utilization": recent_rate / self.rate if self.rate else None,
+                "bytes": {PRIORITY_NAMES[p]: self._bytes[p] for p in PRIORITY_NAMES},
+                "throttled_seconds": {PRIORITY_NAMES[p]: self._throttled[p] for p in PRIORITY_NAMES},
+                "queued_seconds": {PRIORITY_NAMES[p]: self._queued[p] for p in PRIORITY_NAMES},
+                "active_connections": dict(self._active),
+                "waiting_connections": len(self._waiting),
+                "peak_connections": self._peak_connections,
+            }
+
+    def format_stats(self):
+        s = self.stats()
+        total = sum(s["bytes"].values())
+        limit = f"{s['rate_limit'] / 1024 ** 2:.1f} MB/s" if s["rate_limit"] else "제한 없음"
+        lines = [
+            f"네트워크: 누적 {total / 1024 ** 2:.1f} MB, 최근 {s['recent_rate'] / 1024 ** 2:.1f} MB/s"
+            f" (한도 {limit}"
+            + (f", 사용률 {s['utilization'] * 100:.0f}%" if s["utilization"] is not None else "")
+            + f"), 최대 동시 연결 {s['peak_connections']}개"
+        ]
+        for name in PRIORITY_NAMES.values():
+            if s["bytes"][name] or s["queued_seconds"][name]:
+                lines.append(
+                    f"  {name:<10} {s['bytes'][name] / 1024 ** 2:8.1f} MB"
+                    f"  속도 제한 대기 {s['throttled_seconds'][name]:.1f}초"
+                    f"  연결 대기 {s['queued_seconds'][name]:.1f}초"
+                )
+        return "\n".join(lines)
+
+
+def _int_from_env(name):
+    value = os.environ.get(name, "").strip()
+    return int(value) if value else None
+
+
+def governor_from_env():
+    """환경 변수(SETUP_BANDWIDTH_LIMIT 등)로 조절기를 만듭니다."""
+    return NetworkGovernor(
+        rate=parse_rate(os.environ.get(ENV_BANDWIDTH_LIMIT, "")),
+        per_host=_int_from_env(ENV_MAX_CONNECTIONS_PER_HOST),
+        max_connections=_int_from_env(ENV_MAX_CONNECTIONS),
+    )
+
+
+# --- 프로세스 전역 조절기 ---
+_governor = None
+_governor_lock = threading.Lock()
+
+
+def get_governor():
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            _governor = governor_from_env()
+        return _governor
+
+
+def set_governor(governor):
+    """전역 조절기를 바꿉니다 (명령줄 옵션, 시험용). 이전 조절기를 반환합니다."""
+    global _governor
+    with _governor_lock:
+        previous, _governor = _governor, governor
+        return previous
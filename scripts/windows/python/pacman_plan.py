@@ -0,0 +1,322 @@
+# pacman_plan.py (MSYS2 pacman 트랜잭션 계획기)
+#
+# install-deps.sh는 'pacman -Sy --needed'를 두 번, setup.py는 'pacman -Syu'를 두 번 무조건 실행했습니다.
+# 실행할 때마다 동기화 DB를 다시 받고 로그인 셸을 새로 띄웁니다.
+# 이 모듈은 설치된 패키지('pacman -Q')와 업데이트 대상('pacman -Qu')을 한 번만 조회해서
+#   - 요청된 패키지 목록을 합쳐, 아직 설치되지 않은 패키지만 하나의 트랜잭션으로 설치하고
+#   - 동기화 DB가 충분히 최신이고 업데이트할 패키지가 없으면 -Syu를 아예 건너뜁니다.
+# pacman 실행 파일 경로를 인자로 받으므로 Linux에서도 가짜 pacman 스크립트로 시험할 수 있습니다.
+#
+# 사용 예:
+#   python pacman_plan.py --script ../bash/install-deps.sh --dry-run
+#   python pacman_plan.py --pacman ./fake-pacman --db-dir /tmp/sync mingw-w64-ucrt-x86_64-cmake
+
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+
+from step_trace import traced_run
+
+DEFAULT_MAX_DB_AGE = 6 * 60 * 60  # 동기화 DB가 이보다 오래되었으면 -Syu로 다시 받음 (초)
+# 트랜잭션 동안 net_governor 연결 슬롯을 받는 이름 (미러가 여러 곳이어도 하나의 연결로 봄)
+PACMAN_CONNECTION_HOST = "repo.msys2.org"
+MAX_UPGRADE_PASSES = 2  # MSYS2 핵심 패키지(런타임, pacman) 업데이트 후 나머지를 한 번 더 업데이트
+_SCRIPT_PACMAN_RE = re.compile(r"^\s*pacman\s+-S\w*\b")
+
+
+# --- 출력/스크립트 파싱 ---
+def parse_installed(output):
+    """'pacman -Q' 출력 ('이름 버전' 줄) -> {이름: 버전}"""
+    installed = {}
+    for line in output.splitlines():
+        parts = line.split()
+        if len(parts) >= 2:
+            installed[parts[0]] = parts[1]
+    return installed
+
+
+def parse_outdated(output):
+    """
+    'pacman -Qu' 출력 ('이름 현재버전 -> 새버전' 줄) -> {이름: (현재 버전, 새 버전)}
+    IgnorePkg 등으로 '[ignored]'가 붙은 줄은 업데이트되지 않으므로 제외합니다.
+    """
+    outdated = {}
+    for line in output.splitlines():
+        if "[ignored]" in line:
+            continue
+        parts = line.split()
+        if len(parts) >= 4 and parts[2] == "->":
+            outdated[parts[0]] = (parts[1], parts[3])
+    return outdated
+
+
+def parse_group_members(output):
+    """'pacman -Sg 그룹...' 출력 ('그룹 패키지' 줄) -> {그룹: [패키지, ...]}"""
+    groups = {}
+    for line in output.splitlines():
+        parts = line.split()
+        if len(parts) == 2:
+            groups.setdefault(parts[0], []).append(parts[1])
+    return groups
+
+
+def read_script_packages(script_path):
+    """
+    Bash 스크립트에서 'pacman -S... 패키지 \\' 명령의 패키지 목록을 읽습니다.
+    반환값: 명령마다 하나씩 [패키지, ...] 리스트 (스크립트의 순서대로)
+    스크립트를 그대로 진실의 원천으로 두어, 패키지를 추가할 때 한 곳만 고치면 됩니다.
+    """
+    with open(script_path, "r", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+
+    package_lists = []
+    index = 0
+    while index < len(lines):
+        if not _SCRIPT_PACMAN_RE.match(lines[index]):
+            index += 1
+            continue
+        command = ""
+        while index < len(lines):  # 줄 끝 '\'로 이어진 줄을 하나로 합침
+            line = lines[index].rstrip()
+            index += 1
+            if line.endswith("\\"):
+                command += line[:-1] + " "
+                continue
+            command += line
+            break
+        packages = [word for word in command.split()[2:] if not word.startswith("-")]
+        if packages:
+            package_lists.append(packages)
+    return package_lists
+
+
+def merge_package_lists(package_lists):
+    """여러 패키지 목록을 순서를 유지하며 중복 없이 합칩니다."""
+    merged = []
+    seen = set()
+    for packages in package_lists:
+        for name in packages:
+            if name not in seen:
+                seen.add(name)
+                merged.append(name)
+    return merged
+
+
+def sync_db_age(db_dir, clock=time.time):
+    """
+    동기화 DB(<db_dir>/*.db) 중 가장 오래된 파일의 나이(초).
+    DB가 하나도 없으면 None (한 번도 동기화하지 않음).
+    """
+    mtimes = [os.path.getmtime(path) for path in glob.glob(os.path.join(db_dir, "*.db"))]
+    if not mtimes:
+        return None
+    return max(0.0, clock() - min(mtimes))
+
+
+# --- 계획 ---
+class PacmanPlan:
+    def __init__(self, upgrade, refresh, install, outdated, db_age, reason):
+        self.upgrade = upgrade  # 시스템 업데이트(-Su) 실행 여부
+        self.refresh = refresh  # 동기화 DB를 다시 받을지 (-y)
+        self.install = install  # 하나의 트랜잭션으로 설치할 패키지
+        self.outdated = outdated  # {이름: (현재 버전, 새 버전)}
+        self.db_age = db_age  # 동기화 DB 나이 (초, 없으면 None)
+        self.reason = reason  # 업데이트 여부를 정한 이유 (출력용)
+
+    @property
+    def is_empty(self):
+        return not self.upgrade and not self.install
+
+    def describe(self):
+        lines = [f"시스템 업데이트: {'실행' if self.upgrade else '건너뜀'} ({self.reason})"]
+        if self.install:
+            lines.append(f"설치할 패키지 {len(self.install)}개: {' '.join(self.install)}")
+        else:
+            lines.append("설치할 패키지 없음 (모두 설치됨)")
+        return "\n".join(lines)
+
+
+class PacmanPlanner:
+    """
+    pacman: pacman 실행 파일 경로
+    db_dir: 동기화 DB 디렉터리 (기본: pacman 옆의 ../../var/lib/pacman/sync, 없으면 /var/lib/pacman/sync)
+    max_db_age: 이 시간(초)보다 새로운 동기화 DB는 최신으로 봄
+    env: pacman 실행 환경 변수 (기본: 현재 환경 + LC_ALL=C로 출력 형식 고정)
+    clock: DB 나이 계산용 (시험에서 가짜 시계 주입)
+    """
+
+    def __init__(self, pacman="pacman", db_dir=None, max_db_age=DEFAULT_MAX_DB_AGE, env=None, clock=time.time):
+        self.pacman = pacman
+        self.db_dir = db_dir or _default_db_dir(pacman)
+        self.max_db_age = max_db_age
+        self.env = env if env is not None else dict(os.environ, LC_ALL="C")
+        self.clock = clock
+        self.query_count = 0  # 실행한 조회 명령 수 (로그/시험용)
+
+    # --- pacman 실행 ---
+    def _query(self, *args):
+        """조회 명령의 (종료 코드, stdout). 'pacman -Qu'는 업데이트할 것이 없으면 1로 끝나므로 코드는 호출부에서 판단."""
+        self.query_count += 1
+        try:
+            result = traced_run(
+                [self.pacman] + list(args),
+                capture_output=True,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+                env=self.env,
+            )
+        except OSError as e:
+            raise RuntimeError(f"pacman을 실행할 수 없습니다: {self.pacman} ({e})")
+        return result.returncode, result.stdout
+
+    def _transaction(self, args, description):
+        from net_governor import get_governor
+        from setup_utils import run_command
+
+        # --noconfirm 트랜잭션이므로 입력이 필요 없음. 출력은 콘솔(마지막 몇 줄)과 단계 로그로 감
+        with get_governor().connection(PACMAN_CONNECTION_HOST):
+            success, _ = run_command(
+                [self.pacman] + list(args),
+                success_message=f"{description} 완료",
+                error_message=f"{description} 실패",
+                env=self.env,
+            )
+            return success
+
+    def installed_packages(self):
+        code, output = self._query("-Q")
+        if code != 0:
+            raise RuntimeError(f"설치된 패키지 목록을 읽을 수 없습니다 (pacman -Q 종료 코드: {code})")
+        return parse_installed(output)
+
+    def outdated_packages(self):
+        _, output = self._query("-Qu")  # 업데이트할 것이 없으면 종료 코드 1
+        return parse_outdated(output)
+
+    def _expand_groups(self, names, installed):
+        """
+        설치되지 않은 이름 중 그룹(예: mingw-w64-ucrt-x86_64-toolchain)은 구성 패키지로 바꿉니다.
+        구성 패키지가 모두 설치된 그룹은 목록에서 빠집니다. 그룹이 아닌 이름은 그대로 둡니다.
+        """
+        if not names:
+            return []
+        _, output = self._query("-Sg", *names)  # 그룹이 아닌 이름이 섞이면 종료 코드 1
+        groups = parse_group_members(output)
+        missing = []
+        for name in names:
+            if name in groups:
+                missing.extend(member for member in groups[name] if member not in installed)
+            else:
+                missing.append(name)
+        return merge_package_lists([missing])
+
+    # --- 계획/실행 ---
+    def plan(self, package_lists):
+        """
+        package_lists: 설치를 요청한 패키지 목록들 ([[...], [...]] 또는 [...])
+        조회는 'pacman -Q', 'pacman -Qu' 각 한 번 (+ 설치되지 않은 이름이 있으면 'pacman -Sg' 한 번)입니다.
+        """
+        if package_lists and isinstance(package_lists[0], str):
+            package_lists = [package_lists]
+        requested = merge_package_lists(package_lists)
+
+        installed = self.installed_packages()
+        install = self._expand_groups([name for name in requested if name not in installed], installed)
+
+        db_age = sync_db_age(self.db_dir, self.clock)
+        if db_age is None:
+            outdated, refresh, reason = {}, True, "동기화 DB 없음"
+        elif db_age > self.max_db_age:
+            # 오래된 DB 기준의 -Qu 결과는 의미가 없으므로 조회하지 않음
+            outdated, refresh, reason = {}, True, f"동기화 DB가 오래됨 ({db_age / 3600:.1f}시간)"
+        else:
+            outdated = self.outdated_packages()
+            refresh = False
+            reason = (
+                f"업데이트할 패키지 {len(outdated)}개"
+                if outdated
+                else f"동기화 DB 최신 ({db_age / 60:.0f}분 전), 업데이트할 패키지 없음"
+            )
+        upgrade = refresh or bool(outdated)
+        return PacmanPlan(upgrade, refresh, install, outdated, db_age, reason)
+
+    def apply(self, plan):
+        """계획을 실행합니다. 성공하면 True."""
+        if plan.upgrade:
+            for attempt in range(1, MAX_UPGRADE_PASSES + 1):
+                flags = "-Syu" if plan.refresh and attempt == 1 else "-Su"
+                if not self._transaction([flags, "--noconfirm"], f"MSYS2 패키지 업데이트 ({attempt}차)"):
+                    return False
+                # 핵심 패키지만 업데이트하고 끝났을 수 있으므로 남은 업데이트가 있을 때만 한 번 더
+                if attempt < MAX_UPGRADE_PASSES and not self.outdated_packages():
+                    break
+        if plan.install:
+            # DB는 위의 -Syu로 받았거나 이미 최신이므로 -y 없이 한 번에 설치
+            if not self._transaction(
+                ["-S", "--noconfirm", "--needed"] + plan.install,
+                f"패키지 {len(plan.install)}개 설치",
+            ):
+                return False
+        if plan.is_empty:
+            print("pacman: 업데이트/설치할 것이 없습니다.")
+        return True
+
+    def ensure(self, package_lists):
+        plan = self.plan(package_lists)
+        print(plan.describe())
+        return self.apply(plan)
+
+
+def _default_db_dir(pacman):
+    # MSYS2: <루트>/usr/bin/pacman.exe -> <루트>/var/lib/pacman/sync
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(pacman))))
+    candidate = os.path.join(root, "var", "lib", "pacman", "sync")
+    if os.path.isdir(candidate):
+        return candidate
+    return "/var/lib/pacman/sync"
+
+
+def msys2_planner(msys2_root, **kwargs):
+    """
+    MSYS2 설치 경로용 계획기. 로그인 셸 없이 pacman.exe를 직접 실행하고,
+    pacman 훅이 쓰는 도구(bash 등)를 찾도록 usr/bin을 PATH 앞에 둡니다.
+    """
+    usr_bin = os.path.join(msys2_root, "usr", "bin")
+    env = dict(os.environ, LC_ALL="C")
+    env["PATH"] = usr_bin + os.pathsep + env.get("PATH", "")
+    return PacmanPlanner(
+        os.path.join(usr_bin, "pacman.exe"),
+        db_dir=os.path.join(msys2_root, "var", "lib", "pacman", "sync"),
+        env=env,
+        **kwargs,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="pacman 트랜잭션 계획/실행")
+    parser.add_argument("packages", nargs="*", help="설치할 패키지")
+    parser.add_argument("--script", action="append", default=[], help="패키지 목록을 읽을 Bash 스크립트 (여러 번 지정 가능)")
+    parser.add_argument("--pacman", default="pacman", help="pacman 실행 파일")
+    parser.add_argument("--db-dir", help="동기화 DB 디렉터리")
+    parser.add_argument("--max-db-age", type=float, default=DEFAULT_MAX_DB_AGE, help="최신으로 볼 DB 나이 (초)")
+    parser.add_argument("--dry-run", action="store_true", help="계획만 출력")
+    args = parser.parse_args(argv)
+
+    package_lists = [package for script in args.script for package in read_script_packages(script)]
+    if args.packages:
+        package_lists.append(args.packages)
+
+    planner = PacmanPlanner(args.pacman, db_dir=args.db_dir, max_db_age=args.max_db_age)
+    plan = planner.plan(package_lists)
+    print(plan.describe())
+    if args.dry_run:
+        return 0
+    return 0 if planner.apply(plan) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
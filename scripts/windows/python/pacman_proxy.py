@@ -0,0 +1,483 @@
+# pacman_proxy.py (pacman 패키지와 MSYS2 설치 파일을 위한 캐싱 HTTP 프록시)
+#
+# 여러 PC가 같은 패키지(툴체인, clang, cmake, SDL3, Vulkan 등)와 설치 파일을 미러에서 각자 받는 대신,
+# 한 PC에서 이 프록시를 띄우고 모든 mirrorlist.* 맨 앞에 넣으면 두 번째 PC부터는 프록시의 디스크에서 받습니다.
+# (rank_mirrors.py --proxy, init-mirrors.sh/rank-mirrors.sh와 setup.py의 SETUP_PACMAN_PROXY 환경 변수)
+#   - 요청 경로(/mingw/ucrt64/..., /msys/x86_64/..., /distrib/...)를 상위 미러 주소 뒤에 붙여 받고,
+#     연결 오류나 404/5xx이면 다음 미러로 넘어갑니다.
+#   - 패키지(.pkg.tar.zst 등)와 서명, 설치 파일은 내용이 바뀌지 않으므로 캐시에 있으면 sendfile로 바로 보냅니다.
+#   - 동기화 DB(.db, .files와 그 서명)는 요청마다 상위 미러에 조건부 요청(If-None-Match/If-Modified-Since)으로
+#     다시 확인하고, 모든 미러에 연결할 수 없을 때만 캐시된 것을 보냅니다.
+#   - 같은 파일에 대한 동시 요청은 상위에서 한 번만 받습니다. 받는 동안 모든 요청이 받은 만큼씩 따라 읽으므로
+#     다 받을 때까지 기다리다가 pacman의 저속 제한 시간(10초)에 걸리지 않습니다.
+#   - 전체 크기가 max_bytes를 넘으면 가장 오래 쓰지 않은 파일부터 지웁니다.
+# fleet 모드에서는 아티팩트 노드가 같은 포트로 이 프록시를 함께 내놓습니다 (artifact_node.py).
+#
+# 사용 예:
+#   python pacman_proxy.py --cache-dir D:\pacman-cache --port 8767
+#   (다른 PC) set SETUP_PACMAN_PROXY=http://build01:8767 후 setup.py 실행
+
+import argparse
+import hashlib
+import http.server
+import json
+import os
+import threading
+import time
+import uuid
+from email.utils import parsedate_to_datetime
+
+import requests  # HTTP 요청
+
+from artifact_node import send_file
+from net_governor import get_governor, PRIORITY_NORMAL
+
+# --- 상수 ---
+DEFAULT_PORT = 8767
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024 * 10  # 10GB
+# 상위 미러 (init-mirrors.sh의 미러 목록에서 저장소 경로 '/mingw'를 뺀 주소)
+DEFAULT_UPSTREAMS = [
+    "https://mirror.iscas.ac.cn/msys2",
+    "https://mirrors.ustc.edu.cn/msys2",
+    "https://mirrors.bfsu.edu.cn/msys2",
+    "https://mirrors.dotsrc.org/msys2",
+    "https://mirrors.tuna.tsinghua.edu.cn/msys2",
+    "https://mirror.msys2.org",
+    "https://repo.msys2.org",
+]
+PROXY_PATHS = ("/mingw/", "/msys/", "/distrib/")  # 미러 안에서 프록시가 받는 경로
+# 요청마다 상위 미러에 다시 확인하는 동기화 DB
+SYNC_DB_SUFFIXES = (".db", ".db.sig", ".files", ".files.sig")
+UPSTREAM_TIMEOUT = 30  # 상위 미러 연결/읽기 제한 시간 (초)
+CHUNK_SIZE = 1024 * 64
+INDEX_FILE_NAME = "index.json"
+OBJECTS_DIR_NAME = "objects"
+
+
+def upstream_root(mirror_url):
+    """mirrorlist의 미러 주소(https://host/msys2/mingw)에서 저장소 경로를 뺀 주소(https://host/msys2)."""
+    mirror_url = mirror_url.rstrip("/")
+    for repo in ("/mingw", "/msys"):
+        if mirror_url.endswith(repo):
+            return mirror_url[: -len(repo)]
+    return mirror_url
+
+
+def is_sync_db(path):
+    return path.endswith(SYNC_DB_SUFFIXES)
+
+
+class _Fetch:
+    """
+    상위 미러에서 받는 중인 파일 하나. 같은 경로의 요청들이 함께 기다리고 받은 만큼씩 따라 읽습니다.
+    ready가 되면 status가 정해집니다: 200(file을 따라 읽음), 304(캐시 항목 entry를 보냄), 그 외(오류 응답).
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.cond = threading.Condition()
+        self.ready = False
+        self.done = False
+        self.status = None
+        self.total = None  # 모르면 None (연결을 닫아 끝을 알림)
+        self.headers = {}
+        self.written = 0
+        self.error = None
+        self.entry = None
+
+    def publish(self, **fields):
+        with self.cond:
+            for name, value in fields.items():
+                setattr(self, name, value)
+            self.cond.notify_all()
+
+
+class PacmanProxy:
+    """
+    cache_dir: 캐시 디렉터리 (objects/ 아래에 파일, index.json에 목록)
+    upstreams: 상위 미러 주소 목록 (앞에서부터 시도, upstream_root 형식)
+    max_bytes: 캐시 최대 크기
+    host, port, advertise_host: 단독으로 실행할 때의 서버 주소 (artifact_node.ArtifactNode와 같은 규칙)
+    """
+
+    def __init__(
+        self,
+        cache_dir,
+        upstreams=DEFAULT_UPSTREAMS,
+        max_bytes=DEFAULT_MAX_BYTES,
+        host="0.0.0.0",
+        port=DEFAULT_PORT,
+        advertise_host=None,
+        timeout=UPSTREAM_TIMEOUT,
+        governor=None,
+    ):
+        self.cache_dir = cache_dir
+        self.objects_dir = os.path.join(cache_dir, OBJECTS_DIR_NAME)
+        self.index_path = os.path.join(cache_dir, INDEX_FILE_NAME)
+        self.upstreams = [upstream_root(url) for url in upstreams]
+        self.max_bytes = max_bytes
+        self.host = host
+        self.port = port
+        self.advertise_host = advertise_host
+        self.timeout = timeout
+        self.governor = governor
+        self.server = None
+        self.lock = threading.Lock()
+        self.fetches = {}  # 요청 경로 -> 받는 중인 _Fetch
+        self.stats = {
+            "hits": 0,  # 캐시에서 바로 보냄
+            "misses": 0,  # 상위 미러에서 받음
+            "revalidated": 0,  # 동기화 DB가 바뀌지 않음 (304)
+            "stale": 0,  # 미러에 연결할 수 없어 캐시된 DB를 보냄
+            "coalesced": 0,  # 받는 중인 파일을 함께 따라 읽음
+            "evicted": 0,
+            "bytes_fetched": 0,
+            "bytes_served": 0,
+        }
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.entries = self._load_index()  # 요청 경로 -> {"file", "size", "etag", "last_modified", "last_used"}
+
+    # --- 서버 ---
+    @property
+    def url(self):
+        host = self.advertise_host
+        if not host:
+            import socket
+
+            host = socket.gethostname() if self.host in ("", "0.0.0.0") else self.host
+        return f"http://{host}:{self.port}"
+
+    def start(self):
+        """별도 스레드에서 서버를 시작하고 주소를 반환합니다 (port=0이면 빈 포트를 골라 씀)."""
+        self.server = http.server.ThreadingHTTPServer((self.host, self.port), _ProxyHandler)
+        self.server.daemon_threads = True
+        self.server.proxy = self
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, name="pacman-proxy", daemon=True).start()
+        return self.url
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    # --- 요청 처리 ---
+    def handles(self, path):
+        return path.startswith(PROXY_PATHS) and not path.endswith("/") and "/../" not in path + "/"
+
+    def handle(self, handler, path):
+        """handler(BaseHTTPRequestHandler)의 GET 요청을 처리합니다. path는 쿼리를 뺀 경로입니다."""
+        if not self.handles(path):
+            _send_status(handler, 404)
+            return
+        with self.lock:
+            entry = self.entries.get(path)
+            fetch = self.fetches.get(path)
+            if fetch is not None:
+                self.stats["coalesced"] += 1
+            elif entry is not None and not is_sync_db(path):
+                entry["last_used"] = time.time()
+                self.stats["hits"] += 1
+            else:
+                fetch = self.fetches[path] = _Fetch(self._new_object_path(path))
+                threading.Thread(
+                    target=self._fetch, args=(path, fetch, entry), name="pacman-proxy-fetch", daemon=True
+                ).start()
+        if fetch is not None:
+            with fetch.cond:
+                fetch.cond.wait_for(lambda: fetch.ready)
+            if fetch.status == 200:
+                self._send_streaming(handler, fetch)
+                return
+            if fetch.status != 304:
+                _send_status(handler, fetch.status)
+                return
+            entry = fetch.entry
+        self._send_cached(handler, entry)
+
+    def _send_cached(self, handler, entry):
+        headers = _validators(entry)
+        if _not_modified(handler, entry):
+            # pacman은 DB를 받을 때 If-Modified-Since를 보내므로 바뀌지 않았으면 본문 없이 끝남
+            handler.send_response(304)
+            for name, value in headers.items():
+                handler.send_header(name, value)
+            handler.send_header("Content-Length", "0")
+            handler.end_headers()
+            return
+        sent = send_file(handler, os.path.join(self.objects_dir, entry["file"]), "application/octet-stream", headers)
+        with self.lock:
+            self.stats["bytes_served"] += sent
+
+    def _send_streaming(self, handler, fetch):
+        """
+        받는 중인 파일을 받은 만큼씩 보냅니다 (Range는 무시하고 전체를 200으로).
+        상위 미러가 길이를 알려 주지 않았으면 chunked로 보냅니다. 연결을 닫아 끝을 알리면
+        도중에 실패해도 클라이언트가 끝까지 받은 것으로 여기므로, 실패 시 마지막 청크 없이 끊습니다.
+        """
+        chunked = fetch.total is None and handler.request_version != "HTTP/1.0"
+        handler.send_response(200)
+        handler.send_header("Content-Type", "application/octet-stream")
+        if fetch.total is not None:
+            handler.send_header("Content-Length", str(fetch.total))
+        elif chunked:
+            handler.send_header("Transfer-Encoding", "chunked")
+        else:
+            handler.send_header("Connection", "close")
+            handler.close_connection = True
+        for name, value in fetch.headers.items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        sent = 0
+        with open(fetch.file_path, "rb") as f:
+            while True:
+                with fetch.cond:
+                    fetch.cond.wait_for(lambda: fetch.written > sent or fetch.done)
+                    available = fetch.written
+                    failed = fetch.error is not None
+                try:
+                    if available > sent:
+                        if chunked:
+                            handler.wfile.write(f"{available - sent:x}\r\n".encode("ascii"))
+                        sent += handler.connection.sendfile(f, sent, available - sent)
+                        if chunked:
+                            handler.wfile.write(b"\r\n")
+                    elif failed:
+                        # 길이가 모자란(또는 마지막 청크가 없는) 응답을 받은 pacman은 다음 미러로 넘어감
+                        handler.close_connection = True
+                        break
+                    else:
+                        if chunked:
+                            handler.wfile.write(b"0\r\n\r\n")
+                        break
+                except (BrokenPipeError, ConnectionResetError):
+                    handler.close_connection = True
+                    break
+        with self.lock:
+            self.stats["bytes_served"] += sent
+
+    # --- 상위 미러 ---
+    def _fetch(self, path, fetch, entry):
+        try:
+            self._download(path, fetch, entry)
+        except Exception as e:  # 받는 스레드의 오류는 기다리는 요청들에 넘김
+            fetch.publish(error=e)
+        finally:
+            with self.lock:
+                del self.fetches[path]
+            if fetch.status != 200 or fetch.error is not None:
+                _remove(fetch.file_path)
+            fetch.publish(ready=True, done=True, status=fetch.status or 502)
+
+    def _download(self, path, fetch, entry):
+        headers = {"Accept-Encoding": "identity"}  # Content-Length를 그대로 전달하기 위해 압축하지 않음
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        governor = self.governor or get_governor()
+        statuses = []
+        for root in self.upstreams:
+            url = root + path
+            try:
+                with governor.connection(url, PRIORITY_NORMAL), requests.get(
+                    url, headers=headers, stream=True, timeout=self.timeout
+                ) as response:
+                    if response.status_code == 304 and entry is not None:
+                        with self.lock:
+                            entry["last_used"] = time.time()
+                            self.stats["revalidated"] += 1
+                        fetch.publish(status=304, entry=entry, ready=True)
+                        return
+                    if response.status_code != 200:
+                        statuses.append(response.status_code)  # 동기화가 늦은 미러일 수 있으므로 다음 미러로
+                        continue
+                    self._receive(path, fetch, response, governor)
+                    return
+            except requests.exceptions.RequestException as e:
+                if fetch.ready:
+                    raise  # 이미 보내기 시작했으므로 다른 미러로 바꿀 수 없음
+                statuses.append(None)
+                print(f"pacman 프록시: {url} 받기 실패 ({e})")
+        if entry is not None:
+            print(f"pacman 프록시: 상위 미러에 연결할 수 없어 캐시된 파일을 보냅니다: {path}")
+            with self.lock:
+                self.stats["stale"] += 1
+            fetch.publish(status=304, entry=entry, ready=True)
+        elif 404 in statuses:
+            fetch.publish(status=404, ready=True)  # 연결할 수 없는 미러가 있어도 없는 파일로 봄
+        else:
+            fetch.publish(status=502, ready=True)
+
+    def _receive(self, path, fetch, response, governor):
+        length = response.headers.get("Content-Length", "")
+        validators = {
+            name: response.headers[name] for name in ("ETag", "Last-Modified") if response.headers.get(name)
+        }
+        with open(fetch.file_path, "wb") as f:
+            fetch.publish(
+                status=200, total=int(length) if length.isdigit() else None, headers=validators, ready=True
+            )
+            for data in response.iter_content(chunk_size=CHUNK_SIZE):
+                f.write(data)
+                f.flush()  # 따라 읽는 요청이 바로 볼 수 있도록
+                fetch.publish(written=fetch.written + len(data))
+                governor.throttle(len(data), PRIORITY_NORMAL)
+        if fetch.total is not None and fetch.written != fetch.total:
+            raise IOError(f"응답이 중간에 끊겼습니다: {fetch.written}/{fetch.total} 바이트 ({path})")
+        new_entry = {
+            "file": os.path.basename(fetch.file_path),
+            "size": fetch.written,
+            "etag": validators.get("ETag"),
+            "last_modified": validators.get("Last-Modified"),
+            "last_used": time.time(),
+        }
+        with self.lock:
+            old = self.entries.get(path)
+            self.entries[path] = new_entry
+            self.stats["misses"] += 1
+            self.stats["bytes_fetched"] += fetch.written
+            self._evict(keep=path)
+            self._save_index()
+        if old is not None:
+            _remove(os.path.join(self.objects_dir, old["file"]))  # 바뀐 동기화 DB의 이전 내용
+
+    # --- 캐시 ---
+    def _new_object_path(self, path):
+        # 동기화 DB는 새 내용을 다른 파일에 받아, 이전 내용을 보내는 중인 요청과 겹치지 않게 함
+        key = hashlib.sha256(path.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.objects_dir, f"{key}-{uuid.uuid4().hex[:8]}-{os.path.basename(path)}")
+
+    def _evict(self, keep=None):
+        """전체 크기가 max_bytes 이하가 될 때까지 가장 오래 쓰지 않은 파일부터 지웁니다 (lock 안에서 호출)."""
+        total = sum(entry["size"] for entry in self.entries.values())
+        for path, entry in sorted(self.entries.items(), key=lambda item: item[1]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            if path == keep or path in self.fetches:
+                continue
+            del self.entries[path]
+            total -= entry["size"]
+            self.stats["evicted"] += 1
+            _remove(os.path.join(self.objects_dir, entry["file"]))
+
+    def _load_index(self):
+        """목록에 없는 파일(받다가 중단된 파일, 지우지 못한 파일)은 지우고, 파일이 없는 항목은 버립니다."""
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                entries = json.load(f).get("entries", {})
+        except (OSError, ValueError):
+            entries = {}
+        entries = {
+            path: entry
+            for path, entry in entries.items()
+            if os.path.isfile(os.path.join(self.objects_dir, entry["file"]))
+        }
+        known = {entry["file"] for entry in entries.values()}
+        for name in os.listdir(self.objects_dir):
+            if name not in known:
+                _remove(os.path.join(self.objects_dir, name))
+        return entries
+
+    def _save_index(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"entries": self.entries}, f)
+        os.replace(tmp_path, self.index_path)
+
+    def cached_bytes(self):
+        with self.lock:
+            return sum(entry["size"] for entry in self.entries.values())
+
+
+class _ProxyHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # 연결 재사용 (pacman은 미러 하나에 여러 파일을 요청)
+    server_version = "setup-pacman-proxy"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.server.proxy.handle(self, self.path.split("?", 1)[0])
+
+
+def _send_status(handler, code):
+    handler.send_response(code)
+    handler.send_header("Content-Length", "0")
+    handler.end_headers()
+
+
+def _validators(entry):
+    headers = {}
+    if entry.get("etag"):
+        headers["ETag"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["Last-Modified"] = entry["last_modified"]
+    return headers
+
+
+def _not_modified(handler, entry):
+    """클라이언트의 조건부 요청 헤더가 캐시된 내용과 일치하면 True."""
+    if_none_match = handler.headers.get("If-None-Match")
+    if if_none_match and entry.get("etag"):
+        return entry["etag"] in [tag.strip() for tag in if_none_match.split(",")]
+    if_modified_since = handler.headers.get("If-Modified-Since")
+    if if_modified_since and entry.get("last_modified"):
+        try:
+            return parsedate_to_datetime(entry["last_modified"]) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except PermissionError:
+        pass  # Windows에서 아직 보내는 중인 파일은 지울 수 없음 (다음 시작 때 _load_index가 정리)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="pacman 패키지와 MSYS2 설치 파일을 위한 캐싱 HTTP 프록시")
+    parser.add_argument("--cache-dir", required=True, help="캐시 디렉터리")
+    parser.add_argument("--host", default="0.0.0.0", help="바인드 주소")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="포트")
+    parser.add_argument("--max-gb", type=float, default=DEFAULT_MAX_BYTES / 1024 ** 3, help="캐시 최대 크기 (GB)")
+    parser.add_argument(
+        "--mirrorlist", help="상위 미러를 읽을 mirrorlist 파일 (기본: init-mirrors.sh의 미러 목록)"
+    )
+    parser.add_argument("--upstream", action="append", default=[], help="상위 미러 주소 (여러 번 지정 가능)")
+    args = parser.parse_args(argv)
+
+    upstreams = list(args.upstream)
+    if args.mirrorlist:
+        from rank_mirrors import read_mirrors_from_mirrorlist
+
+        upstreams += read_mirrors_from_mirrorlist(args.mirrorlist)
+    proxy = PacmanProxy(
+        args.cache_dir,
+        upstreams=upstreams or DEFAULT_UPSTREAMS,
+        max_bytes=int(args.max_gb * 1024 ** 3),
+        host=args.host,
+        port=args.port,
+    )
+    url = proxy.start()
+    print(f"pacman 프록시 시작: {url} (캐시 {proxy.cached_bytes() / 1024 ** 2:.1f} MB, 상위 미러 {len(proxy.upstreams)}개)")
+    print(f"mirrorlist에 넣을 주소: {url}/mingw (rank_mirrors.py --proxy {url})")
+    try:
+        while True:
+            time.sleep(60)
+            print(f"pacman 프록시 통계: {proxy.stats}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        proxy.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
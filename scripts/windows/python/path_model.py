@@ -0,0 +1,318 @@
+# path_model.py (PATH 값을 한 번 파싱해 정규화 색인으로 다루는 모델: 중복/없는 디렉터리 정리, 변경분만 기록)
+#
+# add_to_system_path는 호출할 때마다 PATH 전체를 다시 나누고 normcase로 선형 비교했고,
+# 현재 세션 PATH는 시스템 PATH와 사용자 PATH를 중복 제거 없이 이어 붙였습니다.
+# PATH가 길고 중복이 많으면 프로세스를 띄우거나 실행 파일을 찾을 때마다 느려집니다.
+#
+# PathModel은 값을 한 번 나눈 뒤 항목마다 %VAR%를 풀고(메모이즈) Windows 규칙으로 정규화한 키를
+# 색인해 두므로, 포함 검사/추가/삭제가 O(1)입니다. compact()는 중복과 없는 디렉터리를 찾아
+# 제거하고, changes()는 원래 값과 달라졌을 때만 새 값을 돌려주어 바뀐 것만 기록하게 합니다.
+#
+# 사용 예 (Windows, 시스템 PATH 점검):
+#   python path_model.py --scope machine             중복/없는 디렉터리 보고
+#   python path_model.py --scope machine --apply     중복 제거 후 기록 (--remove-dead: 없는 디렉터리도)
+
+import argparse
+import functools
+import ntpath
+import os
+import re
+import sys
+
+PATH_SEPARATOR = ";"
+DEFAULT_PATHEXT = ".COM;.EXE;.BAT;.CMD"
+_VAR_RE = re.compile(r"%([^%;]+)%")
+_MAX_EXPAND_DEPTH = 8  # %A%가 %B%를 참조하는 식의 중첩 한도 (순환 참조 방지)
+
+
+@functools.lru_cache(maxsize=4096)
+def normalize_key(directory):
+    """
+    비교용 키: Windows 규칙(대소문자 무시, '/'와 '\\' 동일, 끝 구분자 무시)으로 정규화합니다.
+    Linux에서 실행해도 같은 결과가 나오도록 ntpath를 씁니다.
+    """
+    directory = directory.strip().strip('"')
+    if not directory:
+        return ""
+    key = ntpath.normcase(ntpath.normpath(directory))
+    return key.rstrip("\\") or key
+
+
+class VariableExpander:
+    """
+    %VAR% 참조를 variables로 풉니다 (이름은 대소문자 무시). 없는 변수는 그대로 둡니다 (Windows와 동일).
+    같은 문자열은 한 번만 풀고 결과를 기억합니다.
+    """
+
+    def __init__(self, variables=None):
+        self.variables = {name.upper(): value for name, value in (variables or {}).items()}
+        self._cache = {}
+
+    def expand(self, text):
+        cached = self._cache.get(text)
+        if cached is None:
+            cached = self._cache[text] = self._expand(text, 0)
+        return cached
+
+    def _expand(self, text, depth):
+        if "%" not in text or depth >= _MAX_EXPAND_DEPTH:
+            return text
+
+        def replace(match):
+            value = self.variables.get(match.group(1).upper())
+            if value is None:
+                return match.group(0)
+            return self._expand(value, depth + 1)
+
+        return _VAR_RE.sub(replace, text)
+
+    def is_resolved(self, text):
+        """모든 %VAR%가 풀렸으면 True."""
+        return _VAR_RE.search(self.expand(text)) is None
+
+
+class PathEntry:
+    def __init__(self, raw, directories, resolved):
+        self.raw = raw  # 레지스트리에 기록된 그대로 (예: %MSYS2_PATH%)
+        self.directories = directories  # 풀린 실제 디렉터리 목록 (변수 하나가 여러 디렉터리일 수 있음)
+        self.resolved = resolved  # 모든 %VAR%가 풀렸는지
+        self.raw_key = normalize_key(raw)
+        self.keys = [normalize_key(d) for d in directories]
+
+    @property
+    def is_reference(self):
+        return "%" in self.raw
+
+    def __repr__(self):
+        return f"PathEntry({self.raw!r})"
+
+
+class PathModel:
+    """
+    value: PATH 문자열 (';'로 구분)
+    variables: %VAR% 풀이에 쓸 변수 {이름: 값} (기본: os.environ)
+    isdir: 디렉터리 존재 확인 함수 (결과는 기억함, 시험에서 가짜 함수 주입)
+    """
+
+    def __init__(self, value="", variables=None, isdir=os.path.isdir, sep=PATH_SEPARATOR):
+        self.sep = sep
+        self.expander = VariableExpander(os.environ if variables is None else variables)
+        self._isdir = isdir
+        self._isdir_cache = {}
+        self.original = [e.strip() for e in value.split(sep) if e.strip()]
+        self.entries = []
+        self._raw_index = {}  # raw 키 -> 항목 수 (같은 raw가 여러 번 있을 수 있음)
+        self._dir_index = {}  # 디렉터리 키 -> 항목 수
+        for raw in self.original:
+            self._append(self._make_entry(raw))
+
+    # --- 색인 ---
+    def _make_entry(self, raw):
+        if "%" not in raw:  # 대부분의 항목: 풀 것이 없음
+            return PathEntry(raw, [raw], True)
+        expanded = self.expander.expand(raw)
+        directories = [d.strip() for d in expanded.split(self.sep) if d.strip()]
+        return PathEntry(raw, directories, self.expander.is_resolved(raw))
+
+    def _index(self, entry, delta):
+        for index, key in ((self._raw_index, entry.raw_key), *((self._dir_index, k) for k in entry.keys)):
+            count = index.get(key, 0) + delta
+            if count > 0:
+                index[key] = count
+            else:
+                index.pop(key, None)
+
+    def _append(self, entry, front=False):
+        if front:
+            self.entries.insert(0, entry)
+        else:
+            self.entries.append(entry)
+        self._index(entry, 1)
+
+    def _rebuild(self, entries):
+        self.entries = []
+        self._raw_index = {}
+        self._dir_index = {}
+        for entry in entries:
+            self._append(entry)
+
+    def isdir(self, directory):
+        key = normalize_key(directory)
+        if key not in self._isdir_cache:
+            self._isdir_cache[key] = self._isdir(directory)
+        return self._isdir_cache[key]
+
+    # --- 조회 ---
+    def __contains__(self, entry):
+        """entry(원문 또는 디렉터리)가 이미 PATH에 있는지. %VAR%는 원문으로, 실제 경로는 디렉터리로 비교."""
+        key = normalize_key(entry)
+        if key in self._raw_index:
+            return True
+        return "%" not in entry and key in self._dir_index
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def value(self):
+        """레지스트리에 기록할 값 (%VAR%는 그대로)."""
+        return self.sep.join(entry.raw for entry in self.entries)
+
+    def directories(self, unique=True):
+        """프로세스가 실제로 검색하는 디렉터리 순서 (unique=True면 먼저 나온 것만)."""
+        seen = set()
+        result = []
+        for entry in self.entries:
+            for directory, key in zip(entry.directories, entry.keys):
+                if unique and key in seen:
+                    continue
+                seen.add(key)
+                result.append(directory)
+        return result
+
+    def expanded_value(self, unique=True):
+        """%VAR%를 풀고 (기본) 중복을 뺀 값. 현재 세션의 os.environ["PATH"]용."""
+        return self.sep.join(self.directories(unique))
+
+    # --- 변경 ---
+    def add(self, entry, front=False):
+        """없을 때만 추가합니다. 추가했으면 True."""
+        entry = entry.strip()
+        if not entry or entry in self:
+            return False
+        self._append(self._make_entry(entry), front)
+        return True
+
+    def remove(self, entry):
+        """
+        원문이 같은 항목, 또는 같은 디렉터리를 가리키는 (%VAR%가 없는) 항목을 모두 제거합니다.
+        제거한 수를 반환합니다.
+        """
+        key = normalize_key(entry)
+        kept = [
+            e for e in self.entries if e.raw_key != key and (e.is_reference or key not in e.keys)
+        ]
+        removed = len(self.entries) - len(kept)
+        if removed:
+            self._rebuild(kept)
+        return removed
+
+    # --- 정리 ---
+    def duplicates(self):
+        """
+        앞에서 이미 나온 항목과 겹치는 항목 목록.
+        - 원문이 같은 항목 (예: %MSYS2_PATH%가 두 번)
+        - %VAR%가 없는 경로가 앞의 %VAR%가 없는 항목과 같은 디렉터리를 가리키는 경우
+        %VAR%가 관련된 항목은 나중에 변수 값이 바뀔 수 있으므로 원문이 같을 때만 중복으로 봅니다.
+        (변수로 풀린 디렉터리와 같은 경로가 따로 있어도 지우지 않음)
+        """
+        seen_raw = set()
+        seen_dirs = set()
+        result = []
+        for entry in self.entries:
+            if entry.raw_key in seen_raw or (
+                not entry.is_reference and entry.keys and all(k in seen_dirs for k in entry.keys)
+            ):
+                result.append(entry)
+            seen_raw.add(entry.raw_key)
+            if not entry.is_reference:
+                seen_dirs.update(entry.keys)
+        return result
+
+    def dead_entries(self):
+        """
+        존재하지 않는 디렉터리를 가리키는 항목. 변수가 다 풀리지 않았거나
+        여러 디렉터리로 풀리는 참조는 판단할 수 없으므로 제외합니다.
+        """
+        return [
+            entry
+            for entry in self.entries
+            if entry.resolved and len(entry.directories) == 1 and not self.isdir(entry.directories[0])
+        ]
+
+    def compact(self, remove_dead=False):
+        """중복(과 remove_dead면 없는 디렉터리)을 제거하고 {"duplicates": [...], "dead": [...]} 보고를 반환합니다."""
+        duplicates = self.duplicates()
+        dead = self.dead_entries()
+        drop = {id(e) for e in duplicates}
+        if remove_dead:
+            drop |= {id(e) for e in dead}
+        if drop:
+            self._rebuild([e for e in self.entries if id(e) not in drop])
+        return {"duplicates": [e.raw for e in duplicates], "dead": [e.raw for e in dead]}
+
+    # --- 변경분 ---
+    def diff(self):
+        """원래 값 대비 (추가된 항목, 제거된 항목). 순서만 바뀐 항목은 포함하지 않습니다."""
+        before = [normalize_key(raw) for raw in self.original]
+        before_keys = set(before)
+        added = [e.raw for e in self.entries if e.raw_key not in before_keys]
+        after_counts = {}
+        for entry in self.entries:
+            after_counts[entry.raw_key] = after_counts.get(entry.raw_key, 0) + 1
+        removed = []
+        for raw, key in zip(self.original, before):
+            if after_counts.get(key, 0) > 0:
+                after_counts[key] -= 1
+            else:
+                removed.append(raw)
+        return added, removed
+
+    def changes(self):
+        """값이 원래와 다르면 새 값, 같으면 None (바뀐 것이 없으면 기록하지 않기 위함)."""
+        value = self.value
+        return None if value == self.sep.join(self.original) else value
+
+    # --- 실행 파일 찾기 ---
+    def which(self, name, pathext=None):
+        """PATH 순서대로 name 실행 파일을 찾습니다 (shutil.which와 같은 규칙, 중복 디렉터리는 한 번만)."""
+        extensions = [""]
+        if os.name == "nt" and not os.path.splitext(name)[1]:
+            extensions = [ext.lower() for ext in (pathext or os.environ.get("PATHEXT", DEFAULT_PATHEXT)).split(";") if ext]
+        for directory in self.directories():
+            for ext in extensions:
+                candidate = os.path.join(directory, name + ext)
+                if os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+                    return candidate
+        return None
+
+
+def session_path_model(machine_path, user_path, variables=None):
+    """시스템 PATH 뒤에 사용자 PATH를 이어 붙인 모델 (Windows가 새 프로세스의 PATH를 만드는 순서)."""
+    return PathModel(f"{machine_path or ''}{PATH_SEPARATOR}{user_path or ''}", variables)
+
+
+def format_report(report):
+    lines = []
+    for label, key in (("중복", "duplicates"), ("없는 디렉터리", "dead")):
+        entries = report[key]
+        lines.append(f"{label} {len(entries)}개" + (":" if entries else ""))
+        lines.extend(f"  {entry}" for entry in entries)
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PATH 중복/없는 디렉터리 점검 및 정리")
+    parser.add_argument("--scope", choices=["machine", "user"], default="machine")
+    parser.add_argument("--remove-dead", action="store_true", help="없는 디렉터리도 제거")
+    parser.add_argument("--apply", action="store_true", help="정리한 값을 레지스트리에 기록")
+    args = parser.parse_args(argv)
+
+    from setup_utils import begin_environment_transaction, get_env_variable
+
+    model = PathModel(get_env_variable("Path", args.scope) or "")
+    report = model.compact(remove_dead=args.remove_dead)
+    print(format_report(report))
+    if model.changes() is None:
+        print("정리할 항목이 없습니다.")
+        return 0
+    if not args.apply:
+        print("--apply를 지정하면 레지스트리에 기록합니다.")
+        return 0
+    with begin_environment_transaction(args.scope) as tx:
+        tx.compact_path(remove_dead=args.remove_dead)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,297 @@
+# rank_mirrors.py (MSYS2 미러 동시 측정 및 mirrorlist.* 생성)
+#
+# rank-mirrors.sh는 미러마다 10초씩 210MB 패키지를 순서대로 받아 속도를 재므로
+# 전체 목록을 측정하는 데 수 분이 걸린다. 여기서는 모든 미러를 동시에 측정하고,
+# 크기가 제한된 Range 요청으로 응답 지연(TTFB)과 처리량을 함께 잰다.
+# 측정 결과는 TTL 동안 캐시하여 재실행 시 네트워크를 쓰지 않는다.
+#
+# 사용 예 (Windows 쪽 Python에서 MSYS2 디렉터리를 직접 지정):
+#   python rank_mirrors.py --mirrorlist-dir C:\msys64\etc\pacman.d
+#   python rank_mirrors.py --mirrorlist-dir C:\msys64\etc\pacman.d --proxy http://build01:8767
+
+import argparse
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests  # HTTP 요청
+
+from net_governor import get_governor, PRIORITY_BACKGROUND
+
+# --- 상수 ---
+MIRRORLIST_DIR = "/etc/pacman.d"
+EXTENSIONS = ["clang32", "clang64", "mingw", "mingw32", "mingw64", "msys", "ucrt64"]
+
+# mingw-w64-ucrt-x86_64-arm-none-eabi-gcc-13.3.0-1-any.pkg.tar.zst 210MB
+TEST_PACKAGE = "mingw-w64-ucrt-x86_64-arm-none-eabi-gcc-13.3.0-1-any.pkg.tar.zst"
+TEST_REPO = "ucrt64"
+
+DEFAULT_PROBE_BYTES = 1024 * 1024 * 4  # 미러당 최대 수신량 (4MB, Range 요청)
+DEFAULT_PROBE_TIMEOUT = 10.0  # 미러당 최대 측정 시간 (초)
+DEFAULT_MAX_WORKERS = 16
+DEFAULT_CACHE_TTL = 60 * 60 * 24  # 측정 결과 유효 시간 (1일)
+CHUNK_SIZE = 1024 * 64
+# 순위 계산에 쓰는 기준 패키지 크기: 응답 지연과 처리량을 함께 반영하기 위함
+REFERENCE_PACKAGE_BYTES = 1024 * 1024 * 16
+
+
+class MirrorScore:
+    def __init__(self, url, ttfb=None, throughput=0.0, error=None, measured_at=None):
+        self.url = url
+        self.ttfb = ttfb  # 첫 응답까지 걸린 시간 (초)
+        self.throughput = throughput  # 바이트/초
+        self.error = error
+        self.measured_at = measured_at if measured_at is not None else time.time()
+
+    @property
+    def ok(self):
+        return self.error is None and self.throughput > 0
+
+    def estimated_time(self, reference_bytes=REFERENCE_PACKAGE_BYTES):
+        """reference_bytes 크기 패키지 하나를 받는 데 걸릴 것으로 예상되는 시간 (초)."""
+        if not self.ok:
+            return float("inf")
+        return self.ttfb + reference_bytes / self.throughput
+
+    def sort_key(self):
+        # 실패한 미러는 맨 뒤, 그 외에는 예상 다운로드 시간(TTFB + 크기/처리량) 오름차순
+        return (not self.ok, self.estimated_time())
+
+    def to_dict(self):
+        return {
+            "url": self.url,
+            "ttfb": self.ttfb,
+            "throughput": self.throughput,
+            "error": self.error,
+            "measured_at": self.measured_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data["url"],
+            ttfb=data.get("ttfb"),
+            throughput=data.get("throughput", 0.0),
+            error=data.get("error"),
+            measured_at=data.get("measured_at"),
+        )
+
+    def __repr__(self):
+        return f"MirrorScore({self.url!r}, ttfb={self.ttfb}, throughput={self.throughput:.0f})"
+
+
+# --- 측정 ---
+def probe_mirror(
+    mirror_url,
+    test_path=f"{TEST_REPO}/{TEST_PACKAGE}",
+    probe_bytes=DEFAULT_PROBE_BYTES,
+    timeout=DEFAULT_PROBE_TIMEOUT,
+    clock=time.monotonic,
+    governor=None,
+):
+    """
+    미러 하나의 TTFB와 처리량을 측정합니다. 실패해도 예외 대신 error가 채워진 점수를 반환합니다.
+    연결 슬롯은 조절기(governor)에서 받지만, 속도 제한을 걸면 측정값이 한도로 뭉개지므로
+    받은 바이트는 통계에만 기록합니다.
+    """
+    governor = governor or get_governor()
+    url = f"{mirror_url.rstrip('/')}/{test_path}"
+    with governor.connection(url, PRIORITY_BACKGROUND):
+        return _probe(mirror_url, url, probe_bytes, timeout, clock, governor)
+
+
+def _probe(mirror_url, url, probe_bytes, timeout, clock, governor):
+    started_at = clock()
+    try:
+        with requests.get(
+            url,
+            headers={"Range": f"bytes=0-{probe_bytes - 1}"},
+            stream=True,
+            timeout=timeout,
+        ) as response:
+            response.raise_for_status()
+            first_byte_at = clock()
+            received = 0
+            for data in response.iter_content(chunk_size=CHUNK_SIZE):
+                received += len(data)
+                governor.account(len(data), PRIORITY_BACKGROUND)
+                # Range를 무시하는 미러도 있으므로 수신량과 시간으로 직접 제한
+                if received >= probe_bytes or clock() - started_at >= timeout:
+                    break
+            elapsed = clock() - first_byte_at
+    except requests.exceptions.RequestException as e:
+        return MirrorScore(mirror_url, error=str(e))
+
+    throughput = received / elapsed if elapsed > 0 else float(received)
+    return MirrorScore(mirror_url, ttfb=first_byte_at - started_at, throughput=throughput)
+
+
+def rank_mirrors(
+    mirror_urls,
+    max_workers=DEFAULT_MAX_WORKERS,
+    cache_path=None,
+    cache_ttl=DEFAULT_CACHE_TTL,
+    **probe_kwargs,
+):
+    """
+    미러들을 동시에 측정하고 빠른 순서로 정렬된 MirrorScore 목록을 반환합니다.
+    cache_path가 주어지면 TTL 안의 측정 결과는 재사용하고, 새 결과를 저장합니다.
+    """
+    cached = load_score_cache(cache_path, cache_ttl) if cache_path else {}
+    scores = {url: cached[url] for url in mirror_urls if url in cached}
+    to_probe = [url for url in dict.fromkeys(mirror_urls) if url not in scores]
+
+    if to_probe:
+        print(f"미러 {len(to_probe)}개 동시 측정 중 (캐시 사용: {len(scores)}개)...")
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(to_probe)))) as executor:
+            for score in executor.map(lambda url: probe_mirror(url, **probe_kwargs), to_probe):
+                scores[score.url] = score
+        if cache_path:
+            save_score_cache(cache_path, {**cached, **scores})
+
+    return sorted(scores.values(), key=MirrorScore.sort_key)
+
+
+# --- 캐시 ---
+def load_score_cache(cache_path, ttl, now=None):
+    """TTL 안에 측정된 점수만 {url: MirrorScore}로 반환합니다."""
+    now = time.time() if now is None else now
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    scores = {}
+    for item in data.get("scores", []):
+        score = MirrorScore.from_dict(item)
+        # 실패한 측정은 캐시하지 않음 (일시적인 오류일 수 있음)
+        if score.ok and now - score.measured_at < ttl:
+            scores[score.url] = score
+    return scores
+
+
+def save_score_cache(cache_path, scores):
+    directory = os.path.dirname(cache_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"scores": [s.to_dict() for s in scores.values() if s.ok]}, f, indent=2)
+    os.replace(tmp_path, cache_path)
+
+
+# --- mirrorlist 파일 ---
+def read_mirrors_from_mirrorlist(path, repo=TEST_REPO):
+    """'Server = https://host/msys2/mingw/ucrt64/' 형식에서 'https://host/msys2/mingw'를 추출합니다."""
+    mirrors = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line.startswith("Server"):
+                continue
+            url = line.split("=", 1)[1].strip().rstrip("/")
+            if url.endswith(f"/{repo}"):
+                url = url[: -len(repo) - 1]
+            mirrors.append(url)
+    return mirrors
+
+
+def render_mirrorlist(ext, mirror_urls):
+    """mirrorlist.<ext> 내용을 만듭니다 (msys는 $arch, mingw는 $repo로 치환)."""
+    lines = []
+    for url in mirror_urls:
+        if ext == "msys":
+            lines.append(f"Server = {url.replace('mingw', 'msys', 1)}/$arch/")
+        elif ext == "mingw":
+            lines.append(f"Server = {url}/$repo/")
+        else:
+            lines.append(f"Server = {url}/{ext}/")
+    return "\n".join(lines) + "\n"
+
+
+def backup_mirrorlists(mirrorlist_dir, extensions=EXTENSIONS):
+    """각 mirrorlist.<ext>를 .bak으로 백업합니다 (백업이 이미 있으면 건너뜀)."""
+    for ext in extensions:
+        original = os.path.join(mirrorlist_dir, f"mirrorlist.{ext}")
+        backup = original + ".bak"
+        if not os.path.exists(original):
+            print(f"{original} 파일이 존재하지 않습니다.")
+        elif os.path.exists(backup):
+            print(f"{backup} 파일이 이미 존재합니다. 백업을 건너뜁니다.")
+        else:
+            shutil.copy2(original, backup)
+            print(f"{original} -> {backup} 백업 완료")
+
+
+def write_mirrorlists(mirrorlist_dir, mirror_urls, extensions=EXTENSIONS, prepend=()):
+    """정렬된 미러 목록으로 모든 mirrorlist.<ext> 파일을 다시 씁니다."""
+    urls = list(dict.fromkeys(list(prepend) + list(mirror_urls)))
+    for ext in extensions:
+        path = os.path.join(mirrorlist_dir, f"mirrorlist.{ext}")
+        with open(path, "w", encoding="utf-8", newline="\n") as f:
+            f.write(render_mirrorlist(ext, urls))
+    print("미러리스트 파일 저장 완료")
+
+
+def proxy_mirror_url(proxy_url):
+    """pacman_proxy 주소(http://호스트:포트)를 mirrorlist에 넣을 미러 주소 형식(.../mingw)으로 바꿉니다."""
+    return f"{proxy_url.rstrip('/')}/mingw"
+
+
+def use_mirror_proxy(mirrorlist_dir, proxy_url, extensions=EXTENSIONS):
+    """
+    모든 mirrorlist.<ext> 맨 앞에 pacman_proxy를 넣습니다 (측정은 하지 않음).
+    나머지 미러는 백업(.bak)의 원래 목록을 쓰므로 여러 번 실행하거나 프록시 주소가 바뀌어도 쌓이지 않습니다.
+    """
+    backup_mirrorlists(mirrorlist_dir, extensions)
+    source = os.path.join(mirrorlist_dir, f"mirrorlist.{TEST_REPO}.bak")
+    if not os.path.exists(source):
+        source = os.path.join(mirrorlist_dir, f"mirrorlist.{TEST_REPO}")
+    mirrors = read_mirrors_from_mirrorlist(source)
+    write_mirrorlists(mirrorlist_dir, mirrors, extensions, prepend=[proxy_mirror_url(proxy_url)])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MSYS2 미러를 동시에 측정하여 mirrorlist.*를 생성합니다.")
+    parser.add_argument("--mirrorlist-dir", default=MIRRORLIST_DIR)
+    parser.add_argument("--source", help="미러 목록을 읽을 파일 (기본: mirrorlist.ucrt64.bak)")
+    parser.add_argument("--probe-bytes", type=int, default=DEFAULT_PROBE_BYTES)
+    parser.add_argument("--timeout", type=float, default=DEFAULT_PROBE_TIMEOUT)
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS)
+    parser.add_argument("--cache", help="측정 결과 캐시 파일 (기본: <mirrorlist-dir>/mirror-scores.json)")
+    parser.add_argument("--cache-ttl", type=float, default=DEFAULT_CACHE_TTL)
+    parser.add_argument("--proxy", help="mirrorlist 맨 앞에 넣을 pacman_proxy.py 주소 (http://호스트:포트)")
+    args = parser.parse_args(argv)
+
+    backup_mirrorlists(args.mirrorlist_dir)
+    source = args.source or os.path.join(args.mirrorlist_dir, "mirrorlist.ucrt64.bak")
+    mirrors = read_mirrors_from_mirrorlist(source)
+    if not mirrors:
+        print(f"오류: {source}에서 미러를 찾을 수 없습니다.")
+        return 1
+
+    scores = rank_mirrors(
+        mirrors,
+        max_workers=args.workers,
+        cache_path=args.cache or os.path.join(args.mirrorlist_dir, "mirror-scores.json"),
+        cache_ttl=args.cache_ttl,
+        probe_bytes=args.probe_bytes,
+        timeout=args.timeout,
+    )
+
+    print("Sort fastest mirrors:")
+    for score in scores:
+        if score.ok:
+            print(f"{score.throughput / 1048576:09.6f} MB/sec  TTFB {score.ttfb * 1000:7.1f} ms  {score.url}")
+        else:
+            print(f"{'실패':>13}  {score.error}  {score.url}")
+
+    prepend = [proxy_mirror_url(args.proxy)] if args.proxy else []
+    write_mirrorlists(args.mirrorlist_dir, [s.url for s in scores], prepend=prepend)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
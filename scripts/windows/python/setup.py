@@ -29,17 +29,29 @@ try:
     from setup_utils import (
         is_admin,
         run_as_admin_if_needed,
-        run_command_direct_output,
-        set_system_environment_variable,
-        add_to_system_path,
+        run_command,
+        begin_environment_transaction,
         download_msys2_installer,
         install_msys2,
-        remove_msys2_installer,
         configure_powershell_profile_utf8,
         run_msys2_bash_script,
         setup_python_venv_and_packages,
+        create_venv_from_cache,
         update_current_session_path_from_registry,
+        ENV_ARTIFACT_SOURCE,
+        ENV_PACMAN_PROXY,
     )
+    from step_scheduler import (
+        Step,
+        StepScheduler,
+        STATUS_SUCCESS,
+        STATUS_UP_TO_DATE,
+        print_step_summary,
+        select_steps,
+    )
+    from step_journal import StepJournal, fingerprint, file_digest
+    from step_trace import get_tracer
+    from console_output import get_console
 except ImportError as e:
     print(
         "오류: setup_utils.py를 찾을 수 없습니다. 스크립트와 같은 디렉토리에 있는지 확인하세요."
@@ -70,53 +82,75 @@ PYTHON_EXECUTABLE_PATH = (
 # Python 가상 환경에 설치할 패키지
 PYTHON_VENV_PACKAGES = ["mkdocs", "mkdocs-material", "mkdoxy"]
 
-# VSCode 확장
+# VSCode 확장 ('publisher.name@버전'으로 버전 고정 가능)
 VSCODE_EXTENSIONS = [
     "ms-vscode.cpptools-extension-pack",
     "llvm-vs-code-extensions.vscode-clangd",
     "ms-python.python",
 ]
 
+# 동시에 실행할 설정 단계 수 (의존성이 없는 단계끼리만 동시에 실행됨)
+SETUP_MAX_WORKERS = 3
+# 실행 후 요약 표에 보여줄 가장 느린 구간 수
+SETUP_TRACE_TOP = 15
+# 하위 명령 -> 실행할 단계 (None이면 전체). 선택되지 않은 의존 단계는 이미 완료된 것으로 간주
+SETUP_COMMANDS = {
+    "download": ["msys2-download"],
+    "msys2": ["msys2-download", "msys2-install"],
+    "env": ["msys2-env"],
+    "bash": ["msys2-bash"],
+    "wheels": ["wheelhouse"],
+    "venv": ["wheelhouse", "python-packages"],
+    "vscode": ["vscode-extensions"],
+    "all": None,
+}
+# 완료된 단계와 입력 지문을 기록하는 파일 (지문이 같고 결과가 유효하면 다음 실행에서 건너뜀)
+SETUP_JOURNAL_PATH = os.path.join(TEMP_DOWNLOAD_DIR, "setup-journal.json")
+
+# winget으로 설치할 기본 프로그램 {표시 이름: winget ID}
+WINGET_PROGRAMS = {
+    "PowerShell (최신)": "Microsoft.PowerShell",
+    "VSCode": "Microsoft.VisualStudioCode",
+}
+
+# MSYS2 초기 설정 시 순서대로 실행할 Bash 스크립트 (BASH_SCRIPTS_DIR 기준)
+MSYS2_BASH_SCRIPTS = [
+    "setup-pacman.sh",
+]
+# 설치할 패키지 목록을 읽을 스크립트 (BASH_SCRIPTS_DIR 기준).
+# 직접 실행하지 않고 pacman_plan.py가 목록을 합쳐 한 번의 트랜잭션으로 설치하며,
+# 시스템 업데이트(update-packages.sh 역할)도 필요할 때만 실행함.
+MSYS2_PACKAGE_SCRIPTS = [
+    "install-deps.sh",
+]
+MSYS2_VENV_DIR = r"C:\python\msys2-venv"
+# 미리 받아 둔 wheel 디렉터리 (여러 PC가 공유 폴더를 쓰려면 SETUP_WHEELHOUSE_DIR로 지정)
+WHEELHOUSE_DIR = os.environ.get(
+    "SETUP_WHEELHOUSE_DIR", os.path.join(TEMP_DOWNLOAD_DIR, "wheelhouse")
+)
+PYPI_HOST = "pypi.org"  # wheel을 받는 동안 net_governor 연결 슬롯을 받는 호스트
 
-def main():
-    # 0. 관리자 권한 확인 및 요청
-    run_as_admin_if_needed()  # 실패 시 여기서 종료됨
 
-    print("=" * 50)
-    print("개발 환경 설정 스크립트 (Python 버전)")
-    print("=" * 50)
-    print("이 작업은 최초 실행 시 시간이 오래 걸릴 수 있습니다.")
-    print("인터넷 상태 및 컴퓨터 환경에 따라 소요 시간이 달라질 수 있습니다.")
-    print("작업이 완료될 때까지 기다려 주세요...")
-    time.sleep(5)
-    print("\n")
+# --- 설정 단계 ---
+# 각 단계는 step_scheduler.Step으로 선언되고, 의존성이 없는 단계끼리는 동시에 실행됨.
+# 단계 함수가 False를 반환하면 실패로 간주되어, 그 단계에 의존하는 단계만 건너뜀.
+_step_state = {
+    "reinstall_msys2": True,  # main()에서 사용자 입력으로 결정
+    "msys2_installer_exe": None,  # msys2-download 단계의 결과
+    "compact_path": False,  # --compact-path: msys2-env 단계에서 시스템 PATH의 중복 항목 정리
+}
+
 
+def step_install_programs():
     # 1. winget을 사용한 기본 프로그램 설치
     print_section_header("기본 프로그램 설치 (winget)")
-    winget_common_args = [
-        "--accept-package-agreements",
-        "--accept-source-agreements",
-        "-e",
-    ]
+    from winget_packages import install_winget_packages
 
-    programs_to_install = {
-        "PowerShell (최신)": "Microsoft.PowerShell",
-        "VSCode": "Microsoft.VisualStudioCode",
-    }
-
-    all_programs_installed_ok = True
-    for name, prog_id in programs_to_install.items():
-        print(f"--- {name} 설치 시도 ---")
-        success = run_command_direct_output(
-            ["winget", "install"] + winget_common_args + ["--id", prog_id],
-            success_message=f"{name} 설치/업데이트 성공 또는 이미 최신.",
-            error_message=f"{name} 설치/업데이트 실패.",
-        )
-        # if not success:
-        #     all_programs_installed_ok = False
-        #     if prog_id == PYTHON_WINGET_ID:  # Python 설치 실패는 중요
-        #         print(f"경고: 필수 구성 요소인 {name} 설치에 실패했습니다.")
-        print("-" * 20 + "\n")
+    programs_to_install = WINGET_PROGRAMS
+
+    # 설치된 패키지 목록(winget export/list)을 한 번만 조회하고, 없는 패키지만 설치
+    results = install_winget_packages(programs_to_install)
+    all_programs_installed_ok = all(result.ok for result in results)
 
     if not all_programs_installed_ok:
         print("경고: 일부 프로그램 설치에 실패했습니다. 로그를 확인하세요.")
@@ -126,47 +160,65 @@ def main():
 
     # (중요) 프로그램 설치 후 PATH 변경이 있을 수 있으므로, 현재 세션 PATH 갱신
     update_current_session_path_from_registry()
+    return True
 
+
+def step_configure_powershell_profile():
     # 2. PowerShell 프로필 UTF-8 설정 (setup.ps1의 기능)
     print_section_header("PowerShell 프로필 UTF-8 설정")
     configure_powershell_profile_utf8()
     print_section_footer()
+    return True
 
-    # 3. MSYS2 설치 (install-msys2.ps1의 기능)
-    print_section_header("MSYS2 설치")
-    msys2_installer_exe = None
-    if (
-        not os.path.isdir(MSYS2_ROOT_DIR)
-        or input(
-            f"'{MSYS2_ROOT_DIR}' 디렉터리가 이미 존재합니다. MSYS2를 다시 설치하시겠습니까? (y/n): "
-        ).lower()
-        == "y"
-    ):
-
-        if os.path.isdir(MSYS2_ROOT_DIR):
-            print(
-                f"경고: 기존 '{MSYS2_ROOT_DIR}' 디렉터리가 존재합니다. 덮어쓰거나 문제가 발생할 수 있습니다."
-            )
 
-        msys2_version_tag = MSYS2_INSTALLER_GIT_TAG
-        msys2_clean_tag = msys2_version_tag.replace("-", "")
-        msys2_url = f"https://github.com/msys2/msys2-installer/releases/download/{msys2_version_tag}/msys2-x86_64-{msys2_clean_tag}.exe"
-
-        msys2_installer_exe = download_msys2_installer(msys2_url, TEMP_DOWNLOAD_DIR)
-        if msys2_installer_exe:
-            if not install_msys2(msys2_installer_exe, MSYS2_ROOT_DIR):
-                print("MSYS2 설치 실패. 관련된 다음 단계를 건너뛸 수 있습니다.")
-            else:
-                print("MSYS2 설치 성공.")
-        else:
-            print("MSYS2 설치 프로그램 다운로드 실패. MSYS2 설치를 건너뜁니다.")
-    else:
+def step_download_msys2():
+    # 3. MSYS2 설치 (install-msys2.ps1의 기능) - 설치 파일 다운로드
+    if not _step_state["reinstall_msys2"]:
         print(f"MSYS2가 이미 '{MSYS2_ROOT_DIR}'에 설치된 것으로 간주합니다.")
+        return STATUS_UP_TO_DATE  # 받지 않았으므로 성공으로 기록하지 않음
+
+    msys2_version_tag = MSYS2_INSTALLER_GIT_TAG
+    msys2_clean_tag = msys2_version_tag.replace("-", "")
+    msys2_url = f"https://github.com/msys2/msys2-installer/releases/download/{msys2_version_tag}/msys2-x86_64-{msys2_clean_tag}.exe"
+
+    # 설치 파일은 다운로드 캐시(TEMP_DOWNLOAD_DIR\cache)에 남겨 다음 실행에서 재사용
+    installer_exe = None
+    pacman_proxy = os.environ.get(ENV_PACMAN_PROXY)
+    if pacman_proxy:
+        # pacman 프록시는 미러의 distrib/에 있는 같은 설치 파일을 캐시해 둠 (pacman_proxy.py)
+        installer_exe = download_msys2_installer(
+            f"{pacman_proxy.rstrip('/')}/distrib/x86_64/msys2-x86_64-{msys2_clean_tag}.exe",
+            TEMP_DOWNLOAD_DIR,
+        )
+    _step_state["msys2_installer_exe"] = installer_exe or download_msys2_installer(
+        msys2_url, TEMP_DOWNLOAD_DIR
+    )
+    if not _step_state["msys2_installer_exe"]:
+        print("MSYS2 설치 프로그램 다운로드 실패. MSYS2 설치를 건너뜁니다.")
+        return False
+    return True
+
 
-    if msys2_installer_exe:  # 다운로드 했다면 삭제
-        remove_msys2_installer(msys2_installer_exe)
+def step_install_msys2():
+    # 3. MSYS2 설치 (install-msys2.ps1의 기능) - 설치 실행
+    if not _step_state["reinstall_msys2"]:
+        return STATUS_UP_TO_DATE
+
+    print_section_header("MSYS2 설치")
+    if os.path.isdir(MSYS2_ROOT_DIR):
+        print(
+            f"경고: 기존 '{MSYS2_ROOT_DIR}' 디렉터리가 존재합니다. 덮어쓰거나 문제가 발생할 수 있습니다."
+        )
+    success = install_msys2(_step_state["msys2_installer_exe"], MSYS2_ROOT_DIR)
+    if not success:
+        print("MSYS2 설치 실패. 관련된 다음 단계를 건너뛸 수 있습니다.")
+    else:
+        print("MSYS2 설치 성공.")
     print_section_footer()
+    return success
+
 
+def step_configure_msys2_env():
     # 4. MSYS2 관련 환경 변수 설정 (setup.ps1의 기능)
     print_section_header("MSYS2 환경 변수 설정")
     # 파워셸 스크립트에서 $MSYS2_PATH는 가상환경 경로를 포함했음.
@@ -175,9 +227,14 @@ def main():
     # 파워셸 스크립트는 MSYS2_PATH를 String으로 설정하고, Path에 %MSYS2_PATH%를 추가함.
     # 우선 MSYS2_ROOT만 설정. MSYS2_PATH는 Python venv 생성 후 설정.
 
-    set_system_environment_variable(
-        "MSYS2_ROOT", MSYS2_ROOT_DIR, "REG_SZ"
-    )  # String 타입
+    if not is_admin():
+        print("오류: 시스템 환경 변수를 설정하려면 관리자 권한이 필요합니다.")
+        print_section_footer()
+        return False
+
+    # 아래 변경들은 트랜잭션에 모았다가 한 번에 기록하고, 브로드캐스트도 한 번만 수행
+    env_tx = begin_environment_transaction("machine")
+    env_tx.set("MSYS2_ROOT", MSYS2_ROOT_DIR, "REG_SZ")  # String 타입
 
     # MSYS2의 기본 bin 경로들을 시스템 Path에 추가 (필요시)
     # 예: add_to_system_path(os.path.join(MSYS2_ROOT_DIR, "usr", "bin"))
@@ -206,73 +263,155 @@ def main():
     # 이 MSYS2_PATH는 Python venv 생성 후 완전한 의미를 가짐.
     # 사용자 이름 가져오기
     # current_username = getpass.getuser()
-    msys2_venv_scripts_path = os.path.join("C:\\", "python", "msys2-venv", "Scripts")
-
-    # MSYS2_PATH 정의 (String 타입으로 설정할 것이므로, %VAR% 형태는 없음)
-    msys2_path_value = f"{msys2_venv_scripts_path};{os.path.join(MSYS2_ROOT_DIR, 'ucrt64', 'bin')};{os.path.join(MSYS2_ROOT_DIR, 'usr', 'bin')}"
-
-    set_system_environment_variable(
-        "MSYS2_PATH", msys2_path_value, "REG_SZ"
-    )  # String 타입
+    env_tx.set("MSYS2_PATH", msys2_path_value(), "REG_SZ")  # String 타입
 
     # 시스템 Path에 "%MSYS2_PATH%" 문자열 추가
-    # add_to_system_path는 내부적으로 REG_EXPAND_SZ로 Path를 설정하므로, "%MSYS2_PATH%"가 올바르게 확장됨.
-    add_to_system_path("%MSYS2_PATH%", add_front=True)
+    # 트랜잭션은 Path를 REG_EXPAND_SZ로 기록하므로, "%MSYS2_PATH%"가 올바르게 확장됨.
+    env_tx.add_to_path("%MSYS2_PATH%", front=True)
+    if _step_state["compact_path"]:
+        # 같은 디렉터리를 가리키는 중복 항목 정리 (없는 디렉터리는 보고만 함: python path_model.py)
+        env_tx.compact_path()
+    try:
+        env_tx.commit()
+    except PermissionError:
+        print("오류: 환경 변수 레지스트리 접근 권한 없음. 관리자 권한 확인.")
+        print_section_footer()
+        return False
     print_section_footer()
 
     # (중요) 환경 변수 변경 후 PATH 갱신
     update_current_session_path_from_registry()
+    return True
+
+
+def msys2_path_value():
+    msys2_venv_scripts_path = os.path.join(MSYS2_VENV_DIR, "Scripts")
 
+    # MSYS2_PATH 정의 (String 타입으로 설정할 것이므로, %VAR% 형태는 없음)
+    return f"{msys2_venv_scripts_path};{os.path.join(MSYS2_ROOT_DIR, 'ucrt64', 'bin')};{os.path.join(MSYS2_ROOT_DIR, 'usr', 'bin')}"
+
+
+def step_run_msys2_bash_scripts():
     # 5. MSYS2 초기 설정 (Bash 스크립트 실행)
     print_section_header("MSYS2 초기 설정 (Bash 스크립트)")
+    all_scripts_ok = True
     if os.path.isdir(MSYS2_ROOT_DIR):  # MSYS2가 설치되었거나 이미 존재한다고 가정
-        bash_scripts_to_run = [
-            "setup-pacman.sh",
-            "update-packages.sh",  # 1차 업데이트
-            "update-packages.sh",  # 2차 업데이트 (MSYS2 권장)
-            "install-deps.sh",
-        ]
-        for script_rel_path in bash_scripts_to_run:
-            # run_msys2_bash_script의 두 번째 인자는 repo 루트 기준 .sh 파일 경로
-            # powershell 디렉토리를 기준으로 bash 스크립트를 호출하던 파워셸과는 다름.
-            # 여기서는 repo_root_dir를 기준으로 bash 스크립트의 상대경로를 전달.
-            # setup_utils.run_msys2_bash_script 내부에서 이 경로를 처리함.
-            # setup_utils의 run_msys2_bash_script는 파워셸의 $PSScriptRoot 동작을 모방.
-            # 즉, script_path_relative_to_repo는 '../bash/script.sh' 같은 형태여야 함.
-            # 이를 위해, bash 스크립트 이름만 전달하고, 내부에서 '../bash/'를 붙이도록 수정하거나,
-            # 여기서 정확한 상대 경로를 구성.
-            #
-            # 파워셸 스크립트의 호출: & $bashPath -lc "cd '$PSScriptRoot'; ../bash/setup-pacman.sh"
-            # 여기서 '$PSScriptRoot'는 REPO_ROOT_DIR/powershell 이었음.
-            # run_msys2_bash_script 의 두번째 인자는 이 'cd' 이후의 상대 경로.
-            # 예: "../bash/setup-pacman.sh"
-
-            # script_rel_path가 "bash/setup-pacman.sh" 이므로,
-            # 이를 "../bash/setup-pacman.sh" 형태로 변환.
-            # 또는 run_msys2_bash_script가 이 변환을 하도록. (현재는 후자)
-            # setup_utils.py의 run_msys2_bash_script는
-            # script_path_relative_to_repo 를 'bash/script.sh' 형태로 받고,
-            # 내부에서 bash_command_string = f"cd '{msys_style_powershell_dir}'; {script_path_relative_to_repo.replace('bash/', '../bash/')}"
-            # 로 변환하므로, 여기서는 "bash/script.sh" 형태로 전달.
-
-            full_script_path_in_bash_dir = os.path.join(
-                BASH_SCRIPTS_DIR, os.path.basename(script_rel_path)
-            )
-            if not os.path.exists(full_script_path_in_bash_dir):
-                print(
-                    f"경고: Bash 스크립트 '{full_script_path_in_bash_dir}'를 찾을 수 없습니다. 건너뜁니다."
+        bash_scripts_to_run = MSYS2_BASH_SCRIPTS
+        # 스크립트마다 로그인 셸(bash -lc)을 새로 띄우지 않고 한 세션에서 차례로 실행
+        from msys2_shell import msys2_bash_session
+
+        with msys2_bash_session(MSYS2_ROOT_DIR) as session:
+            for script_rel_path in bash_scripts_to_run:
+                # run_msys2_bash_script의 두 번째 인자는 repo 루트 기준 .sh 파일 경로
+                # powershell 디렉토리를 기준으로 bash 스크립트를 호출하던 파워셸과는 다름.
+                # 여기서는 repo_root_dir를 기준으로 bash 스크립트의 상대경로를 전달.
+                # setup_utils.run_msys2_bash_script 내부에서 이 경로를 처리함.
+                # setup_utils의 run_msys2_bash_script는 파워셸의 $PSScriptRoot 동작을 모방.
+                # 즉, script_path_relative_to_repo는 '../bash/script.sh' 같은 형태여야 함.
+                # 이를 위해, bash 스크립트 이름만 전달하고, 내부에서 '../bash/'를 붙이도록 수정하거나,
+                # 여기서 정확한 상대 경로를 구성.
+                #
+                # 파워셸 스크립트의 호출: & $bashPath -lc "cd '$PSScriptRoot'; ../bash/setup-pacman.sh"
+                # 여기서 '$PSScriptRoot'는 REPO_ROOT_DIR/powershell 이었음.
+                # run_msys2_bash_script 의 두번째 인자는 이 'cd' 이후의 상대 경로.
+                # 예: "../bash/setup-pacman.sh"
+
+                # script_rel_path가 "bash/setup-pacman.sh" 이므로,
+                # 이를 "../bash/setup-pacman.sh" 형태로 변환.
+                # 또는 run_msys2_bash_script가 이 변환을 하도록. (현재는 후자)
+                # setup_utils.py의 run_msys2_bash_script는
+                # script_path_relative_to_repo 를 'bash/script.sh' 형태로 받고,
+                # 내부에서 bash_command_string = f"cd '{msys_style_powershell_dir}'; {script_path_relative_to_repo.replace('bash/', '../bash/')}"
+                # 로 변환하므로, 여기서는 "bash/script.sh" 형태로 전달.
+
+                full_script_path_in_bash_dir = os.path.join(
+                    BASH_SCRIPTS_DIR, os.path.basename(script_rel_path)
                 )
-                continue
-
-            print(f"--- {os.path.basename(full_script_path_in_bash_dir)} 실행 ---")
-            run_msys2_bash_script(
-                MSYS2_ROOT_DIR, "bash/" + script_rel_path, REPO_ROOT_DIR
-            )  # REPO_ROOT_DIR 전달
-            print("-" * 20 + "\n")
+                if not os.path.exists(full_script_path_in_bash_dir):
+                    print(
+                        f"경고: Bash 스크립트 '{full_script_path_in_bash_dir}'를 찾을 수 없습니다. 건너뜁니다."
+                    )
+                    continue
+
+                print(f"--- {os.path.basename(full_script_path_in_bash_dir)} 실행 ---")
+                if not run_msys2_bash_script(
+                    MSYS2_ROOT_DIR, "bash/" + script_rel_path, REPO_ROOT_DIR, session=session
+                ):  # REPO_ROOT_DIR 전달
+                    all_scripts_ok = False
+                print("-" * 20 + "\n")
+        if all_scripts_ok:
+            all_scripts_ok = _apply_pacman_plan()
     else:
         print("MSYS2가 설치되지 않아 Bash 스크립트 실행을 건너뜁니다.")
+        all_scripts_ok = False
     print_section_footer()
+    return all_scripts_ok
+
+
+def _apply_pacman_plan():
+    # 설치/업데이트 대상을 한 번만 조회하여 필요한 트랜잭션만 실행
+    from pacman_plan import msys2_planner, read_script_packages
+
+    package_lists = []
+    for name in MSYS2_PACKAGE_SCRIPTS:
+        package_lists += read_script_packages(os.path.join(BASH_SCRIPTS_DIR, name))
+    print("--- pacman 패키지 업데이트/설치 ---")
+    pacman_proxy = os.environ.get(ENV_PACMAN_PROXY)
+    try:
+        if pacman_proxy:
+            from rank_mirrors import use_mirror_proxy
+
+            print(f"mirrorlist 맨 앞에 pacman 프록시 추가: {pacman_proxy}")
+            use_mirror_proxy(os.path.join(MSYS2_ROOT_DIR, "etc", "pacman.d"), pacman_proxy)
+        return msys2_planner(MSYS2_ROOT_DIR).ensure(package_lists)
+    except (OSError, RuntimeError) as e:
+        print(f"pacman 작업 실패: {e}")
+        return False
+
+
+def _wheelhouse_python():
+    """wheel을 받을 인터프리터: 가상 환경과 같은 Python이어야 호환되는 wheel을 받음."""
+    for python_exe in (
+        os.path.join(MSYS2_VENV_DIR, "Scripts", "python.exe"),
+        PYTHON_EXECUTABLE_PATH,
+    ):
+        if os.path.isfile(python_exe):
+            return python_exe
+    return sys.executable
+
+
+def _wheelhouse_requirements():
+    # pip 자체도 받아 두어 가상 환경의 pip 업그레이드도 오프라인으로 진행
+    return PYTHON_VENV_PACKAGES + ["pip"]
+
+
+def step_prefetch_wheelhouse():
+    # 6-1. 가상 환경에 설치할 패키지의 wheel을 미리 받아 둠 (다른 단계와 동시에 실행)
+    from net_governor import get_governor, PRIORITY_BACKGROUND
+    from wheelhouse import get_interpreter_tag, prefetch_wheelhouse
+
+    print_section_header("Python 패키지 wheel 준비")
+    python_exe = _wheelhouse_python()
+    # fleet 모드: 아티팩트 노드의 wheelhouse를 먼저 찾아봄 (fleet.py)
+    artifact_source = os.environ.get(ENV_ARTIFACT_SOURCE)
+    peer_links = []
+    if artifact_source:
+        from artifact_node import WHEELHOUSE_PATH
+
+        peer_links.append(artifact_source.rstrip("/") + WHEELHOUSE_PATH)
+    with get_governor().connection(PYPI_HOST, PRIORITY_BACKGROUND):
+        ok = prefetch_wheelhouse(
+            python_exe,
+            _wheelhouse_requirements(),
+            WHEELHOUSE_DIR,
+            interpreter_tag=get_interpreter_tag(python_exe),
+            peer_links=peer_links,
+        )
+    print_section_footer()
+    return ok
+
 
+def step_install_python_packages():
     # 6. Python 가상 환경 설정 및 패키지 설치 (setup-python.ps1의 기능)
     # print_section_header("Python 가상 환경 및 패키지 설치")
     # if os.path.isdir(MSYS2_ROOT_DIR):  # MSYS2 설치 확인
@@ -299,14 +438,42 @@ def main():
     #     print("MSYS2가 설치되지 않아 Python 가상 환경 설정을 건너뜁니다.")
     # print_section_footer()
 
-    if os.path.isdir(r"C:\python\msys2-venv\Scripts"):
-        run_command_direct_output(  # 여기를 수정
-            [r"C:\python\msys2-venv\Scripts\pip", "install"] + PYTHON_VENV_PACKAGES,
+    from wheelhouse import pip_install_command, missing_requirements
+
+    # wheelhouse 단계에서 받아 둔 wheel로 오프라인 설치 (없는 패키지가 있으면 인덱스 사용)
+    wheelhouse_dir = WHEELHOUSE_DIR
+    missing = missing_requirements(PYTHON_VENV_PACKAGES, WHEELHOUSE_DIR)
+    if missing:
+        print(f"wheelhouse에 없는 패키지가 있어 인덱스에서 설치합니다: {', '.join(missing)}")
+        wheelhouse_dir = None
+
+    if os.path.isdir(os.path.join(MSYS2_VENV_DIR, "Scripts")):
+        ok, _ = run_command(
+            pip_install_command(
+                [os.path.join(MSYS2_VENV_DIR, "Scripts", "pip")],
+                PYTHON_VENV_PACKAGES,
+                wheelhouse_dir,
+            ),
             success_message="패키지 설치 성공.",
             error_message="패키지 설치 실패.",
         )
+        return ok
+    elif os.path.exists(PYTHON_EXECUTABLE_PATH):
+        # 가상 환경이 없으면 (인터프리터, 패키지 목록)별 템플릿을 복사하여 생성
+        return create_venv_from_cache(
+            PYTHON_EXECUTABLE_PATH,
+            PYTHON_VENV_PACKAGES,
+            MSYS2_VENV_DIR,
+            TEMP_DOWNLOAD_DIR,
+            wheelhouse_dir=wheelhouse_dir,
+        )
+    return True
+
 
+def step_install_vscode_extensions():
     # 7. VSCode 확장 설치 (setup.ps1의 기능)
+    from vscode_extensions import install_vscode_extensions
+
     print_section_header("VSCode 확장 설치")
     # 'code' 명령어가 PATH에 있어야 함 (VSCode 설치 시 보통 추가됨)
     # PATH 갱신이 필요할 수 있음. update_current_session_path_from_registry() 호출됨.
@@ -330,31 +497,306 @@ def main():
 
     if code_exe_path:
         print(f"VSCode 실행 파일 확인: {code_exe_path}")
-        for extension_id in VSCODE_EXTENSIONS:
-            print(f"--- {extension_id} 설치 시도 ---")
-            run_command_direct_output(
-                [
-                    code_exe_path,
-                    "--install-extension",
-                    extension_id,
-                    "--force",
-                ],  # --force는 이미 있어도 재설치/업데이트 시도
-                success_message=f"VSCode 확장 '{extension_id}' 설치/업데이트 성공.",
-                error_message=f"VSCode 확장 '{extension_id}' 설치/업데이트 실패.",
-            )
-            print("-" * 20 + "\n")
+        # 설치된 확장을 한 번만 조회하고, 없거나 버전이 다른 확장만 병렬 설치 (--force 재설치 방지)
+        results = install_vscode_extensions(code_exe_path, VSCODE_EXTENSIONS)
+        print_section_footer()
+        return all(result.ok for result in results)
     else:
         print(
             "VSCode 'code' 명령어를 찾을 수 없습니다. VSCode가 PATH에 설치되었는지 확인하세요."
         )
         print("VSCode 확장 설치를 건너뜁니다.")
     print_section_footer()
+    return True
+
+
+# --- 단계 지문 / 사후 조건 ---
+# 지문: 단계 입력(설정 상수, 스크립트 내용)이 바뀌었는지 판단하는 값.
+# 사후 조건: 지문이 같더라도 결과물이 사라졌으면(예: MSYS2 삭제) 다시 실행하기 위한 가벼운 확인.
+def _msys2_installed():
+    return os.path.isfile(os.path.join(MSYS2_ROOT_DIR, "usr", "bin", "bash.exe"))
+
+
+def _msys2_fingerprint():
+    return fingerprint(MSYS2_INSTALLER_GIT_TAG, MSYS2_ROOT_DIR)
+
+
+def _programs_installed():
+    return all(shutil.which(exe) for exe in ("pwsh", "code"))
+
+
+def _msys2_env_applied():
+    return (
+        os.environ.get("MSYS2_ROOT") == MSYS2_ROOT_DIR
+        and os.environ.get("MSYS2_PATH") == msys2_path_value()
+    )
+
+
+def _bash_scripts_fingerprint():
+    # 스크립트 내용이 바뀌면 (예: install-deps.sh에 패키지 추가) 다시 실행
+    scripts = [
+        (name, file_digest(os.path.join(BASH_SCRIPTS_DIR, name)))
+        for name in MSYS2_BASH_SCRIPTS + MSYS2_PACKAGE_SCRIPTS
+    ]
+    return fingerprint(MSYS2_ROOT_DIR, scripts)
+
+
+def _wheelhouse_fingerprint():
+    return fingerprint(_wheelhouse_requirements(), _wheelhouse_python(), WHEELHOUSE_DIR)
+
+
+def _wheelhouse_ready():
+    from wheelhouse import missing_requirements
+
+    return not missing_requirements(_wheelhouse_requirements(), WHEELHOUSE_DIR)
+
+
+def _venv_ready():
+    from venv_cache import missing_packages
+
+    if not os.path.isfile(os.path.join(MSYS2_VENV_DIR, "Scripts", "pip.exe")):
+        return False
+    return not missing_packages(MSYS2_VENV_DIR, PYTHON_VENV_PACKAGES)
+
+
+def build_setup_steps():
+    """설정 단계와 의존 관계를 선언합니다."""
+    return [
+        Step(
+            "programs",
+            step_install_programs,
+            description="기본 프로그램 설치 (winget)",
+            fingerprint=lambda: fingerprint(WINGET_PROGRAMS),
+            postcondition=_programs_installed,
+        ),
+        Step(
+            "powershell-profile",
+            step_configure_powershell_profile,
+            depends_on=["programs"],  # 최신 PowerShell(pwsh)이 설치된 후
+            description="PowerShell 프로필 UTF-8 설정",
+            fingerprint=lambda: fingerprint("utf8-profile"),
+        ),
+        Step(
+            "msys2-download",
+            step_download_msys2,
+            description="MSYS2 설치 파일 다운로드",
+            fingerprint=_msys2_fingerprint,
+            postcondition=_msys2_installed,
+        ),
+        Step(
+            "msys2-install",
+            step_install_msys2,
+            depends_on=["msys2-download"],
+            description="MSYS2 설치",
+            fingerprint=_msys2_fingerprint,
+            postcondition=_msys2_installed,
+        ),
+        Step(
+            "msys2-env",
+            step_configure_msys2_env,
+            # winget 설치 프로그램(PowerShell, VSCode)도 레지스트리 Path를 고치고, 두 단계 모두 끝에서
+            # 현재 세션 PATH를 레지스트리 값으로 덮어씀. 동시에 실행하면 한쪽의 Path 항목이 사라질 수 있음
+            depends_on=["programs"],
+            description="MSYS2 환경 변수 설정",
+            fingerprint=lambda: fingerprint(MSYS2_ROOT_DIR, msys2_path_value()),
+            postcondition=_msys2_env_applied,
+        ),
+        Step(
+            "msys2-bash",
+            step_run_msys2_bash_scripts,
+            depends_on=["msys2-install", "msys2-env"],
+            description="MSYS2 초기 설정 (Bash 스크립트)",
+            fingerprint=_bash_scripts_fingerprint,
+            postcondition=_msys2_installed,
+        ),
+        Step(
+            "wheelhouse",
+            step_prefetch_wheelhouse,
+            description="Python 패키지 wheel 준비",
+            fingerprint=_wheelhouse_fingerprint,
+            postcondition=_wheelhouse_ready,
+        ),
+        Step(
+            "python-packages",
+            step_install_python_packages,
+            depends_on=["msys2-bash", "wheelhouse"],  # 기존 실행 순서 유지 (pacman 작업 후)
+            description="Python 패키지 설치",
+            fingerprint=lambda: fingerprint(PYTHON_VENV_PACKAGES),
+            postcondition=_venv_ready,
+        ),
+        Step(
+            "vscode-extensions",
+            step_install_vscode_extensions,
+            depends_on=["programs"],  # VSCode가 설치된 후
+            description="VSCode 확장 설치",
+            fingerprint=lambda: fingerprint(VSCODE_EXTENSIONS),
+            postcondition=lambda: shutil.which("code") is not None,
+        ),
+    ]
+
+
+def main(
+    command="all",
+    max_workers=SETUP_MAX_WORKERS,
+    force=(),
+    argv=(),
+    bandwidth_limit=None,
+    compact_path=False,
+):
+    """
+    command: SETUP_COMMANDS의 하위 명령 (해당 단계만 실행)
+    force: 저널과 관계없이 다시 실행할 단계 이름 목록 ("all"이면 전체)
+    argv: 관리자 권한으로 재실행할 때 그대로 넘길 명령줄 인자
+    bandwidth_limit: 전체 네트워크 전송 한도 (예: "20M", net_governor.parse_rate 형식)
+    compact_path: msys2-env 단계에서 시스템 PATH의 중복 항목을 정리 (지문과 관계없이 그 단계를 실행)
+    반환값: 모든 단계가 성공(또는 최신 상태)이면 0, 아니면 1
+    """
+    if bandwidth_limit:
+        # 전역 조절기는 처음 사용할 때 환경 변수로 만들어짐
+        os.environ["SETUP_BANDWIDTH_LIMIT"] = bandwidth_limit
+    steps = build_setup_steps()
+    if SETUP_COMMANDS[command] is not None:
+        steps = select_steps(steps, SETUP_COMMANDS[command])
+    step_names = {step.name for step in steps}
+
+    # 0. 관리자 권한 확인 및 요청 (같은 하위 명령/옵션으로 재실행)
+    run_as_admin_if_needed(arguments=subprocess.list2cmdline(list(argv)))
+
+    print("=" * 50)
+    print("개발 환경 설정 스크립트 (Python 버전)")
+    print("=" * 50)
+    print("이 작업은 최초 실행 시 시간이 오래 걸릴 수 있습니다.")
+    print("인터넷 상태 및 컴퓨터 환경에 따라 소요 시간이 달라질 수 있습니다.")
+    print("작업이 완료될 때까지 기다려 주세요...")
+    print(f"실행할 단계: {', '.join(step.name for step in steps)}")
+    print("\n")
+
+    journal = StepJournal(SETUP_JOURNAL_PATH)
+    force = set(force)
+    msys2_forced = bool(force & {"all", "msys2-download", "msys2-install"})
+    if compact_path:
+        _step_state["compact_path"] = True
+        force.add("msys2-env")
+
+    # MSYS2 재설치 여부는 단계들이 동시에 실행되기 전에 미리 물어봄.
+    # 지난 실행에서 같은 버전으로 설치를 마쳤다면 묻지 않음 (--force msys2-install로 재설치)
+    if "msys2-install" not in step_names:
+        # 설치 단계 없이 다운로드만 실행: 설치되어 있지 않거나 강제할 때만 받음
+        _step_state["reinstall_msys2"] = msys2_forced or not _msys2_installed()
+    elif (
+        not msys2_forced
+        and journal.is_fresh("msys2-install", _msys2_fingerprint())
+        and _msys2_installed()
+    ):
+        _step_state["reinstall_msys2"] = False
+    else:
+        _step_state["reinstall_msys2"] = msys2_forced or (
+            not os.path.isdir(MSYS2_ROOT_DIR)
+            or input(
+                f"'{MSYS2_ROOT_DIR}' 디렉터리가 이미 존재합니다. MSYS2를 다시 설치하시겠습니까? (y/n): "
+            ).lower()
+            == "y"
+        )
+        if _step_state["reinstall_msys2"]:
+            force |= {"msys2-download", "msys2-install"}
+
+    # 명령 출력은 실행 중인 명령마다 마지막 몇 줄만 화면에 갱신하고, 전체는 단계별 압축 로그에 남김
+    run_stamp = time.strftime("%Y%m%d-%H%M%S")
+    console = get_console()
+    with console.session(log_dir=os.path.join(TEMP_DOWNLOAD_DIR, "logs", run_stamp)):
+        results = StepScheduler(
+            steps, max_workers=max_workers, journal=journal, force=force & (step_names | {"all"})
+        ).run()
+
+    print_section_header("설정 단계 결과")
+    print_step_summary(results)
+    print()
+    # 단계/하위 프로세스/다운로드별 소요 시간 (chrome://tracing 또는 ui.perfetto.dev에서 열기)
+    tracer = get_tracer()
+    print(tracer.format_summary(top=SETUP_TRACE_TOP))
+    trace_path = os.path.join(
+        TEMP_DOWNLOAD_DIR, "traces", f"setup-trace-{run_stamp}.json"
+    )
+    print(f"trace 저장: {tracer.write_chrome_trace(trace_path)}")
+    if console.log_paths:
+        print(f"명령 출력 로그: {console.log_dir} ({len(console.log_paths)}개 단계)")
+    from net_governor import get_governor
+
+    print(get_governor().format_stats())
+    print_section_footer()
 
     print("=" * 50)
     print("모든 개발 환경 설정 스크립트(Python)가 완료되었습니다.")
     print("시스템 전체에 변경 사항을 적용하려면 컴퓨터를 재시작하는 것이 좋습니다.")
     print("=" * 50)
     # input("Enter 키를 눌러 종료합니다...")
+    ok = all(result.status in (STATUS_SUCCESS, STATUS_UP_TO_DATE) for result in results.values())
+    return 0 if ok else 1
+
+
+def parse_args(argv=None):
+    """
+    setup.py [하위 명령] [--force STEP] [--workers N] [--bandwidth-limit RATE] [--compact-path]
+    하위 명령을 생략하면 전체(all)를 실행합니다.
+    """
+    import argparse  # 명령줄 실행 시에만 필요
+
+    step_names = [step.name for step in build_setup_steps()]
+
+    def bandwidth_limit(text):
+        # 잘못된 값은 첫 다운로드가 아니라 명령줄을 읽을 때 알림
+        from net_governor import parse_rate
+
+        try:
+            parse_rate(text)
+        except ValueError:
+            raise argparse.ArgumentTypeError(
+                f"전송 한도 형식이 올바르지 않습니다: {text!r} (예: 20M, 512K, 1048576)"
+            )
+        return text
+
+    def add_common_arguments(parser, default):
+        # 옵션은 하위 명령 앞/뒤 어디에나 올 수 있음. 하위 명령 쪽 기본값이
+        # 앞에서 지정한 값을 덮어쓰지 않도록 하위 명령에서는 기본값을 두지 않음.
+        parser.add_argument(
+            "--force",
+            action="append",
+            default=[] if default else argparse.SUPPRESS,
+            choices=step_names + ["all"],
+            metavar="STEP",
+            help="저널과 관계없이 다시 실행할 단계 (여러 번 지정 가능, 'all'이면 전체)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=SETUP_MAX_WORKERS if default else argparse.SUPPRESS,
+            help="동시에 실행할 단계 수",
+        )
+        parser.add_argument(
+            "--bandwidth-limit",
+            type=bandwidth_limit,
+            default=None if default else argparse.SUPPRESS,
+            metavar="RATE",
+            help="전체 네트워크 전송 한도 (예: 20M = 초당 20MB, 기본: 제한 없음)",
+        )
+        parser.add_argument(
+            "--compact-path",
+            action="store_true",
+            default=False if default else argparse.SUPPRESS,
+            help="MSYS2 환경 변수 설정 단계에서 시스템 PATH의 중복 항목도 정리",
+        )
+
+    parser = argparse.ArgumentParser(description="개발 환경 설정 스크립트")
+    add_common_arguments(parser, default=True)
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
+    for command, names in SETUP_COMMANDS.items():
+        subparser = subparsers.add_parser(
+            command, help="전체 단계" if names is None else ", ".join(names)
+        )
+        add_common_arguments(subparser, default=False)
+    args = parser.parse_args(argv)
+    args.command = args.command or "all"
+    return args
 
 
 def print_section_header(title):
@@ -379,4 +821,14 @@ if __name__ == "__main__":
     # setup_utils.run_msys2_bash_script 함수에서 REPO_ROOT_DIR을 사용하여
     # bash 스크립트의 정확한 경로를 찾고, 파워셸 스크립트 실행 시의 CWD를 모방합니다.
 
-    main()
+    args = parse_args()
+    sys.exit(
+        main(
+            args.command,
+            max_workers=args.workers,
+            force=args.force,
+            argv=sys.argv[1:],
+            bandwidth_limit=args.bandwidth_limit,
+            compact_path=args.compact_path,
+        )
+    )
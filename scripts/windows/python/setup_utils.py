@@ -1,12 +1,14 @@
 # setup_utils.py (환경 변수 및 시스템 유틸리티 함수)
 
-import winreg
-import ctypes
+# winreg, ctypes, requests(download_engine, artifact_cache)는 불러오는 데 시간이 들고
+# winreg는 Windows에서만 있으므로, 사용하는 함수 안에서 import 합니다.
+# (setup.py의 단계별 실행이 필요한 모듈만 불러오도록)
 import os
 import sys
 import subprocess  # 외부 명령 실행 (예: winget, code, bash)
-import requests  # 파일 다운로드
-from tqdm import tqdm  # 진행률 표시
+from command_runner import run_streaming, DEFAULT_MAX_CAPTURED_LINES  # 출력 스트리밍
+from env_transaction import EnvironmentTransaction, WinregBackend  # 환경 변수 일괄 변경
+from step_trace import trace_span, traced_run, traced_sleep, CATEGORY_SUBPROCESS  # 시간 측정
 
 # --- 상수 ---
 # 환경 변수 변경 브로드캐스트용
@@ -15,10 +17,24 @@ WM_SETTINGCHANGE = 0x001A
 SMTO_ABORTIFHUNG = 0x0002
 SMTO_NOTIMEOUTIFNOTHUNG = 0x0008
 
+# 다운로드 캐시 (dest_dir 아래에 유지, 반복 실행 시 재다운로드 방지)
+ARTIFACT_CACHE_DIR_NAME = "cache"
+ARTIFACT_CACHE_MAX_BYTES = 1024 * 1024 * 1024 * 2  # 2GB
+# 캐시에 없는 파일을 인터넷보다 먼저 받아 올 아티팩트 노드 주소 (fleet.py)
+ENV_ARTIFACT_SOURCE = "SETUP_ARTIFACT_SOURCE"
+# mirrorlist 맨 앞에 넣고 MSYS2 설치 파일도 먼저 받아 볼 pacman 캐싱 프록시 주소 (pacman_proxy.py)
+ENV_PACMAN_PROXY = "SETUP_PACMAN_PROXY"
+
+# 가상 환경 템플릿 캐시 (dest_dir 아래에 유지, venv_cache.py)
+VENV_CACHE_DIR_NAME = "venv-templates"
+VENV_CACHE_MAX_TEMPLATES = 3
+
 
 # --- 기본 유틸리티 ---
 def is_admin():
     try:
+        import ctypes
+
         return ctypes.windll.shell32.IsUserAnAdmin()
     except:
         return False
@@ -32,6 +48,8 @@ def run_as_admin_if_needed(script_path=None, arguments=""):
             script_path = os.path.abspath(sys.argv[0])  # 현재 실행 중인 스크립트
 
         try:
+            import ctypes
+
             executable = sys.executable
             # Windows Terminal 또는 cmd를 통해 재실행
             # (이전 코드의 run_as_admin 로직을 여기에 통합하거나 유사하게 구현)
@@ -58,16 +76,21 @@ def run_command_direct_output(
         f"실행 시작: {' '.join(command_list) if isinstance(command_list, list) else command_list}"
     )
 
+    command_name = (
+        command_list[0] if isinstance(command_list, list) else command_list.split()[0]
+    )
     try:
         # stdout, stderr를 None (기본값)으로 두면 부모의 스트림을 상속받음
-        process = subprocess.run(
-            command_list,
-            shell=shell,
-            cwd=cwd,
-            env=env,
-            check=False,  # 반환 코드 직접 확인
-            # stdin=None, stdout=None, stderr=None (이것이 기본값)
-        )
+        with trace_span(os.path.basename(command_name), CATEGORY_SUBPROCESS) as span:
+            process = subprocess.run(
+                command_list,
+                shell=shell,
+                cwd=cwd,
+                env=env,
+                check=False,  # 반환 코드 직접 확인
+                # stdin=None, stdout=None, stderr=None (이것이 기본값)
+            )
+            span.args["exit_code"] = process.returncode
 
         if process.returncode == 0:
             if success_message:
@@ -102,69 +125,38 @@ def run_command(
     cwd=None,
     env=None,
     capture_output_for_result=False,
+    spool_path=None,
+    max_captured_lines=DEFAULT_MAX_CAPTURED_LINES,
 ):  # capture_output -> capture_output_for_result
     """
     주어진 명령을 실행하고 출력을 실시간으로 스트리밍합니다.
+    stdout/stderr는 별도 스레드에서 동시에 읽으므로 한쪽 파이프가 가득 차도 멈추지 않습니다.
     capture_output_for_result: True이면 stdout, stderr를 캡처하여 반환값으로 사용.
+                               (스트림별 마지막 max_captured_lines 줄만 보관)
                                False이면 실시간 출력만 하고 반환값은 빈 문자열.
+    spool_path: 주어지면 전체 출력을 이 파일에 기록.
     """
     print(
         f"실행 중: {' '.join(command_list) if isinstance(command_list, list) else command_list}"
     )
 
-    # stdout/stderr를 저장할 변수 (capture_output_for_result가 True일 때 사용)
-    full_stdout = []
-    full_stderr = []
-
     try:
-        # Popen으로 프로세스 시작
-        process = subprocess.Popen(
+        # winget 같은 경우 stderr로도 정상 진행률을 출력하므로, stdout처럼 처리.
+        result = run_streaming(
             command_list,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
             shell=shell,
             cwd=cwd,
             env=env,
-            bufsize=1,  # 라인 버퍼링 활성화 (중요)
-            universal_newlines=True,  # text=True와 함께 사용, 라인 엔딩 처리
+            capture=capture_output_for_result,
+            max_captured_lines=max_captured_lines,
+            spool_path=spool_path,
         )
 
-        # 실시간으로 stdout, stderr 읽기
-        # stdout 처리
-        if process.stdout:
-            for line in iter(process.stdout.readline, ""):
-                line_stripped = line.strip()
-                print(line_stripped)  # 실시간 출력
-                sys.stdout.flush()  # 즉시 터미널에 보이도록 플러시
-                if capture_output_for_result:
-                    full_stdout.append(line_stripped)
-            process.stdout.close()
-
-        # stderr 처리 (stdout과 별도로 또는 stdout과 인터리빙되게 처리 가능)
-        # 여기서는 stdout 먼저 다 읽고 stderr 읽지만, select 등을 사용하면 동시 처리 가능
-        # 또는 stderr도 stdout과 같은 방식으로 루프를 돌릴 수 있음 (별도 스레드 또는 비동기)
-        # 더 간단하게는, wait() 호출 후 남은 stderr를 읽는 방식도 있음.
-        # winget 같은 경우 stderr로도 정상 진행률을 출력하므로, stdout처럼 처리.
-        if process.stderr:
-            for line in iter(process.stderr.readline, ""):
-                line_stripped = line.strip()
-                # stderr 출력을 구분하고 싶다면 print(f"STDERR: {line_stripped}")
-                print(line_stripped)  # 실시간 출력 (stderr도 일반 출력처럼)
-                sys.stderr.flush()
-                if capture_output_for_result:
-                    full_stderr.append(line_stripped)
-            process.stderr.close()
-
-        process.wait()  # 프로세스 종료 대기
-
         # 결과 반환 (capture_output_for_result가 True일 때)
-        stdout_result = "\n".join(full_stdout) if capture_output_for_result else ""
-        stderr_result = "\n".join(full_stderr) if capture_output_for_result else ""
+        stdout_result = result.stdout if capture_output_for_result else ""
+        stderr_result = result.stderr if capture_output_for_result else ""
 
-        if process.returncode == 0:
+        if result.returncode == 0:
             if success_message:
                 print(success_message)
             return True, stdout_result
@@ -172,7 +164,7 @@ def run_command(
             err_msg_to_print = (
                 error_message
                 if error_message
-                else f"명령 실행 중 오류 발생 (종료 코드: {process.returncode})"
+                else f"명령 실행 중 오류 발생 (종료 코드: {result.returncode})"
             )
             print(err_msg_to_print)
             # 오류 시에는 stderr 내용을 반환하는 것이 유용할 수 있음
@@ -194,6 +186,8 @@ def run_command(
 def _broadcast_environment_change():
     """시스템에 환경 변수 변경 사항을 알립니다."""
     try:
+        import ctypes
+
         SendMessageTimeout = ctypes.windll.user32.SendMessageTimeoutW
         result = ctypes.c_size_t()  # UIntPtr in C#
         # SMTO_ABORTIFHUNG (0x0002)
@@ -222,6 +216,8 @@ def _broadcast_environment_change():
 
 def get_env_variable(name, scope="machine"):
     """시스템 또는 사용자 환경 변수를 읽습니다 (비확장)."""
+    import winreg
+
     reg_hive_map = {
         "machine": winreg.HKEY_LOCAL_MACHINE,
         "user": winreg.HKEY_CURRENT_USER,
@@ -257,6 +253,8 @@ def set_system_environment_variable(var_name, var_value, var_type="REG_SZ"):
         print("오류: 시스템 환경 변수를 설정하려면 관리자 권한이 필요합니다.")
         return False
 
+    import winreg
+
     reg_type_map = {
         "REG_SZ": winreg.REG_SZ,
         "REG_EXPAND_SZ": winreg.REG_EXPAND_SZ,
@@ -312,6 +310,8 @@ def add_to_system_path(path_to_add, add_expanded_string=True, add_front=False):
         print("오류: 시스템 PATH를 수정하려면 관리자 권한이 필요합니다.")
         return False
 
+    import winreg
+
     key_path = r"SYSTEM\CurrentControlSet\Control\Session Manager\Environment"
     try:
         with winreg.ConnectRegistry(None, winreg.HKEY_LOCAL_MACHINE) as hkey_root:
@@ -332,24 +332,16 @@ def add_to_system_path(path_to_add, add_expanded_string=True, add_front=False):
                 except FileNotFoundError:
                     current_path_value = ""
 
-                # 경로 정규화 및 중복 방지
-                paths = [p.strip() for p in current_path_value.split(";") if p.strip()]
+                # 경로 정규화 및 중복 방지: 한 번 파싱한 색인으로 비교 (path_model.py)
+                # path_to_add가 %VAR% 형태면 원문으로, 실제 경로면 풀린 디렉터리로 비교
+                # (대소문자, '/' 와 '\\', 끝 구분자 차이는 같은 경로로 봄)
+                from path_model import PathModel
 
-                # path_to_add가 %VAR% 형태인지, 실제 경로인지에 따라 처리
-                # 여기서는 파워셸처럼 %MSYS2_PATH% 자체를 추가하는 시나리오를 가정
-                # 따라서 대소문자 구분 없이 문자열 비교
-                path_to_add_norm = os.path.normcase(path_to_add.strip())
+                paths = PathModel(current_path_value)
 
-                if not any(os.path.normcase(p) == path_to_add_norm for p in paths):
-                    # 파워셸 스크립트는 맨 앞에 추가했었음. 동일하게 하려면:
-                    # paths.insert(0, path_to_add.strip())
-                    # 여기서는 맨 뒤에 추가 (일반적)
-                    if add_front:
-                        paths.insert(0, path_to_add.strip())
-                    else:
-                        paths.append(path_to_add.strip())
-
-                    new_path_value = ";".join(paths)
+                # 파워셸 스크립트는 맨 앞에 추가했었음 (add_front=True). 기본은 맨 뒤에 추가
+                if paths.add(path_to_add, front=add_front):
+                    new_path_value = paths.value
 
                     # Path는 항상 REG_EXPAND_SZ로 설정하는 것이 안전
                     winreg.SetValueEx(
@@ -375,6 +367,20 @@ def add_to_system_path(path_to_add, add_expanded_string=True, add_front=False):
         return False
 
 
+def begin_environment_transaction(scope="machine"):
+    """
+    환경 변수/PATH 변경을 모아 한 번에 적용하는 트랜잭션을 시작합니다.
+    commit 시 레지스트리 키를 한 번만 읽고, 바뀐 값만 기록하며, 브로드캐스트도 한 번만 합니다.
+    사용 예:
+        with begin_environment_transaction() as tx:
+            tx.set("MSYS2_ROOT", r"C:\msys64")
+            tx.add_to_path("%MSYS2_PATH%", front=True)
+    """
+    return EnvironmentTransaction(
+        WinregBackend(broadcast=_broadcast_environment_change), scope=scope
+    )
+
+
 def update_current_session_path_from_registry():
     """레지스트리에서 시스템 및 사용자 PATH를 읽어 현재 세션의 os.environ['PATH']를 업데이트합니다."""
     print("현재 세션의 PATH를 레지스트리 기준으로 갱신 중...")
@@ -395,54 +401,85 @@ def update_current_session_path_from_registry():
         # (단, 이는 broadcast 후 새 프로세스에서 반영된 값일 수 있음)
         # 여기서는 레지스트리에서 직접 읽은 값을 바탕으로 구성
 
-        combined_path = f"{system_path_raw};{user_path_raw}"
-        # 중복 세미콜론 및 앞뒤 세미콜론 제거
-        final_path_list = [p for p in combined_path.split(";") if p.strip()]
-        final_path_str = ";".join(final_path_list)
+        # 시스템 PATH 뒤에 사용자 PATH (Windows와 같은 순서). %VAR%는 현재 환경으로 풀고,
+        # 먼저 나온 디렉터리와 겹치는 항목은 빼서 프로세스 생성/실행 파일 검색 비용을 줄임
+        from path_model import session_path_model
+
+        model = session_path_model(system_path_raw, user_path_raw)
+        final_path_str = model.expanded_value(unique=True)
+        skipped = len(model.directories(unique=False)) - len(model.directories(unique=True))
 
         os.environ["PATH"] = final_path_str
         print(
-            f"현재 세션 PATH가 레지스트리 값 기준으로 업데이트됨 (다음은 os.environ['PATH'] 값):\n{os.environ['PATH']}"
+            f"현재 세션 PATH가 레지스트리 값 기준으로 업데이트됨 (중복 {skipped}개 제외, 다음은 os.environ['PATH'] 값):\n{os.environ['PATH']}"
         )
 
     except Exception as e:
         print(f"현재 세션 PATH 갱신 중 오류: {e}")
 
 
-# --- MSYS2 관련 함수 ---
-def download_msys2_installer(url, dest_dir):
-    """MSYS2 설치 파일을 다운로드합니다."""
-    if not os.path.exists(dest_dir):
-        os.makedirs(dest_dir, exist_ok=True)
+# --- 다운로드 ---
+_artifact_caches = {}
+
+
+def get_artifact_cache(dest_dir):
+    """dest_dir에 대한 다운로드 캐시를 반환합니다 (디렉터리당 하나)."""
+    from artifact_cache import ArtifactCache  # requests를 불러오므로 필요할 때만
+
+    cache_root = os.path.join(dest_dir, ARTIFACT_CACHE_DIR_NAME)
+    if cache_root not in _artifact_caches:
+        _artifact_caches[cache_root] = ArtifactCache(
+            cache_root, max_bytes=ARTIFACT_CACHE_MAX_BYTES
+        )
+    cache = _artifact_caches[cache_root]
+    # fleet 에이전트는 단계를 받을 때 아티팩트 노드 주소를 이 환경 변수로 알려 줌 (fleet.py)
+    cache.source = os.environ.get(ENV_ARTIFACT_SOURCE) or None
+    return cache
 
-    file_name = os.path.join(dest_dir, "msys2-installer.exe")
 
-    print(f"'{url}'에서 '{file_name}'(으)로 다운로드 중...")
+def download_artifact(url, dest_dir, sha256=None, file_name=None, priority=None):
+    """
+    캐시를 거쳐 파일을 다운로드하고 캐시 안의 파일 경로를 반환합니다.
+    캐시에 있으면 네트워크를 사용하지 않고 바로 반환합니다.
+    sha256을 주면 받은 내용과 비교하여 검증합니다. 실패 시 None을 반환합니다.
+    priority: 전송 우선순위 (net_governor.PRIORITY_*, 기본: PRIORITY_NORMAL)
+    반환된 파일은 캐시 소유이므로 직접 삭제하지 않습니다.
+    """
+    import requests
+    from download_engine import DownloadError
+
+    download_kwargs = {} if priority is None else {"priority": priority}
+    print(f"'{url}' 다운로드 중 (캐시: {os.path.join(dest_dir, ARTIFACT_CACHE_DIR_NAME)})...")
     try:
-        response = requests.get(url, stream=True)
-        response.raise_for_status()
-        total_size = int(response.headers.get("content-length", 0))
-
-        with open(file_name, "wb") as f, tqdm(
-            desc=os.path.basename(file_name),
-            total=total_size,
-            unit="iB",
-            unit_scale=True,
-            unit_divisor=1024,
-        ) as bar:
-            for data in response.iter_content(chunk_size=1024 * 4):  # 4KB chunks
-                size = f.write(data)
-                bar.update(size)
-        print("MSYS2 설치 파일 다운로드 완료.")
-        return file_name
+        return get_artifact_cache(dest_dir).fetch(
+            url, sha256=sha256, file_name=file_name, **download_kwargs
+        )
     except requests.exceptions.RequestException as e:
-        print(f"MSYS2 다운로드 오류: {e}")
+        print(f"다운로드 오류: {e}")
+        return None
+    except DownloadError as e:
+        print(f"다운로드 오류: {e}")
         return None
     except Exception as e:
         print(f"파일 쓰기 또는 기타 오류: {e}")
         return None
 
 
+# --- MSYS2 관련 함수 ---
+def download_msys2_installer(url, dest_dir, sha256=None):
+    """MSYS2 설치 파일을 다운로드합니다 (캐시에 있으면 재사용)."""
+    from net_governor import PRIORITY_HIGH  # 설치 단계가 기다리므로 다른 전송보다 먼저
+
+    installer_path = download_artifact(
+        url, dest_dir, sha256=sha256, file_name="msys2-installer.exe", priority=PRIORITY_HIGH
+    )
+    if installer_path:
+        print(f"MSYS2 설치 파일 준비 완료: {installer_path}")
+    else:
+        print("MSYS2 설치 파일을 준비하지 못했습니다.")
+    return installer_path
+
+
 def install_msys2(installer_path, install_root):
     """MSYS2를 설치합니다."""
     if not installer_path or not os.path.exists(installer_path):
@@ -467,14 +504,13 @@ def install_msys2(installer_path, install_root):
         error_message="MSYS2 설치 중 오류 발생.",
     )
     if success:
-        # 설치 후 파일 시스템 동기화 등을 위해 잠시 대기
-        import time
-
-        time.sleep(5)
+        # 설치 후 파일 시스템 동기화 등을 위해 잠시 대기 (trace에 고정 대기로 기록)
+        traced_sleep(5, "install_msys2 대기")
     return success
 
 
 def remove_msys2_installer(installer_path):
+    """설치 파일을 삭제합니다. 캐시에 든 파일은 캐시 일관성을 위해 ArtifactCache.evict를 사용하세요."""
     if installer_path and os.path.exists(installer_path):
         try:
             os.remove(installer_path)
@@ -490,7 +526,7 @@ def configure_powershell_profile_utf8():
     try:
         # $PROFILE 경로 가져오기
         # 'powershell -Command "$PROFILE"' 실행
-        result = subprocess.run(
+        result = traced_run(
             ["pwsh", "-NoProfile", "-Command", "$PROFILE"],
             capture_output=True,
             text=True,
@@ -543,12 +579,14 @@ def configure_powershell_profile_utf8():
 
 
 # --- MSYS2 Bash 스크립트 실행 ---
-def run_msys2_bash_script(msys2_root, script_path_relative_to_repo, repo_root_dir):
+def run_msys2_bash_script(msys2_root, script_path_relative_to_repo, repo_root_dir, session=None):
     r"""
     MSYS2 bash를 사용하여 지정된 .sh 스크립트를 실행합니다.
     msys2_root: MSYS2 설치 경로 (예: C:\msys64)
     script_path_relative_to_repo: 저장소 루트 기준 .sh 파일 경로 (예: bash/setup-pacman.sh)
     repo_root_dir: 이 파이썬 스크립트가 있는 Git 저장소의 루트 디렉토리
+    session: msys2_shell.BashSession이 주어지면 새 로그인 셸을 띄우지 않고 그 세션에서 실행
+             (여러 스크립트를 연달아 실행할 때 로그인 셸 시작 비용을 한 번만 냄)
     """
     bash_exe = os.path.join(msys2_root, "usr", "bin", "bash.exe")
     if not os.path.exists(bash_exe):
@@ -564,6 +602,25 @@ def run_msys2_bash_script(msys2_root, script_path_relative_to_repo, repo_root_di
         )
         return False
 
+    if session is not None:
+        from msys2_shell import ShellSessionError
+
+        print(f"MSYS2 Bash 스크립트 실행 (세션 재사용): {script_path_relative_to_repo}")
+        try:
+            result = session.run(
+                script_path_relative_to_repo, cwd=repo_root_dir, label=script_path_relative_to_repo
+            )
+        except ShellSessionError as e:
+            print(f"Bash 스크립트 '{script_path_relative_to_repo}' 실행 중 오류: {e}")
+            return False
+        if result.returncode != 0:
+            print(
+                f"Bash 스크립트 '{script_path_relative_to_repo}' 실행 중 오류. (종료 코드: {result.returncode})"
+            )
+            return False
+        print(f"Bash 스크립트 '{script_path_relative_to_repo}' 실행 완료 (종료 코드: 0)\n")
+        return True
+
     # bash -lc "cd '스크립트가 있는 디렉토리'; ./스크립트파일"
     # MSYS2 bash는 윈도우 경로를 유닉스 스타일로 변환해야 할 수 있음
     # subprocess는 내부적으로 처리해주지만, cd 대상 경로는 bash가 이해하도록.
@@ -638,9 +695,20 @@ def run_msys2_bash_script(msys2_root, script_path_relative_to_repo, repo_root_di
 
 # --- Python 가상 환경 및 패키지 설치 ---
 def setup_python_venv_and_packages(
-    msys2_root, username, project_python_executable_path, requirements_list
+    msys2_root,
+    username,
+    project_python_executable_path,
+    requirements_list,
+    wheelhouse_dir=None,
+    cache_dir=None,
 ):
-    """지정된 파이썬으로 가상 환경을 만들고 패키지를 설치합니다."""
+    """
+    지정된 파이썬으로 가상 환경을 만들고 패키지를 설치합니다.
+    wheelhouse_dir가 주어지면 인덱스 대신 미리 받아 둔 wheel로만 설치합니다 (wheelhouse.py).
+    cache_dir가 주어지면 (인터프리터, 패키지 목록)별 템플릿을 복사하여 만듭니다 (venv_cache.py).
+    """
+    from wheelhouse import pip_install_command
+
     # 가상 환경 경로 (파워셸 스크립트와 동일하게)
     venv_path = os.path.join(msys2_root, "home", username, "python", "msys2-venv")
 
@@ -651,6 +719,15 @@ def setup_python_venv_and_packages(
         )
         return False
 
+    if cache_dir:
+        return create_venv_from_cache(
+            project_python_executable_path,
+            requirements_list,
+            venv_path,
+            cache_dir,
+            wheelhouse_dir=wheelhouse_dir,
+        )
+
     # 1. 가상 환경 생성
     print(f"'{project_python_executable_path}'을(를) 사용하여 가상 환경 생성 중...")
     # python -m venv <venv_path>
@@ -675,7 +752,9 @@ def setup_python_venv_and_packages(
     # 2. pip 업그레이드
     print("가상 환경 내 pip 업그레이드 중...")
     success, _ = run_command(
-        [venv_python_exe, "-m", "pip", "install", "--upgrade", "pip"],
+        pip_install_command(
+            [venv_python_exe, "-m", "pip"], ["pip"], wheelhouse_dir, upgrade=True
+        ),
         success_message="pip 업그레이드 성공.",
         error_message="pip 업그레이드 실패.",
     )
@@ -687,7 +766,7 @@ def setup_python_venv_and_packages(
         print(f"가상 환경에 패키지 설치 중: {', '.join(requirements_list)}")
         # pip install <package1> <package2> ...
         success, _ = run_command(
-            [venv_pip_exe, "install"] + requirements_list,
+            pip_install_command([venv_pip_exe], requirements_list, wheelhouse_dir),
             success_message="패키지 설치 성공.",
             error_message="패키지 설치 실패.",
         )
@@ -696,3 +775,36 @@ def setup_python_venv_and_packages(
 
     print("Python 가상 환경 및 패키지 설정 완료.")
     return True
+
+
+_venv_caches = {}
+
+
+def get_venv_cache(dest_dir):
+    """dest_dir에 대한 가상 환경 템플릿 캐시를 반환합니다 (디렉터리당 하나)."""
+    from venv_cache import VenvCache
+
+    cache_root = os.path.join(dest_dir, VENV_CACHE_DIR_NAME)
+    if cache_root not in _venv_caches:
+        _venv_caches[cache_root] = VenvCache(
+            cache_root, max_templates=VENV_CACHE_MAX_TEMPLATES, run=run_command
+        )
+    return _venv_caches[cache_root]
+
+
+def create_venv_from_cache(python_exe, requirements_list, venv_path, dest_dir, wheelhouse_dir=None):
+    """
+    템플릿 캐시로 가상 환경을 만듭니다. 같은 인터프리터/패키지 목록의 템플릿이 있으면
+    venv 생성과 pip 설치 없이 복사만 합니다. 실패 시 False를 반환합니다.
+    """
+    from venv_cache import VenvCacheError
+
+    try:
+        get_venv_cache(dest_dir).materialize(
+            python_exe, requirements_list, venv_path, wheelhouse_dir=wheelhouse_dir
+        )
+    except (VenvCacheError, OSError) as e:
+        print(f"가상 환경 생성 실패: {e}")
+        return False
+    print("Python 가상 환경 및 패키지 설정 완료.")
+    return True
@@ -0,0 +1,90 @@
+# step_journal.py (완료된 설정 단계와 입력 지문(fingerprint)을 기록하여 재실행 시 건너뛰기)
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+JOURNAL_VERSION = 1
+
+
+def file_digest(path, chunk_size=1024 * 1024):
+    """파일 내용의 SHA-256. 파일이 없으면 None (지문에 '없음'으로 반영됨)."""
+    hasher = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(chunk_size), b""):
+                hasher.update(block)
+    except OSError:
+        return None
+    return hasher.hexdigest()
+
+
+def fingerprint(*parts):
+    """
+    단계 입력값(설정 상수, 스크립트 해시 등)을 하나의 지문 문자열로 만듭니다.
+    parts는 JSON으로 직렬화 가능한 값이어야 합니다 (dict는 키 순서와 무관).
+    """
+    encoded = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class StepJournal:
+    """
+    단계 이름 -> {fingerprint, completed_at}을 JSON 파일로 보관합니다.
+    단계가 성공할 때마다 바로 저장하므로 중간에 중단되어도 완료된 단계는 남습니다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != JOURNAL_VERSION:
+            return {}
+        return data.get("steps", {})
+
+    def _save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": JOURNAL_VERSION, "steps": self.entries},
+                f,
+                indent=2,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_path, self.path)
+
+    def is_fresh(self, name, step_fingerprint):
+        """마지막 성공 시의 지문과 같으면 True."""
+        with self.lock:
+            entry = self.entries.get(name)
+        return entry is not None and entry.get("fingerprint") == step_fingerprint
+
+    def record(self, name, step_fingerprint):
+        with self.lock:
+            self.entries[name] = {
+                "fingerprint": step_fingerprint,
+                "completed_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            }
+            self._save()
+
+    def invalidate(self, name):
+        with self.lock:
+            if self.entries.pop(name, None) is not None:
+                self._save()
+
+    def completed_at(self, name):
+        with self.lock:
+            entry = self.entries.get(name)
+        return entry.get("completed_at") if entry else None
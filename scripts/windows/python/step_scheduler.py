@@ -0,0 +1,243 @@
+# step_scheduler.py (의존성 그래프 기반 설정 단계 스케줄러)
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from console_output import step_context
+from step_trace import trace_span, CATEGORY_STEP
+
+# --- 단계 상태 ---
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_SUCCESS = "success"
+STATUS_FAILED = "failed"
+STATUS_SKIPPED = "skipped"  # 의존하는 단계가 실패하여 실행하지 않음
+STATUS_UP_TO_DATE = "up-to-date"  # 저널의 지문과 사후 조건이 일치하여 실행하지 않음 (성공으로 간주)
+
+# 의존하는 단계가 실행될 수 있는 상태
+_SATISFIED = (STATUS_SUCCESS, STATUS_UP_TO_DATE)
+
+DEFAULT_MAX_WORKERS = 3
+
+
+class Step:
+    """
+    설정 단계 하나를 나타냅니다.
+    name: 단계 이름 (고유해야 함)
+    func: 인자 없이 호출되는 함수. False를 반환하거나 예외를 던지면 실패로 간주합니다.
+          STATUS_UP_TO_DATE를 반환하면 할 일이 없었던 것으로 보고 최신 상태로 표시합니다 (저널에는 기록하지 않음).
+    depends_on: 먼저 성공해야 하는 단계 이름 목록
+    fingerprint: 단계 입력의 지문을 반환하는 함수 (step_journal.fingerprint). None이면 항상 실행.
+    postcondition: 단계 결과가 아직 유효한지 확인하는 함수. 지문이 같아도 False이면 다시 실행.
+    """
+
+    def __init__(
+        self, name, func, depends_on=(), description="", fingerprint=None, postcondition=None
+    ):
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+        self.description = description or name
+        self.fingerprint = fingerprint
+        self.postcondition = postcondition
+
+
+class StepResult:
+    def __init__(self, name):
+        self.name = name
+        self.status = STATUS_PENDING
+        self.error = None  # 실패 원인 (예외 또는 메시지)
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def duration(self):
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+        return self.finished_at - self.started_at
+
+    def __repr__(self):
+        return f"StepResult({self.name!r}, {self.status!r})"
+
+
+class StepScheduler:
+    """
+    의존성이 없는 단계들을 최대 max_workers개까지 동시에 실행합니다.
+    실패한 단계에 (직접 또는 간접적으로) 의존하는 단계만 건너뛰고, 나머지는 계속 실행합니다.
+    journal(step_journal.StepJournal)이 주어지면 지난 성공 시와 지문이 같고 사후 조건을
+    만족하는 단계는 실행하지 않습니다. force에 있는 단계("all"이면 전체)와, 이번 실행에서
+    실제로 다시 실행된 단계에 의존하는 단계는 항상 실행합니다.
+    """
+
+    def __init__(
+        self,
+        steps,
+        max_workers=DEFAULT_MAX_WORKERS,
+        clock=time.monotonic,
+        journal=None,
+        force=(),
+    ):
+        self.steps = {}
+        for step in steps:
+            if step.name in self.steps:
+                raise ValueError(f"중복된 단계 이름: {step.name}")
+            self.steps[step.name] = step
+        for name in set(force) - {"all"}:
+            if name not in self.steps:
+                raise ValueError(f"강제 실행할 단계 '{name}'이(가) 없습니다.")
+        self.max_workers = max(1, max_workers)
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.journal = journal
+        self.force = set(force)
+        self._validate()
+
+    def _validate(self):
+        """존재하지 않는 의존성과 순환 의존성을 검사합니다."""
+        for step in self.steps.values():
+            for dep in step.depends_on:
+                if dep not in self.steps:
+                    raise ValueError(f"단계 '{step.name}'의 의존 단계 '{dep}'이(가) 없습니다.")
+        visiting, done = set(), set()
+
+        def visit(name, path):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"순환 의존성: {' -> '.join(path + [name])}")
+            visiting.add(name)
+            for dep in self.steps[name].depends_on:
+                visit(dep, path + [name])
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.steps:
+            visit(name, [])
+
+    def _is_forced(self, name):
+        return "all" in self.force or name in self.force
+
+    def _is_up_to_date(self, step, step_fingerprint, dependency_ran):
+        if step_fingerprint is None or dependency_ran or self._is_forced(step.name):
+            return False
+        if not self.journal.is_fresh(step.name, step_fingerprint):
+            return False
+        return step.postcondition is None or bool(step.postcondition())
+
+    def _run_step(self, step, result, dependency_ran=False):
+        result.started_at = self.clock()
+        # 단계 안에서 실행한 명령의 출력은 단계 이름의 로그에 남음 (console_output)
+        with trace_span(step.name, CATEGORY_STEP) as span, step_context(step.name):
+            try:
+                step_fingerprint = None
+                if self.journal is not None and step.fingerprint is not None:
+                    step_fingerprint = step.fingerprint()
+                if self._is_up_to_date(step, step_fingerprint, dependency_ran):
+                    result.status = STATUS_UP_TO_DATE
+                    return
+                outcome = step.func()
+                if outcome is False:
+                    result.status = STATUS_FAILED
+                    result.error = "단계 함수가 False를 반환했습니다."
+                elif outcome == STATUS_UP_TO_DATE:
+                    result.status = STATUS_UP_TO_DATE
+                else:
+                    result.status = STATUS_SUCCESS
+            except Exception as e:
+                result.status = STATUS_FAILED
+                result.error = e
+            finally:
+                if step_fingerprint is not None:
+                    if result.status == STATUS_SUCCESS:
+                        self.journal.record(step.name, step_fingerprint)
+                    elif result.status == STATUS_FAILED:
+                        self.journal.invalidate(step.name)
+                result.finished_at = self.clock()
+                span.args["status"] = result.status
+
+    def run(self):
+        """모든 단계를 실행하고 {이름: StepResult}를 반환합니다 (선언 순서 유지)."""
+        results = {name: StepResult(name) for name in self.steps}
+        running = {}  # future -> name
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                # 의존 단계 결과에 따라 실행 가능/건너뛸 단계 결정 (선언 순서대로)
+                progressed = True
+                while progressed:
+                    progressed = False
+                    for name, step in self.steps.items():
+                        result = results[name]
+                        if result.status != STATUS_PENDING:
+                            continue
+                        dep_status = [results[d].status for d in step.depends_on]
+                        if any(s in (STATUS_FAILED, STATUS_SKIPPED) for s in dep_status):
+                            result.status = STATUS_SKIPPED
+                            failed = [
+                                d
+                                for d in step.depends_on
+                                if results[d].status in (STATUS_FAILED, STATUS_SKIPPED)
+                            ]
+                            result.error = f"의존 단계 실패: {', '.join(failed)}"
+                            print(f"단계 '{name}' 건너뜀 ({result.error})")
+                            progressed = True
+                        elif all(s in _SATISFIED for s in dep_status):
+                            if len(running) >= self.max_workers:
+                                continue
+                            result.status = STATUS_RUNNING
+                            print(f"단계 '{name}' 시작: {step.description}")
+                            dependency_ran = STATUS_SUCCESS in dep_status
+                            future = executor.submit(
+                                self._run_step, step, result, dependency_ran
+                            )
+                            running[future] = name
+
+                if not running:
+                    break
+
+                finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    result = results[name]
+                    if result.status == STATUS_SUCCESS:
+                        print(f"단계 '{name}' 완료 ({result.duration:.1f}초)")
+                    elif result.status == STATUS_UP_TO_DATE:
+                        print(f"단계 '{name}' 최신 상태, 건너뜀 (--force {name}로 강제 실행)")
+                    else:
+                        print(f"단계 '{name}' 실패: {result.error}")
+
+        return results
+
+
+def print_step_summary(results):
+    """단계별 결과를 표 형태로 출력합니다."""
+    print(f"{'단계':<20} {'상태':<10} {'소요 시간':>10}")
+    for result in results.values():
+        print(f"{result.name:<20} {result.status:<10} {result.duration:>9.1f}s")
+    failed = [r.name for r in results.values() if r.status not in _SATISFIED]
+    if failed:
+        print(f"경고: 완료되지 않은 단계가 있습니다: {', '.join(failed)}")
+
+
+def select_steps(steps, names):
+    """
+    names에 있는 단계만 남긴 Step 목록을 반환합니다 (단계 하나만 다시 실행할 때).
+    선택되지 않은 의존 단계는 이미 완료된 것으로 보고 의존 관계에서 뺍니다.
+    """
+    selected = set(names)
+    unknown = selected - {step.name for step in steps}
+    if unknown:
+        raise ValueError(f"알 수 없는 단계: {', '.join(sorted(unknown))}")
+    return [
+        Step(
+            step.name,
+            step.func,
+            depends_on=[dep for dep in step.depends_on if dep in selected],
+            description=step.description,
+            fingerprint=step.fingerprint,
+            postcondition=step.postcondition,
+        )
+        for step in steps
+        if step.name in selected
+    ]
@@ -0,0 +1,160 @@
+# step_trace.py (단계/하위 프로세스/다운로드 시간 측정 및 Chrome trace 내보내기)
+
+import contextlib
+import json
+import os
+import subprocess
+import threading
+import time
+
+# --- 구간 종류 ---
+CATEGORY_STEP = "step"
+CATEGORY_SUBPROCESS = "subprocess"
+CATEGORY_DOWNLOAD = "download"
+CATEGORY_SLEEP = "sleep"
+
+
+class Span:
+    """측정 구간 하나. args에는 종료 코드, 전송 바이트 수 등을 기록합니다."""
+
+    def __init__(self, name, category, start, thread_id, args):
+        self.name = name
+        self.category = category
+        self.start = start
+        self.end = None
+        self.thread_id = thread_id
+        self.args = args
+
+    @property
+    def duration(self):
+        return (self.end if self.end is not None else self.start) - self.start
+
+
+class Tracer:
+    """
+    여러 스레드에서 기록한 구간을 모아 Chrome/Perfetto trace JSON과 요약 표로 내보냅니다.
+    chrome://tracing 또는 https://ui.perfetto.dev 에서 열 수 있습니다.
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.origin = clock()
+        self.spans = []
+        self.lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def span(self, name, category=CATEGORY_STEP, **args):
+        """with 블록의 실행 시간을 기록합니다. 예외가 나면 args["error"]에 남깁니다."""
+        span = Span(name, category, self.clock(), threading.get_ident(), dict(args))
+        try:
+            yield span
+        except BaseException as e:
+            span.args.setdefault("error", repr(e))
+            raise
+        finally:
+            span.end = self.clock()
+            with self.lock:
+                self.spans.append(span)
+
+    def sleep(self, seconds, reason="sleep"):
+        """time.sleep을 구간으로 기록합니다 (고정 대기 시간이 전체에서 차지하는 비중 확인용)."""
+        with self.span(reason, CATEGORY_SLEEP, seconds=seconds):
+            time.sleep(seconds)
+
+    def reset(self):
+        with self.lock:
+            self.spans = []
+            self.origin = self.clock()
+
+    # --- 내보내기 ---
+    def to_chrome_trace(self):
+        """Chrome trace event 형식 ('X' 완료 이벤트, 마이크로초 단위)."""
+        pid = os.getpid()
+        thread_ids = {}
+        events = []
+        with self.lock:
+            spans = sorted(self.spans, key=lambda s: s.start)
+        for span in spans:
+            tid = thread_ids.setdefault(span.thread_id, len(thread_ids) + 1)
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.category,
+                    "ph": "X",
+                    "ts": round((span.start - self.origin) * 1e6, 3),
+                    "dur": round(span.duration * 1e6, 3),
+                    "pid": pid,
+                    "tid": tid,
+                    "args": span.args,
+                }
+            )
+        for thread_id, tid in thread_ids.items():
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {"name": f"worker-{tid}"},
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f, ensure_ascii=False, default=str)
+        return path
+
+    def slowest(self, top=10, category=None):
+        with self.lock:
+            spans = [s for s in self.spans if category is None or s.category == category]
+        return sorted(spans, key=lambda s: s.duration, reverse=True)[:top]
+
+    def format_summary(self, top=10):
+        """가장 오래 걸린 구간 top개를 표로 만듭니다."""
+        lines = [f"{'구간':<40} {'종류':<11} {'시간(초)':>9}  정보"]
+        for span in self.slowest(top):
+            info = ", ".join(f"{k}={v}" for k, v in span.args.items())
+            name = span.name if len(span.name) <= 40 else span.name[:37] + "..."
+            lines.append(f"{name:<40} {span.category:<11} {span.duration:>9.2f}  {info}")
+        totals = {}
+        with self.lock:
+            for span in self.spans:
+                totals[span.category] = totals.get(span.category, 0.0) + span.duration
+        lines.append(
+            "종류별 합계: "
+            + ", ".join(f"{category} {total:.1f}초" for category, total in sorted(totals.items()))
+        )
+        return "\n".join(lines)
+
+
+# --- 프로세스 전역 tracer ---
+_tracer = Tracer()
+
+
+def get_tracer():
+    return _tracer
+
+
+def trace_span(name, category=CATEGORY_STEP, **args):
+    """전역 tracer에 구간을 기록합니다: with trace_span("msys2-install") as span: ..."""
+    return _tracer.span(name, category, **args)
+
+
+def traced_sleep(seconds, reason="sleep"):
+    _tracer.sleep(seconds, reason)
+
+
+def traced_run(command_list, **kwargs):
+    """
+    subprocess.run을 하위 프로세스 구간으로 기록합니다 (출력을 캡처하는 짧은 조회 명령용).
+    인자와 반환값, 예외는 subprocess.run과 같습니다.
+    """
+    command_name = command_list[0] if isinstance(command_list, list) else command_list.split()[0]
+    with _tracer.span(os.path.basename(command_name), CATEGORY_SUBPROCESS) as span:
+        result = subprocess.run(command_list, **kwargs)
+        span.args["exit_code"] = result.returncode
+    return result
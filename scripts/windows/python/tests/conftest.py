@@ -0,0 +1,166 @@
+# conftest.py (tests 공통: 모듈 경로와 로컬 HTTP 서버)
+#
+# 설정 도구 모듈은 scripts/windows/python에 평평하게 있으므로 그 디렉터리를 sys.path에 넣습니다.
+# file_server는 Range와 If-None-Match(etag)를 지원하는 로컬 http.server로,
+# 테스트마다 Range 무시, 응답 잘라 보내기, 지연, chunked 응답 등을 켭니다.
+# 서버가 여러 개 필요하면 make_file_server()를 여러 번 부릅니다.
+#
+# 실행 (scripts/windows/python에서):
+#   python -m pytest -q tests
+
+import http.server
+import os
+import re
+import sys
+import threading
+import time
+
+import pytest
+
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PYTHON_DIR)
+
+
+SLOW_CHUNK_SIZE = 64 * 1024
+
+
+class _FileHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        data = server.files.get(self.path)
+        with server.lock:
+            server.requests.append((self.path, self.headers.get("Range")))
+        time.sleep(server.response_delay)
+        if data is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.headers.get("If-None-Match") == server.etag:
+            self.send_response(304)
+            self.send_header("ETag", server.etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if server.chunked:
+            self._send_chunked(data)
+            return
+        total = len(data)
+        start, end = 0, total - 1
+        match = re.match(r"bytes=(\d+)-(\d*)$", self.headers.get("Range", ""))
+        if match and not server.ignore_range:
+            start = int(match.group(1))
+            end = min(int(match.group(2)), total - 1) if match.group(2) else total - 1
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{total}")
+            self.send_header("Accept-Ranges", "bytes")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("ETag", server.etag)
+        self.end_headers()
+        body = data[start : end + 1]
+        if server.truncate_after is not None and len(body) > server.truncate_after:
+            # Content-Length보다 적게 보내고 연결을 끊음 (전송 중 끊긴 연결)
+            body = body[: server.truncate_after]
+            self.close_connection = True
+        try:
+            if server.chunk_delay:
+                # 느린 미러 흉내: SLOW_CHUNK_SIZE마다 쉬면서 보냄
+                for offset in range(0, len(body), SLOW_CHUNK_SIZE):
+                    self.wfile.write(body[offset : offset + SLOW_CHUNK_SIZE])
+                    self.wfile.flush()
+                    time.sleep(server.chunk_delay)
+            else:
+                self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            return
+        with server.lock:
+            server.bytes_sent += len(body)
+
+
+    def _send_chunked(self, data):
+        """길이를 알리지 않는 응답. truncate_after가 있으면 그만큼 보내고 마지막 청크 없이 끊음."""
+        server = self.server
+        self.send_response(200)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.send_header("ETag", server.etag)
+        self.end_headers()
+        body = data if server.truncate_after is None else data[: server.truncate_after]
+        try:
+            for offset in range(0, len(body), SLOW_CHUNK_SIZE):
+                chunk = body[offset : offset + SLOW_CHUNK_SIZE]
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                time.sleep(server.chunk_delay)
+            if server.truncate_after is None:
+                self.wfile.write(b"0\r\n\r\n")
+            else:
+                self.close_connection = True
+        except (BrokenPipeError, ConnectionResetError):
+            return
+        with server.lock:
+            server.bytes_sent += len(body)
+
+
+class FileServer:
+    """files({경로: bytes})를 내놓는 로컬 서버. url(경로)로 주소를 만듭니다."""
+
+    def __init__(self):
+        self.httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _FileHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.files = {}
+        self.httpd.requests = []
+        self.httpd.bytes_sent = 0
+        self.httpd.lock = threading.Lock()
+        self.httpd.etag = '"v1"'
+        self.httpd.ignore_range = False
+        self.httpd.truncate_after = None  # 응답마다 보낼 최대 바이트 (None이면 전부)
+        self.httpd.response_delay = 0.0  # 응답 헤더 전에 쉬는 시간 (TTFB)
+        self.httpd.chunk_delay = 0.0  # 본문 SLOW_CHUNK_SIZE마다 쉬는 시간 (처리량 제한)
+        self.httpd.chunked = False  # Content-Length 없이 chunked로 보냄 (Range 무시)
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def __getattr__(self, name):
+        return getattr(self.httpd, name)
+
+    def __setattr__(self, name, value):
+        if name == "httpd":
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self.httpd, name, value)
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}{path}"
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def file_server():
+    server = FileServer()
+    try:
+        yield server
+    finally:
+        server.close()
+
+
+@pytest.fixture
+def make_file_server():
+    servers = []
+
+    def make():
+        servers.append(FileServer())
+        return servers[-1]
+
+    try:
+        yield make
+    finally:
+        for server in servers:
+            server.close()
@@ -0,0 +1,35 @@
+# test_artifact_cache.py (artifact_cache: 같은 URL 동시 요청과 캐시 재사용)
+
+import os
+import threading
+
+from artifact_cache import ArtifactCache
+
+
+def test_concurrent_fetches_of_same_url_download_once(file_server, tmp_path):
+    data = os.urandom(2 * 1024 * 1024)
+    file_server.files["/installer.exe"] = data
+    url = file_server.url("/installer.exe")
+    cache = ArtifactCache(str(tmp_path / "cache"))
+
+    paths, errors = [], []
+
+    def fetch():
+        try:
+            paths.append(cache.fetch(url, show_progress=False))
+        except Exception as e:  # 스레드 안의 실패를 본 스레드에서 확인
+            errors.append(e)
+
+    threads = [threading.Thread(target=fetch) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(set(paths)) == 1
+    with open(paths[0], "rb") as f:
+        assert f.read() == data
+    # 본문은 한 번만 받음 (나머지는 캐시)
+    assert file_server.bytes_sent <= len(data) + 1
+    assert os.listdir(cache.incoming_dir) == []
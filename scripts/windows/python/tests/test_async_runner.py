@@ -0,0 +1,83 @@
+# test_async_runner.py (async_runner: 시간 제한, 파이프를 물고 있는 손자 프로세스, 취소, 동시 실행 제한)
+
+import asyncio
+import os
+import sys
+import time
+import warnings
+
+import pytest
+
+from async_runner import AsyncCommandRunner, run_commands_concurrently
+
+# 출력 파이프를 닫고 오래 실행: 리더는 바로 끝나지만 프로세스는 끝나지 않음
+CLOSED_PIPES_CHILD = "import os, time; os.close(1); os.close(2); time.sleep(8)"
+# 파이프를 물려받은 손자를 남기고 바로 종료: 프로세스는 끝났지만 파이프는 열려 있음
+GRANDCHILD_CHILD = (
+    "import subprocess, sys; "
+    "subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(8)']); "
+    "print('hi', flush=True); sys.exit(3)"
+)
+
+
+def _run(code, timeout):
+    started = time.monotonic()
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")  # 닫히지 않은 transport 경고도 실패로 처리
+        result = run_commands_concurrently(
+            [[sys.executable, "-c", code]], timeout=timeout, terminate_grace=0.5, echo=False
+        )[0]
+    return result, time.monotonic() - started
+
+
+def test_timeout_applies_after_pipes_are_closed():
+    result, elapsed = _run(CLOSED_PIPES_CHILD, timeout=1)
+    assert result.timed_out
+    assert not result.ok
+    assert elapsed < 4
+
+
+def test_exited_process_with_inherited_pipes_keeps_exit_code():
+    result, elapsed = _run(GRANDCHILD_CHILD, timeout=1)
+    assert not result.timed_out
+    assert result.returncode == 3
+    assert list(result.stdout_lines) == ["hi"]
+    assert elapsed < 2
+
+
+def test_plain_command():
+    result, _ = _run("print('ok')", timeout=10)
+    assert result.ok
+    assert list(result.stdout_lines) == ["ok"]
+
+
+def test_cancelled_run_stops_the_child(tmp_path):
+    pid_path = tmp_path / "child.pid"
+    code = f"import os, time; open({str(pid_path)!r}, 'w').write(str(os.getpid())); time.sleep(30)"
+
+    async def main():
+        runner = AsyncCommandRunner(terminate_grace=0.5, echo=False)
+        task = asyncio.ensure_future(runner.run([sys.executable, "-c", code]))
+        while not pid_path.exists() or not pid_path.read_text():
+            await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    with pytest.raises(ProcessLookupError):
+        os.kill(int(pid_path.read_text()), 0)
+
+
+def test_concurrency_limit(tmp_path):
+    code = (
+        "import sys, time; start = time.time(); time.sleep(0.3); "
+        "open(sys.argv[1], 'w').write(f'{start} {time.time()}')"
+    )
+    commands = [[sys.executable, "-c", code, str(tmp_path / f"{i}.txt")] for i in range(5)]
+    results = run_commands_concurrently(commands, max_concurrency=2, echo=False)
+    assert all(result.ok for result in results)
+
+    spans = [tuple(map(float, (tmp_path / f"{i}.txt").read_text().split())) for i in range(5)]
+    peak = max(sum(1 for start, end in spans if start <= moment < end) for moment, _ in spans)
+    assert peak == 2
@@ -0,0 +1,86 @@
+# test_command_runner.py (command_runner: 대량 출력에서 교착 없음, 캡처 상한, 스풀 파일 확인)
+
+import sys
+import threading
+
+from command_runner import run_streaming
+
+STREAM_MB = 100  # 스트림마다 쓸 양
+LINE = b"x" * 1023  # 줄바꿈 포함 1KB
+
+# stdout과 stderr에 번갈아 큰 덩어리를 쓰는 자식. 한쪽 파이프만 읽으면 다른 쪽이 가득 차 멈춤
+CHILD = f"""
+import sys
+line = b"x" * 1023
+block = b"".join(b"%d " % i + line[len(b"%d " % i):] + b"\\n" for i in range(1024))
+for n in range({STREAM_MB}):
+    sys.stdout.buffer.write(block)
+    sys.stderr.buffer.write(block)
+sys.stdout.buffer.write(b"stdout-end")  # 줄바꿈 없이 끝나는 마지막 줄
+sys.stderr.buffer.write(b"stderr-end\\n")
+"""
+
+LONG_LINE_CHILD = """
+import sys
+for n in range(256):
+    sys.stdout.buffer.write(b"y" * 65536)
+sys.stdout.buffer.write(b"\\nshort\\n")
+"""
+
+
+def _run_with_deadline(seconds, **kwargs):
+    result = {}
+
+    def target():
+        result["value"] = run_streaming(**kwargs)
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(seconds)
+    assert not thread.is_alive(), "run_streaming이 끝나지 않음 (교착 의심)"
+    return result["value"]
+
+
+def test_large_output_on_both_streams(tmp_path):
+    spool_path = tmp_path / "output.log"
+    result = _run_with_deadline(
+        300,
+        command_list=[sys.executable, "-c", CHILD],
+        echo=False,
+        capture=True,
+        max_captured_lines=50,
+        spool_path=str(spool_path),
+    )
+
+    assert result.returncode == 0
+    lines_per_stream = STREAM_MB * 1024
+    # 캡처는 스트림마다 마지막 50줄만 보관
+    assert len(result.stdout_lines) == 50
+    assert len(result.stderr_lines) == 50
+    assert result.stdout_lines[-1] == "stdout-end"
+    assert result.stderr_lines[-1] == "stderr-end"
+    assert result.stdout_lines[-2].startswith("1023 x")
+
+    # 스풀 파일에는 두 스트림의 모든 줄이 온전히 남음
+    stdout_count = stderr_count = 0
+    with open(spool_path, "rb") as f:
+        for line in f:
+            if line.startswith(b"stderr: "):
+                line = line[len(b"stderr: ") :]
+                stderr_count += 1
+            else:
+                stdout_count += 1
+            assert len(line) == len(LINE) + 1 or line.endswith(b"-end\n")
+    assert stdout_count == lines_per_stream + 1
+    assert stderr_count == lines_per_stream + 1
+
+
+def test_long_line_without_newline(tmp_path):
+    result = _run_with_deadline(
+        60,
+        command_list=[sys.executable, "-c", LONG_LINE_CHILD],
+        echo=False,
+        capture=True,
+    )
+    assert result.returncode == 0
+    assert list(result.stdout_lines) == ["y" * (256 * 65536), "short"]
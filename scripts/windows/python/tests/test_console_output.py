@@ -0,0 +1,109 @@
+# test_console_output.py (console_output: 버린 줄 알림, 단계 로그, 스트림 복원, 콘솔이 막혀도 실행기는 막히지 않음)
+
+import gzip
+import io
+import sys
+import threading
+import time
+
+from console_output import MODE_LIVE, MODE_PLAIN, Console, step_context
+
+
+class BlockingStream(io.StringIO):
+    """blocked가 설정된 동안 write()가 멈추는 스트림 (빠른 편집 모드에서 선택 중인 콘솔 흉내)."""
+
+    def __init__(self):
+        super().__init__()
+        self.blocked = threading.Event()
+        self.entered = threading.Event()
+
+    def write(self, text):
+        if self.blocked.is_set():
+            self.entered.set()
+            while self.blocked.is_set():
+                time.sleep(0.01)
+        return super().write(text)
+
+
+def _read_log(path):
+    if path.endswith(".gz"):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return f.read()
+    import zstandard
+
+    with open(path, "rb") as f:
+        return zstandard.ZstdDecompressor().stream_reader(f).read().decode("utf-8")
+
+
+def test_plain_mode_reports_dropped_lines(monkeypatch):
+    stream = BlockingStream()
+    monkeypatch.setattr(sys, "stdout", stream)
+    console = Console(mode=MODE_PLAIN, refresh_interval=0.01, max_pending_lines=10)
+
+    with console.session():
+        view = console.begin("pacman -Syu")
+        stream.blocked.set()
+        view.add(["first"])
+        assert stream.entered.wait(5)  # 렌더러가 "first"를 쓰다가 멈춤
+        view.add([f"line {i}" for i in range(100)])
+        view.finish(0)
+        stream.blocked.clear()
+
+    lines = stream.getvalue().splitlines()
+    assert lines[0] == "first"
+    assert lines[1].startswith("... 출력 90줄 생략")
+    assert lines[2:] == [f"line {i}" for i in range(90, 100)]
+    assert console.stats["dropped"] == 90
+
+
+def test_begin_does_not_wait_for_blocked_console(monkeypatch):
+    stream = BlockingStream()
+    monkeypatch.setattr(sys, "stdout", stream)
+    console = Console(mode=MODE_PLAIN, refresh_interval=0.01)
+
+    with console.session():
+        stream.blocked.set()
+        console.begin("first").add(["x"])
+        assert stream.entered.wait(5)
+        started = time.monotonic()
+        for index in range(20):
+            view = console.begin(f"command {index}")
+            view.add(["output"] * 100)
+            view.finish(0)
+        assert time.monotonic() - started < 1
+        stream.blocked.clear()
+
+
+def test_step_log_keeps_every_line_and_exit_code(monkeypatch, tmp_path):
+    monkeypatch.setattr(sys, "stdout", io.StringIO())
+    console = Console(mode=MODE_PLAIN, refresh_interval=0.01, max_pending_lines=5)
+
+    with console.session(log_dir=str(tmp_path)):
+        with step_context("build"):
+            view = console.begin("make all")
+        view.add([f"line {i}" for i in range(50)])
+        view.add(["boom"], stderr=True)
+        view.finish(2)
+
+    path = console.log_paths["build"]
+    assert path.startswith(str(tmp_path))
+    log = _read_log(path).splitlines()
+    assert log[0] == "$ make all"
+    assert log[2:52] == [f"line {i}" for i in range(50)]
+    assert log[52] == "stderr: boom"
+    assert log[53].startswith("[종료 코드 2, 51줄, ")
+
+
+def test_session_restores_standard_streams(monkeypatch):
+    stdout, stderr = io.StringIO(), io.StringIO()
+    monkeypatch.setattr(sys, "stdout", stdout)
+    monkeypatch.setattr(sys, "stderr", stderr)
+    console = Console(mode=MODE_LIVE, refresh_interval=0.01)
+
+    with console.session():
+        assert sys.stdout is not stdout
+        assert sys.stderr is not stderr
+        print("hello")
+    assert sys.stdout is stdout
+    assert sys.stderr is stderr
+    assert "hello\n" in stdout.getvalue()
@@ -0,0 +1,106 @@
+# test_download_engine.py (download_engine / artifact_cache: 로컬 http.server로 다운로드 경로 확인)
+
+import hashlib
+import json
+import os
+
+import pytest
+
+import download_engine
+from artifact_cache import ArtifactCache
+from download_engine import DownloadError, download_file, STATE_SUFFIX
+
+SIZE = 4 * 1024 * 1024 + 12345  # MIN_SEGMENT_SIZE(1MB) 기준 4개 세그먼트
+
+
+@pytest.fixture
+def payload(file_server):
+    data = os.urandom(SIZE)
+    file_server.files["/pkg.bin"] = data
+    return data
+
+
+def _range_requests(server):
+    return [r for path, r in server.requests if r and r != "bytes=0-0"]
+
+
+def test_multi_segment_download(file_server, payload, tmp_path):
+    dest = tmp_path / "pkg.bin"
+    hasher = hashlib.sha256()
+    download_file(file_server.url("/pkg.bin"), str(dest), connections=4, show_progress=False, hasher=hasher)
+
+    assert dest.read_bytes() == payload
+    assert hasher.hexdigest() == hashlib.sha256(payload).hexdigest()
+    assert len(_range_requests(file_server)) == 4
+    # 끝나면 작업 파일이 남지 않음
+    assert sorted(os.listdir(tmp_path)) == ["pkg.bin"]
+
+
+def test_resume_after_truncated_transfer(file_server, payload, tmp_path, monkeypatch):
+    monkeypatch.setattr(download_engine, "MAX_RETRIES", 2)
+    monkeypatch.setattr(download_engine, "RETRY_BACKOFF", 0)
+    dest = tmp_path / "pkg.bin"
+    url = file_server.url("/pkg.bin")
+
+    # 응답마다 100KB만 보내고 끊는 서버: 재시도를 다 써도 끝나지 않음
+    file_server.truncate_after = 100 * 1024
+    with pytest.raises(DownloadError):
+        download_file(url, str(dest), connections=4, show_progress=False)
+    assert not dest.exists()
+    with open(str(dest) + STATE_SUFFIX, encoding="utf-8") as f:
+        done = sum(segment["done"] for segment in json.load(f)["segments"])
+    assert 0 < done < SIZE
+
+    # 정상 서버로 다시 받으면 남은 부분만 요청
+    file_server.truncate_after = None
+    file_server.bytes_sent = 0
+    download_file(url, str(dest), connections=4, show_progress=False)
+    assert dest.read_bytes() == payload
+    assert file_server.bytes_sent <= SIZE - done + 1  # 확인용 1바이트 Range 요청 포함
+    assert not os.path.exists(str(dest) + STATE_SUFFIX)
+
+
+def test_segment_retries_back_off_exponentially(file_server, tmp_path, monkeypatch):
+    delays = []
+    monkeypatch.setattr(download_engine, "MAX_RETRIES", 4)
+    monkeypatch.setattr(download_engine, "traced_sleep", lambda seconds, reason: delays.append(seconds))
+    file_server.files["/small.bin"] = os.urandom(256 * 1024)  # 세그먼트 하나
+    file_server.truncate_after = 16 * 1024
+
+    with pytest.raises(DownloadError):
+        download_file(file_server.url("/small.bin"), str(tmp_path / "small.bin"), show_progress=False)
+    base = download_engine.RETRY_BACKOFF
+    assert delays == [base, base * 2, base * 4]
+
+
+def test_truncated_single_stream_is_rejected(file_server, payload, tmp_path):
+    file_server.ignore_range = True
+    file_server.truncate_after = 100 * 1024
+    with pytest.raises(DownloadError):
+        download_file(file_server.url("/pkg.bin"), str(tmp_path / "pkg.bin"), show_progress=False)
+    assert not (tmp_path / "pkg.bin").exists()
+
+
+def test_fallback_when_server_ignores_range(file_server, payload, tmp_path):
+    file_server.ignore_range = True
+    dest = tmp_path / "pkg.bin"
+    hasher = hashlib.sha256()
+    download_file(file_server.url("/pkg.bin"), str(dest), connections=4, show_progress=False, hasher=hasher)
+
+    assert dest.read_bytes() == payload
+    assert hasher.hexdigest() == hashlib.sha256(payload).hexdigest()
+    # 확인 요청 뒤에는 Range 없이 한 번만 받음
+    assert [r for _, r in file_server.requests] == ["bytes=0-0", None]
+
+
+def test_sha256_mismatch_is_rejected(file_server, payload, tmp_path):
+    cache = ArtifactCache(str(tmp_path / "cache"))
+    url = file_server.url("/pkg.bin")
+
+    with pytest.raises(DownloadError, match="SHA-256"):
+        cache.fetch(url, sha256="0" * 64, show_progress=False)
+    assert cache.lookup(url) is None
+
+    path = cache.fetch(url, sha256=hashlib.sha256(payload).hexdigest(), show_progress=False)
+    with open(path, "rb") as f:
+        assert f.read() == payload
@@ -0,0 +1,63 @@
+# test_env_transaction.py (env_transaction: 한 번 읽기, 바뀐 값만 기록, 한 번만 브로드캐스트)
+
+import pytest
+
+from env_transaction import REG_EXPAND_SZ, REG_SZ, EnvironmentTransaction, InMemoryRegistryBackend
+
+
+def _backend():
+    return InMemoryRegistryBackend(
+        {"machine": {"X": ("1", REG_SZ), "Path": (r"C:\Tools;C:\Windows", REG_EXPAND_SZ)}}
+    )
+
+
+def test_commit_reads_once_and_broadcasts_once():
+    backend = _backend()
+    transaction = EnvironmentTransaction(backend, update_os_environ=False)
+    transaction.set("A", "a").set("B", "b").add_to_path(r"C:\New").add_to_path(r"C:\Other", front=True)
+
+    assert sorted(transaction.commit()) == ["A", "B", "Path"]
+    assert backend.read_count == 1
+    assert backend.write_count == 3
+    assert backend.broadcast_count == 1
+    assert backend.values["machine"]["Path"] == (r"C:\Other;C:\Tools;C:\Windows;C:\New", REG_EXPAND_SZ)
+
+
+def test_unchanged_values_are_not_written():
+    backend = _backend()
+    # 이름은 대소문자를 구분하지 않으므로 기존 X와 같은 값
+    assert EnvironmentTransaction(backend, update_os_environ=False).set("x", "1").commit() == []
+    assert backend.read_count == 1
+    assert backend.write_count == 0
+    assert backend.broadcast_count == 0
+
+    assert EnvironmentTransaction(backend, update_os_environ=False).set("x", "2").commit() == ["X"]
+    assert backend.values["machine"]["X"] == ("2", REG_SZ)
+    assert "x" not in backend.values["machine"]
+    assert backend.write_count == 1
+    assert backend.broadcast_count == 1
+
+
+def test_path_edits_ignore_case():
+    backend = _backend()
+    transaction = EnvironmentTransaction(backend, update_os_environ=False)
+    transaction.add_to_path(r"c:\tools").remove_from_path(r"c:\WINDOWS")
+
+    assert transaction.commit() == ["Path"]
+    assert backend.values["machine"]["Path"] == (r"C:\Tools", REG_EXPAND_SZ)
+
+    assert EnvironmentTransaction(backend, update_os_environ=False).add_to_path(r"C:\TOOLS").commit() == []
+    assert backend.broadcast_count == 1
+
+
+def test_empty_transaction_does_not_touch_registry():
+    backend = _backend()
+    assert EnvironmentTransaction(backend).commit() == []
+    assert (backend.read_count, backend.write_count, backend.broadcast_count) == (0, 0, 0)
+
+
+def test_second_commit_raises():
+    transaction = EnvironmentTransaction(_backend(), update_os_environ=False).set("A", "a")
+    transaction.commit()
+    with pytest.raises(RuntimeError):
+        transaction.commit()
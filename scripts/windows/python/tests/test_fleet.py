@@ -0,0 +1,188 @@
+# test_fleet.py (fleet: 코디네이터의 단계 배분 규칙, 에이전트에서 setup 단계를 실행할 때의 강제 실행과 환경 변수)
+
+import os
+
+import pytest
+
+from fleet import FleetCoordinator, SetupStepRunner
+from step_journal import StepJournal
+from step_scheduler import (
+    STATUS_FAILED,
+    STATUS_RUNNING,
+    STATUS_SKIPPED,
+    STATUS_SUCCESS,
+    STATUS_UP_TO_DATE,
+    Step,
+)
+from setup_utils import ENV_ARTIFACT_SOURCE, ENV_PACMAN_PROXY
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _steps(*specs):
+    """"이름" 또는 ("이름", [의존 단계]) 목록으로 Step을 만듭니다."""
+    specs = [(spec, []) if isinstance(spec, str) else spec for spec in specs]
+    return [Step(name, lambda: True, depends_on=deps) for name, deps in specs]
+
+
+def _coordinator(steps, agents=("pc1",), **kwargs):
+    clock = FakeClock()
+    coordinator = FleetCoordinator(steps, clock=clock, **kwargs)
+    for agent in agents:
+        coordinator.register(agent, host=agent)
+    return coordinator, clock
+
+
+def _statuses(coordinator, agent):
+    return coordinator.snapshot()["agents"][agent]["status"]
+
+
+def test_per_host_limit():
+    coordinator, _ = _coordinator(_steps("a", "b", "c"), per_host=2)
+    assert [coordinator.next_task("pc1").get("step") for _ in range(3)] == ["a", "b", None]
+
+    coordinator.report("pc1", "a", STATUS_SUCCESS)
+    assert coordinator.next_task("pc1")["step"] == "c"
+
+
+def test_max_running_limit_across_agents():
+    coordinator, _ = _coordinator(_steps("a", "b"), agents=("pc1", "pc2"), per_host=3, max_running=2)
+    assert coordinator.next_task("pc1")["step"] == "a"
+    assert coordinator.next_task("pc1")["step"] == "b"
+    assert "wait" in coordinator.next_task("pc2")
+
+    coordinator.report("pc1", "b", STATUS_SUCCESS)
+    assert coordinator.next_task("pc2")["step"] == "a"
+
+
+def test_failure_skips_transitive_dependents_only():
+    steps = _steps("download", ("install", ["download"]), ("configure", ["install"]), "other")
+    coordinator, _ = _coordinator(steps, per_host=1)
+    assert coordinator.next_task("pc1")["step"] == "download"
+    coordinator.report("pc1", "download", STATUS_FAILED, error="네트워크 오류")
+
+    assert _statuses(coordinator, "pc1")["install"] == STATUS_SKIPPED
+    assert _statuses(coordinator, "pc1")["configure"] == STATUS_SKIPPED
+    assert coordinator.snapshot()["agents"]["pc1"]["errors"]["configure"] == "의존 단계 실패: install"
+    assert coordinator.next_task("pc1")["step"] == "other"
+    coordinator.report("pc1", "other", STATUS_SUCCESS)
+    assert coordinator.next_task("pc1") == {"done": True}
+    assert not coordinator.ok()
+
+
+def test_download_waits_for_artifact_node():
+    steps = _steps("msys2-download", ("msys2-install", ["msys2-download"]))
+    coordinator, _ = _coordinator(steps, agents=("node", "pc1"), artifact_agent="node")
+    coordinator.register("node", host="node", artifact_url="http://node:8767")
+
+    # 노드가 같은 단계를 끝낼 때까지 기다림
+    assert "wait" in coordinator.next_task("pc1")
+    assert coordinator.next_task("node") == {"step": "msys2-download", "artifact_source": None}
+    assert "wait" in coordinator.next_task("pc1")
+    coordinator.report("node", "msys2-download", STATUS_SUCCESS)
+    assert coordinator.next_task("pc1") == {"step": "msys2-download", "artifact_source": "http://node:8767"}
+
+
+def test_artifact_wait_expires_when_node_never_registers():
+    coordinator, clock = _coordinator(_steps("msys2-download"), artifact_agent="node", artifact_wait=30)
+    assert "wait" in coordinator.next_task("pc1")
+
+    clock.now += 30
+    # 노드 없이 각자 인터넷에서 받음
+    assert coordinator.next_task("pc1") == {"step": "msys2-download", "artifact_source": None}
+
+
+def test_lost_agent_running_steps_fail():
+    coordinator, clock = _coordinator(_steps("a", "b"), agents=("pc1", "pc2"), agent_timeout=10)
+    assert coordinator.next_task("pc1")["step"] == "a"
+
+    clock.now += 5
+    coordinator.heartbeat("pc2")
+    assert _statuses(coordinator, "pc1")["a"] == STATUS_RUNNING
+    clock.now += 6
+    coordinator.next_task("pc2")  # pc1은 11초 동안 응답 없음
+
+    snapshot = coordinator.snapshot()["agents"]["pc1"]
+    assert snapshot["lost"]
+    assert snapshot["status"]["a"] == STATUS_FAILED
+    assert snapshot["errors"]["a"] == "에이전트 응답 없음"
+    assert snapshot["status"]["b"] != STATUS_FAILED
+
+
+def test_artifact_node_waits_until_others_finish():
+    coordinator, _ = _coordinator(_steps("a"), agents=("node", "pc1"), artifact_agent="node", expected_agents=3)
+    coordinator.next_task("node")
+    coordinator.report("node", "a", STATUS_SUCCESS)
+    coordinator.next_task("pc1")
+    coordinator.report("pc1", "a", STATUS_SUCCESS)
+
+    # 아직 등록하지 않은 에이전트가 있으므로 노드를 유지
+    assert "wait" in coordinator.next_task("node")
+    coordinator.register("pc2")
+    assert "wait" in coordinator.next_task("node")
+    assert coordinator.next_task("pc1") == {"done": True}
+
+    coordinator.next_task("pc2")
+    coordinator.report("pc2", "a", STATUS_UP_TO_DATE)
+    assert coordinator.next_task("node") == {"done": True}
+    assert coordinator.is_done()
+    assert coordinator.ok()
+
+
+@pytest.fixture
+def fake_setup(tmp_path, monkeypatch):
+    import setup
+
+    calls = []
+
+    def step(name, depends_on=()):
+        return Step(name, lambda: calls.append(name) or True, depends_on=depends_on, fingerprint=lambda: "v1")
+
+    steps = [step("download"), step("install", ["download"]), step("configure", ["install"]), step("other")]
+    journal_path = str(tmp_path / "journal.json")
+    journal = StepJournal(journal_path)
+    for s in steps:
+        journal.record(s.name, "v1")  # 지난 실행에서 모두 끝남
+    monkeypatch.setattr(setup, "build_setup_steps", lambda: steps)
+    monkeypatch.setattr(setup, "SETUP_JOURNAL_PATH", journal_path)
+    monkeypatch.setattr(setup, "_msys2_installed", lambda: True)
+    monkeypatch.setitem(setup._step_state, "reinstall_msys2", False)
+    monkeypatch.delenv(ENV_ARTIFACT_SOURCE, raising=False)
+    monkeypatch.delenv(ENV_PACMAN_PROXY, raising=False)
+    return calls
+
+
+def test_steps_after_a_rerun_dependency_are_forced(fake_setup):
+    runner = SetupStepRunner(force=["download"])
+    statuses = {name: runner(name)[0] for name in ("download", "install", "configure", "other")}
+
+    assert statuses == {
+        "download": STATUS_SUCCESS,
+        "install": STATUS_SUCCESS,  # 의존 단계가 이 PC에서 다시 실행됨
+        "configure": STATUS_SUCCESS,
+        "other": STATUS_UP_TO_DATE,
+    }
+    assert fake_setup == ["download", "install", "configure"]
+
+
+def test_nothing_runs_when_journal_is_fresh(fake_setup):
+    runner = SetupStepRunner()
+    assert [runner(name)[0] for name in ("download", "install")] == [STATUS_UP_TO_DATE] * 2
+    assert fake_setup == []
+
+
+def test_artifact_source_is_set_once(fake_setup):
+    runner = SetupStepRunner()
+    runner("other")  # 노드가 아직 등록하지 않음
+    assert ENV_ARTIFACT_SOURCE not in os.environ
+
+    runner("download", "http://build01:8767")
+    runner("install", None)  # 노드 주소가 없는 단계도 환경 변수를 지우지 않음
+    assert os.environ[ENV_ARTIFACT_SOURCE] == "http://build01:8767"
+    assert os.environ[ENV_PACMAN_PROXY] == "http://build01:8767"
@@ -0,0 +1,59 @@
+# test_msys2_shell.py (msys2_shell: 종료 코드, 줄바꿈 없는 출력, 서브셸 격리, 문법 오류와 시간 제한)
+
+import shutil
+import time
+
+import pytest
+
+from msys2_shell import BashSession, ShellTimeoutError
+
+BASH = shutil.which("bash")
+
+pytestmark = pytest.mark.skipif(BASH is None, reason="bash가 필요합니다.")
+
+
+@pytest.fixture
+def session():
+    with BashSession(BASH, login=False, echo=False) as session:
+        yield session
+
+
+def test_exit_codes_and_output(session):
+    result = session.run("echo one; echo two >&2; exit 3")
+    assert result.returncode == 3
+    assert list(result.stdout_lines) == ["one", "two"]
+    assert session.run("true").returncode == 0
+
+
+def test_output_without_trailing_newline(session):
+    result = session.run("printf 'no newline'")
+    assert result.returncode == 0
+    assert list(result.stdout_lines) == ["no newline"]
+    assert list(session.run("echo next").stdout_lines) == ["next"]
+
+
+def test_scripts_do_not_leak_into_session(session, tmp_path):
+    start_dir = session.run("pwd").stdout
+    assert session.run("set -e; false; echo unreachable").returncode == 1
+    assert session.run("pwd; cd /; X=leaked", cwd=str(tmp_path)).stdout == str(tmp_path)
+    # set -e, cd, 변수는 서브셸에만 남음
+    result = session.run('false; echo "$PWD [$X]"')
+    assert result.returncode == 0
+    assert list(result.stdout_lines) == [f"{start_dir} []"]
+
+
+def test_syntax_error_does_not_hang(session):
+    result = session.run("echo 'unterminated")
+    assert result.returncode == 2
+    assert "unexpected EOF" in result.stdout
+    # 세션은 계속 쓸 수 있음
+    assert list(session.run("echo 'it''s fine'").stdout_lines) == ["its fine"]
+
+
+def test_timeout_kills_session_and_next_run_restarts(session):
+    started = time.monotonic()
+    with pytest.raises(ShellTimeoutError):
+        session.run("echo started; sleep 30 & sleep 30", timeout=0.5)
+    assert time.monotonic() - started < 5
+    assert session.process is None
+    assert list(session.run("echo again", timeout=5).stdout_lines) == ["again"]
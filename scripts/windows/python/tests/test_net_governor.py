@@ -0,0 +1,40 @@
+# test_net_governor.py (net_governor: 전송 한도 형식과 연결 대기 시간 제한)
+
+import pytest
+
+from net_governor import NetworkGovernor, parse_rate
+
+
+def test_parse_rate():
+    assert parse_rate("20M") == 20 * 1024 * 1024
+    assert parse_rate("512kb/s") == 512 * 1024
+    assert parse_rate("0") is None
+    assert parse_rate("") is None
+    for text in ("20Q", "fast", "-5M"):
+        with pytest.raises(ValueError):
+            parse_rate(text)
+
+
+def test_acquire_connection_timeout_uses_injected_clock():
+    now = [0.0]
+
+    def clock():
+        now[0] += 10.0  # 호출마다 10초씩 흐르는 가짜 시계
+        return now[0]
+
+    governor = NetworkGovernor(per_host=1, clock=clock)
+    assert governor.acquire_connection("example.com")
+    # 슬롯이 없으므로 기다려야 하지만, 가짜 시계로는 이미 제한 시간이 지남 (실제로 5초 기다리지 않음)
+    assert not governor.acquire_connection("example.com", timeout=5)
+    governor.release_connection("example.com")
+    assert governor.acquire_connection("example.com", timeout=5)
+
+
+def test_setup_rejects_invalid_bandwidth_limit(capsys):
+    import setup
+
+    assert setup.parse_args(["--bandwidth-limit", "20M"]).bandwidth_limit == "20M"
+    assert setup.parse_args(["download", "--bandwidth-limit", "512K"]).bandwidth_limit == "512K"
+    with pytest.raises(SystemExit):
+        setup.parse_args(["--bandwidth-limit", "20Q"])
+    assert "전송 한도 형식이 올바르지 않습니다" in capsys.readouterr().err
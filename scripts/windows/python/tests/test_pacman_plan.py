@@ -0,0 +1,110 @@
+# test_pacman_plan.py (pacman_plan: PATH에 둔 가짜 pacman으로 계획과 실행 확인)
+
+import json
+import os
+import stat
+import sys
+import time
+
+import pytest
+
+from pacman_plan import PacmanPlanner
+
+# 상태 파일(pacman-state.json)을 읽고 고치는 가짜 pacman. 실행한 인자는 pacman.log에 한 줄씩 남김
+FAKE_PACMAN = r'''#!{python}
+import json, os, sys
+
+here = os.path.dirname(os.path.abspath(__file__))
+state_path = os.path.join(here, "pacman-state.json")
+with open(state_path) as f:
+    state = json.load(f)
+with open(os.path.join(here, "pacman.log"), "a") as f:
+    f.write(" ".join(sys.argv[1:]) + "\n")
+
+flag, names = sys.argv[1], [a for a in sys.argv[2:] if not a.startswith("-")]
+code = 0
+if flag == "-Q":
+    for name, version in sorted(state["installed"].items()):
+        print(name, version)
+elif flag == "-Qu":
+    for name, new in sorted(state["outdated"].items()):
+        print(name, state["installed"][name], "->", new)
+    code = 0 if state["outdated"] else 1
+elif flag == "-Sg":
+    for group in names:
+        for member in state["groups"].get(group, []):
+            print(group, member)
+    code = 0 if all(name in state["groups"] for name in names) else 1
+elif flag in ("-Syu", "-Su"):
+    state["installed"].update(state["outdated"])
+    state["outdated"] = {{}}
+elif flag == "-S":
+    for name in names:
+        state["installed"].setdefault(name, "1.0-1")
+with open(state_path, "w") as f:
+    json.dump(state, f)
+sys.exit(code)
+'''
+
+
+@pytest.fixture
+def fake_pacman(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "pacman"
+    script.write_text(FAKE_PACMAN.format(python=sys.executable))
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", str(bin_dir) + os.pathsep + os.environ.get("PATH", ""))
+
+    def set_state(installed, outdated=None, groups=None):
+        with open(bin_dir / "pacman-state.json", "w") as f:
+            json.dump({"installed": installed, "outdated": outdated or {}, "groups": groups or {}}, f)
+
+    def calls():
+        path = bin_dir / "pacman.log"
+        return path.read_text().splitlines() if path.exists() else []
+
+    set_state({})
+    return set_state, calls
+
+
+def _sync_dir(tmp_path, age):
+    sync = tmp_path / "sync"
+    sync.mkdir(exist_ok=True)
+    db = sync / "ucrt64.db"
+    db.write_bytes(b"")
+    stamp = time.time() - age
+    os.utime(db, (stamp, stamp))
+    return str(sync)
+
+
+@pytest.mark.skipif(os.name == "nt", reason="가짜 pacman은 shebang 스크립트")
+def test_plan_with_fresh_db_installs_only_missing(fake_pacman, tmp_path):
+    set_state, calls = fake_pacman
+    set_state(
+        {"git": "2.45-1", "mingw-w64-ucrt-x86_64-gcc": "14.1-1"},
+        groups={"mingw-w64-ucrt-x86_64-toolchain": ["mingw-w64-ucrt-x86_64-gcc", "mingw-w64-ucrt-x86_64-gdb"]},
+    )
+    planner = PacmanPlanner("pacman", db_dir=_sync_dir(tmp_path, age=60))
+
+    plan = planner.plan([["git", "mingw-w64-ucrt-x86_64-toolchain"], ["git", "make"]])
+
+    assert not plan.upgrade
+    assert plan.install == ["mingw-w64-ucrt-x86_64-gdb", "make"]
+    assert calls() == ["-Q", "-Sg mingw-w64-ucrt-x86_64-toolchain make", "-Qu"]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="가짜 pacman은 shebang 스크립트")
+def test_ensure_with_stale_db_upgrades_then_installs_once(fake_pacman, tmp_path):
+    set_state, calls = fake_pacman
+    set_state({"git": "2.45-1"}, outdated={"git": "2.46-1"})
+    planner = PacmanPlanner("pacman", db_dir=_sync_dir(tmp_path, age=24 * 3600))
+
+    assert planner.ensure(["git", "make"])
+    transactions = [call for call in calls() if not call.startswith(("-Q", "-Sg"))]
+    assert transactions == ["-Syu --noconfirm", "-S --noconfirm --needed make"]
+
+    # 방금 동기화한 DB로 다시 계획하면 업데이트/설치할 것이 없음
+    planner = PacmanPlanner("pacman", db_dir=_sync_dir(tmp_path, age=60))
+    plan = planner.plan(["git", "make"])
+    assert plan.is_empty
@@ -0,0 +1,137 @@
+# test_pacman_proxy.py (pacman_proxy: DB 재확인, 미러 장애 시 캐시, 동시 요청 합치기, LRU 정리, 길이 없는 응답)
+
+import os
+import threading
+import time
+
+import pytest
+import requests
+
+from pacman_proxy import PacmanProxy
+
+DB_PATH = "/msys/x86_64/msys.db"
+PACKAGE_PATH = "/mingw/ucrt64/mingw-w64-ucrt-x86_64-cmake-3.30.2-1-any.pkg.tar.zst"
+
+
+@pytest.fixture
+def make_proxy(tmp_path):
+    proxies = []
+
+    def make(upstream, **kwargs):
+        proxy = PacmanProxy(str(tmp_path / "cache"), upstreams=[upstream.url("")], host="127.0.0.1", port=0, timeout=5, **kwargs)
+        proxy.start()
+        proxies.append(proxy)
+        return proxy
+
+    try:
+        yield make
+    finally:
+        for proxy in proxies:
+            proxy.stop()
+
+
+def _get(proxy, path):
+    response = requests.get(proxy.url + path, timeout=30)
+    response.raise_for_status()
+    # 클라이언트는 받는 스레드가 캐시 목록을 고치기 전에 본문을 다 받을 수 있음
+    while path in proxy.fetches:
+        time.sleep(0.01)
+    return response.content
+
+
+def test_sync_db_is_revalidated(file_server, make_proxy):
+    file_server.files[DB_PATH] = b"db v1"
+    proxy = make_proxy(file_server)
+
+    assert _get(proxy, DB_PATH) == b"db v1"
+    # 두 번째 요청: 상위 미러가 304를 돌려주므로 캐시된 내용을 보냄
+    assert _get(proxy, DB_PATH) == b"db v1"
+    assert proxy.stats["revalidated"] == 1
+
+    file_server.files[DB_PATH] = b"db v2"
+    file_server.etag = '"v2"'
+    assert _get(proxy, DB_PATH) == b"db v2"
+    assert proxy.stats["misses"] == 2
+    assert len(file_server.requests) == 3
+    assert len(os.listdir(proxy.objects_dir)) == 1  # 이전 DB 내용은 지움
+
+
+def test_stale_db_is_served_when_upstreams_are_down(file_server, make_proxy):
+    file_server.files[DB_PATH] = b"db v1"
+    proxy = make_proxy(file_server)
+    assert _get(proxy, DB_PATH) == b"db v1"
+
+    file_server.close()
+    assert _get(proxy, DB_PATH) == b"db v1"
+    assert proxy.stats["stale"] == 1
+    # 캐시에 없는 파일은 502
+    assert requests.get(proxy.url + PACKAGE_PATH, timeout=30).status_code == 502
+
+
+def test_concurrent_requests_share_one_upstream_download(file_server, make_proxy):
+    data = os.urandom(1024 * 1024)
+    file_server.files[PACKAGE_PATH] = data
+    file_server.chunk_delay = 0.05  # 64KB마다 쉬어 약 0.8초 동안 받음
+    proxy = make_proxy(file_server)
+
+    results = []
+
+    def client():
+        results.append(_get(proxy, PACKAGE_PATH))
+
+    threads = [threading.Thread(target=client)]
+    threads[0].start()
+    while not file_server.requests:
+        time.sleep(0.01)
+    threads += [threading.Thread(target=client) for _ in range(4)]
+    for thread in threads[1:]:
+        thread.start()
+    for thread in threads:
+        thread.join(30)
+
+    assert results == [data] * 5
+    assert len(file_server.requests) == 1
+    assert proxy.stats["coalesced"] == 4
+    assert _get(proxy, PACKAGE_PATH) == data
+    assert proxy.stats["hits"] == 1
+
+
+def test_least_recently_used_files_are_evicted(file_server, make_proxy):
+    paths = [f"/mingw/ucrt64/pkg-{name}-1.0-1-any.pkg.tar.zst" for name in "abc"]
+    for path in paths:
+        file_server.files[path] = os.urandom(1000)
+    proxy = make_proxy(file_server, max_bytes=2500)
+
+    _get(proxy, paths[0])
+    _get(proxy, paths[1])
+    _get(proxy, paths[0])  # a를 다시 써서 b가 가장 오래 쓰지 않은 파일이 됨
+    _get(proxy, paths[2])
+
+    assert sorted(proxy.entries) == sorted([paths[0], paths[2]])
+    assert proxy.stats["evicted"] == 1
+    assert proxy.cached_bytes() == 2000
+    assert len(os.listdir(proxy.objects_dir)) == 2
+
+
+def test_response_without_length_is_chunked(file_server, make_proxy):
+    data = os.urandom(300 * 1024)
+    file_server.files[PACKAGE_PATH] = data
+    file_server.chunked = True
+    proxy = make_proxy(file_server)
+
+    response = requests.get(proxy.url + PACKAGE_PATH, timeout=30)
+    assert response.headers["Transfer-Encoding"] == "chunked"
+    assert response.content == data
+    assert proxy.entries[PACKAGE_PATH]["size"] == len(data)
+
+
+def test_failed_response_without_length_is_not_complete(file_server, make_proxy):
+    file_server.files[PACKAGE_PATH] = os.urandom(300 * 1024)
+    file_server.chunked = True
+    file_server.truncate_after = 100 * 1024  # 마지막 청크 없이 끊김
+    proxy = make_proxy(file_server)
+
+    # 받은 만큼만 보내고 끝을 알리지 않으므로 클라이언트는 실패로 봄
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        requests.get(proxy.url + PACKAGE_PATH, timeout=30).content
+    assert proxy.entries == {}
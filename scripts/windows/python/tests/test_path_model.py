@@ -0,0 +1,27 @@
+# test_path_model.py (path_model: 중복 판단과 정리)
+
+from path_model import PathModel
+
+VARIABLES = {"MSYS2_PATH": r"C:\msys64\ucrt64\bin;C:\msys64\usr\bin", "SystemRoot": r"C:\Windows"}
+
+
+def _model(value):
+    return PathModel(value, variables=VARIABLES, isdir=lambda directory: True)
+
+
+def test_literal_duplicates_are_found_case_insensitively():
+    model = _model(r"C:\Tools;c:/tools\;C:\Git\cmd;C:\TOOLS")
+    assert [e.raw for e in model.duplicates()] == ["c:/tools\\", r"C:\TOOLS"]
+
+
+def test_reference_duplicates_need_identical_text():
+    model = _model(r"%MSYS2_PATH%;C:\msys64\usr\bin;%msys2_path%;%SystemRoot%;C:\Windows")
+    # 변수로 풀린 디렉터리와 같은 경로가 따로 있어도 중복으로 보지 않음 (변수 값이 바뀔 수 있음)
+    assert [e.raw for e in model.duplicates()] == ["%msys2_path%"]
+
+
+def test_compact_keeps_first_occurrence():
+    model = _model(r"C:\Tools;%MSYS2_PATH%;C:\tools;%MSYS2_PATH%")
+    report = model.compact()
+    assert report["duplicates"] == [r"C:\tools", "%MSYS2_PATH%"]
+    assert model.value == r"C:\Tools;%MSYS2_PATH%"
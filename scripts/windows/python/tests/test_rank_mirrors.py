@@ -0,0 +1,109 @@
+# test_rank_mirrors.py (rank_mirrors: 측정 결과 캐시 재사용과 만료, 순위, mirrorlist 생성)
+
+import json
+import os
+
+from rank_mirrors import (
+    TEST_PACKAGE,
+    TEST_REPO,
+    MirrorScore,
+    load_score_cache,
+    rank_mirrors,
+    write_mirrorlists,
+)
+
+PROBE_BYTES = 64 * 1024
+
+
+def _mirrors(file_server):
+    data = os.urandom(PROBE_BYTES * 2)
+    urls = []
+    for name in ("m1", "m2"):
+        file_server.files[f"/{name}/{TEST_REPO}/{TEST_PACKAGE}"] = data
+        urls.append(file_server.url(f"/{name}"))
+    urls.append(file_server.url("/missing"))  # 404를 돌려주는 미러
+    return urls
+
+
+def test_scores_are_cached_and_reused(file_server, tmp_path):
+    urls = _mirrors(file_server)
+    cache_path = str(tmp_path / "scores" / "mirror-scores.json")
+
+    first = rank_mirrors(urls, cache_path=cache_path, probe_bytes=PROBE_BYTES)
+    assert [s.ok for s in first] == [True, True, False]
+    assert first[-1].url == urls[2]
+    assert len(file_server.requests) == 3
+    with open(cache_path, encoding="utf-8") as f:
+        # 실패한 측정은 저장하지 않음
+        assert sorted(item["url"] for item in json.load(f)["scores"]) == urls[:2]
+
+    # 두 번째 실행: 캐시된 미러는 측정하지 않고, 실패했던 미러만 다시 측정
+    file_server.requests.clear()
+    second = rank_mirrors(urls, cache_path=cache_path, probe_bytes=PROBE_BYTES)
+    assert file_server.requests == [("/missing/" + f"{TEST_REPO}/{TEST_PACKAGE}", f"bytes=0-{PROBE_BYTES - 1}")]
+    assert [s.url for s in second[:2]] == [s.url for s in first[:2]]
+    assert [s.throughput for s in second[:2]] == [s.throughput for s in first[:2]]
+
+
+def test_expired_scores_are_measured_again(file_server, tmp_path):
+    urls = _mirrors(file_server)[:2]
+    cache_path = str(tmp_path / "mirror-scores.json")
+    rank_mirrors(urls, cache_path=cache_path, probe_bytes=PROBE_BYTES)
+
+    file_server.requests.clear()
+    rank_mirrors(urls, cache_path=cache_path, cache_ttl=0, probe_bytes=PROBE_BYTES)
+    assert len(file_server.requests) == 2
+
+
+def test_load_score_cache_filters_by_ttl(tmp_path):
+    cache_path = str(tmp_path / "mirror-scores.json")
+    scores = [
+        MirrorScore("https://fresh.example/", ttfb=0.1, throughput=1e6, measured_at=1000.0),
+        MirrorScore("https://stale.example/", ttfb=0.1, throughput=1e6, measured_at=100.0),
+    ]
+    with open(cache_path, "w", encoding="utf-8") as f:
+        json.dump({"scores": [s.to_dict() for s in scores]}, f)
+
+    assert list(load_score_cache(cache_path, ttl=500, now=1200.0)) == ["https://fresh.example/"]
+    assert load_score_cache(str(tmp_path / "absent.json"), ttl=500) == {}
+
+
+def test_ranking_follows_ttfb_and_throughput(make_file_server):
+    data = os.urandom(PROBE_BYTES * 4)
+    urls = {}
+    # (응답 지연, 64KB마다 쉬는 시간): 빠른 미러, 응답만 느린 미러, 전송이 느린 미러
+    for name, response_delay, chunk_delay in (("slow-body", 0, 0.2), ("fast", 0, 0), ("slow-ttfb", 1.0, 0)):
+        server = make_file_server()
+        server.response_delay = response_delay
+        server.chunk_delay = chunk_delay
+        server.files[f"/mingw/{TEST_REPO}/{TEST_PACKAGE}"] = data
+        urls[name] = server.url("/mingw")
+
+    scores = rank_mirrors(list(urls.values()), probe_bytes=PROBE_BYTES * 4)
+    by_url = {score.url: score for score in scores}
+    assert [score.url for score in scores] == [urls["fast"], urls["slow-ttfb"], urls["slow-body"]]
+    assert by_url[urls["slow-ttfb"]].ttfb >= 1.0
+    assert by_url[urls["slow-body"]].ttfb < 1.0
+    assert by_url[urls["slow-body"]].throughput < by_url[urls["slow-ttfb"]].throughput
+
+
+def test_write_mirrorlists(tmp_path):
+    mirrors = ["https://repo.example/msys2/mingw", "https://mirror.example/mingw"]
+    proxy = "http://127.0.0.1:8080/mingw"
+    write_mirrorlists(str(tmp_path), mirrors, extensions=["msys", "mingw", "ucrt64"], prepend=[proxy, mirrors[1]])
+
+    def lines(ext):
+        return (tmp_path / f"mirrorlist.{ext}").read_text(encoding="utf-8").splitlines()
+
+    # 앞에 넣은 주소가 먼저 오고, 중복은 한 번만 씀
+    assert lines("msys") == [
+        "Server = http://127.0.0.1:8080/msys/$arch/",
+        "Server = https://mirror.example/msys/$arch/",
+        "Server = https://repo.example/msys2/msys/$arch/",
+    ]
+    assert lines("mingw") == [
+        "Server = http://127.0.0.1:8080/mingw/$repo/",
+        "Server = https://mirror.example/mingw/$repo/",
+        "Server = https://repo.example/msys2/mingw/$repo/",
+    ]
+    assert lines("ucrt64")[0] == "Server = http://127.0.0.1:8080/mingw/ucrt64/"
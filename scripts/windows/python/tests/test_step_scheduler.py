@@ -0,0 +1,98 @@
+# test_step_scheduler.py (step_scheduler: 가짜 단계로 실패 전파, 동시 실행 수, 의존성 검사, 저널 기록 확인)
+
+import threading
+import time
+
+import pytest
+
+from step_journal import StepJournal, fingerprint
+from step_scheduler import (
+    STATUS_FAILED,
+    STATUS_SKIPPED,
+    STATUS_SUCCESS,
+    STATUS_UP_TO_DATE,
+    Step,
+    StepScheduler,
+)
+
+
+def test_step_with_nothing_to_do_is_not_recorded(tmp_path):
+    journal = StepJournal(str(tmp_path / "journal.json"))
+    calls = []
+
+    def download():
+        calls.append("download")
+        return STATUS_UP_TO_DATE  # 이미 설치되어 있어 받지 않음
+
+    def install():
+        calls.append("install")
+        return True
+
+    steps = [
+        Step("download", download, fingerprint=lambda: fingerprint("v1")),
+        Step("install", install, depends_on=["download"], fingerprint=lambda: fingerprint("v1")),
+    ]
+    results = StepScheduler(steps, journal=journal).run()
+
+    assert results["download"].status == STATUS_UP_TO_DATE
+    assert results["install"].status == STATUS_SUCCESS
+    assert not journal.is_fresh("download", fingerprint("v1"))
+    assert journal.is_fresh("install", fingerprint("v1"))
+
+    # 다음 실행: 기록되지 않은 단계는 다시 확인하고, 기록된 단계는 건너뜀
+    calls.clear()
+    StepScheduler(steps, journal=journal).run()
+    assert calls == ["download"]
+
+
+def test_failure_skips_only_transitive_dependents():
+    ran = []
+
+    def step(name, depends_on=(), ok=True):
+        return Step(name, lambda: ran.append(name) or ok, depends_on=depends_on)
+
+    steps = [
+        step("a", ok=False),
+        step("b", ["a"]),
+        step("c", ["b"]),
+        step("d"),
+        step("e", ["d"]),
+    ]
+    results = StepScheduler(steps, max_workers=2).run()
+
+    assert {name: r.status for name, r in results.items()} == {
+        "a": STATUS_FAILED,
+        "b": STATUS_SKIPPED,
+        "c": STATUS_SKIPPED,
+        "d": STATUS_SUCCESS,
+        "e": STATUS_SUCCESS,
+    }
+    assert sorted(ran) == ["a", "d", "e"]
+
+
+def test_peak_concurrency_is_bounded_by_max_workers():
+    lock = threading.Lock()
+    running = [0]
+    peak = [0]
+
+    def work():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+        return True
+
+    steps = [Step(f"s{i}", work) for i in range(8)]
+    results = StepScheduler(steps, max_workers=3).run()
+
+    assert all(r.status == STATUS_SUCCESS for r in results.values())
+    assert peak[0] == 3
+
+
+def test_invalid_dependencies_are_rejected():
+    with pytest.raises(ValueError, match="순환 의존성"):
+        StepScheduler([Step("a", bool, depends_on=["b"]), Step("b", bool, depends_on=["a"])])
+    with pytest.raises(ValueError, match="의존 단계 'missing'"):
+        StepScheduler([Step("a", bool, depends_on=["missing"])])
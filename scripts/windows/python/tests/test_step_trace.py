@@ -0,0 +1,30 @@
+# test_step_trace.py (step_trace: 캡처 실행 명령도 하위 프로세스 구간으로 기록)
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from step_trace import CATEGORY_SUBPROCESS, get_tracer, traced_run
+
+
+def test_traced_run_records_exit_code():
+    tracer = get_tracer()
+    tracer.reset()
+    result = traced_run([sys.executable, "-c", "print('hi'); raise SystemExit(2)"], capture_output=True, text=True)
+
+    assert result.returncode == 2
+    assert result.stdout.strip() == "hi"
+    [span] = tracer.spans
+    assert span.name == os.path.basename(sys.executable)
+    assert span.category == CATEGORY_SUBPROCESS
+    assert span.args["exit_code"] == 2
+
+
+def test_traced_run_records_errors():
+    tracer = get_tracer()
+    tracer.reset()
+    with pytest.raises(subprocess.CalledProcessError):
+        traced_run([sys.executable, "-c", "raise SystemExit(1)"], check=True)
+    assert "CalledProcessError" in tracer.spans[0].args["error"]
@@ -0,0 +1,28 @@
+# test_venv_cache.py (venv_cache: 가상 환경에 설치된 요구 패키지 확인)
+
+import os
+
+from venv_cache import missing_packages
+
+
+def _dist_info(site_packages, name):
+    os.makedirs(os.path.join(site_packages, name))
+
+
+def test_missing_packages_windows_layout(tmp_path):
+    site_packages = os.path.join(tmp_path, "Lib", "site-packages")
+    _dist_info(site_packages, "mkdocs-1.6.1.dist-info")
+    _dist_info(site_packages, "mkdocs_material-9.5.30.dist-info")
+
+    requirements = ["mkdocs>=1.5", "mkdocs-material", "mkdoxy"]
+    assert missing_packages(str(tmp_path), requirements) == ["mkdoxy"]
+
+
+def test_missing_packages_posix_layout(tmp_path):
+    site_packages = os.path.join(tmp_path, "lib", "python3.13", "site-packages")
+    _dist_info(site_packages, "MkDoxy-1.2.4.dist-info")
+    assert missing_packages(str(tmp_path), ["mkdoxy"]) == []
+
+
+def test_missing_packages_without_venv(tmp_path):
+    assert missing_packages(str(tmp_path / "absent"), ["mkdocs"]) == ["mkdocs"]
@@ -0,0 +1,91 @@
+# test_wheelhouse.py (wheelhouse: wheel 파일 이름 파싱, 빠진 요구 패키지, manifest 무효화, 설치 명령)
+
+from wheelhouse import (
+    is_prefetched,
+    missing_requirements,
+    normalize_name,
+    parse_wheel_filename,
+    pip_install_command,
+    prefetch_wheelhouse,
+)
+
+TAG = "cpython313-win-amd64"
+WHEELS = [
+    "mkdocs-1.6.1-py3-none-any.whl",
+    "mkdocs_material-9.5.30-py3-none-any.whl",
+    "PyYAML-6.0.2-cp313-cp313-win_amd64.whl",
+]
+
+
+def _fake_pip(wheelhouse_dir, commands):
+    """pip wheel 대신 빈 wheel 파일을 만드는 실행 함수."""
+
+    def run(command, **kwargs):
+        commands.append(command)
+        for name in WHEELS:
+            (wheelhouse_dir / name).write_bytes(b"")
+        return True, ""
+
+    return run
+
+
+def test_normalize_and_parse_wheel_filename():
+    assert normalize_name("Mkdocs_Material") == "mkdocs-material"
+    assert normalize_name("zope.interface") == "zope-interface"
+    assert parse_wheel_filename("mkdocs_material-9.5.30-py3-none-any.whl") == (
+        "mkdocs-material",
+        "9.5.30",
+        "py3-none-any",
+    )
+    # 빌드 태그가 있는 이름
+    assert parse_wheel_filename("foo-1.0-1-cp313-cp313-win_amd64.whl") == ("foo", "1.0", "cp313-cp313-win_amd64")
+    assert parse_wheel_filename("mkdocs-1.6.1.tar.gz") is None
+    assert parse_wheel_filename("broken.whl") is None
+
+
+def test_missing_requirements(tmp_path):
+    for name in WHEELS:
+        (tmp_path / name).write_bytes(b"")
+    (tmp_path / "requests-2.32.3.tar.gz").write_bytes(b"")
+
+    requirements = ["Mkdocs_Material>=9", "mkdocs[i18n]==1.6.1", "pyyaml", "requests"]
+    assert missing_requirements(requirements, str(tmp_path)) == ["requests"]
+    assert missing_requirements(["mkdocs"], str(tmp_path / "absent")) == ["mkdocs"]
+
+
+def test_manifest_is_invalidated_by_interpreter_and_missing_wheels(tmp_path):
+    requirements = ["mkdocs", "mkdocs-material"]
+    commands = []
+    run = _fake_pip(tmp_path, commands)
+
+    assert prefetch_wheelhouse("python", requirements, str(tmp_path), TAG, run=run)
+    assert len(commands) == 1
+    assert is_prefetched(requirements, str(tmp_path), TAG)
+    assert is_prefetched(list(reversed(requirements)), str(tmp_path), TAG)  # 순서 무관
+
+    # 이미 받아 두었으면 pip를 다시 실행하지 않음
+    assert prefetch_wheelhouse("python", requirements, str(tmp_path), TAG, run=run)
+    assert len(commands) == 1
+
+    # 인터프리터가 바뀌면(다른 wheel이 필요할 수 있음) 다시 받아야 함
+    assert not is_prefetched(requirements, str(tmp_path), "cpython314-win-amd64")
+    # 기록된 wheel이 지워져도 다시 받아야 함
+    (tmp_path / WHEELS[0]).unlink()
+    assert not is_prefetched(requirements, str(tmp_path), TAG)
+
+
+def test_pip_install_command():
+    pip = ["venv/python.exe", "-m", "pip"]
+    assert pip_install_command(pip, ["mkdocs"]) == pip + ["install", "mkdocs"]
+    assert pip_install_command(pip, ["mkdocs"], wheelhouse_dir="", upgrade=True) == pip + [
+        "install",
+        "--upgrade",
+        "mkdocs",
+    ]
+    assert pip_install_command(pip, ["mkdocs"], wheelhouse_dir="C:/wheelhouse") == pip + [
+        "install",
+        "--no-index",
+        "--find-links",
+        "C:/wheelhouse",
+        "mkdocs",
+    ]
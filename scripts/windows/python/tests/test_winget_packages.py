@@ -0,0 +1,91 @@
+# test_winget_packages.py (winget_packages: winget export/list 출력 파싱)
+
+import json
+
+from winget_packages import parse_winget_export, parse_winget_list, plan_winget_installs
+
+# winget list 출력 (영문 콘솔). 진행률 스피너가 '\r'로 덮어쓴 뒤 표가 나옵니다.
+WINGET_LIST_EN = (
+    "   - \r   \\ \r   | \r   / \r"
+    "Name                                    Id                              Version          Available Source\r\n"
+    "---------------------------------------------------------------------------------------------------------\r\n"
+    "Git                                     Git.Git                         2.45.2                     winget\r\n"
+    "Microsoft Visual Studio Code (User)     Microsoft.VisualStudioCode      1.91.1           1.92.0    winget\r\n"
+    "Microsoft Visual C++ 2015-2022 Redistr… Microsoft.VCRedist.2015+.x64    14.38.33135.0    14.40.33… winget\r\n"
+    "7-Zip 23.01 (x64)                       7zip.7zip                       23.01                      winget\r\n"
+    "Intel(R) Wireless Bluetooth(R)          ARP\\Machine\\X64\\{00000000-1111} 23.40.0.2\r\n"
+)
+
+# 같은 목록의 한국어 콘솔 출력. 한글은 콘솔에서 2칸을 차지하므로 열 위치가 글자 수와 다릅니다.
+WINGET_LIST_KO = (
+    "이름                             ID                           버전          사용 가능 원본\r\n"
+    "------------------------------------------------------------------------------------------\r\n"
+    "Git                              Git.Git                      2.45.2                  winget\r\n"
+    "카카오톡                         Kakao.KakaoTalk              4.1.3.3891              winget\r\n"
+    "한컴오피스 한글 뷰어             Hancom.HwpViewer             12.0.0.3650   12.0.0.40 winget\r\n"
+)
+
+WINGET_EXPORT = {
+    "$schema": "https://aka.ms/winget-packages.schema.2.0.json",
+    "CreationDate": "2024-07-15T10:21:33.123-00:00",
+    "Sources": [
+        {
+            "Packages": [
+                {"PackageIdentifier": "Git.Git", "Version": "2.45.2"},
+                {"PackageIdentifier": "Microsoft.VisualStudioCode", "Version": "1.91.1"},
+            ],
+            "SourceDetails": {
+                "Argument": "https://cdn.winget.microsoft.com/cache",
+                "Identifier": "Microsoft.Winget.Source_8wekyb3d8bbwe",
+                "Name": "winget",
+                "Type": "Microsoft.PreIndexed.Package",
+            },
+        },
+        {
+            "Packages": [{"PackageIdentifier": "9NBLGGH4NNS1"}],
+            "SourceDetails": {"Name": "msstore", "Type": "Microsoft.Rest"},
+        },
+    ],
+    "WinGetVersion": "1.8.1911",
+}
+
+
+def test_parse_winget_list_english():
+    installed = parse_winget_list(WINGET_LIST_EN)
+    assert installed == {
+        "git.git": "2.45.2",
+        "microsoft.visualstudiocode": "1.91.1",
+        "microsoft.vcredist.2015+.x64": "14.38.33135.0",
+        "7zip.7zip": "23.01",
+        "arp\\machine\\x64\\{00000000-1111}": "23.40.0.2",
+    }
+
+
+def test_parse_winget_list_korean_uses_display_width():
+    installed = parse_winget_list(WINGET_LIST_KO)
+    assert installed == {
+        "git.git": "2.45.2",
+        "kakao.kakaotalk": "4.1.3.3891",
+        "hancom.hwpviewer": "12.0.0.3650",
+    }
+
+
+def test_parse_winget_list_without_table():
+    # 설치된 패키지가 없거나 오류 메시지만 나온 경우
+    assert parse_winget_list("No installed package found matching input criteria.\r\n") == {}
+
+
+def test_parse_winget_export():
+    installed = parse_winget_export(json.dumps(WINGET_EXPORT))
+    assert installed == {
+        "git.git": "2.45.2",
+        "microsoft.visualstudiocode": "1.91.1",
+        "9nblggh4nns1": None,
+    }
+
+
+def test_plan_winget_installs_is_case_insensitive():
+    programs = {"Git": "Git.Git", "CMake": "Kitware.CMake"}
+    to_install, already = plan_winget_installs(programs, parse_winget_list(WINGET_LIST_EN))
+    assert to_install == [("CMake", "Kitware.CMake")]
+    assert already == [("Git", "Git.Git")]
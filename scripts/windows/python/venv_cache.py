@@ -0,0 +1,324 @@
+# venv_cache.py (인터프리터 + 요구 패키지 목록별 가상 환경 템플릿 캐시)
+#
+# 같은 Python으로 같은 패키지 목록의 가상 환경을 만들 때마다 'python -m venv', pip 업그레이드,
+# 패키지 설치를 반복하지 않도록, 한 번 만든 가상 환경을 템플릿으로 보관합니다.
+# 새 가상 환경은 템플릿을 복사(site-packages 등 경로가 들어 있지 않은 파일은 하드 링크)한 뒤
+# 템플릿 경로가 기록된 파일(pyvenv.cfg, activate 스크립트, 실행 스크립트/런처)만 고쳐 씁니다.
+#
+# 디렉터리 구조:
+#   <root>/<key>/venv           템플릿 가상 환경
+#   <root>/<key>/template.json  완성 표시 + 정보 (이 파일이 없으면 만들다 중단된 템플릿)
+
+import glob
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import time
+
+from step_trace import traced_run
+
+TEMPLATE_MARKER = "template.json"
+DEFAULT_MAX_TEMPLATES = 3
+# 이 디렉터리 아래 파일에는 가상 환경 경로가 기록되지 않으므로 하드 링크로 공유
+_LINKABLE_DIRS = ("Lib", "lib", "Include", "include", "share")
+# 런처(.exe) 안의 shebang 줄 최대 길이 (이보다 길면 shebang이 아닌 것으로 봄)
+_MAX_SHEBANG = 4096
+
+
+class VenvCacheError(Exception):
+    pass
+
+
+def interpreter_identity(python_exe):
+    """캐시 키에 쓰는 인터프리터 정보 (버전, 구현, 플랫폼, 설치 위치)."""
+    code = (
+        "import json, sys, sysconfig; print(json.dumps({"
+        "'version': sys.version, 'implementation': sys.implementation.name, "
+        "'platform': sysconfig.get_platform(), 'base_prefix': sys.base_prefix}))"
+    )
+    try:
+        result = traced_run(
+            [python_exe, "-c", code], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError) as e:
+        raise VenvCacheError(f"인터프리터 정보를 읽을 수 없습니다: {python_exe} ({e})")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def template_key(identity, requirements):
+    """인터프리터 정보와 정렬된 요구 패키지 목록의 해시."""
+    encoded = json.dumps([identity, sorted(requirements)], sort_keys=True)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:32]
+
+
+def _scripts_dir(venv_path):
+    scripts = os.path.join(venv_path, "Scripts")
+    return scripts if os.path.isdir(scripts) else os.path.join(venv_path, "bin")
+
+
+def venv_python(venv_path):
+    scripts = _scripts_dir(venv_path)
+    for name in ("python.exe", "python"):
+        if os.path.exists(os.path.join(scripts, name)):
+            return os.path.join(scripts, name)
+    return os.path.join(scripts, "python.exe" if os.name == "nt" else "python")
+
+
+def missing_packages(venv_path, requirements):
+    """
+    가상 환경의 site-packages에 설치 정보(*.dist-info)가 없는 요구 패키지 목록.
+    pip를 실행하지 않고 디렉터리만 확인하므로 단계 사후 조건으로 쓸 수 있습니다.
+    """
+    from wheelhouse import normalize_name, requirement_name
+
+    installed = set()
+    patterns = [
+        os.path.join(venv_path, "Lib", "site-packages", "*.dist-info"),
+        os.path.join(venv_path, "lib", "python*", "site-packages", "*.dist-info"),
+    ]
+    for pattern in patterns:
+        for path in glob.glob(pattern):
+            # '<이름>-<버전>.dist-info' (이름의 '-'는 '_'로 바뀌어 있음)
+            installed.add(normalize_name(os.path.basename(path).split("-")[0]))
+    return [req for req in requirements if requirement_name(req) not in installed]
+
+
+def _relocate_launcher(data, old, new):
+    """
+    pip가 만든 Windows 실행 런처(.exe)는 '런처 + #!<python 경로>\\n + zip' 구조입니다.
+    zip 안의 오프셋은 zip 시작 기준이므로 shebang 줄만 바꿔도 됩니다.
+    """
+    pos = data.find(old)
+    if pos == -1:
+        return None
+    line_start = data.rfind(b"#!", max(0, pos - _MAX_SHEBANG), pos)
+    line_end = data.find(b"\n", pos)
+    if line_start == -1 or line_end == -1 or line_end - line_start > _MAX_SHEBANG:
+        return None
+    return data[:line_start] + data[line_start:line_end].replace(old, new) + data[line_end:]
+
+
+def _relocate_file(path, old, new):
+    """파일 안의 템플릿 경로를 새 경로로 바꿉니다. 바꿨으면 True."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if old not in data:
+        return False
+    if path.lower().endswith(".exe"):
+        updated = _relocate_launcher(data, old, new)
+        if updated is None:
+            return False
+    else:
+        updated = data.replace(old, new)
+    mode = os.stat(path).st_mode
+    os.remove(path)  # 하드 링크일 수 있으므로 제자리에서 고치지 않고 새 파일로 씀
+    with open(path, "wb") as f:
+        f.write(updated)
+    os.chmod(path, mode)
+    return True
+
+
+def _link_or_copy(src, dst, link):
+    if link:
+        try:
+            os.link(src, dst)
+            return True
+        except OSError:  # 다른 볼륨, 권한 등
+            pass
+    shutil.copy2(src, dst)
+    return False
+
+
+class VenvCache:
+    """
+    (인터프리터, 요구 패키지 목록) 키마다 가상 환경 템플릿을 하나씩 보관합니다.
+    - 인터프리터가 바뀌거나(업데이트 포함) 요구 목록이 바뀌면 키가 달라져 새로 만듭니다.
+    - 템플릿이 손상되었으면(python 실행 파일이 없음) 지우고 다시 만듭니다.
+    - 템플릿은 최대 max_templates개까지 보관하고, 오래 사용하지 않은 것부터 지웁니다.
+    """
+
+    def __init__(self, root, max_templates=DEFAULT_MAX_TEMPLATES, run=None):
+        self.root = os.path.abspath(root)
+        self.max_templates = max(1, max_templates)
+        self._run = run  # (성공 여부, 출력)을 반환하는 명령 실행 함수 (기본: setup_utils.run_command)
+        os.makedirs(root, exist_ok=True)
+
+    def _run_command(self, command_list, **kwargs):
+        if self._run is None:
+            from setup_utils import run_command
+
+            self._run = run_command
+        return self._run(command_list, **kwargs)
+
+    # --- 템플릿 ---
+    def _template_dir(self, key):
+        return os.path.join(self.root, key)
+
+    def _read_marker(self, key):
+        try:
+            with open(os.path.join(self._template_dir(key), TEMPLATE_MARKER), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_marker(self, key, info):
+        path = os.path.join(self._template_dir(key), TEMPLATE_MARKER)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(info, f, indent=2, ensure_ascii=False)
+        os.replace(path + ".tmp", path)
+
+    def templates(self):
+        """{키: 템플릿 정보} (완성된 템플릿만)"""
+        result = {}
+        for key in os.listdir(self.root):
+            info = self._read_marker(key)
+            if info is not None:
+                result[key] = info
+        return result
+
+    def lookup(self, key):
+        """쓸 수 있는 템플릿이면 정보를, 없거나 손상되었으면 None을 반환합니다."""
+        info = self._read_marker(key)
+        if info is None:
+            return None
+        if not os.path.exists(venv_python(info["venv_path"])):
+            print(f"가상 환경 템플릿이 손상되어 다시 만듭니다: {key}")
+            self.invalidate(key)
+            return None
+        return info
+
+    def invalidate(self, key):
+        shutil.rmtree(self._template_dir(key), ignore_errors=True)
+
+    def clear(self):
+        for key in os.listdir(self.root):
+            self.invalidate(key)
+
+    def _build(self, key, python_exe, requirements, wheelhouse_dir, identity):
+        from wheelhouse import pip_install_command
+
+        template_dir = self._template_dir(key)
+        shutil.rmtree(template_dir, ignore_errors=True)  # 중단된 이전 빌드
+        os.makedirs(template_dir)
+        venv_path = os.path.join(template_dir, "venv")
+
+        print(f"가상 환경 템플릿 생성 중: {venv_path}")
+        success, _ = self._run_command(
+            [python_exe, "-m", "venv", venv_path],
+            error_message="가상 환경 템플릿 생성 실패.",
+        )
+        template_python = venv_python(venv_path)
+        if success:
+            success, _ = self._run_command(
+                pip_install_command([template_python, "-m", "pip"], ["pip"], wheelhouse_dir, upgrade=True),
+                error_message="pip 업그레이드 실패.",
+            )
+        if success and requirements:
+            success, _ = self._run_command(
+                pip_install_command([template_python, "-m", "pip"], requirements, wheelhouse_dir),
+                error_message="패키지 설치 실패.",
+            )
+        if not success:
+            self.invalidate(key)
+            raise VenvCacheError("가상 환경 템플릿을 만들지 못했습니다.")
+
+        info = {
+            "key": key,
+            "venv_path": venv_path,
+            "python": python_exe,
+            "interpreter": identity,
+            "requirements": sorted(requirements),
+            "created_at": time.time(),
+            "last_used": time.time(),
+        }
+        self._write_marker(key, info)
+        return info
+
+    def _evict(self, keep):
+        """템플릿 수가 max_templates를 넘으면 오래 사용하지 않은 것부터 지웁니다."""
+        templates = sorted(self.templates().items(), key=lambda item: item[1].get("last_used", 0))
+        excess = len(templates) - self.max_templates
+        for key, _ in templates:
+            if excess <= 0:
+                break
+            if key == keep:
+                continue
+            print(f"오래된 가상 환경 템플릿 삭제: {key}")
+            self.invalidate(key)
+            excess -= 1
+
+    def get_template(self, python_exe, requirements, wheelhouse_dir=None):
+        """키에 맞는 템플릿 정보를 반환합니다 (없으면 만듦)."""
+        identity = interpreter_identity(python_exe)
+        key = template_key(identity, requirements)
+        info = self.lookup(key)
+        if info is None:
+            info = self._build(key, python_exe, list(requirements), wheelhouse_dir, identity)
+            self._evict(keep=key)
+        else:
+            print(f"가상 환경 템플릿 재사용: {key}")
+            info["last_used"] = time.time()
+            self._write_marker(key, info)
+        return info
+
+    # --- 새 가상 환경 만들기 ---
+    def materialize(self, python_exe, requirements, dest_venv, wheelhouse_dir=None, link=True):
+        """
+        템플릿을 dest_venv로 복사하고 경로를 고칩니다. dest_venv가 이미 있으면 지우고 새로 만듭니다.
+        link=True이면 경로가 기록되지 않는 파일(Lib/site-packages 등)은 하드 링크로 공유합니다.
+        반환값: 새 가상 환경의 python 실행 파일 경로
+        """
+        info = self.get_template(python_exe, requirements, wheelhouse_dir)
+        template_venv = info["venv_path"]
+        dest_venv = os.path.abspath(dest_venv)
+        if os.path.exists(dest_venv):
+            shutil.rmtree(dest_venv)
+
+        linked = copied = 0
+        for dirpath, dirnames, filenames in os.walk(template_venv):
+            rel_dir = os.path.relpath(dirpath, template_venv)
+            target_dir = os.path.normpath(os.path.join(dest_venv, rel_dir))
+            os.makedirs(target_dir, exist_ok=True)
+            top = rel_dir.split(os.sep)[0]
+            can_link = link and top in _LINKABLE_DIRS
+            for name in list(dirnames):
+                src = os.path.join(dirpath, name)
+                if os.path.islink(src):  # lib64 -> lib 같은 링크는 그대로 유지
+                    os.symlink(os.readlink(src), os.path.join(target_dir, name))
+                    dirnames.remove(name)
+            for name in filenames:
+                src = os.path.join(dirpath, name)
+                dst = os.path.join(target_dir, name)
+                if os.path.islink(src):
+                    os.symlink(os.readlink(src), dst)
+                elif _link_or_copy(src, dst, can_link):
+                    linked += 1
+                else:
+                    copied += 1
+
+        relocated = self._relocate(dest_venv, template_venv)
+        print(
+            f"가상 환경 생성 완료 (템플릿 복사): {dest_venv} "
+            f"(하드 링크 {linked}개, 복사 {copied}개, 경로 수정 {relocated}개)"
+        )
+        return venv_python(dest_venv)
+
+    @staticmethod
+    def _relocate(dest_venv, template_venv):
+        """템플릿 경로가 기록되는 파일들(pyvenv.cfg, Scripts/bin 아래 파일)의 경로를 고칩니다."""
+        old = template_venv.encode("utf-8")
+        new = dest_venv.encode("utf-8")
+        candidates = [os.path.join(dest_venv, "pyvenv.cfg")]
+        scripts = _scripts_dir(dest_venv)
+        candidates += [
+            os.path.join(scripts, name)
+            for name in os.listdir(scripts)
+            if not os.path.islink(os.path.join(scripts, name))
+        ]
+        relocated = 0
+        for path in candidates:
+            if os.path.isfile(path) and _relocate_file(path, old, new):
+                relocated += 1
+        return relocated
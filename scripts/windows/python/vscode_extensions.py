@@ -0,0 +1,161 @@
+# vscode_extensions.py (설치된 확장을 한 번만 조회하고, 필요한 확장만 병렬 설치)
+
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from net_governor import get_governor, PRIORITY_BACKGROUND
+from step_trace import traced_run
+
+# --- 상수 ---
+DEFAULT_MAX_WORKERS = 3  # 동시에 실행할 'code --install-extension' 수
+LIST_TIMEOUT = 60  # 'code --list-extensions' 타임아웃 (초)
+INSTALL_TIMEOUT = 600  # 확장 하나 설치 타임아웃 (초)
+MARKETPLACE_HOST = "marketplace.visualstudio.com"  # 설치 시 연결 슬롯을 받는 호스트
+
+# 확장별 결과 상태
+RESULT_INSTALLED = "installed"
+RESULT_UPDATED = "updated"
+RESULT_UP_TO_DATE = "up-to-date"
+RESULT_FAILED = "failed"
+
+
+class ExtensionResult:
+    def __init__(self, extension_id, status, message=""):
+        self.extension_id = extension_id
+        self.status = status
+        self.message = message
+
+    @property
+    def ok(self):
+        return self.status != RESULT_FAILED
+
+    def __repr__(self):
+        return f"ExtensionResult({self.extension_id!r}, {self.status!r})"
+
+
+# --- 파싱 / 비교 (순수 함수, 플랫폼 무관) ---
+def parse_extension_spec(spec):
+    """'publisher.name' 또는 'publisher.name@1.2.3'을 (소문자 ID, 버전 또는 None)으로 나눕니다."""
+    extension_id, _, version = spec.strip().partition("@")
+    return extension_id.lower(), (version or None)
+
+
+def parse_installed_extensions(output):
+    """
+    'code --list-extensions --show-versions' 출력을 {소문자 ID: 버전}으로 변환합니다.
+    예: "ms-python.python@2025.4.0"
+    """
+    installed = {}
+    for line in output.splitlines():
+        line = line.strip()
+        if not line or "@" not in line or "." not in line.split("@", 1)[0]:
+            continue  # 빈 줄, 경고 메시지 등은 무시
+        extension_id, version = parse_extension_spec(line)
+        installed[extension_id] = version
+    return installed
+
+
+def plan_extension_installs(requested_specs, installed):
+    """
+    설치가 필요한 확장 목록을 계산합니다.
+    반환값: (install_list, up_to_date_list)
+      install_list: [(spec, RESULT_INSTALLED | RESULT_UPDATED)]
+      up_to_date_list: [spec]
+    버전을 지정하지 않은 확장은 설치되어 있기만 하면 최신으로 간주하고,
+    'publisher.name@버전'으로 지정하면 설치된 버전이 다를 때 해당 버전으로 설치합니다.
+    """
+    to_install = []
+    up_to_date = []
+    seen = set()
+    for spec in requested_specs:
+        extension_id, version = parse_extension_spec(spec)
+        if extension_id in seen:
+            continue
+        seen.add(extension_id)
+
+        if extension_id not in installed:
+            to_install.append((spec, RESULT_INSTALLED))
+        elif version and installed[extension_id] != version:
+            to_install.append((spec, RESULT_UPDATED))
+        else:
+            up_to_date.append(spec)
+    return to_install, up_to_date
+
+
+# --- 실행 ---
+def list_installed_extensions(code_exe):
+    """설치된 확장 목록을 한 번에 조회합니다. 실패 시 None을 반환합니다."""
+    try:
+        result = traced_run(
+            [code_exe, "--list-extensions", "--show-versions"],
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            timeout=LIST_TIMEOUT,
+            check=False,
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        print(f"VSCode 확장 목록 조회 실패: {e}")
+        return None
+    if result.returncode != 0:
+        print(f"VSCode 확장 목록 조회 실패 (종료 코드: {result.returncode})")
+        return None
+    return parse_installed_extensions(result.stdout)
+
+
+def _install_one(code_exe, spec, status):
+    command = [code_exe, "--install-extension", spec]
+    if status == RESULT_UPDATED:
+        command.append("--force")  # 다른 버전이 설치되어 있을 때만 강제 설치
+    try:
+        with get_governor().connection(MARKETPLACE_HOST, PRIORITY_BACKGROUND):
+            result = traced_run(
+                command,
+                capture_output=True,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+                timeout=INSTALL_TIMEOUT,
+                check=False,
+            )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        return ExtensionResult(spec, RESULT_FAILED, str(e))
+
+    output = (result.stdout + result.stderr).strip()
+    if result.returncode != 0:
+        return ExtensionResult(spec, RESULT_FAILED, output.splitlines()[-1] if output else "")
+    return ExtensionResult(spec, status)
+
+
+def install_vscode_extensions(code_exe, requested_specs, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    설치된 확장을 한 번 조회한 뒤, 없거나 버전이 다른 확장만 병렬로 설치합니다.
+    확장별 ExtensionResult 목록을 요청 순서대로 반환합니다.
+    """
+    installed = list_installed_extensions(code_exe)
+    if installed is None:
+        installed = {}  # 조회 실패 시 모두 설치 시도
+    to_install, up_to_date = plan_extension_installs(requested_specs, installed)
+
+    results = {spec: ExtensionResult(spec, RESULT_UP_TO_DATE) for spec in up_to_date}
+    if to_install:
+        print(f"설치할 VSCode 확장 {len(to_install)}개: {', '.join(s for s, _ in to_install)}")
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = [
+                executor.submit(_install_one, code_exe, spec, status)
+                for spec, status in to_install
+            ]
+            for future in futures:
+                result = future.result()
+                results[result.extension_id] = result
+    else:
+        print("모든 VSCode 확장이 이미 설치되어 있습니다.")
+
+    ordered = [results[spec] for spec in requested_specs if spec in results]
+    for result in ordered:
+        if result.status == RESULT_FAILED:
+            print(f"  [실패] {result.extension_id}: {result.message}")
+        else:
+            print(f"  [{result.status}] {result.extension_id}")
+    return ordered
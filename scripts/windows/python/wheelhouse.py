@@ -0,0 +1,187 @@
+# wheelhouse.py (패키지 wheel을 한 번만 받아 두고 가상 환경에는 오프라인으로 설치)
+#
+# prefetch_wheelhouse()는 'pip wheel'로 요구 패키지와 의존성 전체를 wheel로 받아(또는 빌드해)
+# 공유 디렉터리에 모아 둡니다. 이후 설치는 'pip install --no-index --find-links <디렉터리>'로
+# 인덱스에 접속하지 않고 진행합니다. 같은 요구 목록/인터프리터로 이미 받아 두었으면 다시 받지 않습니다.
+
+import hashlib
+import json
+import os
+import re
+import subprocess
+
+from step_trace import traced_run
+
+MANIFEST_NAME = "wheelhouse.json"
+
+
+def normalize_name(name):
+    """PEP 503 프로젝트 이름 정규화 (Mkdocs_Material -> mkdocs-material)."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def requirement_name(requirement):
+    """'mkdocs>=1.5', 'mkdocs[i18n]==1.6' 같은 요구 문자열에서 프로젝트 이름만 추출합니다."""
+    match = re.match(r"\s*([A-Za-z0-9][A-Za-z0-9._-]*)", requirement)
+    if not match:
+        raise ValueError(f"요구 패키지 형식을 알 수 없습니다: {requirement!r}")
+    return normalize_name(match.group(1))
+
+
+def parse_wheel_filename(file_name):
+    """
+    'mkdocs-1.6.1-py3-none-any.whl' -> ("mkdocs", "1.6.1", "py3-none-any")
+    wheel 파일이 아니면 None.
+    """
+    if not file_name.endswith(".whl"):
+        return None
+    parts = file_name[: -len(".whl")].split("-")
+    if len(parts) not in (5, 6):  # 빌드 태그가 있으면 6개
+        return None
+    return normalize_name(parts[0]), parts[1], "-".join(parts[-3:])
+
+
+def list_wheels(wheelhouse_dir):
+    """{프로젝트 이름: [wheel 파일 이름, ...]}"""
+    wheels = {}
+    try:
+        names = os.listdir(wheelhouse_dir)
+    except FileNotFoundError:
+        return wheels
+    for file_name in sorted(names):
+        parsed = parse_wheel_filename(file_name)
+        if parsed:
+            wheels.setdefault(parsed[0], []).append(file_name)
+    return wheels
+
+
+def missing_requirements(requirements, wheelhouse_dir):
+    """wheelhouse에 wheel이 하나도 없는 요구 패키지 목록 (의존성은 manifest로 확인)."""
+    available = list_wheels(wheelhouse_dir)
+    return [req for req in requirements if requirement_name(req) not in available]
+
+
+def requirements_key(requirements, interpreter_tag=""):
+    """요구 목록(순서 무관)과 인터프리터 태그(예: cpython313-win-amd64)로 만든 키."""
+    encoded = json.dumps([interpreter_tag, sorted(requirements)])
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def get_interpreter_tag(python_exe):
+    """wheel 호환성을 결정하는 인터프리터 태그 (예: 'cpython313-win-amd64'). 실패하면 빈 문자열."""
+    try:
+        result = traced_run(
+            [
+                python_exe,
+                "-c",
+                "import sys, sysconfig; "
+                "print(f'{sys.implementation.name}{sys.version_info[0]}{sys.version_info[1]}-' "
+                "+ sysconfig.get_platform())",
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+    return result.stdout.strip()
+
+
+def _load_manifest(wheelhouse_dir):
+    try:
+        with open(os.path.join(wheelhouse_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(wheelhouse_dir, manifest):
+    path = os.path.join(wheelhouse_dir, MANIFEST_NAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def is_prefetched(requirements, wheelhouse_dir, interpreter_tag=""):
+    """같은 요구 목록으로 받아 둔 기록이 있고, 기록된 wheel 파일이 모두 남아 있으면 True."""
+    entry = _load_manifest(wheelhouse_dir).get(requirements_key(requirements, interpreter_tag))
+    if not entry:
+        return False
+    return all(
+        os.path.isfile(os.path.join(wheelhouse_dir, name)) for name in entry.get("wheels", [])
+    )
+
+
+def pip_install_command(pip_command, requirements, wheelhouse_dir=None, upgrade=False):
+    """
+    pip install 명령 리스트를 만듭니다.
+    pip_command: [venv_pip_exe] 또는 [venv_python_exe, "-m", "pip"]
+    wheelhouse_dir가 주어지면 인덱스를 쓰지 않고 wheelhouse에서만 설치합니다.
+    """
+    command = list(pip_command) + ["install"]
+    if upgrade:
+        command.append("--upgrade")
+    if wheelhouse_dir:
+        command += ["--no-index", "--find-links", wheelhouse_dir]
+    return command + list(requirements)
+
+
+def prefetch_wheelhouse(
+    python_exe, requirements, wheelhouse_dir, interpreter_tag="", run=None, peer_links=()
+):
+    """
+    requirements와 모든 의존성의 wheel을 wheelhouse_dir에 받아 둡니다.
+    이미 같은 요구 목록으로 받아 두었으면 pip를 실행하지 않고 True를 반환합니다.
+    run: (성공 여부, 출력)을 반환하는 명령 실행 함수 (기본: setup_utils.run_command)
+    peer_links: 먼저 찾아볼 다른 wheelhouse 주소 (아티팩트 노드의 /wheelhouse/ 등).
+                여기에 모두 있으면 인덱스에 접속하지 않고, 하나라도 없으면 인덱스에서 받습니다.
+    """
+    requirements = list(requirements)
+    if is_prefetched(requirements, wheelhouse_dir, interpreter_tag):
+        print(f"wheelhouse 최신 상태: {wheelhouse_dir}")
+        return True
+
+    if run is None:
+        from setup_utils import run_command as run
+
+    os.makedirs(wheelhouse_dir, exist_ok=True)
+    before = set(os.listdir(wheelhouse_dir))
+    # --find-links: 이미 받아 둔 wheel은 다시 받지 않음. sdist만 있는 패키지는 여기서 wheel로 빌드
+    command = [python_exe, "-m", "pip", "wheel", "--wheel-dir", wheelhouse_dir, "--find-links", wheelhouse_dir]
+    success = False
+    if peer_links:
+        peer_args = [arg for link in peer_links for arg in ("--find-links", link)]
+        success, _ = run(
+            command + ["--no-index"] + peer_args + requirements,
+            success_message=f"wheelhouse 준비 완료 (아티팩트 노드): {wheelhouse_dir}",
+            error_message="아티팩트 노드에 없는 패키지가 있어 인덱스에서 받습니다.",
+        )
+    if not success:
+        success, _ = run(
+            command + requirements,
+            success_message=f"wheelhouse 준비 완료: {wheelhouse_dir}",
+            error_message="wheelhouse 준비 실패.",
+        )
+    if not success:
+        return False
+
+    missing = missing_requirements(requirements, wheelhouse_dir)
+    if missing:
+        print(f"오류: wheelhouse에 없는 패키지: {', '.join(missing)}")
+        return False
+
+    # 이번에 받은 wheel과 요구 패키지의 wheel을 기록 (다음 실행에서 파일이 남아 있는지 확인용)
+    available = list_wheels(wheelhouse_dir)
+    wheels = sorted(
+        {name for name in os.listdir(wheelhouse_dir) if name.endswith(".whl") and name not in before}
+        | {name for req in requirements for name in available[requirement_name(req)]}
+    )
+    manifest = _load_manifest(wheelhouse_dir)
+    manifest[requirements_key(requirements, interpreter_tag)] = {
+        "requirements": sorted(requirements),
+        "interpreter": interpreter_tag,
+        "wheels": wheels,
+    }
+    _save_manifest(wheelhouse_dir, manifest)
+    return True
@@ -0,0 +1,239 @@
+# winget_packages.py (설치된 패키지 목록을 한 번만 조회하고, 없는 패키지만 설치)
+
+import json
+import os
+import subprocess
+import tempfile
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+
+from step_trace import traced_run
+
+# --- 상수 ---
+WINGET_COMMON_ARGS = [
+    "--accept-package-agreements",
+    "--accept-source-agreements",
+    "-e",
+]
+DEFAULT_MAX_WORKERS = 2  # 설치 프로그램(MSI 등)은 서로 잠금을 기다리므로 작게 유지
+INVENTORY_TIMEOUT = 300  # winget export/list 타임아웃 (초)
+INSTALL_TIMEOUT = 1800  # 패키지 하나 설치 타임아웃 (초)
+
+RESULT_INSTALLED = "installed"
+RESULT_ALREADY_INSTALLED = "already-installed"
+RESULT_FAILED = "failed"
+
+
+class PackageResult:
+    def __init__(self, name, package_id, status, message=""):
+        self.name = name
+        self.package_id = package_id
+        self.status = status
+        self.message = message
+
+    @property
+    def ok(self):
+        return self.status != RESULT_FAILED
+
+    def __repr__(self):
+        return f"PackageResult({self.package_id!r}, {self.status!r})"
+
+
+# --- 파싱 (순수 함수, 플랫폼 무관) ---
+def parse_winget_export(text):
+    """
+    'winget export' JSON을 {소문자 패키지 ID: 버전 또는 None}으로 변환합니다.
+    --include-versions 없이 내보낸 경우 버전은 None입니다.
+    """
+    data = json.loads(text)
+    installed = {}
+    for source in data.get("Sources", []):
+        for package in source.get("Packages", []):
+            package_id = package.get("PackageIdentifier")
+            if package_id:
+                installed[package_id.lower()] = package.get("Version")
+    return installed
+
+
+def _display_width(text):
+    """콘솔 표시 폭 (한글 등 전각 문자는 2칸)."""
+    return sum(2 if unicodedata.east_asian_width(c) in ("W", "F") else 1 for c in text)
+
+
+def _slice_by_width(text, start, end=None):
+    """표시 폭 기준 [start, end) 구간의 문자열을 잘라냅니다."""
+    result = []
+    position = 0
+    for c in text:
+        width = _display_width(c)
+        if position >= start and (end is None or position + width <= end):
+            result.append(c)
+        position += width
+    return "".join(result).strip()
+
+
+def parse_winget_list(text):
+    """
+    'winget list' 표 출력을 {소문자 패키지 ID: 버전}으로 변환합니다.
+    헤더 이름은 언어별로 다르므로(Name/이름, Id/ID ...) 열 위치만 사용합니다:
+    두 번째 열이 ID, 세 번째 열이 버전입니다.
+    """
+    # 진행률 표시(스피너)는 '\r'로 덮어쓰므로 마지막 조각만 사용
+    lines = [line.split("\r")[-1].rstrip() for line in text.splitlines()]
+    separator = next(
+        (i for i, line in enumerate(lines) if line and set(line) == {"-"}), None
+    )
+    if separator is None or separator == 0:
+        return {}
+
+    header = lines[separator - 1]
+    # 헤더에서 각 열이 시작하는 표시 폭 위치
+    starts = []
+    position = 0
+    previous = " "
+    for c in header:
+        if previous == " " and c != " ":
+            starts.append(position)
+        position += _display_width(c)
+        previous = c
+    if len(starts) < 3:
+        return {}
+
+    installed = {}
+    for line in lines[separator + 1 :]:
+        if not line.strip():
+            continue
+        package_id = _slice_by_width(line, starts[1], starts[2])
+        version_end = starts[3] if len(starts) > 3 else None
+        version = _slice_by_width(line, starts[2], version_end)
+        if package_id and " " not in package_id:
+            installed[package_id.lower()] = version or None
+    return installed
+
+
+def plan_winget_installs(programs, installed):
+    """
+    programs: {표시 이름: 패키지 ID}
+    반환값: (설치할 [(이름, ID)], 이미 설치된 [(이름, ID)])
+    """
+    to_install = []
+    already = []
+    for name, package_id in programs.items():
+        if package_id.lower() in installed:
+            already.append((name, package_id))
+        else:
+            to_install.append((name, package_id))
+    return to_install, already
+
+
+# --- 실행 ---
+def _run_capture(command, timeout):
+    return traced_run(
+        command,
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        timeout=timeout,
+        check=False,
+    )
+
+
+def get_installed_packages(winget_exe="winget"):
+    """
+    설치된 패키지 목록을 한 번에 조회합니다.
+    'winget export' JSON을 우선 사용하고, 실패하면 'winget list' 표를 파싱합니다.
+    둘 다 실패하면 None을 반환합니다.
+    """
+    export_path = os.path.join(tempfile.mkdtemp(prefix="winget-export-"), "packages.json")
+    try:
+        result = _run_capture(
+            [
+                winget_exe,
+                "export",
+                "-o",
+                export_path,
+                "--include-versions",
+                "--accept-source-agreements",
+            ],
+            INVENTORY_TIMEOUT,
+        )
+        # export는 일부 패키지를 내보내지 못해도 0이 아닌 코드로 끝날 수 있으므로 파일 존재로 판단
+        if os.path.exists(export_path):
+            with open(export_path, "r", encoding="utf-8-sig") as f:
+                return parse_winget_export(f.read())
+        print(f"winget export 실패 (종료 코드: {result.returncode}), winget list로 대체합니다.")
+    except (OSError, ValueError, subprocess.TimeoutExpired) as e:
+        print(f"winget export 실패 ({e}), winget list로 대체합니다.")
+    finally:
+        try:
+            os.remove(export_path)
+            os.rmdir(os.path.dirname(export_path))
+        except OSError:
+            pass
+
+    try:
+        result = _run_capture(
+            [winget_exe, "list", "--accept-source-agreements"], INVENTORY_TIMEOUT
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        print(f"winget list 실패: {e}")
+        return None
+    if result.returncode != 0:
+        print(f"winget list 실패 (종료 코드: {result.returncode})")
+        return None
+    return parse_winget_list(result.stdout)
+
+
+def _install_one(winget_exe, name, package_id):
+    try:
+        result = _run_capture(
+            [winget_exe, "install"] + WINGET_COMMON_ARGS + ["--id", package_id],
+            INSTALL_TIMEOUT,
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        return PackageResult(name, package_id, RESULT_FAILED, str(e))
+    if result.returncode != 0:
+        output = (result.stdout + result.stderr).strip()
+        message = output.splitlines()[-1] if output else ""
+        return PackageResult(
+            name, package_id, RESULT_FAILED, f"{message} (종료 코드: {result.returncode})"
+        )
+    return PackageResult(name, package_id, RESULT_INSTALLED)
+
+
+def install_winget_packages(programs, winget_exe="winget", max_workers=DEFAULT_MAX_WORKERS):
+    """
+    설치된 패키지 목록을 한 번 조회한 뒤, 없는 패키지만 최대 max_workers개씩 설치합니다.
+    programs: {표시 이름: 패키지 ID}
+    패키지별 PackageResult 목록을 programs 순서대로 반환합니다.
+    """
+    installed = get_installed_packages(winget_exe)
+    if installed is None:
+        installed = {}  # 조회 실패 시 모두 설치 시도 (winget이 알아서 건너뜀)
+    to_install, already = plan_winget_installs(programs, installed)
+
+    results = {
+        package_id: PackageResult(name, package_id, RESULT_ALREADY_INSTALLED)
+        for name, package_id in already
+    }
+    if to_install:
+        print(f"설치할 패키지 {len(to_install)}개: {', '.join(i for _, i in to_install)}")
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = [
+                executor.submit(_install_one, winget_exe, name, package_id)
+                for name, package_id in to_install
+            ]
+            for future in futures:
+                result = future.result()
+                results[result.package_id] = result
+    else:
+        print("모든 패키지가 이미 설치되어 있습니다.")
+
+    ordered = [results[package_id] for package_id in programs.values()]
+    for result in ordered:
+        if result.status == RESULT_FAILED:
+            print(f"  [실패] {result.name} ({result.package_id}): {result.message}")
+        else:
+            print(f"  [{result.status}] {result.name} ({result.package_id})")
+    return ordered